@@ -6,6 +6,9 @@ from typing import Optional, Dict, Any
 import json
 import random
 
+from metrics import metrics
+from rate_limit import upstream_budget
+
 SCHOOL_API_URL = "https://api-sekolah-indonesia.vercel.app"
 SCHOOL_TYPES = {
     "sd": {
@@ -175,7 +178,7 @@ class SchoolTypeSelect(discord.ui.Select):
             await interaction.followup.send(embed=loading_embed, ephemeral=False)
             
             try:
-                async with aiohttp.ClientSession() as session:
+                async with aiohttp.ClientSession(trace_configs=[upstream_budget.aiohttp_trace("sekolah"), metrics.aiohttp_trace("sekolah")]) as session:
                     url = f"{SCHOOL_API_URL}/sekolah/{school_type.upper()}"
                     print(f"[DEBUG] Fetching schools with URL: {url}")
                     
@@ -309,7 +312,7 @@ class SchoolCommands(commands.Cog):
             
             loading_msg = await ctx.send("🔍 Mencari sekolah... Mohon tunggu sebentar.")
             
-            async with aiohttp.ClientSession() as session:
+            async with aiohttp.ClientSession(trace_configs=[upstream_budget.aiohttp_trace("sekolah"), metrics.aiohttp_trace("sekolah")]) as session:
                 search_term = name.strip()
                 url = f"{SCHOOL_API_URL}/sekolah/s?sekolah={search_term}"
                 
@@ -358,7 +361,7 @@ class SchoolCommands(commands.Cog):
         loading_msg = await ctx.send(self.get_text(guild_id, "school.loading"))
         
         try:
-            async with aiohttp.ClientSession() as session:
+            async with aiohttp.ClientSession(trace_configs=[upstream_budget.aiohttp_trace("sekolah"), metrics.aiohttp_trace("sekolah")]) as session:
                 url = f"{SCHOOL_API_URL}/sekolah/s?npsn={npsn}"
                 async with session.get(url) as response:
                     if response.status == 200:
@@ -16,6 +16,7 @@ load_dotenv()
 
 # Perubahan: Import router dari modul routers.auth
 from routers.auth import router as auth_router
+from routers.metrics import router as metrics_router, read_bot_counters
 
 app = FastAPI(
     title="Ruri Dragon API",
@@ -40,6 +41,9 @@ app.add_middleware(
 # Include auth router
 app.include_router(auth_router)
 
+# Include metrics router (latency histograms and error rates from the bot)
+app.include_router(metrics_router)
+
 # Sample data models
 class BotStats(BaseModel):
     total_commands: int
@@ -118,6 +122,12 @@ def get_dynamic_stats():
     # Ensure active_servers doesn't go below a minimum value
     dynamic_stats["active_servers"] = max(dynamic_stats["active_servers"], 70)
     
+    # Use the bot's real guild/user counters when its metrics snapshot is available
+    counters = read_bot_counters()
+    if counters:
+        dynamic_stats["active_servers"] = counters["guilds"]
+        dynamic_stats["users_reached"] = counters["users"]
+    
     return dynamic_stats
 
 # Generate updated top commands
@@ -0,0 +1,70 @@
+from fastapi import APIRouter, Depends, HTTPException, Request
+import hmac
+import json
+import os
+import time
+from typing import Any, Dict, Optional
+
+# Router untuk metrics latensi dan error dari proses bot
+router = APIRouter(prefix="/api", tags=["metrics"])
+
+# Snapshot ditulis berkala oleh bot (lihat metrics.py di root repo)
+REPO_DIR = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+METRICS_FILE = os.getenv("METRICS_FILE", os.path.join(REPO_DIR, "src", "data", "metrics.json"))
+# Token untuk scraper dari luar host; tanpa token endpoint hanya untuk localhost
+METRICS_TOKEN = os.getenv("METRICS_TOKEN")
+LOCAL_HOSTS = {"127.0.0.1", "::1", "localhost"}
+
+def require_metrics_access(request: Request) -> None:
+    """
+    Dependency akses /api/metrics
+    
+    Jika METRICS_TOKEN diset, request harus membawa header
+    "Authorization: Bearer <token>". Tanpa token hanya klien localhost
+    yang dilayani.
+    """
+    if METRICS_TOKEN:
+        scheme, _, token = request.headers.get("Authorization", "").partition(" ")
+        if scheme.lower() != "bearer" or not hmac.compare_digest(token.encode(), METRICS_TOKEN.encode()):
+            raise HTTPException(status_code=401, detail="Invalid metrics token",
+                                headers={"WWW-Authenticate": "Bearer"})
+        return
+    host = request.client.host if request.client else None
+    if host not in LOCAL_HOSTS:
+        raise HTTPException(status_code=403, detail="Metrics are only available from localhost")
+
+def read_snapshot() -> Dict[str, Any]:
+    """Membaca snapshot terakhir yang ditulis bot"""
+    with open(METRICS_FILE, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+def read_bot_counters() -> Optional[Dict[str, Any]]:
+    """
+    Jumlah server, member, pengguna unik dan channel dari snapshot terakhir
+    
+    Returns:
+        Dictionary counter, atau None jika snapshot belum ada atau bot belum siap
+    """
+    try:
+        counters = read_snapshot().get("gauges", {}).get("bot")
+    except (OSError, ValueError):
+        return None
+    if not counters or not counters.get("ready"):
+        return None
+    return counters
+
+@router.get("/metrics", dependencies=[Depends(require_metrics_access)])
+async def get_metrics():
+    """
+    Snapshot histogram latensi (p50/p90/p99/max dalam ms) dan error per
+    command dan per API upstream, counter bot, ditambah umur snapshot dalam detik
+    """
+    try:
+        snapshot = read_snapshot()
+    except FileNotFoundError:
+        raise HTTPException(status_code=503, detail="Metrics snapshot not available yet")
+    except (OSError, ValueError) as e:
+        raise HTTPException(status_code=500, detail=f"Failed to read metrics snapshot: {e}")
+    
+    snapshot["age_s"] = max(0.0, time.time() - snapshot.get("generated_at", 0))
+    return snapshot
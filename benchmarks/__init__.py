@@ -0,0 +1,6 @@
+"""
+Benchmark dan simulasi untuk module bot
+
+Setiap file dijalankan dari root repo, misalnya:
+python -m benchmarks.bench_city_index
+"""
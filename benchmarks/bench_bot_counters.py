@@ -0,0 +1,177 @@
+"""
+bench_bot_counters.py - Benchmark penghitung server, member dan channel
+
+Jalankan dari root repo: python -m benchmarks.bench_bot_counters
+"""
+
+import time
+import random
+import asyncio
+from typing import Any, Dict, List
+
+from bot_counters import BotCounters
+
+class _Member:
+    __slots__ = ("id", "guild")
+    
+    def __init__(self, user_id: int, guild):
+        self.id = user_id
+        self.guild = guild
+
+class _Guild:
+    def __init__(self, guild_id: int):
+        self.id = guild_id
+        self.members: List[_Member] = []
+        self.channels: List[Any] = []
+        self.member_count = 0
+
+class _Channel:
+    __slots__ = ("guild",)
+    
+    def __init__(self, guild):
+        self.guild = guild
+
+class _RawRemove:
+    __slots__ = ("guild_id", "user")
+    
+    def __init__(self, member: _Member):
+        self.guild_id = member.guild.id
+        self.user = member
+
+class _Bot:
+    def __init__(self):
+        self.guilds: List[_Guild] = []
+    
+    def add_listener(self, func, name) -> None:
+        pass
+    
+    def is_ready(self) -> bool:
+        return True
+    
+    def get_all_members(self):
+        for guild in self.guilds:
+            yield from guild.members
+    
+    def get_all_channels(self):
+        for guild in self.guilds:
+            yield from guild.channels
+
+def benchmark(guild_count: int = 200, member_count: int = 2_000_000, events: int = 200_000,
+             reads: int = 10_000, seed: int = 20) -> Dict[str, Any]:
+    """
+    Menguji penghitung dengan server sintetis berisi jutaan member
+    
+    Membuat guild_count server dengan total member_count keanggotaan
+    (ukuran server mengikuti distribusi Pareto, pengguna tersebar di
+    beberapa server), menjalankan event join/leave/channel/guild acak,
+    lalu membandingkan penghitung dengan hitungan penuh dan mengukur
+    waktu baca keduanya.
+    
+    Args:
+        guild_count: Jumlah server awal
+        member_count: Total keanggotaan semua server
+        events: Jumlah event acak
+        reads: Jumlah pembacaan penghitung untuk pengukuran
+        seed: Seed random
+    
+    Returns:
+        Dictionary hasil pengukuran
+    """
+    rng = random.Random(seed)
+    bot = _Bot()
+    user_pool = int(member_count * 0.75)
+    weights = [rng.paretovariate(1.2) for _ in range(guild_count)]
+    total_weight = sum(weights)
+    next_guild_id = 1
+    for weight in weights:
+        guild = _Guild(next_guild_id)
+        next_guild_id += 1
+        size = max(1, int(member_count * weight / total_weight))
+        guild.members = [_Member(rng.randrange(user_pool), guild) for _ in range(size)]
+        guild.member_count = size
+        guild.channels = [_Channel(guild) for _ in range(rng.randint(5, 80))]
+        bot.guilds.append(guild)
+    memberships = sum(guild.member_count for guild in bot.guilds)
+    
+    def full_count() -> Dict[str, int]:
+        return {
+            "guilds": len(bot.guilds),
+            "members": sum(guild.member_count for guild in bot.guilds),
+            "users": len({member.id for member in bot.get_all_members()}),
+            "channels": len(list(bot.get_all_channels()))
+        }
+    
+    start = time.perf_counter()
+    expected = full_count()
+    full_ms = (time.perf_counter() - start) * 1e3
+    
+    tracker = BotCounters().install(bot)
+    start = time.perf_counter()
+    tracker.rebuild(bot.guilds)
+    rebuild_ms = (time.perf_counter() - start) * 1e3
+    
+    async def run_events() -> float:
+        nonlocal next_guild_id
+        start = time.perf_counter()
+        for _ in range(events):
+            roll = rng.random()
+            guild = rng.choice(bot.guilds)
+            if roll < 0.45:
+                member = _Member(rng.randrange(user_pool), guild)
+                guild.members.append(member)
+                guild.member_count += 1
+                await tracker.on_member_join(member)
+            elif roll < 0.9 and guild.members:
+                index = rng.randrange(len(guild.members))
+                guild.members[index], guild.members[-1] = guild.members[-1], guild.members[index]
+                member = guild.members.pop()
+                guild.member_count -= 1
+                await tracker.on_raw_member_remove(_RawRemove(member))
+            elif roll < 0.95:
+                channel = _Channel(guild)
+                guild.channels.append(channel)
+                await tracker.on_guild_channel_create(channel)
+            elif roll < 0.9999 and guild.channels:
+                await tracker.on_guild_channel_delete(guild.channels.pop())
+            elif roll < 0.99995 and len(bot.guilds) > 1:
+                bot.guilds.remove(guild)
+                await tracker.on_guild_remove(guild)
+            else:
+                guild = _Guild(next_guild_id)
+                next_guild_id += 1
+                size = rng.randint(1, 500)
+                guild.members = [_Member(rng.randrange(user_pool), guild) for _ in range(size)]
+                guild.member_count = size
+                guild.channels = [_Channel(guild) for _ in range(rng.randint(1, 20))]
+                bot.guilds.append(guild)
+                await tracker.on_guild_join(guild)
+        return time.perf_counter() - start
+    
+    event_time = asyncio.run(run_events())
+    
+    start = time.perf_counter()
+    for _ in range(reads):
+        tracker.guilds, tracker.members, tracker.users, tracker.channels
+    read_us = (time.perf_counter() - start) / reads * 1e6
+    
+    actual = {key: value for key, value in tracker.snapshot().items() if key != "ready"}
+    expected = full_count()
+    return {
+        "guilds": len(bot.guilds),
+        "memberships": memberships,
+        "full_count_ms": full_ms,
+        "rebuild_ms": rebuild_ms,
+        "event_us": event_time / events * 1e6,
+        "read_us": read_us,
+        "counters": actual,
+        "matches": actual == expected
+    }
+
+if __name__ == "__main__":
+    result = benchmark()
+    print(f"{result['guilds']} server, {result['memberships']} keanggotaan awal")
+    print(f"Hitung penuh (get_all_members + get_all_channels): {result['full_count_ms']:.1f} ms per pembacaan")
+    print(f"Rebuild sekali saat on_ready: {result['rebuild_ms']:.1f} ms")
+    print(f"Event inkremental: {result['event_us']:.2f} us per event")
+    print(f"Baca penghitung: {result['read_us']:.2f} us per pembacaan (4 angka)")
+    print(f"Penghitung: {result['counters']} | cocok dengan hitungan penuh: {result['matches']}")
@@ -0,0 +1,194 @@
+"""
+bench_city_index.py - Benchmark indeks pencarian kota dan menu wilayah
+
+Jalankan dari root repo: python -m benchmarks.bench_city_index
+"""
+
+import time
+import random
+from typing import Any, Dict, List
+
+from city_index import (
+    CityIndex, DEFAULT_ALIASES, DEFAULT_REGION, REGIONS, REGION_KEYWORDS, REGION_OVERRIDES,
+    normalize, strip_admin
+)
+
+def benchmark(city_count: int = 514, queries: int = 2000, seed: int = 23) -> Dict[str, Any]:
+    """
+    Mengukur latensi indeks untuk daftar kota seukuran kota.json
+    
+    Nama kota sintetis (KAB./KOTA + suku kata acak) dicampur nama kota
+    besar asli. Query berupa nama persis, alias, awalan, substring dan
+    nama dengan satu salah ketik, lalu dibandingkan dengan pencarian
+    linear lama (cocok persis lalu substring pertama).
+    
+    Args:
+        city_count: Jumlah kota
+        queries: Jumlah query
+        seed: Seed random
+    
+    Returns:
+        Dictionary hasil pengukuran dalam mikrodetik
+    """
+    rng = random.Random(seed)
+    real = ["KOTA JAKARTA", "KOTA YOGYAKARTA", "KOTA SURAKARTA", "KOTA BANDUNG", "KOTA SURABAYA",
+            "KOTA SEMARANG", "KOTA MEDAN", "KOTA MAKASSAR", "KOTA DENPASAR", "KAB. ACEH BARAT",
+            "KOTA BOGOR", "KAB. BOGOR", "KOTA MALANG", "KAB. MALANG", "KOTA BALIKPAPAN"]
+    syllables = ["ba", "ka", "ta", "ma", "ja", "su", "ra", "ngan", "lung", "po", "ti", "wa", "si",
+                 "ha", "ya", "ran", "kar", "to", "go", "de", "nu", "le", "ri", "mo", "sa", "bu", "lo"]
+    names = set(real)
+    while len(names) < city_count:
+        words = ["".join(rng.choice(syllables) for _ in range(rng.randint(2, 4))) for _ in range(rng.choice([1, 1, 2]))]
+        names.add(f"{rng.choice(['KAB.', 'KOTA'])} {' '.join(words).upper()}")
+    cities = [{"id": str(i), "name": name} for i, name in enumerate(sorted(names))]
+    
+    start = time.perf_counter()
+    index = CityIndex(cities)
+    build_ms = (time.perf_counter() - start) * 1e3
+    
+    def typo(text: str) -> str:
+        position = rng.randrange(len(text))
+        return text[:position] + rng.choice("aiueokt") + text[position + 1:]
+    
+    samples = []
+    for _ in range(queries):
+        name = strip_admin(normalize(rng.choice(cities)["name"]))
+        kind = rng.random()
+        if kind < 0.2:
+            samples.append(name)
+        elif kind < 0.3:
+            samples.append(rng.choice(list(DEFAULT_ALIASES)))
+        elif kind < 0.55:
+            samples.append(name[:rng.randint(1, len(name))])
+        elif kind < 0.75:
+            start_at = rng.randrange(len(name))
+            samples.append(name[start_at:start_at + rng.randint(3, 6)])
+        else:
+            samples.append(typo(name))
+    
+    def timed(func) -> List[float]:
+        latencies = []
+        for query in samples:
+            began = time.perf_counter()
+            func(query)
+            latencies.append((time.perf_counter() - began) * 1e6)
+        latencies.sort()
+        return latencies
+    
+    def linear(query: str):
+        query = query.lower()
+        for city in cities:
+            if city["name"].lower() == query:
+                return city
+        for city in cities:
+            if query in city["name"].lower():
+                return city
+        return None
+    
+    def pct(latencies: List[float], fraction: float) -> float:
+        return latencies[min(len(latencies) - 1, int(fraction * len(latencies)))]
+    
+    resolve = timed(index.resolve)
+    complete = timed(index.complete)
+    scan = timed(linear)
+    typo_hits = 0
+    typo_total = 0
+    for city in rng.sample(cities, 200):
+        name = strip_admin(normalize(city["name"]))
+        if len(name) < 6:
+            continue
+        typo_total += 1
+        typo_hits += index.resolve(typo(name)) is city
+    return {
+        "cities": len(index),
+        "build_ms": build_ms,
+        "resolve_p50_us": pct(resolve, 0.5),
+        "resolve_p99_us": pct(resolve, 0.99),
+        "complete_p50_us": pct(complete, 0.5),
+        "complete_p99_us": pct(complete, 0.99),
+        "linear_p50_us": pct(scan, 0.5),
+        "typo_accuracy": typo_hits / typo_total if typo_total else 0.0,
+        "jogja": index.resolve("jogja")["name"]
+    }
+
+def benchmark_regions(filler: int = 250, opens: int = 200, seed: int = 24) -> Dict[str, Any]:
+    """
+    Mengukur latensi membuka menu wilayah
+    
+    Daftar kota berisi semua kata kunci dan nama di tabel koreksi,
+    ditambah nama sintetis. Cara lama (setiap buka menu: cek substring
+    setiap kata kunci untuk setiap kota, lalu urutkan ulang) dibandingkan
+    dengan regions() pada indeks: pembagian pertama dan pembukaan
+    berikutnya yang memakai hasil tersimpan.
+    
+    Args:
+        filler: Jumlah nama sintetis tambahan
+        opens: Jumlah pembukaan menu yang diukur
+        seed: Seed random
+    
+    Returns:
+        Dictionary hasil pengukuran dalam mikrodetik
+    """
+    rng = random.Random(seed)
+    names = {keyword for keywords in REGION_KEYWORDS.values() for keyword in keywords}
+    names.update(REGION_OVERRIDES)
+    syllables = ["ba", "ka", "ta", "ma", "ja", "su", "ra", "ngan", "lung", "po", "ti", "wa", "si", "ha", "ya"]
+    while len(names) < len(REGION_OVERRIDES) + filler:
+        names.add("".join(rng.choice(syllables) for _ in range(rng.randint(2, 4))))
+    cities = sorted(names)
+    
+    def legacy_open():
+        regions = {region: dict(info, city_count=0) for region, info in REGIONS.items()}
+        cities_by_region = {region: [] for region in regions}
+        for position, city in enumerate(cities):
+            region = DEFAULT_REGION
+            for candidate, keywords in REGION_KEYWORDS.items():
+                if any(keyword in city.lower() for keyword in keywords):
+                    region = candidate
+                    break
+            cities_by_region[region].append({"id": str(position), "name": city})
+            regions[region]["city_count"] += 1
+        for region in cities_by_region:
+            cities_by_region[region] = sorted(cities_by_region[region], key=lambda x: x.get("name", ""))
+        return regions, cities_by_region
+    
+    start = time.perf_counter()
+    for _ in range(opens):
+        _, legacy = legacy_open()
+    legacy_us = (time.perf_counter() - start) / opens * 1e6
+    
+    index = CityIndex(cities)
+    start = time.perf_counter()
+    _, grouped = index.regions()
+    first_us = (time.perf_counter() - start) * 1e6
+    start = time.perf_counter()
+    for _ in range(opens):
+        index.regions()
+    cached_us = (time.perf_counter() - start) / opens * 1e6
+    
+    legacy_region = {city["name"]: region for region, members in legacy.items() for city in members}
+    moved = sum(
+        1 for region, members in grouped.items() for city in members
+        if legacy_region[city["name"]] != region
+    )
+    return {
+        "cities": len(cities),
+        "legacy_us": legacy_us,
+        "first_us": first_us,
+        "cached_us": cached_us,
+        "reclassified": moved,
+        "default_region": len(grouped[DEFAULT_REGION])
+    }
+
+if __name__ == "__main__":
+    result = benchmark()
+    print(f"{result['cities']} kota, indeks dibangun dalam {result['build_ms']:.1f} ms")
+    print(f"resolve : p50 {result['resolve_p50_us']:.0f} us, p99 {result['resolve_p99_us']:.0f} us")
+    print(f"complete: p50 {result['complete_p50_us']:.0f} us, p99 {result['complete_p99_us']:.0f} us")
+    print(f"Pencarian linear lama: p50 {result['linear_p50_us']:.0f} us")
+    print(f"Salah ketik satu huruf ditemukan: {result['typo_accuracy'] * 100:.0f}% | 'jogja' -> {result['jogja']}")
+    
+    regions = benchmark_regions()
+    print(f"Menu wilayah, {regions['cities']} kota: cara lama {regions['legacy_us']:.0f} us per buka menu, "
+          f"pembagian pertama {regions['first_us']:.0f} us, berikutnya {regions['cached_us']:.2f} us")
+    print(f"Kota yang wilayahnya dikoreksi: {regions['reclassified']}")
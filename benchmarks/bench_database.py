@@ -0,0 +1,155 @@
+"""
+bench_database.py - Benchmarks for the in-memory storage in database.py
+
+Run from the repository root: python -m benchmarks.bench_database
+"""
+
+import os
+import json
+import time
+import random
+import tempfile
+from datetime import datetime, timedelta
+from typing import Dict, List, Any, Optional
+
+from database import MemoryStorage, compile_query, BACKUP_FILE, LEGACY_BACKUP_FILE
+
+def benchmark_lookups(sizes=(1_000, 100_000, 1_000_000), lookups: int = 1_000) -> List[Dict[str, Any]]:
+    """
+    Measure find_one latency on guilds.guild_id with and without the index.
+    
+    The unindexed run does fewer lookups on large collections so the whole
+    benchmark stays within a couple of minutes.
+    """
+    results = []
+    for size in sizes:
+        storage = MemoryStorage()
+        for i in range(size):
+            storage.insert_one("guilds", {"_id": str(i), "guild_id": str(i), "settings": {}})
+        
+        timings = {}
+        for label, indexed in (("scan", False), ("indexed", True)):
+            if indexed:
+                storage.create_index("guilds", "guild_id", unique=True)
+                count = lookups
+            else:
+                count = max(10, min(lookups, lookups * 1_000 // size))
+            
+            keys = [str(random.randrange(size)) for _ in range(count)]
+            start = time.perf_counter()
+            for key in keys:
+                storage.find_one("guilds", {"guild_id": key})
+            timings[label] = (time.perf_counter() - start) / count * 1e6
+        
+        results.append({"documents": size, "scan_us": timings["scan"], "indexed_us": timings["indexed"]})
+        print(f"{size:>9} docs | scan {timings['scan']:>12.2f} us/lookup | indexed {timings['indexed']:>6.2f} us/lookup")
+    return results
+
+def _legacy_matches(doc: Dict[str, Any], query: Dict[str, Any]) -> bool:
+    """The interpreted equality-only matcher used before queries were compiled"""
+    for key, value in query.items():
+        if key not in doc or doc[key] != value:
+            return False
+    return True
+
+def benchmark_queries(size: int = 200_000, repeats: int = 5) -> Dict[str, float]:
+    """
+    Compare the old interpreted matcher with compiled predicates on full scans,
+    and a timestamp range query scanned versus served from a sorted index.
+    """
+    storage = MemoryStorage()
+    now = time.time()
+    languages = ("id", "en", "ar", "ms")
+    for i in range(size):
+        storage.insert_one("guilds", {
+            "_id": str(i), "guild_id": str(i), "language": languages[i % 4],
+            "prefix": "!", "joined_at": now - i
+        })
+    docs = list(storage.collections["guilds"].values())
+    
+    def timed(run) -> float:
+        best = float("inf")
+        for _ in range(repeats):
+            start = time.perf_counter()
+            run()
+            best = min(best, time.perf_counter() - start)
+        return best * 1e3
+    
+    query = {"language": "en", "prefix": "!"}
+    results = {
+        "legacy_equality_ms": timed(lambda: [d for d in docs if _legacy_matches(d, query)]),
+        "compiled_equality_ms": timed(lambda: list(filter(compile_query(query), docs))),
+    }
+    
+    last_hour = {"joined_at": {"$gte": now - 3_600}}
+    results["range_scan_ms"] = timed(lambda: storage.find("guilds", last_hour))
+    storage.create_index("guilds", "joined_at", sorted=True)
+    results["range_indexed_ms"] = timed(lambda: storage.find("guilds", last_hour))
+    
+    in_query = {"guild_id": {"$in": [str(random.randrange(size)) for _ in range(100)]}}
+    results["in_scan_ms"] = timed(lambda: storage.find("guilds", in_query))
+    storage.create_index("guilds", "guild_id", unique=True)
+    results["in_indexed_ms"] = timed(lambda: storage.find("guilds", in_query))
+    
+    for label, value in results.items():
+        print(f"{label:>22}: {value:8.2f} ms ({size} docs)")
+    return results
+
+def benchmark_snapshots(documents: int = 1_000_000, directory: Optional[str] = None) -> List[Dict[str, Any]]:
+    """
+    Compare save/load time and file size of the old JSON backup with the
+    binary snapshot (uncompressed, zlib and zstd when available).
+    
+    Every format is loaded into a fresh MemoryStorage so the typed source
+    collections are never replaced (the JSON backup turns datetimes into
+    strings, which would make the later binary rows save different data).
+    """
+    storage = MemoryStorage()
+    joined = datetime(2024, 1, 1)
+    languages = ("id", "en", "ar", "ms")
+    for i in range(documents):
+        storage.insert_one("guilds", {
+            "_id": str(i), "guild_id": str(i),
+            "settings": {"prefix": "!", "language": languages[i % 4]},
+            "member_count": i % 5000, "joined_at": joined + timedelta(seconds=i)
+        })
+    
+    directory = directory or tempfile.mkdtemp(prefix="memory-db-bench-")
+    results = []
+    
+    def record(label: str, path: str, save, load) -> None:
+        start = time.perf_counter()
+        save()
+        save_s = time.perf_counter() - start
+        start = time.perf_counter()
+        load()
+        load_s = time.perf_counter() - start
+        size_mb = os.path.getsize(path) / 1e6
+        os.remove(path)
+        results.append({"format": label, "save_s": save_s, "load_s": load_s, "size_mb": size_mb})
+        print(f"{label:>14} | save {save_s:6.2f}s | load {load_s:6.2f}s | {size_mb:8.1f} MB ({documents} docs)")
+    
+    json_path = os.path.join(directory, LEGACY_BACKUP_FILE)
+    
+    def json_save():
+        with open(json_path, 'w', encoding='utf-8') as f:
+            json.dump(storage.collections, f, indent=2, default=str)
+    record("json (legacy)", json_path, json_save, lambda: MemoryStorage().load_from_file(json_path))
+    
+    binary_path = os.path.join(directory, BACKUP_FILE)
+    for compression in (None, "zlib", "zstd"):
+        if compression == "zstd":
+            from snapshot import zstandard
+            if zstandard is None:
+                continue
+        record(f"binary {compression or 'raw'}", binary_path,
+               lambda: storage.save_to_file(binary_path, compression),
+               lambda: MemoryStorage().load_from_file(binary_path))
+    
+    os.rmdir(directory)
+    return results
+
+if __name__ == "__main__":
+    benchmark_lookups()
+    benchmark_queries()
+    benchmark_snapshots()
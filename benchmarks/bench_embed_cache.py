@@ -0,0 +1,104 @@
+"""
+bench_embed_cache.py - Benchmark latensi command help dengan EmbedCache
+
+Jalankan dari root repo: python -m benchmarks.bench_embed_cache
+"""
+
+import time
+import asyncio
+from typing import Callable, Dict
+
+import discord
+
+from embed_cache import EmbedCache
+from language import catalog
+
+def _percentile(samples: list, fraction: float) -> float:
+    """Persentil dari daftar sampel yang sudah terurut"""
+    return samples[min(len(samples) - 1, int(len(samples) * fraction))]
+
+async def _replay(handler: Callable, requests: int, concurrency: int) -> Dict[str, float]:
+    """Menjalankan handler dari banyak task sekaligus dan mengukur latensinya"""
+    latencies = []
+    queue = asyncio.Queue()
+    for i in range(requests):
+        queue.put_nowait(i)
+    
+    async def worker():
+        while not queue.empty():
+            i = queue.get_nowait()
+            start = time.perf_counter()
+            await handler(i)
+            latencies.append(time.perf_counter() - start)
+    
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    latencies.sort()
+    return {"p50_us": _percentile(latencies, 0.50) * 1e6, "p99_us": _percentile(latencies, 0.99) * 1e6}
+
+def benchmark(requests: int = 20_000, concurrency: int = 100, guilds: int = 500) -> Dict[str, Dict[str, float]]:
+    """
+    Mengukur latensi p50/p99 command help dengan dan tanpa cache
+    
+    Handler meniru menu help: menelusuri registry command, menerjemahkan
+    judul lewat katalog, membangun embed, lalu menambahkan footer per
+    pengguna dan "mengirim" (await asyncio.sleep(0), yang memberi giliran
+    ke task lain sehingga latensi ikut memuat antrean event loop).
+    
+    Args:
+        requests: Jumlah pemanggilan help
+        concurrency: Jumlah task yang memanggil bersamaan
+        guilds: Jumlah server (separuh berbahasa Inggris, sepertiga memakai prefix "?")
+    
+    Returns:
+        Dictionary "before"/"after" berisi p50_us dan p99_us
+    """
+    registry = {name: object() for name in (
+        "help", "ping", "info", "stats", "invite", "prefix", "language", "anime", "waifu", "imsakiyah"
+    )}
+    categories = {
+        "Umum": ["help", "ping", "info", "stats", "invite"],
+        "Setelan": ["prefix", "language"],
+        "Anime": ["anime", "waifu"],
+        "Islami": ["imsakiyah"]
+    }
+    
+    def render(lang: str, prefix: str) -> discord.Embed:
+        embed = discord.Embed(
+            title=catalog.get(lang, "commands.help.title"),
+            description=catalog.get(lang, "commands.help.description", prefix=prefix),
+            color=0x3498db
+        )
+        for category, names in categories.items():
+            valid = [f"`{prefix}{name}`" for name in names if registry.get(name)]
+            if valid:
+                embed.add_field(name=f"⚙️ {category}", value=" • ".join(valid), inline=False)
+        return embed
+    
+    def settings(i: int) -> tuple:
+        guild_id = i % guilds
+        return ("en" if guild_id % 2 else "id", "?" if guild_id % 3 == 0 else "!")
+    
+    async def uncached(i: int) -> None:
+        lang, prefix = settings(i)
+        embed = render(lang, prefix)
+        embed.set_footer(text=f"Requested by user{i}")
+        await asyncio.sleep(0)
+        embed.to_dict()
+    
+    cache = EmbedCache()
+    
+    async def cached(i: int) -> None:
+        lang, prefix = settings(i)
+        embed = cache.get(("help", lang, prefix), lambda: render(lang, prefix))
+        embed.set_footer(text=f"Requested by user{i}")
+        await asyncio.sleep(0)
+        embed.to_dict()
+    
+    before = asyncio.run(_replay(uncached, requests, concurrency))
+    after = asyncio.run(_replay(cached, requests, concurrency))
+    print(f"tanpa cache : p50 {before['p50_us']:8.1f} us, p99 {before['p99_us']:8.1f} us")
+    print(f"dengan cache: p50 {after['p50_us']:8.1f} us, p99 {after['p99_us']:8.1f} us (hit rate {cache.stats()['hit_rate']:.1%})")
+    return {"before": before, "after": after}
+
+if __name__ == "__main__":
+    benchmark()
@@ -0,0 +1,84 @@
+"""
+bench_http_pool.py - Uji beban PooledHTTPClient terhadap server stub lokal
+
+Jalankan dari root repo: python -m benchmarks.bench_http_pool
+"""
+
+import json
+import time
+import asyncio
+import urllib.request
+from typing import Any, Dict
+
+from aiohttp import web
+
+from http_pool import PooledHTTPClient
+
+def load_test(count: int = 64, latency: float = 0.05, levels=(1, 2, 4, 8, 16)) -> Dict[str, Any]:
+    """
+    Mengukur throughput terhadap server stub lokal
+    
+    Server aiohttp lokal membalas setiap request setelah `latency` detik.
+    Untuk setiap tingkat konkurensi, `count` request dijalankan lewat
+    asyncio.gather memakai PooledHTTPClient, lalu dibandingkan dengan pola
+    lama: request blocking (urllib, setara requests.get) di dalam coroutine.
+    
+    Args:
+        count: Jumlah request per pengukuran
+        latency: Waktu respons server stub dalam detik
+        levels: Tingkat max_concurrency yang diuji
+    
+    Returns:
+        Dictionary hasil per tingkat konkurensi dalam request per detik
+    """
+    payload = [{"id": str(i), "name": f"KOTA {i}"} for i in range(500)]
+    
+    async def handler(request):
+        await asyncio.sleep(latency)
+        return web.Response(text=json.dumps(payload), content_type="text/plain")
+    
+    async def run() -> Dict[str, Any]:
+        app = web.Application()
+        app.router.add_get("/kota.json", handler)
+        runner = web.AppRunner(app)
+        await runner.setup()
+        site = web.TCPSite(runner, "127.0.0.1", 0)
+        await site.start()
+        port = runner.addresses[0][1]
+        url = f"http://127.0.0.1:{port}/kota.json"
+        results: Dict[str, Any] = {"pooled": {}}
+        try:
+            async def blocking_fetch():
+                with urllib.request.urlopen(url) as response:
+                    return json.loads(response.read())
+            
+            # Server stub berjalan di loop yang sama, jadi baseline blocking
+            # dijalankan dari thread agar stub tetap bisa menjawab
+            def blocking_batch():
+                async def batch():
+                    await asyncio.gather(*(blocking_fetch() for _ in range(count)))
+                asyncio.run(batch())
+            
+            start = time.perf_counter()
+            await asyncio.get_running_loop().run_in_executor(None, blocking_batch)
+            results["blocking"] = count / (time.perf_counter() - start)
+            
+            for level in levels:
+                client = PooledHTTPClient(f"loadtest-{level}", max_concurrency=level)
+                start = time.perf_counter()
+                responses = await asyncio.gather(*(client.get_json(url) for _ in range(count)))
+                elapsed = time.perf_counter() - start
+                await client.close()
+                assert all(status == 200 and len(data) == len(payload) for status, data in responses)
+                results["pooled"][level] = count / elapsed
+        finally:
+            await runner.cleanup()
+        return results
+    
+    return asyncio.run(run())
+
+if __name__ == "__main__":
+    result = load_test()
+    print(f"Blocking (requests.get di coroutine): {result['blocking']:.1f} req/s pada semua tingkat konkurensi")
+    for level, throughput in result["pooled"].items():
+        print(f"Pool aiohttp, konkurensi {level:>2}: {throughput:.1f} req/s")
@@ -0,0 +1,178 @@
+"""
+bench_i18n.py - Benchmark katalog terjemahan
+
+Jalankan dari root repo: python -m benchmarks.bench_i18n
+"""
+
+import os
+import sys
+import json
+import time
+import tempfile
+import subprocess
+from typing import Any, Dict, List
+
+from memory_db import MemoryDB
+from i18n import DEFAULT_LANGUAGE, LocaleCatalog, flatten
+from settings_cache import GuildSettingsCache
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+def _legacy_get_text(languages: Dict[str, Any], lang: str, key: str, **kwargs) -> Any:
+    """get_text lama (menelusuri dict bersarang setiap panggilan), untuk benchmark"""
+    value = languages[lang]["translations"]
+    for k in key.split('.'):
+        if isinstance(value, dict) and k in value:
+            value = value[k]
+        elif lang != DEFAULT_LANGUAGE:
+            return _legacy_get_text(languages, DEFAULT_LANGUAGE, key, **kwargs)
+        else:
+            return key
+    if isinstance(value, str):
+        try:
+            value = value.format(**kwargs)
+        except KeyError:
+            pass
+    return value
+
+def benchmark(catalog: LocaleCatalog, database: Any,
+              guilds: int = 1_000, iterations: int = 200_000) -> Dict[str, float]:
+    """
+    Membandingkan get_text lama dengan katalog terkompilasi
+    
+    Kedua jalur menentukan bahasa guild lebih dulu: jalur lama lewat
+    storage setiap panggilan, jalur baru lewat GuildSettingsCache.
+    Jalur lama menelusuri dictionary bersarang dari semua bahasa katalog.
+    
+    Args:
+        catalog: Katalog terjemahan
+        database: Storage dengan get_language dan add_setting_listener
+        guilds: Jumlah guild berbeda dalam aliran panggilan
+        iterations: Jumlah lookup per jalur
+    
+    Returns:
+        Dictionary rata-rata mikrodetik per lookup
+    """
+    languages = {code: catalog.language_data(code) for code in catalog.available_languages()}
+    cache = GuildSettingsCache(database, default_lang=DEFAULT_LANGUAGE)
+    keys = [key for key, value in flatten(languages[DEFAULT_LANGUAGE]["translations"]).items()
+            if isinstance(value, str)]
+    kwargs = {"prefix": "!", "command": "ping", "city": "Jakarta", "error": "x"}
+    # Separuh panggilan tanpa parameter, seperti judul/label embed
+    calls = [(i % guilds, keys[i % len(keys)], kwargs if i % 2 else {}) for i in range(iterations)]
+    
+    start = time.perf_counter()
+    for guild_id, key, params in calls:
+        _legacy_get_text(languages, database.get_language(guild_id), key, **params)
+    legacy_us = (time.perf_counter() - start) / iterations * 1e6
+    
+    start = time.perf_counter()
+    for guild_id, key, params in calls:
+        catalog.get(cache.get_language(guild_id), key, **params)
+    compiled_us = (time.perf_counter() - start) / iterations * 1e6
+    
+    print(f"get_text lama       : {legacy_us:.3f} us/lookup")
+    print(f"katalog terkompilasi: {compiled_us:.3f} us/lookup ({len(keys)} kunci, {len(languages)} bahasa, {guilds} guild)")
+    return {"legacy_us": legacy_us, "compiled_us": compiled_us}
+
+_STARTUP_PROBE = """
+import sys, time, tracemalloc
+sys.path[:0] = [{path!r}, {root!r}]
+# Module stdlib yang sudah di-import bot (discord.py) sebelum terjemahan dimuat
+import json, logging, threading, typing, string, collections.abc
+if {trace!r}:
+    tracemalloc.start()
+start = time.perf_counter()
+{body}
+elapsed = time.perf_counter() - start
+print(elapsed, tracemalloc.get_traced_memory()[0])
+"""
+
+def _probe(path: str, body: str) -> tuple:
+    """Menjalankan potongan kode di interpreter baru, mengembalikan (detik, byte)"""
+    # Bot berjalan dengan .pyc, jadi cache bytecode harus aktif di sini
+    env = {key: value for key, value in os.environ.items() if key != "PYTHONDONTWRITEBYTECODE"}
+    
+    def run(trace: bool) -> List[str]:
+        code = _STARTUP_PROBE.format(path=path, root=ROOT,
+                                     body=body, trace=trace)
+        return subprocess.run([sys.executable, "-c", code], check=True, env=env,
+                              capture_output=True, text=True).stdout.split()
+    
+    # Putaran pertama hanya menulis .pyc; waktu diukur tanpa tracemalloc
+    run(False)
+    elapsed = min(float(run(False)[0]) for _ in range(5))
+    return elapsed, int(run(True)[1])
+
+def _tag_strings(tree: Any, tag: str) -> Any:
+    """Menyalin dictionary terjemahan dengan penanda di setiap string"""
+    if isinstance(tree, dict):
+        return {key: _tag_strings(value, tag) for key, value in tree.items()}
+    if isinstance(tree, str):
+        return f"[{tag}] {tree}"
+    return tree
+
+def benchmark_startup(languages: int = 2) -> Dict[str, float]:
+    """
+    Membandingkan biaya startup dict literal Python dengan LocaleCatalog
+    
+    Jalur lama meng-import module berisi LANGUAGES untuk semua bahasa lalu
+    meng-compile tabel semuanya dengan compile_table. Jalur baru membuat
+    LocaleCatalog lalu mengambil satu teks, sehingga hanya bahasa default
+    yang dimuat. Setiap jalur diukur
+    di interpreter baru; memori adalah alokasi Python (tracemalloc) yang
+    masih hidup setelahnya.
+    
+    Args:
+        languages: Jumlah bahasa (file locales/ disalin bergantian jika
+            lebih banyak dari yang ada)
+    
+    Returns:
+        Dictionary waktu (ms) dan memori (KiB) untuk kedua jalur
+    """
+    catalog = LocaleCatalog(reload_interval=None)
+    codes = catalog.available_languages()
+    sources = [catalog.language_data(code) for code in codes]
+    
+    with tempfile.TemporaryDirectory() as tmp:
+        locales = os.path.join(tmp, "locales")
+        os.mkdir(locales)
+        literal = {}
+        for i in range(languages):
+            if i < len(codes):
+                code, data = codes[i], sources[i]
+            else:
+                # Bahasa tiruan dengan string sendiri, agar tidak berbagi konstanta
+                code, data = f"x{i}", _tag_strings(sources[i % len(sources)], f"x{i}")
+            literal[code] = data
+            with open(os.path.join(locales, f"{code}.json"), "w", encoding="utf-8") as f:
+                json.dump(literal[code], f, ensure_ascii=False, indent=2)
+        with open(os.path.join(tmp, "language_literal.py"), "w", encoding="utf-8") as f:
+            f.write(f"LANGUAGES = {literal!r}\n")
+        
+        eager_s, eager_bytes = _probe(tmp, (
+            "import i18n\n"
+            "from language_literal import LANGUAGES\n"
+            "tables = {code: i18n.compile_table(data.get('translations', {})) for code, data in LANGUAGES.items()}\n"
+            "tables['id']['commands.help.title']"
+        ))
+        lazy_s, lazy_bytes = _probe(tmp, (
+            "import i18n\n"
+            f"catalog = i18n.LocaleCatalog({locales!r}, reload_interval=None)\n"
+            "catalog.get('id', 'commands.help.title')"
+        ))
+    
+    print(f"dict literal, {languages:>2} bahasa dimuat: {eager_s * 1e3:7.2f} ms, {eager_bytes / 1024:8.1f} KiB")
+    print(f"LocaleCatalog,  1 bahasa dimuat: {lazy_s * 1e3:7.2f} ms, {lazy_bytes / 1024:8.1f} KiB")
+    return {
+        "eager_ms": eager_s * 1e3, "eager_kib": eager_bytes / 1024,
+        "lazy_ms": lazy_s * 1e3, "lazy_kib": lazy_bytes / 1024
+    }
+
+if __name__ == "__main__":
+    storage = MemoryDB()
+    for guild_id in range(0, 1_000, 2):
+        storage.set_guild_language(guild_id, "en")
+    benchmark(LocaleCatalog(reload_interval=None), storage)
+    benchmark_startup(2)
+    benchmark_startup(20)
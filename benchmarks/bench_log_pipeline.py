@@ -0,0 +1,99 @@
+"""
+bench_log_pipeline.py - Benchmark logging inline vs lewat antrean
+
+Jalankan dari root repo: python -m benchmarks.bench_log_pipeline
+"""
+
+import os
+import re
+import time
+import queue
+import tempfile
+import logging
+from typing import Dict
+
+from log_pipeline import LOG_FORMAT, LoopQueueHandler, SanitizingQueueListener
+
+class _ASCIIFilter(logging.Filter):
+    """Filter lama yang menjalankan regex di setiap record, untuk benchmark"""
+    
+    def filter(self, record):
+        if isinstance(record.msg, str):
+            record.msg = re.sub(r'[^\x00-\x7F]+', '[non-ASCII]', record.msg)
+        return True
+
+def benchmark(records: int = 50_000) -> Dict[str, float]:
+    """
+    Membandingkan waktu logging di thread pemanggil: inline vs antrean
+    
+    Jalur lama: filter regex ASCII lalu StreamHandler dan FileHandler
+    ditulis langsung. Jalur baru: LoopQueueHandler, listener menulis ke
+    handler yang sama di thread lain. Yang diukur adalah lama
+    logger.info() menahan pemanggil (event loop).
+    
+    Args:
+        records: Jumlah record per jalur
+    
+    Returns:
+        Dictionary inline_us dan queued_us (median per record)
+    """
+    def make_logger(name: str) -> logging.Logger:
+        logger = logging.Logger(name, logging.INFO)
+        logger.propagate = False
+        return logger
+    
+    def timed(logger: logging.Logger) -> list:
+        samples = []
+        for i in range(records):
+            start = time.perf_counter()
+            logger.info("Command used: %s by %s in %s", "help", f"user{i}", "Server ☕")
+            samples.append(time.perf_counter() - start)
+        samples.sort()
+        return samples
+    
+    formatter = logging.Formatter(LOG_FORMAT)
+    with tempfile.TemporaryDirectory() as tmp, open(os.devnull, "w") as devnull:
+        def sinks(path: str) -> list:
+            handlers = [logging.StreamHandler(devnull), logging.FileHandler(path, encoding="utf-8")]
+            for handler in handlers:
+                handler.setFormatter(formatter)
+            return handlers
+        
+        inline = make_logger("bench.inline")
+        inline.addFilter(_ASCIIFilter())
+        for handler in sinks(os.path.join(tmp, "inline.log")):
+            inline.addHandler(handler)
+        
+        inline_samples = timed(inline)
+        for handler in inline.handlers:
+            handler.close()
+        
+        log_queue = queue.SimpleQueue()
+        queued = make_logger("bench.queued")
+        queue_handler = LoopQueueHandler(log_queue)
+        queued.addHandler(queue_handler)
+        listener = SanitizingQueueListener(log_queue, *sinks(os.path.join(tmp, "queued.log")))
+        listener.start()
+        
+        queued_samples = timed(queued)
+        
+        drain_start = time.perf_counter()
+        listener.stop()
+        drain_s = time.perf_counter() - drain_start
+        for handler in listener.handlers:
+            handler.close()
+    
+    def summary(samples: list) -> str:
+        return (f"p50 {samples[len(samples) // 2] * 1e6:6.2f} us, "
+                f"rata-rata {sum(samples) / len(samples) * 1e6:6.2f} us per record")
+    
+    print(f"inline : {summary(inline_samples)} di thread pemanggil")
+    print(f"antrean: {summary(queued_samples)} di thread pemanggil "
+          f"(listener selesai {drain_s:.2f} s kemudian)")
+    return {
+        "inline_us": inline_samples[len(inline_samples) // 2] * 1e6,
+        "queued_us": queued_samples[len(queued_samples) // 2] * 1e6
+    }
+
+if __name__ == "__main__":
+    benchmark()
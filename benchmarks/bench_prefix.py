@@ -0,0 +1,123 @@
+"""
+bench_prefix.py - Benchmark tabel prefix dan filter awal on_message
+
+Pesan diputar ulang lewat commands.Bot sungguhan (get_prefix,
+get_context dan invoke milik discord.py) tanpa koneksi ke Discord,
+sehingga biaya membangun Context untuk setiap pesan ikut terukur.
+
+Jalankan dari root repo: python -m benchmarks.bench_prefix
+"""
+
+import time
+import random
+import asyncio
+import tempfile
+from types import SimpleNamespace
+from typing import Dict
+
+import discord
+from discord.ext import commands
+
+from src.core.database import Database
+from src.core.prefix import PrefixTable, mention_prefixes, could_be_command
+
+BOT_ID = 1234567890
+
+class ReplayBot(commands.Bot):
+    """Bot tanpa login; get_context membandingkan author dengan bot.user"""
+    user = SimpleNamespace(id=BOT_ID)
+
+def benchmark(messages: int = 200_000, guilds: int = 5_000, command_ratio: float = 0.05,
+              repeats: int = 5) -> Dict[str, float]:
+    """
+    Memutar ulang aliran pesan campuran obrolan/command dan mencetak pesan per detik
+    
+    Jalur lama membaca prefix dari database di get_prefix dan meneruskan
+    semua pesan ke process_commands, sehingga setiap obrolan membangun
+    Context. Jalur baru memakai PrefixTable dan filter awal on_message,
+    sehingga hanya pesan command yang sampai ke get_context. Setiap jalur
+    diputar `repeats` kali; yang dilaporkan hasil terbaik dan rentangnya.
+    
+    Args:
+        messages: Jumlah pesan yang diputar ulang
+        guilds: Jumlah server
+        command_ratio: Porsi pesan yang berupa command
+        repeats: Jumlah putaran per jalur
+    
+    Returns:
+        Dictionary pesan per detik (terbaik) untuk jalur lama dan baru
+    """
+    rng = random.Random(42)
+    with tempfile.TemporaryDirectory() as tmp:
+        database = Database(flush_interval=60, data_dir=tmp)
+        for guild_id in range(0, guilds, 3):
+            database.set_prefix(guild_id, "?")
+        
+        chat = ["halo semua", "wkwk", "ada yang main?", "gg", "selamat pagi", "otw"]
+        stream = []
+        for i in range(messages):
+            guild_id = rng.randrange(guilds)
+            prefix = "?" if guild_id % 3 == 0 else "!"
+            if rng.random() < command_ratio:
+                content = f"{prefix}{rng.choice(['help', 'ping', 'imsakiyah jakarta'])}"
+            else:
+                content = rng.choice(chat)
+            # Pengganti discord.Message: hanya atribut yang dibaca Context dan get_context
+            stream.append(SimpleNamespace(
+                _state=None,
+                attachments=[],
+                content=content,
+                guild=SimpleNamespace(id=guild_id),
+                author=SimpleNamespace(id=i % 50_000 + 1, bot=False)
+            ))
+        mentions = mention_prefixes(BOT_ID)
+        table = PrefixTable(database)
+        invoked = 0
+        
+        async def legacy_prefix(bot, message):
+            return [database.get_prefix(message.guild.id, "!"), *mentions]
+        
+        async def table_prefix(bot, message):
+            return [table.get(message.guild.id), *mentions]
+        
+        async def noop(ctx, *args):
+            nonlocal invoked
+            invoked += 1
+        
+        def make_bot(command_prefix) -> commands.Bot:
+            bot = ReplayBot(command_prefix=command_prefix, intents=discord.Intents.none(), help_command=None)
+            for name in ("help", "ping", "imsakiyah"):
+                bot.add_command(commands.Command(noop, name=name))
+            return bot
+        
+        async def legacy(bot, message):
+            await bot.process_commands(message)
+        
+        async def filtered(bot, message):
+            if could_be_command(message.content, table.get(message.guild.id), mentions):
+                await bot.process_commands(message)
+        
+        async def replay(command_prefix, handler) -> tuple:
+            nonlocal invoked
+            bot = make_bot(command_prefix)
+            rates = []
+            for _ in range(repeats):
+                invoked = 0
+                start = time.perf_counter()
+                for message in stream:
+                    await handler(bot, message)
+                rates.append(messages / (time.perf_counter() - start))
+            return max(rates), min(rates), invoked
+        
+        async def run() -> tuple:
+            return await replay(legacy_prefix, legacy), await replay(table_prefix, filtered)
+        
+        (old_rate, old_low, old_invoked), (new_rate, new_low, new_invoked) = asyncio.run(run())
+        database.close()
+    
+    print(f"lama : {old_rate:>10,.0f} pesan/detik (terendah {old_low:,.0f}), {old_invoked} command dijalankan")
+    print(f"baru : {new_rate:>10,.0f} pesan/detik (terendah {new_low:,.0f}), {new_invoked} command dijalankan")
+    return {"old_per_second": old_rate, "new_per_second": new_rate}
+
+if __name__ == "__main__":
+    benchmark()
@@ -0,0 +1,111 @@
+"""
+bench_schedule_prefetch.py - Simulasi lonjakan jadwal sholat saat pergantian hari
+
+Jalankan dari root repo: python -m benchmarks.bench_schedule_prefetch
+"""
+
+import time
+import shutil
+import tempfile
+import random
+import asyncio
+from typing import Any, Dict
+
+from schedule_prefetch import DemandTracker, SchedulePrefetcher
+from upstream_cache import UpstreamCache
+
+def simulate(cities: int = 500, users: int = 3000, history: int = 5000, top: int = 500,
+             latency: float = 0.02, seed: int = 25) -> Dict[str, Any]:
+    """
+    Mensimulasikan lonjakan permintaan pada pergantian bulan
+    
+    Upstream diganti klien stub dengan latensi tetap (200 dengan ETag,
+    atau 304 untuk If-None-Match yang cocok). Permintaan kemarin mengikuti
+    distribusi Zipf dan dicatat di DemandTracker. Untuk dua skenario,
+    tanggal 1 (file bulan baru belum ada di cache) dan pergantian hari
+    biasa (file bulan berjalan sudah lewat masa segarnya), `users`
+    permintaan datang bersamaan dalam gelombang, dengan dan tanpa prefetch.
+    
+    Args:
+        cities: Jumlah kota
+        users: Jumlah permintaan setelah tengah malam
+        history: Jumlah permintaan kemarin untuk DemandTracker
+        top: Jumlah kota yang diprefetch
+        latency: Latensi upstream stub dalam detik
+        seed: Seed random
+    
+    Returns:
+        Dictionary hasil per skenario: hit rate dan request upstream saat lonjakan
+    """
+    class StubClient:
+        def __init__(self):
+            self.calls = 0
+        
+        async def fetch_json(self, url, headers=None, **kwargs):
+            self.calls += 1
+            await asyncio.sleep(latency)
+            if headers and headers.get("If-None-Match") == '"v1"':
+                return 304, {}, None
+            return 200, {"ETag": '"v1"'}, [{"date": "2025-03-01", "imsak": "04:20"}]
+        
+        async def close(self):
+            pass
+    
+    rng = random.Random(seed)
+    ids = [f"kota{i}" for i in range(cities)]
+    weights = [1 / (rank + 1) ** 1.1 for rank in range(cities)]
+    rollover = SchedulePrefetcher.next_rollover()
+    
+    def schedule_request(city, year, month):
+        return (f"adzan/{city}/{year}/{month}", f"https://upstream/{city}/{year}/{month}.json", 86400, None)
+    
+    async def scenario(month_start: bool, prefetch: bool) -> Dict[str, Any]:
+        directory = tempfile.mkdtemp(prefix="prefetch-sim-")
+        try:
+            client = StubClient()
+            cache = UpstreamCache(directory, client, prune_on_start=False)
+            demand = DemandTracker()
+            now = time.time()
+            for city in rng.choices(ids, weights, k=history):
+                demand.record(city, now - rng.uniform(0, 86400))
+            if not month_start:
+                # File bulan berjalan sudah di cache tetapi perlu revalidasi
+                for city in ids:
+                    key, url, _, _ = schedule_request(city, rollover.year, rollover.month)
+                    await cache.seed(key, url, [], etag='"v1"')
+            prefetcher = SchedulePrefetcher(cache, schedule_request, demand=demand, top=top, budget=top)
+            if prefetch:
+                await prefetcher.run_once(rollover, window=0.2)
+            calls_before = client.calls
+            prefetcher.begin_rollover_window()
+            burst = rng.choices(ids, weights, k=users)
+            for wave in range(0, users, 250):
+                await asyncio.gather(*(
+                    cache.get(*schedule_request(city, rollover.year, rollover.month))
+                    for city in burst[wave:wave + 250]
+                ))
+            result = prefetcher.stats()["rollover"]
+            result["upstream_during_burst"] = client.calls - calls_before
+            result["prefetch_requests"] = calls_before
+            return result
+        finally:
+            shutil.rmtree(directory, ignore_errors=True)
+    
+    async def run() -> Dict[str, Any]:
+        results = {}
+        for month_start in (True, False):
+            name = "tanggal_1" if month_start else "hari_biasa"
+            results[name] = {
+                "tanpa_prefetch": await scenario(month_start, False),
+                "prefetch": await scenario(month_start, True)
+            }
+        return results
+    
+    return asyncio.run(run())
+
+if __name__ == "__main__":
+    for name, result in simulate().items():
+        for mode, stats in result.items():
+            print(f"{name:<10} {mode:<14} hit rate {stats['hit_rate'] * 100:5.1f}% | "
+                  f"request upstream saat lonjakan {stats['upstream_during_burst']:>3} | "
+                  f"request prefetch {stats['prefetch_requests']:>2}")
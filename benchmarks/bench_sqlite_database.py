@@ -0,0 +1,58 @@
+"""
+bench_sqlite_database.py - Membandingkan backend SQLite dengan backend JSON
+
+Jalankan dari root repo: python -m benchmarks.bench_sqlite_database
+"""
+
+import os
+import time
+import tempfile
+
+from src.core.database import Database
+from src.core.sqlite_database import SQLiteDatabase
+
+def benchmark(commands: int = 1_000_000, guilds: int = 10_000) -> None:
+    """
+    Membandingkan backend SQLite dengan backend JSON
+    
+    Mencatat sejumlah command dan pengaturan guild ke kedua backend di
+    direktori sementara, lalu mencetak waktu dan kenaikan RSS.
+    
+    Args:
+        commands: Jumlah log command yang ditulis
+        guilds: Jumlah guild yang diberi prefix
+    """
+    def rss_mb() -> float:
+        # RSS saat ini (bukan puncak) agar kedua backend bisa dibandingkan
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE") / (1024 * 1024)
+    
+    for name, factory in (("json", Database), ("sqlite", SQLiteDatabase)):
+        with tempfile.TemporaryDirectory() as tmp:
+            rss_before = rss_mb()
+            store = factory(data_dir=tmp)
+            
+            start = time.perf_counter()
+            for i in range(commands):
+                store.log_command(i % 50_000, i % guilds, f"cmd{i % 20}")
+            log_time = time.perf_counter() - start
+            
+            start = time.perf_counter()
+            for i in range(guilds):
+                store.set_prefix(i, "?")
+            settings_time = time.perf_counter() - start
+            
+            start = time.perf_counter()
+            for i in range(guilds):
+                store.get_prefix(i)
+            lookup_time = time.perf_counter() - start
+            
+            store.close()
+            print(
+                f"{name:>6} | log_command {commands / log_time:>10.0f}/s | "
+                f"set_prefix {guilds / settings_time:>8.0f}/s | get_prefix {guilds / lookup_time:>8.0f}/s | "
+                f"RSS +{rss_mb() - rss_before:.1f} MB"
+            )
+
+if __name__ == "__main__":
+    benchmark()
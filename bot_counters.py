@@ -0,0 +1,221 @@
+"""
+bot_counters.py - Penghitung server, member dan channel yang diperbarui per event
+
+Module ini menyimpan jumlah server, total member (jumlah member_count
+semua server), pengguna unik dan channel untuk seluruh bot. Angka
+dihitung penuh satu kali saat on_ready, lalu diperbarui secara
+inkremental dari event guild join/remove, member join/remove dan
+channel create/delete, sehingga presence, command stats dan dashboard
+cukup membaca integer dalam O(1) alih-alih menelusuri semua member
+atau channel setiap kali dipanggil.
+"""
+
+import time
+import logging
+from typing import Any, Dict, List
+
+logger = logging.getLogger("counters")
+
+class BotCounters:
+    """
+    Penghitung bot-wide yang dipasang sebagai listener event
+    
+    Pengguna unik dihitung dengan refcount per ID pengguna (jumlah server
+    yang dia ikuti bersama bot): member join menaikkan refcount, member
+    remove menurunkannya, dan pengguna dihapus saat refcount mencapai nol.
+    Kontribusi setiap server (member_count dan jumlah channel) disimpan
+    agar guild remove mengurangi angka yang sama persis dengan saat masuk.
+    
+    Cache discord.py dikosongkan setiap kali koneksi baru (bukan resume)
+    dibuat, jadi penghitung ditandai basi pada on_connect dan dihitung
+    ulang pada on_ready atau pembacaan pertama setelah bot siap.
+    """
+    def __init__(self):
+        self._bot = None
+        self._built = False
+        # guild_id -> [member_count, jumlah channel]
+        self._guilds: Dict[int, List[int]] = {}
+        # user_id -> jumlah server bersama
+        self._users: Dict[int, int] = {}
+        self._members = 0
+        self._channels = 0
+        self.rebuilds = 0
+    
+    def install(self, bot) -> "BotCounters":
+        """
+        Memasang listener event ke bot
+        
+        Listener ditambahkan lewat add_listener, sehingga tidak menimpa
+        handler @bot.event yang sudah ada. Memasang ke bot yang sama dua
+        kali tidak berpengaruh.
+        
+        Args:
+            bot: Instance commands.Bot
+        
+        Returns:
+            Penghitung ini
+        """
+        if self._bot is bot:
+            return self
+        self._bot = bot
+        self._built = False
+        for event in ("on_connect", "on_ready", "on_guild_join", "on_guild_remove", "on_guild_available",
+                      "on_member_join", "on_raw_member_remove",
+                      "on_guild_channel_create", "on_guild_channel_delete"):
+            bot.add_listener(getattr(self, event), event)
+        return self
+    
+    def rebuild(self, guilds) -> None:
+        """
+        Menghitung ulang semua angka dari cache guild
+        
+        Satu-satunya operasi O(member); dipanggil sekali per koneksi.
+        
+        Args:
+            guilds: Iterable guild (misalnya bot.guilds)
+        """
+        start = time.perf_counter()
+        self._guilds = {}
+        self._users = {}
+        self._members = 0
+        self._channels = 0
+        for guild in guilds:
+            self._add_guild(guild)
+        self._built = True
+        self.rebuilds += 1
+        logger.debug(f"Penghitung dihitung ulang dalam {(time.perf_counter() - start) * 1e3:.1f} ms")
+    
+    def _ensure(self) -> None:
+        """Menghitung ulang jika penghitung basi dan cache bot sudah lengkap"""
+        if not self._built and self._bot is not None and self._bot.is_ready():
+            self.rebuild(self._bot.guilds)
+    
+    def _add_guild(self, guild) -> None:
+        if guild.id in self._guilds:
+            return
+        member_count = guild.member_count or 0
+        channel_count = len(guild.channels)
+        self._guilds[guild.id] = [member_count, channel_count]
+        self._members += member_count
+        self._channels += channel_count
+        users = self._users
+        for member in guild.members:
+            users[member.id] = users.get(member.id, 0) + 1
+    
+    def _remove_user(self, user_id: int) -> None:
+        count = self._users.get(user_id)
+        if count is None:
+            return
+        if count <= 1:
+            del self._users[user_id]
+        else:
+            self._users[user_id] = count - 1
+    
+    @property
+    def guilds(self) -> int:
+        """Jumlah server"""
+        self._ensure()
+        return len(self._guilds)
+    
+    @property
+    def members(self) -> int:
+        """Total member_count semua server (pengguna di beberapa server terhitung berulang)"""
+        self._ensure()
+        return self._members
+    
+    @property
+    def users(self) -> int:
+        """Jumlah pengguna unik, sama dengan len(set(bot.get_all_members()))"""
+        self._ensure()
+        return len(self._users)
+    
+    @property
+    def channels(self) -> int:
+        """Jumlah channel server, sama dengan len(list(bot.get_all_channels()))"""
+        self._ensure()
+        return self._channels
+    
+    def snapshot(self) -> Dict[str, Any]:
+        """
+        Mendapatkan semua angka tanpa memicu penghitungan ulang
+        
+        Aman dipanggil dari thread lain (misalnya thread export metrics).
+        
+        Returns:
+            Dictionary guilds, members, users, channels dan ready
+        """
+        return {
+            "guilds": len(self._guilds),
+            "members": self._members,
+            "users": len(self._users),
+            "channels": self._channels,
+            "ready": self._built
+        }
+    
+    async def on_connect(self) -> None:
+        """Koneksi baru mengosongkan cache discord.py, jadi angka lama tidak berlaku"""
+        self._built = False
+    
+    async def on_ready(self) -> None:
+        self._ensure()
+    
+    async def on_guild_join(self, guild) -> None:
+        if self._built:
+            self._add_guild(guild)
+    
+    async def on_guild_remove(self, guild) -> None:
+        if not self._built:
+            return
+        counts = self._guilds.pop(guild.id, None)
+        if counts is None:
+            return
+        self._members -= counts[0]
+        self._channels -= counts[1]
+        for member in guild.members:
+            self._remove_user(member.id)
+    
+    async def on_guild_available(self, guild) -> None:
+        # Server yang kembali dari outage membawa data member baru; jarang terjadi,
+        # jadi cukup hitung ulang semuanya pada pembacaan berikutnya
+        if self._built and guild.id in self._guilds:
+            self._built = False
+    
+    async def on_member_join(self, member) -> None:
+        if not self._built:
+            return
+        counts = self._guilds.get(member.guild.id)
+        if counts is None:
+            return
+        counts[0] += 1
+        self._members += 1
+        self._users[member.id] = self._users.get(member.id, 0) + 1
+    
+    async def on_raw_member_remove(self, payload) -> None:
+        # Versi raw juga dipanggil untuk member yang tidak ada di cache
+        if not self._built:
+            return
+        counts = self._guilds.get(payload.guild_id)
+        if counts is None:
+            return
+        counts[0] -= 1
+        self._members -= 1
+        self._remove_user(payload.user.id)
+    
+    async def on_guild_channel_create(self, channel) -> None:
+        if not self._built:
+            return
+        counts = self._guilds.get(channel.guild.id)
+        if counts is not None:
+            counts[1] += 1
+            self._channels += 1
+    
+    async def on_guild_channel_delete(self, channel) -> None:
+        if not self._built:
+            return
+        counts = self._guilds.get(channel.guild.id)
+        if counts is not None:
+            counts[1] -= 1
+            self._channels -= 1
+
+# Penghitung bersama untuk seluruh proses
+counters = BotCounters()
@@ -0,0 +1,542 @@
+"""
+city_index.py - Indeks pencarian kota untuk jadwal imsakiyah
+
+Module ini membangun indeks sekali per versi daftar kota: hash map nama
+ternormalisasi (termasuk alias seperti "jogja" -> Yogyakarta), trie
+prefix per awal kata, dan indeks trigram untuk pencarian substring dan
+fuzzy. Hasil diurutkan per tingkat kecocokan (sama persis, prefix nama,
+prefix kata, substring, lalu jarak edit), sehingga nama yang paling
+mirip selalu muncul pertama, bukan hasil pertama yang kebetulan cocok.
+
+Pembagian kota per wilayah untuk menu imsakiyah juga dihitung sekali
+per indeks, memakai automaton Aho-Corasick atas kata kunci wilayah
+ditambah tabel koreksi untuk kota yang tidak mengandung kata kunci.
+"""
+
+import re
+import heapq
+import unicodedata
+from collections import deque
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+# Alias umum -> nama kota (tanpa awalan KOTA/KAB.)
+DEFAULT_ALIASES = {
+    "jogja": "yogyakarta",
+    "jogjakarta": "yogyakarta",
+    "yogya": "yogyakarta",
+    "jogya": "yogyakarta",
+    "solo": "surakarta",
+    "jkt": "jakarta",
+    "batavia": "jakarta",
+    "bdg": "bandung",
+    "sby": "surabaya",
+    "smg": "semarang",
+    "mdn": "medan",
+    "plg": "palembang",
+    "mks": "makassar",
+    "ujung pandang": "makassar",
+    "dps": "denpasar",
+    "bpn": "balikpapan",
+    "pku": "pekanbaru",
+    "btm": "batam",
+    "mlg": "malang"
+}
+
+# Wilayah untuk menu imsakiyah, dalam urutan tampil
+REGIONS = {
+    "jawa": {"name": "Jawa", "emoji": "🏙️"},
+    "sumatera": {"name": "Sumatera", "emoji": "🌋"},
+    "kalimantan": {"name": "Kalimantan", "emoji": "🏝️"},
+    "sulawesi": {"name": "Sulawesi", "emoji": "🌊"},
+    "bali_ntt": {"name": "Bali & Nusa Tenggara", "emoji": "🏖️"},
+    "maluku_papua": {"name": "Maluku & Papua", "emoji": "🦜"}
+}
+
+# Kata kunci per wilayah; jika beberapa cocok, yang lebih dulu di daftar menang
+REGION_KEYWORDS = {
+    "jawa": ["jakarta", "jawa", "bandung", "semarang", "yogyakarta", "yogya", "solo", "surabaya", "malang", "banten", "bogor", "bekasi", "tangerang", "depok", "cirebon", "sukabumi", "tasikmalaya", "cilegon", "serang", "cimahi", "tegal", "pekalongan", "salatiga", "magelang", "purwokerto", "kediri", "madiun", "mojokerto", "pasuruan", "batu", "blitar", "probolinggo"],
+    
+    "sumatera": ["sumatera", "sumatra", "aceh", "medan", "padang", "palembang", "pekanbaru", "jambi", "bengkulu", "bandar lampung", "lampung", "pangkal pinang", "tanjungpinang", "batam", "bintan", "tanjung balai", "dumai", "bukit tinggi", "payakumbuh", "pariaman", "solok", "padang panjang", "sawahlunto", "lubuk linggau", "prabumulih", "tebing tinggi", "pematang siantar", "binjai", "sibolga", "padang sidempuan", "gunungsitoli", "banda aceh", "langsa", "lhokseumawe", "subulussalam"],
+    
+    "kalimantan": ["kalimantan", "borneo", "pontianak", "palangkaraya", "banjarmasin", "samarinda", "tanjungpinang", "tanjung selor", "tarakan", "bontang", "balikpapan", "singkawang", "sampit", "palangka raya"],
+    
+    "sulawesi": ["sulawesi", "celebes", "makassar", "manado", "palu", "kendari", "gorontalo", "mamuju", "ambon", "ternate", "tidore", "bitung", "tomohon", "kotamobagu", "bau-bau"],
+    
+    "bali_ntt": ["bali", "denpasar", "mataram", "kupang", "nusa", "singaraja"],
+    
+    "maluku_papua": ["maluku", "papua", "jayapura", "manokwari", "sorong", "ternate", "ambon", "fakfak", "merauke", "timika"]
+}
+
+# Koreksi untuk kota (nama tanpa awalan KOTA/KAB.) yang tidak mengandung
+# kata kunci wilayahnya atau cocok dengan kata kunci wilayah lain
+_OVERRIDES_BY_REGION = {
+    "sumatera": [
+        "argamakmur", "bagan siapiapi", "bangkinang", "bengkalis", "kuala tungkal", "muara bungo",
+        "muara bulian", "muara enim", "muara sabak", "muara tebo", "sarolangun", "sungai penuh", "bangko",
+        "lahat", "baturaja", "kayu agung", "sekayu", "pagar alam", "curup", "manna", "mukomuko",
+        "kepahiang", "tais", "liwa", "kotabumi", "menggala", "metro", "kalianda", "gunung sugih",
+        "blambangan umpu", "pringsewu", "gedong tataan", "krui", "tanjung pandan", "manggar",
+        "sungailiat", "toboali", "koba", "muntok", "mentok", "ranai", "tarempa", "daik", "tanjung uban",
+        "meulaboh", "sigli", "takengon", "blangkejeren", "kutacane", "calang", "bireuen", "idi",
+        "kuala simpang", "lhoksukon", "jantho", "sinabang", "singkil", "tapaktuan", "kabanjahe",
+        "sidikalang", "balige", "tarutung", "dolok sanggul", "pangururan", "salak", "rantau prapat",
+        "kisaran", "lubuk pakam", "sei rampah", "stabat", "limapuluh", "gunung tua", "sibuhuan",
+        "panyabungan", "teluk dalam", "painan", "batusangkar", "lubuk basung", "lubuk sikaping",
+        "muaro sijunjung", "pulau punjung", "padang aro", "simpang ampek", "tuapejat", "sarilamak",
+        "arosuka", "pasir pengaraian", "rengat", "tembilahan", "siak sri indrapura", "pangkalan kerinci",
+        "teluk kuantan", "selat panjang", "bagan batu", "bukittinggi", "pematangsiantar",
+        "padangsidimpuan", "lubuklinggau", "pangkalpinang", "sawah lunto", "batu bara"
+    ],
+    "kalimantan": [
+        "amuntai", "barabai", "kandangan", "marabahan", "pelaihari", "kotabaru", "batulicin", "paringin",
+        "ketapang", "sintang", "putussibau", "sanggau", "mempawah", "ngabang", "sambas", "bengkayang",
+        "sekadau", "nanga pinoh", "kuala kapuas", "kuala kurun", "kuala pembuang", "buntok",
+        "muara teweh", "pangkalan bun", "puruk cahu", "tamiang layang", "kasongan", "sukamara",
+        "nunukan", "malinau", "tanjung redeb", "tenggarong", "sendawar", "penajam", "tanah grogot",
+        "sangatta", "tideng pale"
+    ],
+    "sulawesi": [
+        "bantaeng", "barru", "bulukumba", "enrekang", "jeneponto", "majene", "makale", "malili", "mamasa",
+        "masamba", "maros", "pangkajene", "parepare", "pare pare", "pinrang", "polewali", "rantepao",
+        "sengkang", "sinjai", "sungguminasa", "takalar", "watampone", "watansoppeng", "benteng",
+        "amurang", "airmadidi", "melonguane", "ratahan", "tahuna", "limboto", "marisa", "suwawa",
+        "tilamuta", "kwandang", "ampana", "banggai", "bungku", "buol", "donggala", "kolonodale", "luwuk",
+        "parigi", "poso", "tolitoli", "andolo", "baubau", "lasusua", "pasarwajo", "raha", "rumbia",
+        "unaaha", "wanggudu", "wangi wangi"
+    ],
+    "bali_ntt": [
+        "amlapura", "bangli", "gianyar", "negara", "semarapura", "tabanan", "atambua", "bajawa", "bima",
+        "dompu", "ende", "kalabahi", "kefamenanu", "labuan bajo", "larantuka", "maumere", "praya",
+        "ruteng", "selong", "soe", "sumbawa besar", "taliwang", "waikabubak", "waingapu", "mbay",
+        "borong", "lewoleba", "tambolaka", "seba", "baa"
+    ],
+    "maluku_papua": [
+        "ambon", "ternate", "tidore", "sofifi", "dobo", "masohi", "namlea", "piru", "saumlaki", "tual",
+        "tiakur", "labuha", "maba", "sanana", "weda", "jailolo", "tobelo", "daruba", "bula", "biak",
+        "nabire", "serui", "wamena", "sarmi", "agats", "enarotali", "kaimana", "bintuni", "teminabuan",
+        "waisai", "fak fak", "mulia", "oksibil", "tanah merah", "kepi", "sugapa", "karubaga", "tiom",
+        "kenyam", "burmeso", "ilaga", "wasior", "ransiki", "aimas", "kumurkek"
+    ]
+}
+REGION_OVERRIDES = {name: region for region, names in _OVERRIDES_BY_REGION.items() for name in names}
+
+# Wilayah untuk kota yang tidak dikenali sama sekali
+DEFAULT_REGION = "jawa"
+
+_ADMIN_PREFIX = re.compile(r"^(?:kota administrasi|kota adm|kabupaten|kotamadya|kab|kota|kotif)\s+")
+
+# Tingkat kecocokan, makin kecil makin baik
+EXACT, NAME_PREFIX, WORD_PREFIX, SUBSTRING, FUZZY = range(5)
+
+def normalize(text: str) -> str:
+    """
+    Menormalkan nama kota: huruf kecil, tanpa diakritik dan tanda baca
+    
+    Args:
+        text: Nama asli
+    
+    Returns:
+        Nama ternormalisasi, misalnya "KAB. TANAH DATAR" -> "kab tanah datar"
+    """
+    text = unicodedata.normalize("NFKD", text)
+    text = "".join(char for char in text if not unicodedata.combining(char))
+    return re.sub(r"[^a-z0-9]+", " ", text.lower()).strip()
+
+def strip_admin(text: str) -> str:
+    """Membuang awalan administratif (kota, kab, kabupaten) dari nama ternormalisasi"""
+    return _ADMIN_PREFIX.sub("", text) or text
+
+def _trigrams(text: str) -> List[str]:
+    padded = f"  {text} "
+    return [padded[i:i + 3] for i in range(len(padded) - 2)]
+
+def edit_distance(a: str, b: str, limit: int) -> int:
+    """
+    Jarak edit Damerau-Levenshtein (optimal string alignment) dengan batas
+    
+    Hanya pita selebar 2 * limit + 1 di sekitar diagonal yang dihitung.
+    
+    Args:
+        a: String pertama
+        b: String kedua
+        limit: Jarak maksimum yang menarik
+    
+    Returns:
+        Jarak edit, atau limit + 1 jika melebihi batas
+    """
+    if abs(len(a) - len(b)) > limit:
+        return limit + 1
+    over = limit + 1
+    previous2: Optional[List[int]] = None
+    previous = list(range(len(b) + 1))
+    for i in range(1, len(a) + 1):
+        current = [over] * (len(b) + 1)
+        current[0] = i
+        low = max(1, i - limit)
+        high = min(len(b), i + limit)
+        row_min = current[0] if low == 1 else over
+        char_a = a[i - 1]
+        for j in range(low, high + 1):
+            value = previous[j - 1] if char_a == b[j - 1] else previous[j - 1] + 1
+            if previous[j] + 1 < value:
+                value = previous[j] + 1
+            if current[j - 1] + 1 < value:
+                value = current[j - 1] + 1
+            if previous2 is not None and j > 1 and char_a == b[j - 2] and a[i - 2] == b[j - 1] and previous2[j - 2] + 1 < value:
+                value = previous2[j - 2] + 1
+            current[j] = value
+            if value < row_min:
+                row_min = value
+        if row_min > limit:
+            return over
+        previous2, previous = previous, current
+    return min(previous[len(b)], over)
+
+class KeywordMatcher:
+    """
+    Pencocok banyak kata kunci sekaligus (automaton Aho-Corasick)
+    
+    Semua kata kunci dicari dalam satu kali jalan atas teks, berapa pun
+    jumlahnya. Kata kunci hanya cocok sebagai kata utuh, jadi "solo"
+    tidak cocok dengan "solok" dan "jawa" tidak cocok dengan "bajawa".
+    """
+    def __init__(self, keywords: Iterable[Tuple[str, Any]]):
+        """
+        Membangun automaton
+        
+        Args:
+            keywords: Pasangan (kata kunci, nilai) dalam urutan prioritas
+        """
+        self._goto: List[Dict[str, int]] = [{}]
+        self._fail: List[int] = [0]
+        # Per state: (panjang kata kunci, prioritas) yang berakhir di state ini
+        self._output: List[List[Tuple[int, int]]] = [[]]
+        self.values: List[Any] = []
+        
+        for keyword, value in keywords:
+            text = normalize(keyword)
+            if not text:
+                continue
+            state = 0
+            for char in text:
+                child = self._goto[state].get(char)
+                if child is None:
+                    child = len(self._goto)
+                    self._goto.append({})
+                    self._fail.append(0)
+                    self._output.append([])
+                    self._goto[state][char] = child
+                state = child
+            self._output[state].append((len(text), len(self.values)))
+            self.values.append(value)
+        
+        # Fail link dihitung per kedalaman (BFS), output diwarisi dari state fail
+        queue = deque(self._goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for char, child in self._goto[state].items():
+                queue.append(child)
+                fail = self._fail[state]
+                while fail and char not in self._goto[fail]:
+                    fail = self._fail[fail]
+                self._fail[child] = self._goto[fail].get(char, 0)
+                self._output[child] = self._output[child] + self._output[self._fail[child]]
+    
+    def first(self, text: str) -> Optional[Any]:
+        """
+        Mencari kata kunci berprioritas tertinggi yang muncul sebagai kata utuh
+        
+        Args:
+            text: Teks ternormalisasi (lihat normalize)
+        
+        Returns:
+            Nilai kata kunci tersebut, atau None jika tidak ada yang cocok
+        """
+        goto = self._goto
+        fail = self._fail
+        output = self._output
+        best = None
+        state = 0
+        for end, char in enumerate(text, 1):
+            while state and char not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(char, 0)
+            for length, priority in output[state]:
+                if best is not None and priority >= best:
+                    continue
+                start = end - length
+                if (start == 0 or text[start - 1] == " ") and (end == len(text) or text[end] == " "):
+                    best = priority
+        return None if best is None else self.values[best]
+
+_region_matcher: Optional[KeywordMatcher] = None
+
+def region_of(name: str) -> str:
+    """
+    Menentukan wilayah satu kota
+    
+    Args:
+        name: Nama kota
+    
+    Returns:
+        ID wilayah (kunci REGIONS)
+    """
+    return _region_of_normalized(normalize(name))
+
+def _region_of_normalized(full: str) -> str:
+    global _region_matcher
+    override = REGION_OVERRIDES.get(strip_admin(full))
+    if override is not None:
+        return override
+    if _region_matcher is None:
+        _region_matcher = KeywordMatcher(
+            (keyword, region) for region, keywords in REGION_KEYWORDS.items() for keyword in keywords
+        )
+    region = _region_matcher.first(full)
+    return DEFAULT_REGION if region is None else region
+
+class CityIndex:
+    """
+    Indeks pencarian untuk satu versi daftar kota
+    
+    Setiap kota punya satu atau lebih kunci pencarian: nama tanpa awalan
+    administratif, nama lengkap, dan alias. Kunci dimasukkan ke hash map
+    (sama persis), trie (prefix dari setiap awal kata) dan indeks trigram
+    (kandidat substring dan fuzzy). Hasil adalah dictionary kota asli.
+    """
+    def __init__(self, cities: Iterable[Any], aliases: Optional[Dict[str, str]] = None):
+        """
+        Membangun indeks
+        
+        Args:
+            cities: List kota dari kota.json (dict dengan id/name, atau string)
+            aliases: Dictionary alias -> nama kota (default DEFAULT_ALIASES)
+        """
+        self.source = cities
+        self.cities: List[Dict[str, Any]] = []
+        # (teks kunci, indeks kota)
+        self._keys: List[Tuple[str, int]] = []
+        self._exact: Dict[str, List[int]] = {}
+        self._trie: Dict[str, Any] = {}
+        self._trigrams: Dict[str, List[int]] = {}
+        self._searchable: List[int] = []
+        self._order: List[Tuple[int, bool, str]] = []
+        
+        for position, city in enumerate(cities):
+            if isinstance(city, dict) and "name" in city and "id" in city:
+                entry = city
+            elif isinstance(city, str):
+                # Entri string memakai posisinya sebagai ID, sama seperti sebelumnya
+                entry = {"id": str(position), "name": city}
+            else:
+                continue
+            index = len(self.cities)
+            self.cities.append(entry)
+            full = normalize(str(entry["name"]))
+            short = strip_admin(full)
+            # Urutan di dalam satu tingkat: nama pendek dulu, kota sebelum
+            # kabupaten dengan nama sama, lalu alfabetis
+            self._order.append((len(short), not full.startswith("kota"), full))
+            self._add_key(short, index)
+            if full != short:
+                # Nama lengkap hanya untuk kecocokan persis, supaya "ka" tidak
+                # mencocokkan semua "KAB. ..."
+                self._add_key(full, index, searchable=False)
+        
+        for alias, target in (DEFAULT_ALIASES if aliases is None else aliases).items():
+            alias_key = normalize(alias)
+            target_key = normalize(target)
+            for index in self._exact_cities(target_key):
+                self._add_key(alias_key, index)
+        
+        self._name_order = sorted(range(len(self.cities)), key=lambda i: self._order[i][2])
+        self._regions: Optional[Tuple[Dict[str, Dict[str, Any]], Dict[str, List[Dict[str, Any]]]]] = None
+    
+    def __len__(self) -> int:
+        return len(self.cities)
+    
+    def _exact_cities(self, text: str) -> List[int]:
+        cities = []
+        for key_id in self._exact.get(text, ()):
+            index = self._keys[key_id][1]
+            if index not in cities:
+                cities.append(index)
+        return cities
+    
+    def _add_key(self, text: str, index: int, searchable: bool = True) -> None:
+        if not text:
+            return
+        key_id = len(self._keys)
+        self._keys.append((text, index))
+        self._exact.setdefault(text, []).append(key_id)
+        if not searchable:
+            return
+        self._searchable.append(key_id)
+        
+        # Prefix dari setiap awal kata: "aceh barat" bisa ditemukan lewat "bar"
+        starts = [0] + [match.end() for match in re.finditer(" ", text)]
+        for start in starts:
+            node = self._trie
+            for char in text[start:]:
+                node = node.setdefault(char, {})
+                node.setdefault("", []).append(key_id)
+        
+        for trigram in set(_trigrams(text)):
+            self._trigrams.setdefault(trigram, []).append(key_id)
+    
+    def _prefix_keys(self, query: str) -> List[int]:
+        node = self._trie
+        for char in query:
+            node = node.get(char)
+            if node is None:
+                return []
+        return node.get("", [])
+    
+    def _fuzzy_limit(self, query: str) -> int:
+        return max(1, min(3, len(query) // 4))
+    
+    def _rank(self, query: str, limit: Optional[int] = None, fuzzy: bool = True) -> List[int]:
+        """
+        Mengumpulkan indeks kota untuk query, diurutkan dari yang paling cocok
+        
+        Tingkat diperiksa berurutan dan berhenti begitu hasil sudah cukup,
+        karena tingkat berikutnya tidak akan pernah mengalahkan hasil yang
+        sudah ada.
+        """
+        full = normalize(query)
+        if not full:
+            return []
+        short = strip_admin(full)
+        keys = self._keys
+        best: Dict[int, Tuple[int, int]] = {}
+        
+        def offer(key_id: int, tier: int, distance: int = 0) -> None:
+            index = keys[key_id][1]
+            current = best.get(index)
+            if current is None or (tier, distance) < current:
+                best[index] = (tier, distance)
+        
+        def enough() -> bool:
+            return limit is not None and len(best) >= limit
+        
+        for text in {full, short}:
+            for key_id in self._exact.get(text, ()):
+                offer(key_id, EXACT)
+        if not enough():
+            order = self._order
+            for key_id in self._prefix_keys(short):
+                text, index = keys[key_id]
+                if full != short:
+                    # "kota bog" lebih cocok ke KOTA BOGOR daripada KAB. BOGOR
+                    tier = NAME_PREFIX if order[index][2].startswith(full) else WORD_PREFIX
+                else:
+                    tier = NAME_PREFIX if text.startswith(short) else WORD_PREFIX
+                offer(key_id, tier)
+        
+        # Substring: semua trigram di dalam query harus ada di kunci
+        if not enough():
+            if len(short) >= 3:
+                postings = sorted((self._trigrams.get(gram, ()) for gram in set(_trigrams(short)[2:-1])), key=len)
+                candidates = set(postings[0]) if postings else set()
+                for posting in postings[1:]:
+                    if not candidates:
+                        break
+                    candidates.intersection_update(posting)
+                for key_id in candidates:
+                    if short in keys[key_id][0]:
+                        offer(key_id, SUBSTRING)
+            elif len(short) == 2:
+                for key_id in self._searchable:
+                    if short in keys[key_id][0]:
+                        offer(key_id, SUBSTRING)
+        
+        if fuzzy and not enough() and len(short) >= 3:
+            max_distance = self._fuzzy_limit(short)
+            grams = set(_trigrams(short))
+            overlap: Dict[int, int] = {}
+            for gram in grams:
+                for key_id in self._trigrams.get(gram, ()):
+                    overlap[key_id] = overlap.get(key_id, 0) + 1
+            # Satu edit merusak paling banyak tiga trigram
+            required = len(grams) - 3 * max_distance
+            for key_id in heapq.nlargest(16, overlap, key=overlap.get):
+                text, index = keys[key_id]
+                if overlap[key_id] < required:
+                    break
+                if index in best:
+                    continue
+                distance = edit_distance(short, text, max_distance)
+                # Ketikan yang belum selesai: bandingkan juga dengan awal kunci
+                if distance > max_distance and len(text) > len(short):
+                    distance = edit_distance(short, text[:len(short)], max_distance) + 1
+                if distance <= max_distance:
+                    offer(key_id, FUZZY, distance)
+        
+        order = self._order
+        sort_key = lambda index: (best[index], order[index])
+        if limit is None:
+            return sorted(best, key=sort_key)
+        return heapq.nsmallest(limit, best, key=sort_key)
+    
+    def search(self, query: str, limit: Optional[int] = None, fuzzy: bool = True) -> List[Dict[str, Any]]:
+        """
+        Mencari kota yang cocok dengan query, diurutkan dari yang paling cocok
+        
+        Args:
+            query: Teks pencarian
+            limit: Jumlah hasil maksimum (None = semua)
+            fuzzy: Sertakan hasil berdasarkan jarak edit
+        
+        Returns:
+            List dictionary kota
+        """
+        return [self.cities[index] for index in self._rank(query, limit, fuzzy)]
+    
+    def resolve(self, query: str) -> Optional[Dict[str, Any]]:
+        """
+        Menentukan satu kota untuk query
+        
+        Args:
+            query: Nama kota, alias, awal nama, atau nama dengan salah ketik
+        
+        Returns:
+            Dictionary kota terbaik, atau None jika tidak ada yang cukup mirip
+        """
+        ranked = self._rank(query, 1)
+        return self.cities[ranked[0]] if ranked else None
+    
+    def regions(self) -> Tuple[Dict[str, Dict[str, Any]], Dict[str, List[Dict[str, Any]]]]:
+        """
+        Mendapatkan pembagian kota per wilayah
+        
+        Dihitung sekali per indeks lalu dipakai bersama oleh semua menu,
+        jadi hasilnya tidak boleh diubah.
+        
+        Returns:
+            Tuple (wilayah dengan name/emoji/city_count, list kota per wilayah urut nama)
+        """
+        if self._regions is None:
+            cities_by_region: Dict[str, List[Dict[str, Any]]] = {region: [] for region in REGIONS}
+            for city, order in zip(self.cities, self._order):
+                cities_by_region[_region_of_normalized(order[2])].append(city)
+            regions = {}
+            for region, info in REGIONS.items():
+                cities_by_region[region].sort(key=lambda city: city.get("name", ""))
+                regions[region] = dict(info, city_count=len(cities_by_region[region]))
+            self._regions = (regions, cities_by_region)
+        return self._regions
+    
+    def complete(self, query: str, limit: int = 25) -> List[Dict[str, Any]]:
+        """
+        Saran untuk autocomplete
+        
+        Args:
+            query: Teks yang sedang diketik (boleh kosong)
+            limit: Jumlah saran maksimum (Discord membatasi 25)
+        
+        Returns:
+            List dictionary kota
+        """
+        if not normalize(query):
+            return [self.cities[index] for index in self._name_order[:limit]]
+        return self.search(query, limit)
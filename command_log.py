@@ -0,0 +1,360 @@
+"""
+command_log.py - Module untuk log penggunaan command yang ringkas
+
+Module ini menyediakan ring buffer berbasis array bertipe untuk mencatat
+penggunaan command. Nama command di-intern menjadi indeks kecil, ID
+user/guild disimpan sebagai integer dan waktu sebagai epoch, sehingga
+satu entri hanya memakan beberapa puluh byte. Entri lama otomatis
+tergeser saat kapasitas penuh atau melewati masa retensi.
+
+Statistik (total, per command, user/guild unik) dijaga terpisah secara
+inkremental oleh CommandStats, dengan HyperLogLog untuk hitungan unik,
+sehingga membaca statistik tidak perlu memindai log.
+"""
+
+import math
+import time
+from array import array
+from collections import namedtuple
+
+CommandLogEntry = namedtuple("CommandLogEntry", ["timestamp", "user_id", "guild_id", "command"])
+
+class CommandLog:
+    def __init__(self, capacity=100_000, retention=7 * 24 * 60 * 60):
+        """
+        Membuat log command baru
+        
+        Args:
+            capacity: Jumlah maksimum entri yang disimpan
+            retention: Umur maksimum entri dalam detik (None = tanpa batas)
+        
+        Raises:
+            ValueError: Jika capacity kurang dari 1
+        """
+        if capacity < 1:
+            raise ValueError(f"command log capacity must be at least 1, got {capacity}")
+        self.capacity = capacity
+        self.retention = retention
+        self._timestamps = array('d', bytes(8 * capacity))
+        self._user_ids = array('Q', bytes(8 * capacity))
+        self._guild_ids = array('Q', bytes(8 * capacity))
+        self._commands = array('H', bytes(2 * capacity))
+        self._start = 0
+        self._size = 0
+        
+        # Intern table: nama command <-> indeks
+        self.command_names = []
+        self._command_index = {}
+    
+    @staticmethod
+    def _to_id(value):
+        """Mengubah ID Discord (int/str/None) menjadi integer, 0 untuk None"""
+        if value is None:
+            return 0
+        try:
+            converted = int(value)
+        except (TypeError, ValueError):
+            raise ValueError(f"Discord ID must be numeric, got {value!r}") from None
+        if not 0 <= converted <= _MASK64:
+            raise ValueError(f"Discord ID out of range: {value!r}")
+        return converted
+    
+    def _intern(self, command_name):
+        """Mendapatkan indeks untuk nama command, mendaftarkannya jika baru"""
+        index = self._command_index.get(command_name)
+        if index is None:
+            index = len(self.command_names)
+            self.command_names.append(command_name)
+            self._command_index[command_name] = index
+        return index
+    
+    def _slot(self, position):
+        """Mengubah posisi logis (0 = entri tertua) menjadi indeks array"""
+        return (self._start + position) % self.capacity
+    
+    def _entry(self, position):
+        """Membaca entri pada posisi logis sebagai CommandLogEntry"""
+        slot = self._slot(position)
+        guild_id = self._guild_ids[slot]
+        return CommandLogEntry(
+            self._timestamps[slot],
+            self._user_ids[slot],
+            guild_id or None,
+            self.command_names[self._commands[slot]]
+        )
+    
+    def append(self, user_id, guild_id, command_name, timestamp=None):
+        """
+        Menambahkan entri log command
+        
+        Args:
+            user_id: ID pengguna Discord
+            guild_id: ID guild Discord (None untuk DM)
+            command_name: Nama command
+            timestamp: Waktu epoch, default waktu sekarang
+        
+        Raises:
+            ValueError: Jika user_id atau guild_id bukan ID numerik
+        """
+        # Validasi sebelum buffer diubah agar ID yang salah tidak menggeser entri
+        user_id = self._to_id(user_id)
+        guild_id = self._to_id(guild_id)
+        if timestamp is None:
+            timestamp = time.time()
+        
+        if self._size == self.capacity:
+            # Buffer penuh, timpa entri tertua
+            self._start = (self._start + 1) % self.capacity
+            self._size -= 1
+        
+        slot = self._slot(self._size)
+        self._timestamps[slot] = timestamp
+        self._user_ids[slot] = user_id
+        self._guild_ids[slot] = guild_id
+        self._commands[slot] = self._intern(command_name)
+        self._size += 1
+        
+        self.prune(timestamp)
+    
+    def prune(self, now=None):
+        """
+        Membuang entri yang sudah melewati masa retensi
+        
+        Args:
+            now: Waktu epoch acuan, default waktu sekarang
+        
+        Returns:
+            Jumlah entri yang dibuang
+        """
+        if self.retention is None or self._size == 0:
+            return 0
+        if now is None:
+            now = time.time()
+        
+        cutoff = now - self.retention
+        if self._timestamps[self._start] >= cutoff:
+            return 0
+        
+        expired = self._bisect(cutoff)
+        if expired:
+            self._start = self._slot(expired)
+            self._size -= expired
+        return expired
+    
+    def _bisect(self, timestamp):
+        """Posisi logis entri pertama dengan waktu >= timestamp"""
+        lo, hi = 0, self._size
+        timestamps = self._timestamps
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if timestamps[self._slot(mid)] < timestamp:
+                lo = mid + 1
+            else:
+                hi = mid
+        return lo
+    
+    def between(self, start=None, end=None):
+        """
+        Iterasi entri dengan start <= waktu < end
+        
+        Args:
+            start: Waktu epoch awal (None = dari entri tertua)
+            end: Waktu epoch akhir (None = sampai entri terbaru)
+        
+        Yields:
+            CommandLogEntry dari yang terlama ke terbaru
+        """
+        first = 0 if start is None else self._bisect(start)
+        last = self._size if end is None else self._bisect(end)
+        for position in range(first, last):
+            yield self._entry(position)
+    
+    def since(self, seconds):
+        """
+        Iterasi entri dalam beberapa detik terakhir
+        
+        Args:
+            seconds: Rentang waktu ke belakang dalam detik
+        
+        Yields:
+            CommandLogEntry dari yang terlama ke terbaru
+        """
+        return self.between(start=time.time() - seconds)
+    
+    def clear(self):
+        """Menghapus semua entri (intern table dipertahankan)"""
+        self._start = 0
+        self._size = 0
+    
+    def memory_usage(self):
+        """
+        Mendapatkan ukuran memori array penyimpan
+        
+        Returns:
+            Jumlah byte yang dialokasikan untuk entri
+        """
+        return sum(
+            buffer.itemsize * len(buffer)
+            for buffer in (self._timestamps, self._user_ids, self._guild_ids, self._commands)
+        )
+    
+    def __len__(self):
+        return self._size
+    
+    def __iter__(self):
+        for position in range(self._size):
+            yield self._entry(position)
+    
+    def __getitem__(self, position):
+        if position < 0:
+            position += self._size
+        if not 0 <= position < self._size:
+            raise IndexError("command log index out of range")
+        return self._entry(position)
+
+_MASK64 = (1 << 64) - 1
+
+def _mix64(value):
+    """Hash 64-bit (splitmix64) untuk ID integer"""
+    z = (value + 0x9E3779B97F4A7C15) & _MASK64
+    z = ((z ^ (z >> 30)) * 0xBF58476D1CE4E5B9) & _MASK64
+    z = ((z ^ (z >> 27)) * 0x94D049BB133111EB) & _MASK64
+    return z ^ (z >> 31)
+
+class HyperLogLog:
+    def __init__(self, precision=12):
+        """
+        Membuat sketch HyperLogLog untuk menghitung nilai unik
+        
+        Args:
+            precision: Jumlah bit indeks register (2^precision register,
+                galat standar sekitar 1.04 / sqrt(2^precision))
+        """
+        self.precision = precision
+        self.size = 1 << precision
+        self.registers = bytearray(self.size)
+        self._alpha = 0.7213 / (1 + 1.079 / self.size)
+        # Dijaga inkremental agar count() O(1)
+        self._inverse_sum = float(self.size)
+        self._zeros = self.size
+    
+    def add(self, value):
+        """
+        Menambahkan ID ke sketch
+        
+        Args:
+            value: ID integer (atau string angka)
+        """
+        hashed = _mix64(int(value))
+        index = hashed >> (64 - self.precision)
+        remainder = (hashed << self.precision) & _MASK64
+        rank = min(64 - remainder.bit_length() + 1, 64 - self.precision + 1)
+        
+        current = self.registers[index]
+        if rank > current:
+            if current == 0:
+                self._zeros -= 1
+            self._inverse_sum += 2.0 ** -rank - 2.0 ** -current
+            self.registers[index] = rank
+    
+    def count(self):
+        """
+        Mendapatkan perkiraan jumlah nilai unik
+        
+        Returns:
+            Integer perkiraan kardinalitas
+        """
+        estimate = self._alpha * self.size * self.size / self._inverse_sum
+        if estimate <= 2.5 * self.size and self._zeros:
+            # Koreksi rentang kecil (linear counting)
+            estimate = self.size * math.log(self.size / self._zeros)
+        return int(round(estimate))
+    
+    def clear(self):
+        """Mengosongkan sketch"""
+        self.registers = bytearray(self.size)
+        self._inverse_sum = float(self.size)
+        self._zeros = self.size
+
+class CommandStats:
+    def __init__(self, precision=12):
+        """
+        Membuat agregat statistik command yang diperbarui saat log_command
+        
+        Args:
+            precision: Presisi HyperLogLog untuk user dan guild unik
+        """
+        self.total = 0
+        self.per_command = {}
+        self.users = HyperLogLog(precision)
+        self.guilds = HyperLogLog(precision)
+    
+    def record(self, user_id, guild_id, command_name):
+        """
+        Memperbarui agregat untuk satu penggunaan command
+        
+        Args:
+            user_id: ID pengguna Discord
+            guild_id: ID guild Discord (None untuk DM)
+            command_name: Nama command
+        """
+        self.total += 1
+        self.per_command[command_name] = self.per_command.get(command_name, 0) + 1
+        if user_id is not None:
+            self.users.add(user_id)
+        if guild_id:
+            self.guilds.add(guild_id)
+    
+    def snapshot(self):
+        """
+        Mendapatkan statistik saat ini tanpa memindai log
+        
+        Returns:
+            Dictionary total_commands, unique_users, unique_guilds,
+            command_distribution (user/guild unik berupa perkiraan)
+        """
+        return {
+            "total_commands": self.total,
+            "unique_users": self.users.count(),
+            "unique_guilds": self.guilds.count(),
+            "command_distribution": dict(self.per_command)
+        }
+    
+    def clear(self):
+        """Mengosongkan semua agregat"""
+        self.total = 0
+        self.per_command = {}
+        self.users.clear()
+        self.guilds.clear()
+
+def exact_command_stats(command_log):
+    """
+    Menghitung ulang statistik secara eksak dengan memindai log
+    
+    Dipakai untuk verifikasi oleh admin. Hanya mencakup entri yang masih
+    tersimpan di log (belum tergeser kapasitas/retensi), sehingga bisa
+    lebih kecil dari agregat seumur hidup di CommandStats.
+    
+    Args:
+        command_log: Instance CommandLog
+    
+    Returns:
+        Dictionary dengan format yang sama seperti CommandStats.snapshot()
+    """
+    unique_users = set()
+    unique_guilds = set()
+    command_counts = {}
+    
+    for entry in command_log:
+        if entry.user_id:
+            unique_users.add(entry.user_id)
+        if entry.guild_id:
+            unique_guilds.add(entry.guild_id)
+        command_counts[entry.command] = command_counts.get(entry.command, 0) + 1
+    
+    return {
+        "total_commands": len(command_log),
+        "unique_users": len(unique_users),
+        "unique_guilds": len(unique_guilds),
+        "command_distribution": command_counts
+    }
@@ -0,0 +1,170 @@
+"""
+command_middleware.py - Middleware before/after invoke untuk command
+
+Module ini menyatukan pencatatan command di satu tempat: hook global
+before_invoke/after_invoke membuang pemanggilan ganda untuk pesan yang
+sama, mengukur lama eksekusi per command, dan mengumpulkan log command
+ke buffer yang disimpan per batch. Handler command tidak perlu lagi
+memanggil log_command sendiri.
+"""
+
+import sys
+import time
+import asyncio
+import inspect
+import logging
+from collections import OrderedDict
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from metrics import MetricsRegistry, metrics as default_metrics
+
+logger = logging.getLogger("commands")
+
+# (timestamp, user_id, guild_id, command)
+LogEntry = Tuple[float, int, Optional[int], str]
+
+class CommandMiddleware:
+    """
+    Hook before/after invoke untuk dedupe, timing dan log command
+    
+    Pemanggilan diidentifikasi dengan (ID pesan, nama command); kunci
+    yang sudah terlihat disimpan di OrderedDict berukuran tetap sehingga
+    cek dan pembuangan kunci tertua sama-sama O(1) dan urutannya terjaga.
+    Log command masuk buffer dan diserahkan ke persist() sekaligus saat
+    buffer penuh atau flush_interval detik setelah entri pertama masuk.
+    """
+    def __init__(self, persist: Callable[[List[LogEntry]], Any], dedupe_size: int = 1024,
+                 batch_size: int = 50, flush_interval: float = 5.0,
+                 metrics: Optional[MetricsRegistry] = None):
+        """
+        Membuat middleware command
+        
+        Args:
+            persist: Fungsi (sinkron atau async) yang menyimpan list LogEntry
+            dedupe_size: Jumlah pemanggilan terakhir yang diingat untuk dedupe
+            batch_size: Jumlah entri sebelum buffer langsung disimpan
+            flush_interval: Umur maksimum buffer dalam detik
+            metrics: Registry untuk latensi dan error (default: registry bersama)
+        """
+        self.persist = persist
+        self.dedupe_size = dedupe_size
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self._seen: "OrderedDict[Tuple[int, str], None]" = OrderedDict()
+        self._buffer: List[LogEntry] = []
+        self._flush_handle: Optional[asyncio.TimerHandle] = None
+        self.metrics = metrics if metrics is not None else default_metrics
+        self.duplicates = 0
+        self.flushed = 0
+    
+    def install(self, bot) -> "CommandMiddleware":
+        """
+        Memasang hook global ke bot
+        
+        Args:
+            bot: Instance commands.Bot
+        
+        Returns:
+            Middleware ini
+        """
+        bot.before_invoke(self.before_invoke)
+        bot.after_invoke(self.after_invoke)
+        return self
+    
+    def _first_seen(self, key: Tuple[int, str]) -> bool:
+        """Menandai pemanggilan, False jika kunci ini sudah pernah terlihat"""
+        if key in self._seen:
+            self.duplicates += 1
+            return False
+        self._seen[key] = None
+        if len(self._seen) > self.dedupe_size:
+            self._seen.popitem(last=False)
+        return True
+    
+    async def before_invoke(self, ctx) -> None:
+        """Hook global sebelum command dijalankan"""
+        key = (ctx.message.id, ctx.command.qualified_name)
+        ctx.middleware_started = time.perf_counter() if self._first_seen(key) else None
+    
+    async def after_invoke(self, ctx) -> None:
+        """Hook global setelah command selesai (juga saat command error)"""
+        started = getattr(ctx, "middleware_started", None)
+        if started is None:
+            return
+        ctx.middleware_started = None
+        elapsed = time.perf_counter() - started
+        name = ctx.command.qualified_name
+        
+        error = None
+        if ctx.command_failed:
+            # Hook ini dipanggil dari blok finally, exception command masih aktif
+            exc = sys.exc_info()[1]
+            error = type(getattr(exc, "original", exc)).__name__ if exc is not None else "CommandFailed"
+        self.metrics.record_command(name, elapsed, error)
+        
+        logger.info("Command used: %s by %s in %s (%.1f ms)", name, ctx.author, ctx.guild or "DM", elapsed * 1e3)
+        self.enqueue(ctx.author.id, ctx.guild.id if ctx.guild else None, name)
+    
+    def enqueue(self, user_id: int, guild_id: Optional[int], command: str) -> None:
+        """
+        Memasukkan satu log command ke buffer
+        
+        Args:
+            user_id: ID pengguna Discord
+            guild_id: ID server Discord atau None untuk DM
+            command: Nama command
+        """
+        self._buffer.append((time.time(), user_id, guild_id, command))
+        if len(self._buffer) >= self.batch_size:
+            self._schedule(0)
+        elif self._flush_handle is None:
+            self._schedule(self.flush_interval)
+    
+    def _schedule(self, delay: float) -> None:
+        """Menjadwalkan flush di event loop"""
+        if self._flush_handle is not None:
+            self._flush_handle.cancel()
+        loop = asyncio.get_running_loop()
+        self._flush_handle = loop.call_later(delay, lambda: loop.create_task(self.flush()))
+    
+    def drain(self) -> List[LogEntry]:
+        """
+        Mengambil dan mengosongkan buffer tanpa menyimpannya
+        
+        Dipakai saat shutdown, ketika event loop sudah tidak berjalan dan
+        isi buffer ditulis langsung lewat API database sinkron.
+        
+        Returns:
+            List LogEntry yang belum disimpan
+        """
+        if self._flush_handle is not None:
+            self._flush_handle.cancel()
+            self._flush_handle = None
+        batch, self._buffer = self._buffer, []
+        return batch
+    
+    async def flush(self) -> None:
+        """Menyerahkan isi buffer ke persist() dalam satu batch"""
+        batch = self.drain()
+        if not batch:
+            return
+        try:
+            result = self.persist(batch)
+            if inspect.isawaitable(result):
+                await result
+            self.flushed += len(batch)
+        except Exception as e:
+            logger.error(f"Gagal menyimpan {len(batch)} log command: {e}")
+    
+    def stats(self) -> Dict[str, Any]:
+        """
+        Mendapatkan statistik middleware
+        
+        Returns:
+            Dictionary duplicates, pending dan flushed
+        """
+        return {
+            "duplicates": self.duplicates,
+            "pending": len(self._buffer),
+            "flushed": self.flushed
+        }
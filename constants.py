@@ -5,6 +5,12 @@ Modul ini berisi konstanta-konstanta yang digunakan di berbagai
 bagian aplikasi bot Discord.
 """
 
+import os
+from dotenv import load_dotenv
+
+# Pengaturan rate limit di bawah bisa diubah lewat environment variable
+load_dotenv()
+
 # Warna untuk embed Discord
 EMBED_COLORS = {
     "primary": 0x3498db,    # Biru
@@ -105,4 +111,38 @@ HELP_TEXT = {
 **Islamic Features:**
 `{prefix}imsakiyah <city>` - Imsakiyah schedule
 """
-} 
\ No newline at end of file
+} 
+
+# Log command: kapasitas ring buffer dan umur maksimum entri (detik)
+COMMAND_LOG_CAPACITY = 100_000
+COMMAND_LOG_RETENTION = 7 * 24 * 60 * 60
+
+# Command cooldown default (detik)
+COOLDOWN = 3
+# Command cooldowns (detik) per kategori
+# Kunci dicocokkan dengan nama command induk lalu nama cog, selain itu "general"
+COOLDOWNS = {
+    "general": 3,
+    "anime": 5,
+    "waifu": 3,
+    "imsakiyah": 5,
+    "lastfm": 5,
+    "sekolah": 3
+}
+
+# Rate limiter: command beruntun yang boleh sebelum cooldown berlaku
+RATE_LIMIT_BURST = int(os.getenv('RATE_LIMIT_BURST', '3'))
+# Bucket server = pengali x rate dan kapasitas bucket pengguna
+RATE_LIMIT_GUILD_MULTIPLIER = int(os.getenv('RATE_LIMIT_GUILD_MULTIPLIER', '10'))
+# Batas keras jumlah bucket per kategori
+RATE_LIMIT_MAX_BUCKETS = int(os.getenv('RATE_LIMIT_MAX_BUCKETS', '100000'))
+
+# Budget global per API upstream: (request per detik, burst)
+UPSTREAM_BUDGETS = {
+    "jikan": (3, 3),
+    "lastfm": (5, 5),
+    "sekolah": (5, 10),
+    "jadwalsholat": (10, 10)
+}
+# Request yang harus menunggu lebih lama dari ini langsung gagal
+UPSTREAM_MAX_WAIT = float(os.getenv('UPSTREAM_MAX_WAIT', '5'))
@@ -6,15 +6,426 @@ but stores all data in memory (which means data is lost on restart).
 
 import os
 import json
+import math
 import time
 import logging
-import datetime
-from typing import Dict, List, Any, Optional, Union
+import threading
+import bisect
+import heapq
+import itertools
+import functools
+from typing import Dict, List, Any, Optional, Union, Iterable, Iterator
+
+from command_log import CommandLog, CommandStats, exact_command_stats
+from snapshot import write_snapshot, read_snapshot, is_snapshot
+from constants import COMMAND_LOG_CAPACITY, COMMAND_LOG_RETENTION
 
 # Setup logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger("memory-db")
 
+BACKUP_FILE = "memory_db_backup.mdb"
+# Backups written before the binary snapshot format
+LEGACY_BACKUP_FILE = "memory_db_backup.json"
+
+_MISSING = object()
+
+def _resolve(doc: Dict[str, Any], path: str) -> Any:
+    """Read a (dotted) field path from a document, _MISSING if absent"""
+    value = doc
+    for part in path.split("."):
+        if not isinstance(value, dict) or part not in value:
+            return _MISSING
+        value = value[part]
+    return value
+
+class Index:
+    """Secondary hash index mapping a field value to the _ids holding it"""
+    
+    def __init__(self, field: str, unique: bool = False):
+        self.field = field
+        self.unique = unique
+        # Dotted fields index the nested value, the same path queries resolve
+        self.dotted = "." in field
+        # value -> {_id: None}; a dict keeps insertion order and O(1) removal
+        self.entries: Dict[Any, Dict[str, None]] = {}
+        # Documents whose value cannot be hashed are always scanned
+        self.unhashable: Dict[str, None] = {}
+    
+    def value(self, doc: Dict[str, Any]) -> Any:
+        """Get the indexed value of a document, _MISSING if it has none"""
+        if self.dotted:
+            return _resolve(doc, self.field)
+        return doc.get(self.field, _MISSING)
+    
+    def add(self, doc: Dict[str, Any]) -> None:
+        """Add a document to the index"""
+        value = self.value(doc)
+        if value is _MISSING:
+            return
+        try:
+            self.entries.setdefault(value, {})[doc["_id"]] = None
+        except TypeError:
+            self.unhashable[doc["_id"]] = None
+    
+    def remove(self, doc: Dict[str, Any]) -> None:
+        """Remove a document from the index"""
+        value = self.value(doc)
+        if value is _MISSING:
+            return
+        try:
+            bucket = self.entries.get(value)
+        except TypeError:
+            self.unhashable.pop(doc["_id"], None)
+            return
+        if bucket is not None:
+            bucket.pop(doc["_id"], None)
+            if not bucket:
+                del self.entries[value]
+    
+    def lookup(self, value: Any) -> Optional[Iterable[str]]:
+        """Get candidate _ids for a value, or None if the value is not indexable"""
+        try:
+            bucket = self.entries.get(value, {})
+        except TypeError:
+            return None
+        if self.unhashable:
+            return list(bucket) + list(self.unhashable)
+        return bucket
+    
+    def conflicts(self, doc_id: Optional[str], value: Any) -> bool:
+        """Check whether storing value under doc_id would break uniqueness"""
+        if not self.unique:
+            return False
+        try:
+            bucket = self.entries.get(value)
+        except TypeError:
+            return False
+        return bool(bucket) and any(other != doc_id for other in bucket)
+    
+    def clear(self) -> None:
+        """Remove all entries from the index"""
+        self.entries = {}
+        self.unhashable = {}
+
+class SortedIndex(Index):
+    """Index that also keeps its distinct values sorted to serve range queries"""
+    
+    def __init__(self, field: str, unique: bool = False):
+        super().__init__(field, unique=unique)
+        self.keys: List[Any] = []
+        # Values that cannot be ordered against the rest (None, mixed types)
+        self.unordered: Dict[Any, None] = {}
+    
+    def add(self, doc: Dict[str, Any]) -> None:
+        """Add a document to the index"""
+        value = self.value(doc)
+        if value is _MISSING:
+            return
+        try:
+            is_new = value not in self.entries
+        except TypeError:
+            self.unhashable[doc["_id"]] = None
+            return
+        super().add(doc)
+        if is_new:
+            try:
+                if value is None:
+                    raise TypeError
+                bisect.insort(self.keys, value)
+            except TypeError:
+                self.unordered[value] = None
+    
+    def remove(self, doc: Dict[str, Any]) -> None:
+        """Remove a document from the index"""
+        value = self.value(doc)
+        if value is _MISSING:
+            return
+        super().remove(doc)
+        try:
+            if value in self.entries:
+                return
+        except TypeError:
+            return
+        if value in self.unordered:
+            del self.unordered[value]
+            return
+        position = bisect.bisect_left(self.keys, value)
+        if position < len(self.keys) and self.keys[position] == value:
+            del self.keys[position]
+    
+    def range(self, lower: Any = _MISSING, upper: Any = _MISSING,
+              include_lower: bool = True, include_upper: bool = True) -> Optional[List[str]]:
+        """Get candidate _ids with lower <(=) value <(=) upper, or None if the bounds cannot be ordered"""
+        try:
+            start = 0
+            if lower is not _MISSING:
+                start = (bisect.bisect_left if include_lower else bisect.bisect_right)(self.keys, lower)
+            end = len(self.keys)
+            if upper is not _MISSING:
+                end = (bisect.bisect_right if include_upper else bisect.bisect_left)(self.keys, upper)
+        except TypeError:
+            return None
+        
+        ids = [doc_id for key in self.keys[start:end] for doc_id in self.entries[key]]
+        # Unordered values might still compare against the bounds, let the predicate decide
+        for key in self.unordered:
+            ids.extend(self.entries[key])
+        ids.extend(self.unhashable)
+        return ids
+    
+    def clear(self) -> None:
+        """Remove all entries from the index"""
+        super().clear()
+        self.keys = []
+        self.unordered = {}
+
+_COMPARISONS = {"$gt": ">", "$gte": ">=", "$lt": "<", "$lte": "<="}
+_OPERATORS = {"$eq", "$ne", "$in", "$exists"} | set(_COMPARISONS)
+
+def _is_operator_dict(condition: Any) -> bool:
+    return isinstance(condition, dict) and bool(condition) and all(
+        isinstance(key, str) and key.startswith("$") for key in condition
+    )
+
+def _query_shape(query: Dict[str, Any]):
+    """Split a query into its shape (fields and operators) and the parameter values"""
+    shape = []
+    params = []
+    for field, condition in query.items():
+        if _is_operator_dict(condition):
+            operators = []
+            for operator, value in condition.items():
+                if operator not in _OPERATORS:
+                    raise ValueError(f"Unsupported query operator: {operator}")
+                if operator == "$in":
+                    try:
+                        value = frozenset(value)
+                    except TypeError:
+                        value = list(value)
+                operators.append(operator)
+                params.append(value)
+            shape.append((field, tuple(operators)))
+        else:
+            shape.append((field, None))
+            params.append(condition)
+    return tuple(shape), tuple(params)
+
+@functools.lru_cache(maxsize=256)
+def _compile_shape(shape) -> Any:
+    """Generate a predicate function for a query shape; values are bound later"""
+    lines = ["def predicate(p, doc):", "    try:"]
+    slot = 0
+    for number, (field, operators) in enumerate(shape):
+        variable = f"v{number}"
+        if "." in field:
+            lines.append(f"        {variable} = _resolve(doc, {field!r})")
+        else:
+            lines.append(f"        {variable} = doc.get({field!r}, _MISSING)")
+        
+        for operator in operators or (None,):
+            if operator is None or operator == "$eq":
+                test = f"{variable} is not _MISSING and {variable} == p[{slot}]"
+            elif operator == "$ne":
+                test = f"{variable} is _MISSING or {variable} != p[{slot}]"
+            elif operator == "$in":
+                test = f"{variable} is not _MISSING and {variable} in p[{slot}]"
+            elif operator == "$exists":
+                test = f"({variable} is not _MISSING) == bool(p[{slot}])"
+            else:
+                test = (f"{variable} is not _MISSING and {variable} is not None "
+                        f"and {variable} {_COMPARISONS[operator]} p[{slot}]")
+            lines.append(f"        if not ({test}): return False")
+            slot += 1
+    lines += ["    except TypeError:", "        return False", "    return True"]
+    
+    namespace = {"_MISSING": _MISSING, "_resolve": _resolve}
+    exec("\n".join(lines), namespace)
+    return namespace["predicate"]
+
+def compile_query(query: Dict[str, Any]):
+    """
+    Compile a query into a predicate doc -> bool.
+    
+    Supports equality plus $eq, $ne, $in, $exists, $gt, $gte, $lt and $lte.
+    The generated function is cached per query shape, so repeated queries
+    that only differ in their values are compiled once.
+    """
+    shape, params = _query_shape(query)
+    return functools.partial(_compile_shape(shape), params)
+
+def _evaluate(doc: Dict[str, Any], expression: Any) -> Any:
+    """Evaluate a "$field" reference, a {name: expression} object or a literal"""
+    if isinstance(expression, str) and expression.startswith("$"):
+        value = _resolve(doc, expression[1:])
+        return None if value is _MISSING else value
+    if isinstance(expression, dict):
+        return {name: _evaluate(doc, sub) for name, sub in expression.items()}
+    return expression
+
+def _group_key(value: Any) -> Any:
+    """Make a group _id hashable (compound keys are dicts)"""
+    if isinstance(value, dict):
+        return tuple((name, _group_key(sub)) for name, sub in value.items())
+    if isinstance(value, list):
+        return tuple(_group_key(sub) for sub in value)
+    return value
+
+def _stage_match(stream: Iterable[Dict[str, Any]], query: Dict[str, Any]) -> Iterator[Dict[str, Any]]:
+    return filter(compile_query(query), stream)
+
+def _stage_group(stream: Iterable[Dict[str, Any]], spec: Dict[str, Any]) -> Iterator[Dict[str, Any]]:
+    key_expression = spec.get("_id")
+    accumulators = []
+    for name, accumulator in spec.items():
+        if name == "_id":
+            continue
+        (operator, expression), = accumulator.items()
+        if operator not in ("$sum", "$count", "$max", "$min", "$avg"):
+            raise ValueError(f"Unsupported $group accumulator: {operator}")
+        accumulators.append((name, operator, expression))
+    
+    # Only one running value per accumulator is kept for each group
+    groups: Dict[Any, List[Any]] = {}
+    for doc in stream:
+        group_id = _evaluate(doc, key_expression)
+        state = groups.get(_group_key(group_id))
+        if state is None:
+            state = groups[_group_key(group_id)] = [group_id] + [None] * len(accumulators)
+        for slot, (name, operator, expression) in enumerate(accumulators, 1):
+            if operator == "$count":
+                state[slot] = (state[slot] or 0) + 1
+                continue
+            value = _evaluate(doc, expression)
+            if operator == "$sum":
+                if isinstance(value, (int, float)) and not isinstance(value, bool):
+                    state[slot] = (state[slot] or 0) + value
+                elif state[slot] is None:
+                    state[slot] = 0
+            elif operator == "$avg":
+                total, count = state[slot] or (0, 0)
+                if isinstance(value, (int, float)) and not isinstance(value, bool):
+                    total, count = total + value, count + 1
+                state[slot] = (total, count)
+            elif value is not None:
+                current = state[slot]
+                if current is None or (value > current if operator == "$max" else value < current):
+                    state[slot] = value
+    
+    for state in groups.values():
+        result = {"_id": state[0]}
+        for slot, (name, operator, expression) in enumerate(accumulators, 1):
+            value = state[slot]
+            if operator == "$avg":
+                value = value[0] / value[1] if value and value[1] else None
+            result[name] = value
+        yield result
+
+def _sort_key(spec: Dict[str, int]):
+    """Build a sort key for a {field: 1 | -1} specification (missing/None sorts first)"""
+    fields = list(spec.items())
+    
+    def compare(a: Dict[str, Any], b: Dict[str, Any]) -> int:
+        for field, direction in fields:
+            left, right = _resolve(a, field), _resolve(b, field)
+            left = None if left is _MISSING else left
+            right = None if right is _MISSING else right
+            if left == right:
+                continue
+            if left is None:
+                order = -1
+            elif right is None:
+                order = 1
+            else:
+                order = -1 if left < right else 1
+            return order if direction >= 0 else -order
+        return 0
+    
+    if len(fields) == 1:
+        # Fast path: plain key function with a null-first flag
+        field, direction = fields[0]
+        
+        def single(doc: Dict[str, Any]):
+            value = _resolve(doc, field)
+            return (False, None) if value is _MISSING or value is None else (True, value)
+        return single, direction < 0
+    return functools.cmp_to_key(compare), False
+
+def _stage_sort(stream: Iterable[Dict[str, Any]], spec: Dict[str, int]) -> Iterator[Dict[str, Any]]:
+    key, reverse = _sort_key(spec)
+    return iter(sorted(stream, key=key, reverse=reverse))
+
+def _stage_top_k(stream: Iterable[Dict[str, Any]], spec: Dict[str, int], limit: int) -> Iterator[Dict[str, Any]]:
+    """$sort followed by $limit: keep only the best `limit` documents in a heap"""
+    key, reverse = _sort_key(spec)
+    select = heapq.nlargest if reverse else heapq.nsmallest
+    return iter(select(limit, stream, key=key))
+
+def _stage_limit(stream: Iterable[Dict[str, Any]], limit: int) -> Iterator[Dict[str, Any]]:
+    return itertools.islice(stream, limit)
+
+def _stage_skip(stream: Iterable[Dict[str, Any]], skip: int) -> Iterator[Dict[str, Any]]:
+    return itertools.islice(stream, skip, None)
+
+def _stage_project(stream: Iterable[Dict[str, Any]], spec: Dict[str, Any]) -> Iterator[Dict[str, Any]]:
+    include_id = spec.get("_id", 1) not in (0, False)
+    fields = {name: value for name, value in spec.items() if name != "_id"}
+    excluding = bool(fields) and all(value in (0, False) for value in fields.values())
+    
+    for doc in stream:
+        if excluding:
+            result = {name: value for name, value in doc.items() if name not in fields}
+            if not include_id:
+                result.pop("_id", None)
+        else:
+            result = {"_id": doc["_id"]} if include_id and "_id" in doc else {}
+            for name, value in fields.items():
+                if value in (1, True):
+                    found = _resolve(doc, name)
+                    if found is not _MISSING:
+                        result[name] = found
+                else:
+                    result[name] = _evaluate(doc, value)
+        yield result
+
+_STAGES = {
+    "$match": _stage_match,
+    "$group": _stage_group,
+    "$sort": _stage_sort,
+    "$limit": _stage_limit,
+    "$skip": _stage_skip,
+    "$project": _stage_project,
+}
+
+def run_pipeline(source: Iterable[Dict[str, Any]], pipeline: List[Dict[str, Any]]) -> Iterator[Dict[str, Any]]:
+    """
+    Chain aggregation stages lazily over an iterable of documents.
+    
+    Stages pull documents one at a time; only $group and $sort have to see
+    the whole input, and a $sort directly followed by $limit keeps just the
+    top documents in a heap instead of sorting everything.
+    """
+    stream = iter(source)
+    stages = list(pipeline)
+    position = 0
+    while position < len(stages):
+        stage = stages[position]
+        if len(stage) != 1:
+            raise ValueError(f"Aggregation stage must have exactly one operator: {stage!r}")
+        (operator, spec), = stage.items()
+        if operator not in _STAGES:
+            raise ValueError(f"Unsupported aggregation stage: {operator}")
+        
+        following = stages[position + 1] if position + 1 < len(stages) else {}
+        if operator == "$sort" and "$limit" in following:
+            stream = _stage_top_k(stream, spec, following["$limit"])
+            position += 2
+            continue
+        
+        stream = _STAGES[operator](stream, spec)
+        position += 1
+    return stream
+
 class MemoryStorage:
     """In-memory database replacement for MongoDB"""
     
@@ -26,9 +437,90 @@ class MemoryStorage:
             "stats": {},
             "settings": {}
         }
+        # collection -> field -> Index
+        self.indexes: Dict[str, Dict[str, Index]] = {}
         self.connected = True
+        self._save_thread: Optional[threading.Thread] = None
         logger.info("Initialized memory storage")
     
+    def create_index(self, collection: str, field: str, unique: bool = False, sorted: bool = False) -> bool:
+        """Create a secondary index on a field (sorted=True also serves range queries)"""
+        if collection not in self.collections:
+            self.collections[collection] = {}
+        
+        index = SortedIndex(field, unique=unique) if sorted else Index(field, unique=unique)
+        for doc in self.collections[collection].values():
+            value = index.value(doc)
+            if value is not _MISSING and index.conflicts(doc["_id"], value):
+                logger.error(f"Cannot create unique index on {collection}.{field}: duplicate value {value!r}")
+                return False
+            index.add(doc)
+        
+        self.indexes.setdefault(collection, {})[field] = index
+        logger.debug(f"Created {'unique ' if unique else ''}{'sorted ' if sorted else ''}index on {collection}.{field}")
+        return True
+    
+    def drop_index(self, collection: str, field: str) -> bool:
+        """Drop a secondary index"""
+        if field in self.indexes.get(collection, {}):
+            del self.indexes[collection][field]
+            return True
+        return False
+    
+    def rebuild_indexes(self, collection: Optional[str] = None) -> None:
+        """Rebuild indexes from the stored documents (after a bulk load or reset)"""
+        targets = [collection] if collection else list(self.indexes)
+        for name in targets:
+            docs = self.collections.get(name)
+            for index in self.indexes.get(name, {}).values():
+                index.clear()
+                if isinstance(docs, dict):
+                    for doc in docs.values():
+                        index.add(doc)
+    
+    @staticmethod
+    def _index_lookup(index: Index, condition: Any) -> Optional[Iterable[str]]:
+        """Candidate _ids an index can give for one query condition, None if it cannot narrow"""
+        if not _is_operator_dict(condition):
+            return index.lookup(condition)
+        if "$eq" in condition:
+            return index.lookup(condition["$eq"])
+        if "$in" in condition:
+            ids: Dict[str, None] = {}
+            for value in condition["$in"]:
+                found = index.lookup(value)
+                if found is None:
+                    return None
+                ids.update(dict.fromkeys(found))
+            return ids
+        if isinstance(index, SortedIndex) and any(op in condition for op in _COMPARISONS):
+            lower = condition.get("$gte", condition.get("$gt", _MISSING))
+            upper = condition.get("$lte", condition.get("$lt", _MISSING))
+            return index.range(lower, upper, "$gt" not in condition, "$lt" not in condition)
+        return None
+    
+    def _candidates(self, collection: str, query: Dict[str, Any]) -> Iterable[Dict[str, Any]]:
+        """Pick the most selective index for a query, falling back to a full scan"""
+        docs = self.collections[collection]
+        best = None
+        for field, index in self.indexes.get(collection, {}).items():
+            if field not in query:
+                continue
+            ids = self._index_lookup(index, query[field])
+            if ids is not None and (best is None or len(ids) < len(best)):
+                best = ids
+                if not best:
+                    break
+        
+        if best is None:
+            return docs.values()
+        return [docs[doc_id] for doc_id in best]
+    
+    @staticmethod
+    def _matches(doc: Dict[str, Any], query: Dict[str, Any]) -> bool:
+        """Check whether a document satisfies a query"""
+        return compile_query(query)(doc)
+    
     def insert_one(self, collection: str, document: Dict[str, Any]) -> bool:
         """Insert a document into a collection"""
         if collection not in self.collections:
@@ -38,7 +530,21 @@ class MemoryStorage:
         if "_id" not in document:
             document["_id"] = str(int(time.time())) + str(hash(str(document)))
         
+        indexes = self.indexes.get(collection, {})
+        for field, index in indexes.items():
+            value = index.value(document)
+            if value is not _MISSING and index.conflicts(document["_id"], value):
+                logger.warning(f"Duplicate key for unique index {collection}.{field}: {value!r}")
+                return False
+        
+        existing = self.collections[collection].get(document["_id"])
+        if existing is not None:
+            for index in indexes.values():
+                index.remove(existing)
+        
         self.collections[collection][document["_id"]] = document
+        for index in indexes.values():
+            index.add(document)
         return True
     
     def find_one(self, collection: str, query: Dict[str, Any]) -> Optional[Dict[str, Any]]:
@@ -46,14 +552,9 @@ class MemoryStorage:
         if collection not in self.collections:
             return None
             
-        # Simple query matching
-        for doc_id, doc in self.collections[collection].items():
-            matches = True
-            for key, value in query.items():
-                if key not in doc or doc[key] != value:
-                    matches = False
-                    break
-            if matches:
+        matches = compile_query(query)
+        for doc in self._candidates(collection, query):
+            if matches(doc):
                 return doc
         return None
     
@@ -70,8 +571,11 @@ class MemoryStorage:
         
         # Handle upsert case
         if doc is None and upsert:
-            # Create new document with query fields
-            new_doc = query.copy()
+            # Create new document with the equality fields of the query
+            new_doc = {
+                key: value for key, value in query.items()
+                if not _is_operator_dict(value) and "." not in key
+            }
             # Apply updates
             if "$set" in update:
                 for key, value in update["$set"].items():
@@ -82,6 +586,31 @@ class MemoryStorage:
         
         # Update existing document
         if doc is not None:
+            indexes = self.indexes.get(collection, {})
+            
+            # Reject updates that would break a unique index
+            for key, value in update.get("$set", {}).items():
+                for field, index in indexes.items():
+                    if field == key:
+                        new_value = value
+                    elif field.startswith(key + ".") and isinstance(value, dict):
+                        new_value = _resolve(value, field[len(key) + 1:])
+                    else:
+                        continue
+                    if new_value is not _MISSING and index.conflicts(doc["_id"], new_value):
+                        logger.warning(f"Duplicate key for unique index {collection}.{field}: {new_value!r}")
+                        return False
+            
+            # Take the document out of indexes on fields that are about to change,
+            # including dotted indexes below a replaced field
+            changed = [*update.get("$set", {}), *update.get("$inc", {})]
+            touched = [
+                index for field, index in indexes.items()
+                if any(field == key or field.startswith(key + ".") for key in changed)
+            ]
+            for index in touched:
+                index.remove(doc)
+            
             if "$set" in update:
                 for key, value in update["$set"].items():
                     doc[key] = value
@@ -90,6 +619,9 @@ class MemoryStorage:
                     if key not in doc:
                         doc[key] = 0
                     doc[key] += value
+            
+            for index in touched:
+                index.add(doc)
             return True
             
         return False
@@ -105,6 +637,8 @@ class MemoryStorage:
             return False
             
         # Delete the document
+        for index in self.indexes.get(collection, {}).values():
+            index.remove(doc)
         del self.collections[collection][doc["_id"]]
         return True
     
@@ -117,55 +651,89 @@ class MemoryStorage:
             # Return all documents
             return list(self.collections[collection].values())
             
-        # Simple query matching
-        results = []
-        for doc_id, doc in self.collections[collection].items():
-            matches = True
-            for key, value in query.items():
-                if key not in doc or doc[key] != value:
-                    matches = False
-                    break
-            if matches:
-                results.append(doc)
-        return results
+        return list(filter(compile_query(query), self._candidates(collection, query)))
     
     def count_documents(self, collection: str, query: Dict[str, Any] = None) -> int:
         """Count documents in a collection"""
         return len(self.find(collection, query))
     
     def aggregate(self, collection: str, pipeline: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
-        """Simple aggregation support"""
+        """Run an aggregation pipeline and collect the results"""
+        return list(self.aggregate_iter(collection, pipeline))
+    
+    def aggregate_iter(self, collection: str, pipeline: List[Dict[str, Any]]) -> Iterator[Dict[str, Any]]:
+        """Run an aggregation pipeline lazily ($match, $group, $sort, $limit, $skip, $project)"""
         if collection not in self.collections:
-            return []
-            
-        # Very basic aggregation support - just return all documents
-        logger.warning("Memory storage has limited aggregation support")
-        return list(self.collections[collection].values())
+            return iter(())
+        
+        docs = self.collections[collection]
+        source = docs.values() if isinstance(docs, dict) else docs
+        stages = list(pipeline)
+        
+        # A leading $match can use the secondary indexes
+        if stages and "$match" in stages[0] and isinstance(docs, dict):
+            query = stages.pop(0)["$match"]
+            source = filter(compile_query(query), self._candidates(collection, query))
+        return run_pipeline(source, stages)
     
     def drop_collection(self, collection: str) -> bool:
         """Drop a collection"""
         if collection in self.collections:
             self.collections[collection] = {}
+            self.rebuild_indexes(collection)
             return True
         return False
     
-    def save_to_file(self, filename: str = "memory_db_backup.json") -> bool:
-        """Save the current database state to a file"""
+    def save_to_file(self, filename: str = BACKUP_FILE, compression: Optional[str] = None,
+                     background: bool = False) -> bool:
+        """
+        Save the current database state as a binary snapshot.
+        
+        compression may be None, "zlib" or "zstd" (falls back to zlib when
+        zstandard is not installed). With background=True the snapshot is
+        written from a separate thread and this returns immediately; use
+        wait_for_save() to block until it is on disk.
+        """
+        if background:
+            self.wait_for_save()
+            self._save_thread = threading.Thread(
+                target=self._write_snapshot, args=(filename, compression),
+                name="memory-db-snapshot", daemon=True
+            )
+            self._save_thread.start()
+            return True
+        return self._write_snapshot(filename, compression)
+    
+    def _write_snapshot(self, filename: str, compression: Optional[str]) -> bool:
+        """Write the snapshot file, logging instead of raising on failure"""
         try:
-            with open(filename, 'w', encoding='utf-8') as f:
-                json.dump(self.collections, f, indent=2, default=str)
-            logger.info(f"Saved memory database to {filename}")
+            start = time.perf_counter()
+            size = write_snapshot(filename, self.collections, compression)
+            logger.info(f"Saved memory database to {filename} ({size} bytes, {time.perf_counter() - start:.2f}s)")
             return True
         except Exception as e:
             logger.error(f"Failed to save database to file: {e}")
             return False
     
-    def load_from_file(self, filename: str = "memory_db_backup.json") -> bool:
-        """Load database state from a file"""
+    def wait_for_save(self) -> None:
+        """Block until a background save started by save_to_file has finished"""
+        if self._save_thread is not None:
+            self._save_thread.join()
+            self._save_thread = None
+    
+    def load_from_file(self, filename: str = BACKUP_FILE) -> bool:
+        """Load database state from a binary snapshot or a legacy JSON backup"""
+        if filename == BACKUP_FILE and not os.path.exists(filename) and os.path.exists(LEGACY_BACKUP_FILE):
+            filename = LEGACY_BACKUP_FILE
         try:
             if os.path.exists(filename):
-                with open(filename, 'r', encoding='utf-8') as f:
-                    self.collections = json.load(f)
+                self.wait_for_save()
+                if is_snapshot(filename):
+                    self.collections = read_snapshot(filename)
+                else:
+                    with open(filename, 'r', encoding='utf-8') as f:
+                        self.collections = json.load(f)
+                self.rebuild_indexes()
                 logger.info(f"Loaded memory database from {filename}")
                 return True
             else:
@@ -183,12 +751,18 @@ class Database:
         self.db = None
         self.client = None
         self.storage = MemoryStorage()
+        self.command_log = CommandLog(COMMAND_LOG_CAPACITY, COMMAND_LOG_RETENTION)
+        self.command_stats = CommandStats()
         self.connected = True
         self.debug_mode = os.environ.get("DB_DEBUG", "false").lower() == "true"
         
         if self.debug_mode:
             logger.setLevel(logging.DEBUG)
         
+        # Lookups by guild/user id are the hot path, keep them O(1)
+        self.storage.create_index("guilds", "guild_id", unique=True)
+        self.storage.create_index("users", "user_id", unique=True)
+        
         logger.info("Database initialized with memory storage")
         
     def connect(self) -> bool:
@@ -240,42 +814,48 @@ class Database:
     def log_command(self, guild_id: Optional[Union[int, str]], 
                    user_id: Union[int, str], command: str) -> bool:
         """Log a command execution to the database"""
-        log_entry = {
-            "guild_id": str(guild_id) if guild_id else None,
-            "user_id": str(user_id),
-            "command": command,
-            "timestamp": datetime.datetime.now()
-        }
-        return self.storage.insert_one("commands", log_entry)
+        try:
+            self.command_log.append(user_id, guild_id, command)
+        except ValueError as e:
+            logger.warning(f"Command {command!r} not logged: {e}")
+            return False
+        self.command_stats.record(user_id, guild_id, command)
+        return True
     
     def get_command_stats(self) -> Dict[str, Any]:
-        """Get command usage statistics"""
-        commands = self.storage.find("commands")
-        
-        # Count total commands
-        total_commands = len(commands)
+        """Get command usage statistics (unique users/guilds are HyperLogLog estimates)"""
+        return self.command_stats.snapshot()
+    
+    def aggregate_commands(self, pipeline: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """
+        Run an aggregation pipeline over the retained command log.
         
-        # Count unique users and guilds
-        unique_users = set()
-        unique_guilds = set()
-        command_counts = {}
+        Entries are streamed as {"timestamp", "user_id", "guild_id", "command"}
+        documents, e.g. per-guild breakdown:
+        [{"$match": {"guild_id": 123}}, {"$group": {"_id": "$command", "uses": {"$sum": 1}}}]
         
-        for cmd in commands:
-            unique_users.add(cmd.get("user_id"))
-            if cmd.get("guild_id"):
-                unique_guilds.add(cmd.get("guild_id"))
-            
-            command_name = cmd.get("command")
-            if command_name not in command_counts:
-                command_counts[command_name] = 0
-            command_counts[command_name] += 1
+        The log is ordered by time, so timestamp bounds in a leading $match are
+        resolved by binary search instead of scanning older entries.
+        """
+        start = end = None
+        condition = pipeline[0].get("$match", {}).get("timestamp") if pipeline else None
+        if _is_operator_dict(condition):
+            start = condition.get("$gte", condition.get("$gt"))
+            end = condition.get("$lt")
+            if "$lte" in condition:
+                # between() excludes its end bound, step just past it
+                end = math.nextafter(condition["$lte"], math.inf)
         
-        return {
-            "total_commands": total_commands,
-            "unique_users": len(unique_users),
-            "unique_guilds": len(unique_guilds),
-            "command_distribution": command_counts
-        }
+        entries = (entry._asdict() for entry in self.command_log.between(start, end))
+        return list(run_pipeline(entries, pipeline))
+    
+    def commands_since(self, seconds: float) -> List[Dict[str, Any]]:
+        """Get command log entries from the last `seconds` seconds"""
+        return self.aggregate_commands([{"$match": {"timestamp": {"$gte": time.time() - seconds}}}])
+    
+    def verify_command_stats(self) -> Dict[str, Any]:
+        """Recompute exact statistics by scanning the retained command log (admin only, O(n))"""
+        return exact_command_stats(self.command_log)
     
     def get_guild_setting(self, guild_id: Union[int, str], key: str) -> Any:
         """Get a guild setting"""
@@ -324,9 +904,9 @@ class Database:
         """Set a guild's prefix setting"""
         return self.set_guild_setting(guild_id, "prefix", prefix)
     
-    def backup(self) -> bool:
-        """Backup the database to a file"""
-        return self.storage.save_to_file()
+    def backup(self, background: bool = False) -> bool:
+        """Backup the database to a snapshot file (optionally from a background thread)"""
+        return self.storage.save_to_file(background=background)
     
     def restore(self) -> bool:
         """Restore the database from a file"""
@@ -347,6 +927,11 @@ class Database:
                 for collection in self.storage.collections.values() 
                 if isinstance(collection, dict)
             ),
+            "command_log": {
+                "entries": len(self.command_log),
+                "capacity": self.command_log.capacity,
+                "bytes": self.command_log.memory_usage()
+            },
             "debug_mode": self.debug_mode
         }
     
@@ -357,5 +942,8 @@ class Database:
                 self.storage.collections[collection] = {}
             elif isinstance(self.storage.collections[collection], list):
                 self.storage.collections[collection] = []
+        self.storage.rebuild_indexes()
+        self.command_log.clear()
+        self.command_stats.clear()
         logger.info("Database rebuilt (memory storage cleared)")
-        return True 
\ No newline at end of file
+        return True
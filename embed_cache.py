@@ -0,0 +1,101 @@
+"""
+embed_cache.py - Cache embed yang sudah dirender
+
+Module ini menyimpan hasil render embed statis dan semi-statis (help,
+daftar kategori, dll) yang hanya bergantung pada bahasa, prefix dan
+versi daftar command. Embed disimpan sebagai payload dict dan setiap
+permintaan mendapat salinan Embed baru yang aman diubah (misalnya untuk
+footer per pengguna), sehingga command tidak perlu menelusuri semua
+command dan menerjemahkan ulang teks di setiap pemanggilan.
+"""
+
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable
+
+import discord
+
+def _fresh_payload(payload: Dict[str, Any]) -> Dict[str, Any]:
+    """Menyalin container di payload embed agar salinan bisa diubah tanpa menyentuh cache"""
+    copy = dict(payload)
+    for key, value in payload.items():
+        if key == "fields":
+            copy[key] = [dict(field) for field in value]
+        elif isinstance(value, dict):
+            copy[key] = dict(value)
+    return copy
+
+class EmbedCache:
+    """
+    Cache LRU kunci -> payload embed
+    
+    Kunci selalu diawali versi registry command, jadi memuat atau
+    melepas extension cukup menaikkan versi lewat invalidate(). Prefix
+    dan bahasa server menjadi bagian kunci, sehingga perubahan keduanya
+    langsung menghasilkan kunci baru dan entri lama tergeser LRU.
+    """
+    def __init__(self, max_size: int = 512):
+        """
+        Membuat cache embed
+        
+        Args:
+            max_size: Jumlah embed maksimum yang disimpan
+        """
+        self.max_size = max_size
+        self.version = 0
+        self._entries: "OrderedDict[tuple, Dict[str, Any]]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+    
+    def get(self, key: Hashable, render: Callable[[], discord.Embed]) -> discord.Embed:
+        """
+        Mendapatkan salinan embed dari cache, merender jika belum ada
+        
+        Args:
+            key: Tuple input render, misalnya ("help", bahasa, prefix)
+            render: Fungsi tanpa argumen yang membangun embed
+        
+        Returns:
+            discord.Embed baru yang boleh diubah pemanggil
+        """
+        full_key = (self.version, key)
+        payload = self._entries.get(full_key)
+        if payload is None:
+            self.misses += 1
+            payload = render().to_dict()
+            self._entries[full_key] = payload
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+        else:
+            self.hits += 1
+            self._entries.move_to_end(full_key)
+        return discord.Embed.from_dict(_fresh_payload(payload))
+    
+    def invalidate(self) -> None:
+        """Membuang semua embed, dipanggil saat extension dimuat/dilepas"""
+        self.version += 1
+        self._entries.clear()
+    
+    def stats(self) -> Dict[str, Any]:
+        """
+        Mendapatkan statistik cache
+        
+        Returns:
+            Dictionary size, version, hits, misses, hit_rate dan evictions
+        """
+        lookups = self.hits + self.misses
+        return {
+            "size": len(self._entries),
+            "version": self.version,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+            "evictions": self.evictions
+        }
+    
+    def __len__(self) -> int:
+        return len(self._entries)
+
+# Cache bersama untuk seluruh proses
+embed_cache = EmbedCache()
@@ -0,0 +1,131 @@
+"""
+http_pool.py - Klien HTTP async bersama dengan pooling koneksi
+
+Module ini menyediakan satu aiohttp.ClientSession per API upstream yang
+dipakai bersama oleh semua command. Koneksi keep-alive dipakai ulang,
+setiap request dibatasi timeout connect/read, dan jumlah request yang
+berjalan bersamaan dibatasi semaphore sehingga antrean tidak memakan
+timeout. Request melewati budget upstream dan metrics lewat TraceConfig,
+sama seperti session Jikan dan API sekolah.
+"""
+
+import asyncio
+from typing import Any, Dict, Mapping, Optional, Tuple
+
+import aiohttp
+
+from metrics import metrics
+from rate_limit import upstream_budget
+
+class PooledHTTPClient:
+    """
+    Session aiohttp bersama untuk satu API upstream
+    
+    Session dibuat saat pertama dipakai di event loop yang berjalan dan
+    dibuat ulang jika sudah ditutup atau loop-nya berganti, jadi close()
+    aman dipanggil kapan saja (misalnya saat extension di-reload).
+    """
+    def __init__(self, name: str, max_concurrency: int = 8, connect_timeout: float = 5.0,
+                 read_timeout: float = 15.0, total_timeout: float = 30.0, keepalive: float = 30.0):
+        """
+        Membuat klien untuk satu API
+        
+        Args:
+            name: Nama API untuk budget dan metrics
+            max_concurrency: Jumlah request bersamaan maksimum (juga ukuran pool koneksi)
+            connect_timeout: Batas waktu membuka koneksi TCP/TLS dalam detik
+            read_timeout: Batas waktu menunggu data dari socket dalam detik
+            total_timeout: Batas waktu satu request secara keseluruhan dalam detik
+            keepalive: Lama koneksi idle disimpan di pool dalam detik
+        """
+        self.name = name
+        self.max_concurrency = max_concurrency
+        self.timeout = aiohttp.ClientTimeout(total=total_timeout, sock_connect=connect_timeout, sock_read=read_timeout)
+        self.keepalive = keepalive
+        self._session: Optional[aiohttp.ClientSession] = None
+        self._semaphore: Optional[asyncio.Semaphore] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+    
+    def _get_session(self) -> aiohttp.ClientSession:
+        loop = asyncio.get_running_loop()
+        if self._session is None or self._session.closed or self._loop is not loop:
+            connector = aiohttp.TCPConnector(
+                limit=self.max_concurrency,
+                keepalive_timeout=self.keepalive,
+                ttl_dns_cache=300
+            )
+            self._session = aiohttp.ClientSession(
+                connector=connector,
+                timeout=self.timeout,
+                trace_configs=[upstream_budget.aiohttp_trace(self.name), metrics.aiohttp_trace(self.name)]
+            )
+            self._semaphore = asyncio.Semaphore(self.max_concurrency)
+            self._loop = loop
+        return self._session
+    
+    async def fetch_json(self, url: str, **kwargs) -> Tuple[int, Mapping[str, str], Any]:
+        """
+        Mengambil JSON dari URL beserta header respons
+        
+        Content-Type tidak diperiksa, karena raw.githubusercontent.com
+        mengirim JSON sebagai text/plain.
+        
+        Args:
+            url: URL tujuan
+            **kwargs: Argumen tambahan untuk session.get (params, headers, ...)
+        
+        Returns:
+            Tuple (status HTTP, header respons (case-insensitive), data JSON atau None jika status bukan 200)
+        
+        Raises:
+            aiohttp.ClientError, asyncio.TimeoutError, UpstreamBudgetExceeded
+        """
+        session = self._get_session()
+        async with self._semaphore:
+            async with session.get(url, **kwargs) as response:
+                headers = response.headers.copy()
+                if response.status != 200:
+                    return response.status, headers, None
+                return response.status, headers, await response.json(content_type=None)
+    
+    async def get_json(self, url: str, **kwargs) -> Tuple[int, Any]:
+        """
+        Mengambil dan mem-parse JSON dari URL
+        
+        Args:
+            url: URL tujuan
+            **kwargs: Argumen tambahan untuk session.get
+        
+        Returns:
+            Tuple (status HTTP, data JSON atau None jika status bukan 200)
+        """
+        status, _, data = await self.fetch_json(url, **kwargs)
+        return status, data
+    
+    async def close(self) -> None:
+        """Menutup session dan semua koneksi di pool"""
+        session, self._session = self._session, None
+        if session is not None and not session.closed:
+            await session.close()
+
+_clients: Dict[str, PooledHTTPClient] = {}
+
+def pooled_client(name: str, **options) -> PooledHTTPClient:
+    """
+    Mendapatkan klien bersama untuk satu API
+    
+    Klien yang sama dikembalikan untuk nama yang sama, sehingga module
+    yang dimuat ulang atau salinan kode di entry point lain tetap memakai
+    pool koneksi yang sama.
+    
+    Args:
+        name: Nama API
+        **options: Argumen PooledHTTPClient, hanya dipakai saat klien pertama dibuat
+    
+    Returns:
+        PooledHTTPClient
+    """
+    client = _clients.get(name)
+    if client is None:
+        client = _clients[name] = PooledHTTPClient(name, **options)
+    return client
@@ -0,0 +1,356 @@
+"""
+i18n.py - Katalog terjemahan yang sudah dikompilasi
+
+Module ini mengubah dictionary terjemahan bersarang menjadi tabel datar
+"kunci.bertitik" -> template per bahasa, dengan fallback ke bahasa
+default yang sudah digabung sejak awal. Template juga di-parse sekali
+sehingga get_text cukup satu kali lookup dict.
+
+Terjemahan disimpan sebagai satu file JSON per bahasa di folder
+locales/. LocaleCatalog baru membaca file sebuah bahasa saat bahasa itu
+pertama kali dipakai, dan memuat ulang file yang berubah tanpa restart.
+"""
+
+import os
+import json
+import logging
+import threading
+from collections.abc import Mapping
+from string import Formatter
+from typing import Any, Dict, Iterator, List, Optional
+
+logger = logging.getLogger("i18n")
+
+DEFAULT_LANGUAGE = "id"
+LOCALES_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "locales")
+# Jeda pemeriksaan perubahan file bahasa dalam detik
+RELOAD_INTERVAL = 2.0
+
+class Template:
+    """Template terjemahan yang berisi placeholder {nama}"""
+    __slots__ = ("source", "fields")
+    
+    def __init__(self, source: str, fields: frozenset):
+        self.source = source
+        self.fields = fields
+    
+    def render(self, kwargs: Dict[str, Any]) -> str:
+        """
+        Mengisi placeholder template
+        
+        Args:
+            kwargs: Nilai untuk placeholder
+        
+        Returns:
+            String terisi, atau template mentah jika ada placeholder yang tidak diberikan
+        """
+        if self.fields.issubset(kwargs):
+            return self.source.format_map(kwargs)
+        return self.source
+
+def compile_template(text: str) -> Any:
+    """
+    Mem-parse string terjemahan sekali
+    
+    Args:
+        text: String terjemahan
+    
+    Returns:
+        String jadi jika tidak ada placeholder, selain itu Template
+    """
+    try:
+        fields = frozenset(field for _, field, _, _ in Formatter().parse(text) if field is not None)
+    except ValueError:
+        # Kurung kurawal tidak seimbang, tampilkan apa adanya
+        return text
+    if not fields:
+        # "{{" dan "}}" tetap harus di-unescape seperti str.format
+        return text.format() if "{" in text or "}" in text else text
+    return Template(text, fields)
+
+def flatten(tree: Dict[str, Any], prefix: str = "") -> Dict[str, Any]:
+    """
+    Meratakan dictionary terjemahan bersarang
+    
+    Args:
+        tree: Dictionary terjemahan
+        prefix: Awalan kunci untuk rekursi
+    
+    Returns:
+        Dictionary "a.b.c" -> nilai (node tengah juga ikut, seperti perilaku lama)
+    """
+    flat = {}
+    for key, value in tree.items():
+        path = f"{prefix}{key}"
+        flat[path] = value
+        if isinstance(value, dict):
+            flat.update(flatten(value, f"{path}."))
+    return flat
+
+def compile_table(translations: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Meratakan dan meng-compile terjemahan satu bahasa
+    
+    Args:
+        translations: Dictionary terjemahan bersarang
+    
+    Returns:
+        Dictionary "a.b.c" -> string jadi, Template atau node dict
+    """
+    return {key: compile_template(value) if isinstance(value, str) else value
+            for key, value in flatten(translations).items()}
+
+class LocaleCatalog:
+    """
+    Katalog terjemahan yang dimuat per bahasa dari file locales/<kode>.json
+    
+    Tidak ada file yang dibaca saat katalog dibuat. Bahasa dimuat (bersama
+    bahasa default untuk fallback) saat pertama kali diminta, lalu sebuah
+    thread latar memeriksa mtime file yang sudah dimuat setiap
+    reload_interval detik dan memuat ulang yang berubah. Tabel diganti
+    utuh sehingga get() tidak perlu lock.
+    """
+    def __init__(self, directory: str = LOCALES_DIR, default_lang: str = DEFAULT_LANGUAGE,
+                 reload_interval: Optional[float] = RELOAD_INTERVAL):
+        """
+        Membuat katalog
+        
+        Args:
+            directory: Folder berisi file <kode>.json
+            default_lang: Bahasa fallback untuk kunci yang tidak diterjemahkan
+            reload_interval: Jeda pemeriksaan perubahan file (None = tanpa hot reload)
+        """
+        self.directory = directory
+        self.default_lang = default_lang
+        self.reload_interval = reload_interval
+        # Tabel datar yang sudah digabung dengan fallback, per bahasa
+        self._tables: Dict[str, Dict[str, Any]] = {}
+        # Isi file per bahasa: (mtime_ns, data mentah, tabel milik bahasa itu saja)
+        self._sources: Dict[str, tuple] = {}
+        # Bahasa tanpa file yang bisa dimuat -> mtime_ns file saat dicoba
+        # (None jika tidak ada); tabelnya adalah tabel bahasa default
+        self._fallbacks: Dict[Optional[str], Optional[int]] = {}
+        self._lock = threading.RLock()
+        self._watcher: Optional[threading.Thread] = None
+        self._stop = threading.Event()
+        self.loads = 0
+        self.reloads = 0
+    
+    def _path(self, lang: str) -> str:
+        """Path file untuk kode bahasa"""
+        return os.path.join(self.directory, f"{lang}.json")
+    
+    def available_languages(self) -> List[str]:
+        """
+        Mendapatkan daftar bahasa yang punya file, tanpa memuatnya
+        
+        Returns:
+            List kode bahasa (terurut, bahasa default lebih dulu)
+        """
+        try:
+            names = [name[:-5] for name in os.listdir(self.directory) if name.endswith(".json")]
+        except FileNotFoundError:
+            return []
+        return sorted(names, key=lambda lang: (lang != self.default_lang, lang))
+    
+    def _mtime(self, lang: str) -> Optional[int]:
+        """mtime_ns file bahasa, None jika tidak ada"""
+        try:
+            return os.stat(self._path(lang)).st_mtime_ns
+        except OSError:
+            return None
+    
+    def _read(self, lang: str) -> bool:
+        """
+        Membaca dan meng-compile file satu bahasa (dipanggil dengan lock)
+        
+        File yang tidak bisa dibaca atau berisi JSON rusak dicatat di log
+        dan diperlakukan seperti file yang tidak ada.
+        
+        Returns:
+            False jika file tidak ada atau gagal dimuat
+        """
+        path = self._path(lang)
+        try:
+            mtime = os.stat(path).st_mtime_ns
+            with open(path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+            if not isinstance(data, dict):
+                raise ValueError("isi file bukan object JSON")
+            table = compile_table(data.get("translations", {}))
+        except FileNotFoundError:
+            return False
+        except (OSError, ValueError) as e:
+            logger.error(f"Gagal memuat bahasa {lang}: {e}")
+            return False
+        self._sources[lang] = (mtime, data, table)
+        self.loads += 1
+        return True
+    
+    def _merge(self, lang: str) -> None:
+        """Membangun ulang tabel gabungan bahasa dengan fallback (dipanggil dengan lock)"""
+        own = self._sources[lang][2]
+        if lang == self.default_lang or self.default_lang not in self._sources:
+            self._tables[lang] = own
+        else:
+            self._tables[lang] = {**self._sources[self.default_lang][2], **own}
+    
+    def _load(self, lang: Optional[str]) -> Dict[str, Any]:
+        """
+        Mendapatkan tabel bahasa, memuat file saat pertama dipakai
+        
+        Bahasa yang tidak punya file (atau filenya rusak) memakai tabel
+        bahasa default, yang disimpan di bawah kode bahasa itu agar get()
+        berikutnya tidak memeriksa disk lagi. Watcher menggantinya saat
+        file bahasa itu muncul atau diperbaiki.
+        """
+        with self._lock:
+            table = self._tables.get(lang)
+            if table is not None:
+                return table
+            if self.default_lang not in self._sources and self._read(self.default_lang):
+                self._merge(self.default_lang)
+            if lang is not None and lang != self.default_lang and self._read(lang):
+                self._merge(lang)
+            elif lang not in self._tables:
+                self._fallbacks[lang] = None if lang is None else self._mtime(lang)
+                self._tables[lang] = self._tables.get(self.default_lang, {})
+            self._start_watcher()
+            return self._tables[lang]
+    
+    def get(self, lang: Optional[str], key: str, **kwargs) -> Any:
+        """
+        Mendapatkan teks terjemahan
+        
+        Args:
+            lang: Kode bahasa (bahasa tidak dikenal memakai default)
+            key: Kunci terjemahan (e.g. 'commands.help.title')
+            **kwargs: Parameter untuk dimasukkan ke dalam string
+        
+        Returns:
+            String terjemahan, atau kunci itu sendiri jika tidak ditemukan
+        """
+        table = self._tables.get(lang)
+        if table is None:
+            table = self._load(lang)
+        entry = table.get(key)
+        if entry is None:
+            return key
+        if entry.__class__ is Template:
+            return entry.render(kwargs)
+        return entry
+    
+    def language_data(self, lang: str) -> Optional[Dict[str, Any]]:
+        """
+        Mendapatkan isi file bahasa (name, native_name, translations)
+        
+        Args:
+            lang: Kode bahasa
+        
+        Returns:
+            Dictionary isi file, atau None jika bahasa tidak ada
+        """
+        if lang not in self._sources:
+            self._load(lang)
+        source = self._sources.get(lang)
+        return source[1] if source else None
+    
+    def loaded_languages(self) -> List[str]:
+        """
+        Mendapatkan bahasa yang sudah dimuat ke memori
+        
+        Returns:
+            List kode bahasa
+        """
+        return list(self._sources)
+    
+    def reload_changed(self) -> List[str]:
+        """
+        Memuat ulang file bahasa yang berubah sejak dimuat
+        
+        Returns:
+            List kode bahasa yang dimuat ulang
+        """
+        changed = []
+        with self._lock:
+            for lang, (mtime, _, _) in list(self._sources.items()):
+                try:
+                    current = os.stat(self._path(lang)).st_mtime_ns
+                except FileNotFoundError:
+                    continue  # File dihapus, pakai versi terakhir yang dimuat
+                if current == mtime:
+                    continue
+                if not self._read(lang):
+                    # File setengah tersimpan atau JSON rusak, coba lagi di putaran berikutnya
+                    continue
+                changed.append(lang)
+            
+            for lang, mtime in list(self._fallbacks.items()):
+                if lang is None:
+                    continue
+                current = self._mtime(lang)
+                if current is None or current == mtime:
+                    continue
+                self._fallbacks[lang] = current
+                if self._read(lang):
+                    del self._fallbacks[lang]
+                    changed.append(lang)
+            
+            if changed:
+                # Perubahan bahasa default mengubah fallback semua bahasa
+                targets = list(self._sources) if self.default_lang in changed else changed
+                for lang in targets:
+                    self._merge(lang)
+                for lang in self._fallbacks:
+                    self._tables[lang] = self._tables.get(self.default_lang, {})
+                self.reloads += len(changed)
+        if changed:
+            logger.info(f"Bahasa dimuat ulang: {', '.join(changed)}")
+        return changed
+    
+    def _start_watcher(self) -> None:
+        """Menjalankan thread hot reload saat bahasa pertama dimuat"""
+        if self.reload_interval is None or self._watcher is not None:
+            return
+        self._watcher = threading.Thread(target=self._watch, name="locale-reload", daemon=True)
+        self._watcher.start()
+    
+    def _watch(self) -> None:
+        """Loop thread hot reload"""
+        while not self._stop.wait(self.reload_interval):
+            try:
+                self.reload_changed()
+            except Exception as e:
+                logger.error(f"Pemeriksaan file bahasa gagal: {e}")
+    
+    def close(self) -> None:
+        """Menghentikan thread hot reload"""
+        self._stop.set()
+        if self._watcher is not None:
+            self._watcher.join()
+            self._watcher = None
+
+class LocaleMapping(Mapping):
+    """
+    Tampilan dict LANGUAGES lama di atas LocaleCatalog
+    
+    Untuk kode yang masih membaca LANGUAGES[lang]["translations"]; isi
+    bahasa baru dimuat saat diakses.
+    """
+    def __init__(self, catalog: LocaleCatalog):
+        self.catalog = catalog
+    
+    def __getitem__(self, lang: str) -> Dict[str, Any]:
+        data = self.catalog.language_data(lang)
+        if data is None:
+            raise KeyError(lang)
+        return data
+    
+    def __contains__(self, lang: object) -> bool:
+        return isinstance(lang, str) and os.path.exists(self.catalog._path(lang))
+    
+    def __iter__(self) -> Iterator[str]:
+        return iter(self.catalog.available_languages())
+    
+    def __len__(self) -> int:
+        return len(self.catalog.available_languages())
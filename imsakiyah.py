@@ -6,16 +6,24 @@ kepada pengguna dalam format yang mudah dibaca melalui Discord embeds dan
 komponen UI interaktif.
 """
 
+import os
 import json
+import asyncio
+import time
 import traceback
 import re
-from datetime import datetime, timedelta
+from datetime import datetime
 
-import requests
 import discord
 import pytz
+from discord import app_commands
 from discord.ext import commands
 
+from city_index import CityIndex
+from metrics import metrics
+from schedule_prefetch import DemandTracker, SchedulePrefetcher
+from upstream_cache import shared_cache
+
 # Constants
 API_BASE_URL = "https://raw.githubusercontent.com/lakuapik/jadwalsholatorg/master/kota.json"
 ADZAN_API_BASE = "https://raw.githubusercontent.com/lakuapik/jadwalsholatorg/master/adzan"
@@ -27,6 +35,100 @@ EMBED_COLORS = {
     "info": 0x9b59b6      # Purple
 }
 
+# Cache disk untuk kota.json dan file adzan bulanan, direvalidasi dengan ETag/If-Modified-Since
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+CACHE_DIR = os.getenv("IMSAKIYAH_CACHE_DIR", os.path.join(BASE_DIR, "cache", "jadwalsholat"))
+CITIES_SEED_FILE = os.path.join(BASE_DIR, "cache", "cities.json")
+CITIES_REVALIDATE_AFTER = 24 * 3600
+SCHEDULE_REVALIDATE_AFTER = 24 * 3600
+cache = shared_cache("jadwalsholat", CACHE_DIR)
+_cities_seeded = False
+_city_index = None
+
+def _read_cities_seed():
+    """Membaca cache/cities.json, None jika tidak ada atau rusak"""
+    try:
+        with open(CITIES_SEED_FILE, "r", encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+async def _seed_cities():
+    """Mengisi cache kota.json dari cache/cities.json saat cold start"""
+    seed = await asyncio.to_thread(_read_cities_seed)
+    if isinstance(seed, dict) and isinstance(seed.get("data"), list):
+        await cache.seed("kota", API_BASE_URL, seed["data"])
+
+def _month_end(year, month):
+    """Awal bulan berikutnya (WIB) sebagai epoch detik"""
+    next_year, next_month = (year + 1, 1) if month == 12 else (year, month + 1)
+    return pytz.timezone('Asia/Jakarta').localize(datetime(next_year, next_month, 1)).timestamp()
+
+def _cities_request():
+    """Argumen cache untuk kota.json"""
+    return "kota", API_BASE_URL, CITIES_REVALIDATE_AFTER, None
+
+def _schedule_request(city_id, year, month):
+    """
+    Argumen cache untuk file adzan satu bulan
+    
+    Jadwal bulan berjalan kedaluwarsa di awal bulan berikutnya; jadwal
+    bulan yang sudah lewat disimpan sehari.
+    """
+    expires_at = max(_month_end(year, month), time.time() + SCHEDULE_REVALIDATE_AFTER)
+    return (
+        f"adzan/{city_id}/{year}/{month}",
+        f"{ADZAN_API_BASE}/{city_id}/{year}/{month}.json",
+        SCHEDULE_REVALIDATE_AFTER,
+        expires_at
+    )
+
+# Kota yang paling sering diminta diprefetch menjelang tengah malam WIB
+demand = DemandTracker()
+prefetcher = SchedulePrefetcher(cache, _schedule_request, _cities_request, demand)
+metrics.register_gauges("prefetch_jadwalsholat", prefetcher.stats)
+
+async def fetch_cities():
+    """
+    Mendapatkan daftar kota dari cache atau kota.json
+    
+    Returns:
+        List kota, atau None jika belum pernah di-cache dan upstream gagal
+    """
+    global _cities_seeded
+    if not _cities_seeded:
+        _cities_seeded = True
+        await _seed_cities()
+    return await cache.get(*_cities_request())
+
+async def fetch_schedule(city_id, year, month):
+    """
+    Mendapatkan jadwal satu bulan dari cache atau file adzan
+    
+    Returns:
+        List jadwal harian, atau None jika tidak tersedia
+    """
+    demand.record(city_id)
+    return await cache.get(*_schedule_request(city_id, year, month))
+
+async def get_city_index():
+    """
+    Mendapatkan indeks pencarian untuk versi kota.json saat ini
+    
+    Cache mengembalikan list yang sama sampai kota.json berubah di
+    upstream, jadi indeks hanya dibangun ulang saat list-nya berganti.
+    
+    Returns:
+        CityIndex, atau None jika daftar kota tidak tersedia
+    """
+    global _city_index
+    data = await fetch_cities()
+    if not isinstance(data, list):
+        return None
+    if _city_index is None or _city_index.source is not data:
+        _city_index = CityIndex(data)
+    return _city_index
+
 # UI Components for Imsakiyah
 class RegionSelect(discord.ui.Select):
     """Component dropdown untuk memilih wilayah"""
@@ -80,12 +182,15 @@ class CitySearchModal(discord.ui.Modal):
         # Get search query
         search_query = self.search_input.value.lower()
         
-        # Find matching cities in the current region
-        matching_cities = []
-        for city in self.parent_view.cities:
-            city_name = city.get('name', '').lower()
-            if search_query in city_name:
-                matching_cities.append(city)
+        # Search the shared index and keep cities of the current region, ranked by relevance
+        index = await get_city_index()
+        if index is None:
+            index = CityIndex(self.parent_view.cities)
+        region_ids = {str(city.get('id')) for city in self.parent_view.cities}
+        matching_cities = [
+            city for city in index.search(search_query, fuzzy=False) or index.search(search_query)
+            if str(city.get('id')) in region_ids
+        ]
         
         # If no matches, show message
         if not matching_cities:
@@ -542,39 +647,33 @@ class Imsakiyah:
         
     async def get_regions_data(self):
         """Get regions data with cities organized by region"""
-        # Get list of cities
-        cities_data = await self.get_cities()
+        # Regions are computed once per city list and kept with the city index
+        index = await get_city_index()
+        if index is not None:
+            return index.regions()
         
-        if not cities_data or 'data' not in cities_data:
-            # Create fallback cities if API fails
-            fallback_cities = [
-                {"id": "jakarta", "name": "Jakarta"},
-                {"id": "bandung", "name": "Bandung"},
-                {"id": "surabaya", "name": "Surabaya"},
-                {"id": "medan", "name": "Medan"},
-                {"id": "makassar", "name": "Makassar"},
-                {"id": "semarang", "name": "Semarang"},
-                {"id": "palembang", "name": "Palembang"},
-                {"id": "denpasar", "name": "Denpasar"}
-            ]
-            all_cities = fallback_cities
-        else:
-            all_cities = cities_data['data']
-            
-        # Organize cities by region
-        regions, cities_by_region = self._get_cities_by_region(all_cities)
+        # Create fallback cities if API fails
+        fallback_cities = [
+            {"id": "jakarta", "name": "Jakarta"},
+            {"id": "bandung", "name": "Bandung"},
+            {"id": "surabaya", "name": "Surabaya"},
+            {"id": "medan", "name": "Medan"},
+            {"id": "makassar", "name": "Makassar"},
+            {"id": "semarang", "name": "Semarang"},
+            {"id": "palembang", "name": "Palembang"},
+            {"id": "denpasar", "name": "Denpasar"}
+        ]
         
-        return regions, cities_by_region
+        # Organize cities by region
+        return self._get_cities_by_region(fallback_cities)
         
     async def get_cities(self):
         """Get list of available cities"""
-        try:
-            response = requests.get(API_BASE_URL)
-            response.raise_for_status()
-            return {"data": response.json()}
-        except Exception as e:
-            print(f"Error fetching cities: {e}")
+        data = await fetch_cities()
+        if data is None:
+            print("Error fetching cities: upstream unavailable and nothing cached")
             return None
+        return {"data": data}
      
     async def get_imsakiyah_data(self, city_id, year=None, month=None):
         """Get imsakiyah data for a specific city and month"""
@@ -584,50 +683,12 @@ class Imsakiyah:
         if not month:
             month = datetime.now().month
             
-        try:
-            # Try to get data from the API
-            response = requests.get(f"{ADZAN_API_BASE}/{city_id}/{year}/{month}.json")
-            
-            # If API returns error, use fallback data
-            if response.status_code != 200:
-                print(f"Error fetching imsakiyah data, using fallback: {response.status_code}")
-                return self._generate_fallback_data(city_id, month, year)
-                
-            return {"data": response.json()}
-        except Exception as e:
-            print(f"Error fetching imsakiyah data: {e}")
-            return self._generate_fallback_data(city_id, month, year)
-     
-    def _generate_fallback_data(self, city_id, month, year):
-        """Generate fallback data when API is unavailable"""
-        # Generate 30 days of fallback data with slight variations
-        fallback_data = []
-        base_date = datetime(year, month, 1)
-        
-        for i in range(30):
-            current_date = base_date + timedelta(days=i)
-            
-            # Skip if month changes
-            if current_date.month != month:
-                continue
-                
-            # Generate slight variations in time
-            minute_offset = (i % 5) - 2  # Between -2 and 2
-            
-            fallback_data.append({
-                "date": current_date.strftime('%Y-%m-%d'),
-                "hijri": "Ramadan 1445",
-                "imsak": f"04:{(23 + minute_offset) % 60:02d}",
-                "subuh": f"04:{(33 + minute_offset) % 60:02d}",
-                "terbit": f"05:{(48 + minute_offset) % 60:02d}",
-                "dhuha": f"06:{(15 + minute_offset) % 60:02d}",
-                "dzuhur": f"12:{(0 + minute_offset) % 60:02d}",
-                "ashar": f"15:{(16 + minute_offset) % 60:02d}",
-                "maghrib": f"18:{(5 + minute_offset) % 60:02d}",
-                "isya": f"19:{(15 + minute_offset) % 60:02d}"
-            })
-            
-        return {"data": fallback_data}
+        # Cached copy (possibly stale if upstream is down) instead of made-up times
+        data = await fetch_schedule(city_id, year, month)
+        if data is None:
+            print(f"Error fetching imsakiyah data for {city_id} {year}-{month}: upstream unavailable and nothing cached")
+            return None
+        return {"data": data}
      
     async def get_today_schedule(self, city_id):
         """Get today's schedule for a specific city"""
@@ -752,85 +813,90 @@ class Imsakiyah:
      
     def _get_cities_by_region(self, all_cities):
         """Organize cities by region"""
-        # Define regions
-        regions = {
-            "jawa": {
-                "name": "Jawa",
-                "emoji": "🏙️",
-                "city_count": 0
-            },
-            "sumatera": {
-                "name": "Sumatera",
-                "emoji": "🌋", 
-                "city_count": 0
-            },
-            "kalimantan": {
-                "name": "Kalimantan",
-                "emoji": "🏝️",
-                "city_count": 0
-            },
-            "sulawesi": {
-                "name": "Sulawesi",
-                "emoji": "🌊",
-                "city_count": 0
-            },
-            "bali_ntt": {
-                "name": "Bali & Nusa Tenggara",
-                "emoji": "🏖️",
-                "city_count": 0
-            },
-            "maluku_papua": {
-                "name": "Maluku & Papua",
-                "emoji": "🦜",
-                "city_count": 0
-            }
-        }
-        
-        # Keywords to map cities to regions
-        region_keywords = {
-            "jawa": ["jakarta", "jawa", "bandung", "semarang", "yogyakarta", "yogya", "solo", "surabaya", "malang", "banten", "bogor", "bekasi", "tangerang", "depok", "cirebon", "sukabumi", "tasikmalaya", "cilegon", "serang", "cimahi", "tegal", "pekalongan", "salatiga", "magelang", "purwokerto", "kediri", "madiun", "mojokerto", "pasuruan", "batu", "blitar", "probolinggo"],
-            
-            "sumatera": ["sumatera", "sumatra", "aceh", "medan", "padang", "palembang", "pekanbaru", "jambi", "bengkulu", "bandar lampung", "lampung", "pangkal pinang", "tanjungpinang", "batam", "bintan", "tanjung balai", "dumai", "bukit tinggi", "payakumbuh", "pariaman", "solok", "padang panjang", "sawahlunto", "lubuk linggau", "prabumulih", "tebing tinggi", "pematang siantar", "binjai", "sibolga", "padang sidempuan", "gunungsitoli", "banda aceh", "langsa", "lhokseumawe", "subulussalam"],
-            
-            "kalimantan": ["kalimantan", "borneo", "pontianak", "palangkaraya", "banjarmasin", "samarinda", "tanjungpinang", "tanjung selor", "tarakan", "bontang", "balikpapan", "singkawang", "sampit", "palangka raya"],
-            
-            "sulawesi": ["sulawesi", "celebes", "makassar", "manado", "palu", "kendari", "gorontalo", "mamuju", "ambon", "ternate", "tidore", "bitung", "tomohon", "kotamobagu", "bau-bau"],
-            
-            "bali_ntt": ["bali", "denpasar", "mataram", "kupang", "nusa", "singaraja"],
+        return CityIndex(all_cities).regions()
+
+async def create_schedule_embed(imsakiyah, city_id, city_name):
+    """
+    Membuat embed jadwal hari ini untuk satu kota
+    
+    Args:
+        imsakiyah: Instance Imsakiyah
+        city_id: ID kota
+        city_name: Nama kota untuk judul embed
+    
+    Returns:
+        Embed jadwal, atau embed peringatan jika jadwal tidak tersedia
+    """
+    # Get today's schedule
+    schedule = await imsakiyah.get_today_schedule(city_id)
+    
+    # If no schedule found, show error
+    if not schedule:
+        embed = discord.Embed(
+            title="❌ Jadwal Tidak Tersedia",
+            description=f"Jadwal imsakiyah untuk kota {city_name} tidak tersedia untuk hari ini.",
+            color=EMBED_COLORS["warning"]
+        )
+        return embed
+    
+    # Format date
+    try:
+        date_str = schedule.get('date', datetime.now().strftime('%Y-%m-%d'))
+        if not isinstance(date_str, str):
+            date_str = datetime.now().strftime('%Y-%m-%d')
             
-            "maluku_papua": ["maluku", "papua", "jayapura", "manokwari", "sorong", "ternate", "ambon", "fakfak", "merauke", "timika"]
-        }
+        date_obj = datetime.strptime(date_str, '%Y-%m-%d')
+        formatted_date = date_obj.strftime('%d %B %Y')
         
-        # Helper function to determine region of a city
-        def determine_region(city_name):
-            city_lower = city_name.lower()
-            for region, keywords in region_keywords.items():
-                for keyword in keywords:
-                    if keyword in city_lower:
-                        return region
-            return "jawa"  # Default to Jawa if no match
-        
-        # Organize cities by region
-        cities_by_region = {region: [] for region in regions}
-        
-        for city in all_cities:
-            if isinstance(city, dict) and 'name' in city and 'id' in city:
-                city_name = city['name']
-                region = determine_region(city_name)
-                cities_by_region[region].append(city)
-                regions[region]["city_count"] += 1
-            elif isinstance(city, str):
-                # Handle string entries (from fallback)
-                region = determine_region(city)
-                idx = all_cities.index(city)
-                cities_by_region[region].append({"id": str(idx), "name": city})
-                regions[region]["city_count"] += 1
-        
-        # Sort cities alphabetically within each region
-        for region in cities_by_region:
-            cities_by_region[region] = sorted(cities_by_region[region], key=lambda x: x.get('name', ''))
-        
-        return regions, cities_by_region 
+        # Get day name in Indonesian
+        day_names_id = {
+            0: "Senin",
+            1: "Selasa",
+            2: "Rabu",
+            3: "Kamis",
+            4: "Jumat",
+            5: "Sabtu",
+            6: "Minggu"
+        }
+        day_name = day_names_id.get(date_obj.weekday(), "")
+    except Exception as e:
+        print(f"[ERROR] Error formatting date: {e}")
+        formatted_date = "Hari ini"
+        day_name = ""
+    
+    # Create embed for schedule
+    embed = discord.Embed(
+        title=f"📆 Jadwal Imsakiyah {city_name}",
+        description=f"Jadwal untuk {day_name}, {formatted_date}",
+        color=EMBED_COLORS["primary"]
+    )
+    
+    # Prayer time fields to display
+    prayer_times = {
+        "imsak": "🌙 Imsak",
+        "subuh": "🌅 Subuh",
+        "terbit": "🌞 Terbit",
+        "dhuha": "🌤️ Dhuha",
+        "dzuhur": "☀️ Dzuhur",
+        "ashar": "🌇 Ashar",
+        "maghrib": "🌆 Maghrib",
+        "isya": "🌃 Isya"
+    }
+    
+    # Add prayer times to embed
+    for code, label in prayer_times.items():
+        time_value = schedule.get(code, "🕒 --:--")
+        if time_value and isinstance(time_value, str) and ":" in time_value:
+            # Format the time if it's a valid string with colon
+            embed.add_field(name=label, value=f"🕒 {time_value}", inline=True)
+        else:
+            # Use default value if missing or invalid
+            embed.add_field(name=label, value="🕒 --:--", inline=True)
+    
+    # Add footer with data source
+    embed.set_footer(text="Data dari jadwalsholat.org | 👨‍💻 Rurawr Bot")
+    
+    return embed
 
 async def jadwal_imsakiyah(ctx, city=None):
     """Command to show imsakiyah schedule"""
@@ -844,26 +910,17 @@ async def jadwal_imsakiyah(ctx, city=None):
         try:
             # If no city provided, show interactive menu with regions
             if not city:
-                cities = await imsakiyah.get_cities()
-                if not cities or not isinstance(cities, dict) or 'data' not in cities:
+                index = await get_city_index()
+                if index is None:
                     embed = discord.Embed(
                         title="❌ Gagal Memuat Data",
                         description="Tidak dapat memuat daftar kota. Silakan coba lagi nanti.",
                         color=EMBED_COLORS["error"]
                     )
                     return await ctx.send(embed=embed)
-        
-                # Verify cities['data'] is a list
-                if not isinstance(cities['data'], list):
-                    embed = discord.Embed(
-                        title="❌ Format Data Tidak Valid",
-                        description="Format data kota tidak sesuai. Silakan coba lagi nanti.",
-                        color=EMBED_COLORS["error"]
-                    )
-                    return await ctx.send(embed=embed)
                 
-                # Organize cities by region
-                regions, cities_by_region = await imsakiyah.get_regions_data()
+                # Regions are precomputed with the city index
+                regions, cities_by_region = index.regions()
                 
                 # Create the interactive view
                 view = ImsakiyahMainView(regions, cities_by_region)
@@ -885,9 +942,9 @@ async def jadwal_imsakiyah(ctx, city=None):
                     )
                     return await ctx.send(embed=embed)
                 
-                # Get cities and search
-                cities = await imsakiyah.get_cities()
-                if not cities or not isinstance(cities, dict) or 'data' not in cities:
+                # Get the city index and search
+                index = await get_city_index()
+                if index is None:
                     embed = discord.Embed(
                         title="❌ Gagal Memuat Data",
                         description="Tidak dapat memuat daftar kota. Silakan coba lagi nanti.",
@@ -895,23 +952,8 @@ async def jadwal_imsakiyah(ctx, city=None):
                     )
                     return await ctx.send(embed=embed)
                 
-                # Search for cities matching the term
-                matching_cities = []
-                for city_data in cities['data']:
-                    try:
-                        if isinstance(city_data, dict) and 'name' in city_data:
-                            if search_term in city_data['name'].lower():
-                                matching_cities.append(city_data)
-                        elif isinstance(city_data, str) and search_term in city_data.lower():
-                            # Convert string to dict format for consistency
-                            idx = cities['data'].index(city_data)
-                            matching_cities.append({"id": str(idx), "name": city_data})
-                    except Exception as e:
-                        print(f"[ERROR] Error during city search: {e}")
-                        continue
-                
-                # Sort results alphabetically
-                matching_cities = sorted(matching_cities, key=lambda x: x['name'])
+                # Ranked matches; typo-tolerant results only when nothing matches literally
+                matching_cities = index.search(search_term, fuzzy=False) or index.search(search_term)
                 
                 if not matching_cities:
                     embed = discord.Embed(
@@ -927,9 +969,9 @@ async def jadwal_imsakiyah(ctx, city=None):
                 # Send the search results
                 return await ctx.send(embed=view.create_search_embed(), view=view)
             
-            # Find the city ID based on name
-            cities = await imsakiyah.get_cities()
-            if not cities or not isinstance(cities, dict) or 'data' not in cities:
+            # Find the city based on name, alias or a close spelling
+            index = await get_city_index()
+            if index is None:
                 embed = discord.Embed(
                     title="❌ Gagal Memuat Data",
                     description="Tidak dapat memuat daftar kota. Silakan coba lagi nanti.",
@@ -937,28 +979,10 @@ async def jadwal_imsakiyah(ctx, city=None):
                 )
                 return await ctx.send(embed=embed)
             
-            city_id = None
-            city_name = "Kota"
-            
-            # Try to find exact match first
-            for city_data in cities['data']:
-                if isinstance(city_data, dict) and 'name' in city_data and 'id' in city_data:
-                    if city_data['name'].lower() == city.lower():
-                        city_id = city_data['id']
-                        city_name = city_data['name']
-                        break
-                        
-            # If no exact match, try partial match
-            if not city_id:
-                for city_data in cities['data']:
-                    if isinstance(city_data, dict) and 'name' in city_data and 'id' in city_data:
-                        if city.lower() in city_data['name'].lower():
-                            city_id = city_data['id']
-                            city_name = city_data['name']
-                            break
+            city_data = index.resolve(city)
             
             # If no city found, show error
-            if not city_id:
+            if city_data is None:
                 embed = discord.Embed(
                     title="❌ Kota Tidak Ditemukan",
                     description=(
@@ -969,74 +993,7 @@ async def jadwal_imsakiyah(ctx, city=None):
                 )
                 return await ctx.send(embed=embed)
             
-            # Get today's schedule
-            schedule = await imsakiyah.get_today_schedule(city_id)
-            
-            # If no schedule found, show error
-            if not schedule:
-                embed = discord.Embed(
-                    title="❌ Jadwal Tidak Tersedia",
-                    description=f"Jadwal imsakiyah untuk kota {city_name} tidak tersedia untuk hari ini.",
-                    color=EMBED_COLORS["warning"]
-                )
-                return await ctx.send(embed=embed)
-    
-            # Format date
-            try:
-                date_str = schedule.get('date', datetime.now().strftime('%Y-%m-%d'))
-                if not isinstance(date_str, str):
-                    date_str = datetime.now().strftime('%Y-%m-%d')
-                    
-                date_obj = datetime.strptime(date_str, '%Y-%m-%d')
-                formatted_date = date_obj.strftime('%d %B %Y')
-                
-                # Get day name in Indonesian
-                day_names_id = {
-                    0: "Senin",
-                    1: "Selasa",
-                    2: "Rabu",
-                    3: "Kamis",
-                    4: "Jumat",
-                    5: "Sabtu",
-                    6: "Minggu"
-                }
-                day_name = day_names_id.get(date_obj.weekday(), "")
-            except Exception as e:
-                print(f"[ERROR] Error formatting date: {e}")
-                formatted_date = "Hari ini"
-                day_name = ""
-            
-            # Create embed for schedule
-            embed = discord.Embed(
-                title=f"📆 Jadwal Imsakiyah {city_name}",
-                description=f"Jadwal untuk {day_name}, {formatted_date}",
-                color=EMBED_COLORS["primary"]
-            )
-            
-            # Prayer time fields to display
-            prayer_times = {
-                "imsak": "🌙 Imsak",
-                "subuh": "🌅 Subuh",
-                "terbit": "🌞 Terbit",
-                "dhuha": "🌤️ Dhuha",
-                "dzuhur": "☀️ Dzuhur",
-                "ashar": "🌇 Ashar",
-                "maghrib": "🌆 Maghrib",
-                "isya": "🌃 Isya"
-            }
-            
-            # Add prayer times to embed
-            for code, label in prayer_times.items():
-                time_value = schedule.get(code, "🕒 --:--")
-                if time_value and isinstance(time_value, str) and ":" in time_value:
-                    # Format the time if it's a valid string with colon
-                    embed.add_field(name=label, value=f"🕒 {time_value}", inline=True)
-                else:
-                    # Use default value if missing or invalid
-                    embed.add_field(name=label, value="🕒 --:--", inline=True)
-            
-            # Add footer with data source
-            embed.set_footer(text="Data dari jadwalsholat.org | 👨‍💻 Rurawr Bot")
+            embed = await create_schedule_embed(imsakiyah, city_data['id'], city_data['name'])
             
             # Send the embed
             return await ctx.send(embed=embed)
@@ -1054,6 +1011,44 @@ async def jadwal_imsakiyah(ctx, city=None):
             )
             return await ctx.send(embed=embed)
 
+@app_commands.command(name="imsakiyah", description="Tampilkan jadwal imsakiyah hari ini untuk kota di Indonesia")
+@app_commands.describe(kota="Nama kota, misalnya Jakarta atau Jogja")
+async def imsakiyah_slash(interaction: discord.Interaction, kota: str):
+    """Slash command version of the imsakiyah schedule"""
+    await interaction.response.defer()
+    try:
+        index = await get_city_index()
+        city_data = index.resolve(kota) if index is not None else None
+        if city_data is None:
+            embed = discord.Embed(
+                title="❌ Kota Tidak Ditemukan",
+                description=f"Kota '{kota}' tidak ditemukan dalam database. Pilih kota dari saran yang muncul.",
+                color=EMBED_COLORS["error"]
+            )
+        else:
+            embed = await create_schedule_embed(Imsakiyah(interaction.client), city_data['id'], city_data['name'])
+        await interaction.followup.send(embed=embed)
+    except Exception as e:
+        print(f"[ERROR] Error in imsakiyah slash command: {e}")
+        traceback.print_exc()
+        embed = discord.Embed(
+            title="❌ Terjadi Kesalahan",
+            description="Terjadi kesalahan saat memproses perintah. Silakan coba lagi nanti.",
+            color=EMBED_COLORS["error"]
+        )
+        await interaction.followup.send(embed=embed)
+
+@imsakiyah_slash.autocomplete("kota")
+async def imsakiyah_city_autocomplete(interaction: discord.Interaction, current: str):
+    """Suggest up to 25 cities from the city index while the user types"""
+    index = await get_city_index()
+    if index is None:
+        return []
+    return [
+        app_commands.Choice(name=str(city['name'])[:100], value=str(city['name'])[:100])
+        for city in index.complete(current, limit=25)
+    ]
+
 async def setup(bot):
     """Setup function to register the command"""
     print("[DEBUG] Setting up imsakiyah extension...")
@@ -1070,4 +1065,16 @@ async def setup(bot):
         """Display Ramadan schedule for a city in Indonesia"""
         await jadwal_imsakiyah(ctx, city)
     
-    print("[DEBUG] Successfully registered imsakiyah command") 
\ No newline at end of file
+    # Slash command with city autocomplete, synced by the bot's tree sync
+    bot.tree.add_command(imsakiyah_slash, override=True)
+    
+    # Warm the schedule cache for popular cities before each WIB midnight
+    prefetcher.start()
+    
+    print("[DEBUG] Successfully registered imsakiyah command") 
+
+async def teardown(bot):
+    """Menghentikan prefetch, melepas slash command dan menutup session HTTP saat extension dilepas"""
+    prefetcher.stop()
+    bot.tree.remove_command(imsakiyah_slash.name)
+    await cache.client.close()
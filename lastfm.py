@@ -16,6 +16,9 @@ from matplotlib.colors import ListedColormap
 import numpy as np
 import pycountry
 
+from metrics import metrics
+from rate_limit import upstream_budget, UpstreamBudgetExceeded
+
 # Load environment variables
 load_dotenv()
 
@@ -47,10 +50,12 @@ async def lastfm_request(method, **params):
     }
     
     try:
-        response = requests.get(LASTFM_API_URL, params=query_params)
-        response.raise_for_status()  # Raise exception for 4XX/5XX responses
-        return response.json()
-    except requests.exceptions.RequestException as e:
+        await upstream_budget.acquire("lastfm")
+        with metrics.track_upstream("lastfm"):
+            response = requests.get(LASTFM_API_URL, params=query_params)
+            response.raise_for_status()  # Raise exception for 4XX/5XX responses
+            return response.json()
+    except (requests.exceptions.RequestException, UpstreamBudgetExceeded) as e:
         print(f"[ERROR] Last.fm API Request Error: {e}")
         return None
 
@@ -0,0 +1,241 @@
+"""
+log_pipeline.py - Pipeline logging berbasis antrean
+
+Module ini memindahkan semua pekerjaan logging dari event loop ke satu
+thread listener. Logger di thread pemanggil hanya merangkai pesan
+(msg % args dan traceback) lalu memasukkan record ke antrean;
+membersihkan karakter non-ASCII (sekali per record), memformat dan
+menulis ke file berotasi dilakukan oleh listener. Record debug yang berisik bisa di-sample per logger sebelum
+masuk antrean.
+"""
+
+import os
+import re
+import sys
+import time
+import queue
+import atexit
+import logging
+import logging.handlers
+from typing import Dict, Optional, Any
+
+LOG_FORMAT = '%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+# Logger pihak ketiga yang sangat berisik di level DEBUG: simpan 1 dari N record
+DEFAULT_SAMPLE_RATES = {"discord": 50, "discord.gateway": 200, "asyncio": 10}
+
+_NON_ASCII = re.compile(r'[^\x00-\x7F]+')
+_EXC_FORMATTER = logging.Formatter()
+
+class SamplingFilter(logging.Filter):
+    """
+    Meneruskan hanya 1 dari setiap N record per logger untuk level rendah
+    
+    Rate dicari dari nama logger terdekat di hierarki (misalnya
+    "discord.gateway" lalu "discord"), dan hasilnya di-cache per nama.
+    """
+    def __init__(self, rates: Dict[str, int], level: int = logging.DEBUG):
+        """
+        Membuat filter sampling
+        
+        Args:
+            rates: Dictionary nama logger -> N (1 = tidak di-sample)
+            level: Record dengan level di atas ini selalu diteruskan
+        """
+        super().__init__()
+        self.rates = dict(rates)
+        self.level = level
+        self._resolved: Dict[str, int] = {}
+        self._counters: Dict[str, int] = {}
+        self.dropped = 0
+    
+    def _rate(self, name: str) -> int:
+        """Mencari rate untuk logger dari nama paling spesifik"""
+        rate = self._resolved.get(name)
+        if rate is None:
+            probe = name
+            while True:
+                if probe in self.rates:
+                    rate = self.rates[probe]
+                    break
+                if "." not in probe:
+                    rate = 1
+                    break
+                probe = probe.rsplit(".", 1)[0]
+            self._resolved[name] = rate
+        return rate
+    
+    def filter(self, record: logging.LogRecord) -> bool:
+        if record.levelno > self.level:
+            return True
+        rate = self._rate(record.name)
+        if rate <= 1:
+            return True
+        count = self._counters.get(record.name, 0)
+        self._counters[record.name] = count + 1
+        if count % rate == 0:
+            return True
+        self.dropped += 1
+        return False
+
+class LoopQueueHandler(logging.handlers.QueueHandler):
+    """
+    QueueHandler yang hanya merangkai pesan di thread pemanggil
+    
+    Argumen log bisa berupa objek yang masih diubah setelah logger
+    dipanggil, dan exc_info menahan frame traceback, jadi keduanya diubah
+    menjadi string sebelum record masuk antrean. Format lengkap (waktu,
+    level, nama logger) tetap dikerjakan listener. Antrean sudah aman
+    lintas thread, jadi lock handler juga dilewati. Waktu yang dihabiskan
+    di handler dicatat untuk logging_stats().
+    """
+    def __init__(self, log_queue):
+        super().__init__(log_queue)
+        self.records = 0
+        self.total = 0.0
+        self.max = 0.0
+    
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        # Handler root adalah yang terakhir melihat record, jadi record
+        # boleh diubah langsung tanpa disalin seperti QueueHandler bawaan
+        record.msg = record.getMessage()
+        record.args = None
+        if record.exc_info:
+            if not record.exc_text:
+                record.exc_text = _EXC_FORMATTER.formatException(record.exc_info)
+            record.exc_info = None
+        return record
+    
+    def handle(self, record: logging.LogRecord) -> bool:
+        start = time.perf_counter()
+        accepted = self.filter(record)
+        if accepted:
+            if isinstance(accepted, logging.LogRecord):
+                record = accepted
+            try:
+                self.queue.put_nowait(self.prepare(record))
+            except Exception:
+                self.handleError(record)
+        elapsed = time.perf_counter() - start
+        self.records += 1
+        self.total += elapsed
+        if elapsed > self.max:
+            self.max = elapsed
+        return bool(accepted)
+
+class SanitizingQueueListener(logging.handlers.QueueListener):
+    """Listener yang membersihkan pesan sekali sebelum diteruskan ke handler"""
+    
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        # Pesan sudah dirangkai LoopQueueHandler.prepare
+        if not record.msg.isascii():
+            record.msg = _NON_ASCII.sub('[non-ASCII]', record.msg)
+        return record
+
+class LoggingPipeline:
+    """Handle untuk pipeline logging yang sedang berjalan"""
+    
+    def __init__(self, handler: LoopQueueHandler, listener: SanitizingQueueListener, sampler: SamplingFilter):
+        self.handler = handler
+        self.listener = listener
+        self.sampler = sampler
+        self._stopped = False
+    
+    def stats(self) -> Dict[str, Any]:
+        """
+        Mendapatkan waktu yang dihabiskan logging di thread pemanggil
+        
+        Returns:
+            Dictionary records, dropped, queued, mean_us dan max_us
+        """
+        records = self.handler.records
+        return {
+            "records": records,
+            "dropped": self.sampler.dropped,
+            "queued": self.handler.queue.qsize(),
+            "mean_us": self.handler.total / records * 1e6 if records else 0.0,
+            "max_us": self.handler.max * 1e6
+        }
+    
+    def stop(self) -> None:
+        """Menulis semua record yang tersisa lalu menghentikan listener"""
+        if self._stopped:
+            return
+        self._stopped = True
+        self.listener.stop()
+        for handler in self.listener.handlers:
+            handler.close()
+
+_pipeline: Optional[LoggingPipeline] = None
+
+def _file_handler(path: str, level: int, max_bytes: int, backup_count: int) -> logging.Handler:
+    """Membuat handler file berotasi, membuat foldernya jika perlu"""
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    handler = logging.handlers.RotatingFileHandler(path, maxBytes=max_bytes, backupCount=backup_count, encoding="utf-8")
+    handler.setLevel(level)
+    return handler
+
+def setup_logging(log_file: Optional[str] = None, error_file: Optional[str] = None,
+                  level: Any = logging.INFO, max_bytes: int = 5 * 1024 * 1024, backup_count: int = 5,
+                  sample_rates: Optional[Dict[str, int]] = None, console: bool = True) -> LoggingPipeline:
+    """
+    Memasang pipeline logging pada root logger
+    
+    Handler root yang sudah ada (misalnya dari basicConfig) diganti
+    dengan satu LoopQueueHandler. Pemanggilan berikutnya mengembalikan
+    pipeline yang sudah berjalan.
+    
+    Args:
+        log_file: File log berotasi untuk semua record (None = tanpa file)
+        error_file: File log berotasi khusus ERROR ke atas (None = tanpa file)
+        level: Level root logger (int atau nama seperti "INFO")
+        max_bytes: Ukuran file sebelum dirotasi
+        backup_count: Jumlah file rotasi yang disimpan
+        sample_rates: Dictionary nama logger -> N untuk sampling record DEBUG
+        console: Tulis juga ke stderr
+    
+    Returns:
+        LoggingPipeline yang berjalan
+    """
+    global _pipeline
+    if _pipeline is not None:
+        return _pipeline
+    
+    formatter = logging.Formatter(LOG_FORMAT)
+    handlers = []
+    if console:
+        handlers.append(logging.StreamHandler(sys.stderr))
+    if log_file:
+        handlers.append(_file_handler(log_file, logging.NOTSET, max_bytes, backup_count))
+    if error_file:
+        handlers.append(_file_handler(error_file, logging.ERROR, max_bytes, backup_count))
+    for handler in handlers:
+        handler.setFormatter(formatter)
+    
+    log_queue = queue.SimpleQueue()
+    sampler = SamplingFilter(DEFAULT_SAMPLE_RATES if sample_rates is None else sample_rates)
+    queue_handler = LoopQueueHandler(log_queue)
+    queue_handler.addFilter(sampler)
+    
+    root = logging.getLogger()
+    for handler in list(root.handlers):
+        root.removeHandler(handler)
+    root.addHandler(queue_handler)
+    root.setLevel(level)
+    
+    listener = SanitizingQueueListener(log_queue, *handlers, respect_handler_level=True)
+    listener.start()
+    
+    _pipeline = LoggingPipeline(queue_handler, listener, sampler)
+    atexit.register(_pipeline.stop)
+    return _pipeline
+
+def logging_stats() -> Dict[str, Any]:
+    """
+    Mendapatkan statistik pipeline logging
+    
+    Returns:
+        Dictionary dari LoggingPipeline.stats(), kosong jika belum dipasang
+    """
+    return _pipeline.stats() if _pipeline is not None else {}
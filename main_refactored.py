@@ -22,6 +22,11 @@ import re
 from memory_db import db
 from utils import get_prefix, log_command, create_embed
 from constants import EMBED_COLORS, BOT_INFO, COMMAND_DESCRIPTIONS
+from log_pipeline import setup_logging
+from bot_counters import counters
+
+# Logging lewat antrean; pesan dirangkai dan dibersihkan di thread listener
+setup_logging()
 
 # Load environment variables
 load_dotenv()
@@ -50,6 +55,9 @@ def get_prefix_wrapper(bot, message):
 intents = discord.Intents.all()
 bot = commands.Bot(command_prefix=get_prefix_wrapper, intents=intents, help_command=None)
 
+# Jumlah server dan pengguna diperbarui per event, bukan dihitung ulang per command
+counters.install(bot)
+
 # Simpan waktu mulai bot untuk perhitungan uptime
 bot.start_time = datetime.now()
 bot.version = BOT_INFO.get('version', '1.0.0')
@@ -227,8 +235,8 @@ async def info_command(ctx):
     embed.add_field(
         name="📊 Statistik",
         value=(
-            f"🏘️ Server: `{len(bot.guilds)}`\n"
-            f"👥 Pengguna: `{len(set(bot.get_all_members()))}`\n"
+            f"🏘️ Server: `{counters.guilds}`\n"
+            f"👥 Pengguna: `{counters.users}`\n"
             f"⌛ Uptime: `{get_uptime_str()}`\n"
             f"🌐 Ping: `{bot.latency*1000:.2f}ms`"
         ),
@@ -309,8 +317,8 @@ async def stats_command(ctx):
         value=(
             f"Total perintah digunakan: `{total_commands}`\n"
             f"Jumlah jenis perintah: `{len(command_stats)}`\n"
-            f"Server aktif: `{len(bot.guilds)}`\n"
-            f"Pengguna terjangkau: `{len(set(bot.get_all_members()))}`"
+            f"Server aktif: `{counters.guilds}`\n"
+            f"Pengguna terjangkau: `{counters.users}`"
         ),
         inline=False
     )
@@ -21,6 +21,16 @@ import time
 from memory_db import MemoryDB
 from utils import get_lang, get_prefix, get_text, log_command, get_command_stats, get_timestamp, format_time_id, create_embed
 from constants import WAIFU_API_URL, WAIFU_CATEGORIES, EMBED_COLORS, BOT_INFO, COMMAND_DESCRIPTIONS
+from constants import COMMAND_LOG_CAPACITY, COMMAND_LOG_RETENTION
+from constants import COOLDOWN, COOLDOWNS, RATE_LIMIT_BURST, RATE_LIMIT_GUILD_MULTIPLIER, RATE_LIMIT_MAX_BUCKETS
+from constants import UPSTREAM_BUDGETS, UPSTREAM_MAX_WAIT
+from command_log import CommandLog, CommandStats, exact_command_stats
+from log_pipeline import setup_logging
+from command_middleware import CommandMiddleware
+from metrics import metrics, format_table
+from rate_limit import CommandRateLimiter, RateLimited, upstream_budget
+from bot_counters import counters
+from imsakiyah import fetch_cities, fetch_schedule
 
 # Load environment variables
 load_dotenv()
@@ -33,20 +43,9 @@ if not TOKEN:
 # Inisialisasi MemoryDB
 db = MemoryDB()
 
-# Configure logging to prevent Korean characters from being displayed in terminal
-logging.basicConfig(level=logging.INFO, 
-                   format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
-
-# Filter to prevent non-ASCII characters in logs
-class ASCIIFilter(logging.Filter):
-    def filter(self, record):
-        if isinstance(record.msg, str):
-            record.msg = re.sub(r'[^\x00-\x7F]+', '[non-ASCII]', record.msg)
-        return True
-
-# Apply filter to root logger
-root_logger = logging.getLogger()
-root_logger.addFilter(ASCIIFilter())
+# Logging berjalan lewat antrean; pesan dibersihkan dari non-ASCII oleh thread listener
+setup_logging(log_file="bot_log.txt", error_file="error_log.txt")
+logger = logging.getLogger("bot")
 
 # Add signal handlers for graceful shutdown
 def handle_exit(signum, frame):
@@ -71,7 +70,7 @@ async def on_ready():
     """Event yang dipanggil saat bot siap digunakan"""
     print(f"\n{'='*50}")
     print(f"Bot is ready! Logged in as {bot.user.name} (ID: {bot.user.id})")
-    print(f"Connected to {len(bot.guilds)} guilds | Serving {len(set(bot.get_all_members()))} users")
+    print(f"Connected to {counters.guilds} guilds | Serving {counters.users} users")
     print(f"Python version: {platform.python_version()}")
     print(f"Discord.py version: {discord.__version__}")
     print(f"Running on: {platform.system()} {platform.release()} ({os.name})")
@@ -85,10 +84,8 @@ async def on_ready():
         )
     )
     
-    # Log startup in a file
-    with open("bot_log.txt", "a", encoding="utf-8") as f:
-        startup_msg = f"[{datetime.now()}] Bot started: {bot.user.name} (ID: {bot.user.id})"
-        f.write(f"{startup_msg}\n")
+    # Log startup (written to bot_log.txt by the logging listener)
+    logger.info("Bot started: %s (ID: %s)", bot.user.name, bot.user.id)
     
     print("Bot is fully operational!")
 
@@ -164,9 +161,6 @@ async def ping_command(ctx):
     embed.set_footer(text=f"Requested by {ctx.author.name}", icon_url=ctx.author.avatar.url if ctx.author.avatar else None)
     
     await message.edit(content=None, embed=embed)
-    
-    # Log command usage
-    log_command(ctx.author.id, ctx.guild.id if ctx.guild else None, "ping")
 
 @bot.command(name="help", aliases=["bantuan", "h", "menu"])
 async def help_command(ctx, command_name=None):
@@ -248,9 +242,6 @@ async def help_command(ctx, command_name=None):
         )
         
         await ctx.send(embed=embed)
-    
-    # Log command usage
-    log_command(ctx.author.id, ctx.guild.id if ctx.guild else None, "help")
 
 @bot.command(name="info", aliases=["about", "tentang"])
 async def info_command(ctx):
@@ -265,8 +256,8 @@ async def info_command(ctx):
     embed.add_field(
         name="📊 Statistik",
         value=(
-            f"🏘️ Server: `{len(bot.guilds)}`\n"
-            f"👥 Pengguna: `{len(set(bot.get_all_members()))}`\n"
+            f"🏘️ Server: `{counters.guilds}`\n"
+            f"👥 Pengguna: `{counters.users}`\n"
             f"⌛ Uptime: `{get_timestamp()}`\n"
             f"🌐 Ping: `{bot.latency*1000:.2f}ms`"
         ),
@@ -302,9 +293,6 @@ async def info_command(ctx):
     )
     
     await ctx.send(embed=embed)
-    
-    # Log command usage
-    log_command(ctx.author.id, ctx.guild.id if ctx.guild else None, "info")
 
 @bot.command(name="stats")
 @commands.has_permissions(administrator=True)
@@ -345,8 +333,8 @@ async def stats_command(ctx):
         value=(
             f"Total perintah digunakan: `{total_commands}`\n"
             f"Jumlah jenis perintah: `{len(command_stats)}`\n"
-            f"Server aktif: `{len(bot.guilds)}`\n"
-            f"Pengguna terjangkau: `{len(set(bot.get_all_members()))}`"
+            f"Server aktif: `{counters.guilds}`\n"
+            f"Pengguna terjangkau: `{counters.users}`"
         ),
         inline=False
     )
@@ -358,9 +346,6 @@ async def stats_command(ctx):
     )
     
     await ctx.send(embed=embed)
-    
-    # Log command usage
-    log_command(ctx.author.id, ctx.guild.id if ctx.guild else None, "stats")
 
 @bot.command(name="prefix")
 @commands.has_permissions(manage_guild=True)
@@ -393,6 +378,7 @@ from dotenv import load_dotenv
 try:
     from constants import WAIFU_API_URL, WAIFU_CATEGORIES, EMBED_COLORS, BOT_INFO, COMMAND_DESCRIPTIONS
     from language import LANGUAGES
+    from embed_cache import embed_cache
 except ImportError as e:
     print(f"Error importing modules: {e}")
     print("Make sure all required files are present in the directory")
@@ -405,27 +391,16 @@ import re  # For anime search regex
 import atexit
 import importlib.util
 
-# Configure logging to prevent Korean characters from being displayed in terminal
-import logging
-logging.basicConfig(level=logging.INFO, 
-                   format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
-
-# Filter to prevent non-ASCII characters in logs
-class ASCIIFilter(logging.Filter):
-    def filter(self, record):
-        if isinstance(record.msg, str):
-            record.msg = re.sub(r'[^\x00-\x7F]+', '[non-ASCII]', record.msg)
-        return True
-
-# Apply filter to root logger
-root_logger = logging.getLogger()
-root_logger.addFilter(ASCIIFilter())
+# Logging berjalan lewat antrean; pesan dibersihkan dari non-ASCII oleh thread listener
+setup_logging(log_file="bot_log.txt", error_file="error_log.txt")
+logger = logging.getLogger("bot")
 
 # In-memory storage sebagai pengganti database
 GUILD_SETTINGS = {
     # guild_id: {'language': 'id', 'prefix': '!'}
 }
-COMMAND_LOGS = []
+COMMAND_LOGS = CommandLog(COMMAND_LOG_CAPACITY, COMMAND_LOG_RETENTION)
+COMMAND_STATS = CommandStats()
 USER_DATA = {}
 
 # Load environment variables
@@ -482,14 +457,13 @@ def set_guild_prefix(guild_id, prefix):
     return True
 
 def log_command(user_id, guild_id, command_name):
-    """Log command usage"""
-    log_entry = {
-        'user_id': user_id,
-        'guild_id': guild_id,
-        'command': command_name,
-        'timestamp': datetime.now()
-    }
-    COMMAND_LOGS.append(log_entry)
+    """Log command usage, False if the user/guild ID is not a valid Discord ID"""
+    try:
+        COMMAND_LOGS.append(user_id, guild_id, command_name)
+    except ValueError as e:
+        logger.warning(f"Command {command_name!r} not logged: {e}")
+        return False
+    COMMAND_STATS.record(user_id, guild_id, command_name)
     
     # Update user data
     if user_id not in USER_DATA:
@@ -506,13 +480,9 @@ def log_command(user_id, guild_id, command_name):
     return True
 
 def get_command_stats():
-    """Get command usage statistics"""
-    stats = {}
-    for log in COMMAND_LOGS:
-        command = log['command']
-        if command not in stats:
-            stats[command] = 0
-        stats[command] += 1
+    """Get command usage statistics (per command plus 'total'), maintained at log time"""
+    stats = dict(COMMAND_STATS.per_command)
+    stats["total"] = COMMAND_STATS.total
     return stats
 
 # Function to get guild language
@@ -571,6 +541,31 @@ def get_text(guild_id: Optional[int], key: str, **kwargs) -> str:
 intents = discord.Intents.all()
 bot = commands.Bot(command_prefix=get_prefix, intents=intents, help_command=None)
 
+def log_command_batch(entries):
+    """Persist a batch of command logs collected by the command middleware, skipping entries that fail"""
+    for _, user_id, guild_id, command_name in entries:
+        try:
+            log_command(user_id, guild_id, command_name)
+        except Exception as e:
+            logger.error(f"Failed to log command {command_name!r}: {e}")
+
+# Dedupe, timing and batched logging for every command (replaces per-handler log_command calls)
+command_middleware = CommandMiddleware(log_command_batch).install(bot)
+
+# Token buckets per user/guild per COOLDOWNS category, plus a global budget per upstream API
+rate_limiter = CommandRateLimiter(
+    COOLDOWNS,
+    default_cooldown=COOLDOWN,
+    burst=RATE_LIMIT_BURST,
+    guild_multiplier=RATE_LIMIT_GUILD_MULTIPLIER,
+    max_buckets=RATE_LIMIT_MAX_BUCKETS
+).install(bot)
+upstream_budget.configure(UPSTREAM_BUDGETS, max_wait=UPSTREAM_MAX_WAIT)
+
+# Guild/member/channel totals maintained from gateway events; read in O(1) by on_ready, stats and the dashboard
+counters.install(bot)
+metrics.register_gauges("bot", counters.snapshot)
+
 # Update bot specs
 BOT_SPECS = {
     "python_version": platform.python_version(),
@@ -712,6 +707,17 @@ class CategorySelect(discord.ui.Select):
         selected_category = self.values[0]
         guild_id = interaction.guild_id
         
+        # The embed only depends on the category, the guild language and the command registry
+        embed = embed_cache.get(
+            ("help_category", selected_category, get_lang(guild_id), len(interaction.client.all_commands)),
+            lambda: self.render_category(interaction.client, guild_id, selected_category)
+        )
+        
+        # Update the message with the category information
+        await interaction.response.edit_message(embed=embed)
+    
+    def render_category(self, client, guild_id, selected_category):
+        """Build the embed for one command category"""
         # Define commands in each category
         categories = {
             "general": ["help", "info", "ping"],
@@ -736,7 +742,7 @@ class CategorySelect(discord.ui.Select):
         command_text = ""
         for cmd_name in commands_in_category:
             # Try to get command description
-            cmd = interaction.client.get_command(cmd_name)
+            cmd = client.get_command(cmd_name)
             description = cmd.help if cmd and cmd.help else get_text(guild_id, f"command_descriptions.{cmd_name}")
             
             # Prefix with emoji based on category
@@ -809,8 +815,7 @@ class CategorySelect(discord.ui.Select):
             inline=False
         )
         
-        # Update the message with the category information
-        await interaction.response.edit_message(embed=embed)
+        return embed
 
 class HelpView(discord.ui.View):
     def __init__(self, guild_id, bot):
@@ -879,6 +884,9 @@ async def load_cogs():
     
     print(f"📚 Loaded {loaded_count}/{len(extensions)} extensions.")
     
+    # The command registry changed, drop rendered help embeds
+    embed_cache.invalidate()
+    
     # Attempt to load MAL module specifically if it wasn't loaded above
     if "mal" not in bot.extensions:
         try:
@@ -913,8 +921,8 @@ async def on_ready():
     print(f"🤖 {BOT_INFO['name']} v{BOT_INFO['version']} is online!")
     print(f"👤 Logged in as: {bot.user.name}#{bot.user.discriminator}")
     print(f"🆔 Bot ID: {bot.user.id}")
-    print(f"🌐 Connected to {len(bot.guilds)} server(s)")
-    print(f"👥 Serving {sum(guild.member_count for guild in bot.guilds)} users")
+    print(f"🌐 Connected to {counters.guilds} server(s)")
+    print(f"👥 Serving {counters.members} users")
     print(f"🐍 Python version: {platform.python_version()}")
     print(f"📚 discord.py version: {discord.__version__}")
     
@@ -1073,14 +1081,8 @@ async def on_guild_join(guild):
 @bot.event 
 async def on_error(event, *args, **kwargs):
     """Global error handler for bot events"""
-    error = sys.exc_info()
-    error_text = f"Unhandled error in {event}: {error[1]}"
-    print(error_text)
-    try:
-        with open("error_log.txt", "a", encoding="utf-8") as f:
-            f.write(f"[{datetime.now()}] {error_text}\n")
-    except:
-        pass  # If we can't write to file, just continue
+    # Written to the console and error_log.txt by the logging listener
+    logger.exception("Unhandled error in %s", event)
 
 @bot.command(name="language", aliases=["languange"])
 async def language_command(ctx, lang_code: str = None):
@@ -1195,11 +1197,44 @@ async def language_command(ctx, lang_code: str = None):
     
     embed.set_footer(text=f"Server ID: {ctx.guild.id}")
     
-    # Log command usage
-    log_command(ctx.guild.id, ctx.author.id, "language", success=True)
-    
     await ctx.send(embed=embed)
 
+def render_help_menu(guild_id, current_prefix):
+    """Build the main help menu embed (without the per-user description)"""
+    embed = discord.Embed(
+        title=get_text(guild_id, "help.title", bot_name=BOT_INFO['name']),
+        color=EMBED_COLORS["primary"]
+    )
+
+    # Add command categories
+    categories = {
+        "image": "🖼️",
+        "reaction": "💞",
+        "fun": "🎭",
+        "lastfm": "🎵",
+        "utility": "⚙️"
+    }
+
+    for category, emoji in categories.items():
+        category_name = get_text(guild_id, f"help.categories.{category}")
+        category_desc = get_text(guild_id, f"help.category_descriptions.{category}")
+        embed.add_field(
+            name=f"{emoji} {category_name}",
+            value=category_desc,
+            inline=True
+        )
+
+    # Add quick tips
+    embed.add_field(
+        name=f"🌐 {get_text(guild_id, 'tips')}",
+        value=get_text(guild_id, 'help_command_guide', prefix=current_prefix),
+        inline=False
+    )
+    
+    embed.set_thumbnail(url=bot.user.avatar.url if bot.user.avatar else None)
+    embed.set_footer(text=get_text(guild_id, "help.footer", creator=BOT_INFO['creator'], count=len(bot.commands)))
+    return embed
+
 @bot.command(name="help")
 async def help_command(ctx, *, command_name: str = None):
     """Display help command with categories and detailed information"""
@@ -1233,40 +1268,13 @@ async def help_command(ctx, *, command_name: str = None):
         embed.set_footer(text=get_text(guild_id, "help.return_to_menu", prefix=current_prefix))
         return await ctx.send(embed=embed)
 
-    # Main help menu
-    embed = discord.Embed(
-        title=get_text(guild_id, "help.title", bot_name=BOT_INFO['name']),
-        description=get_text(guild_id, "help.description", user=ctx.author.mention),
-        color=EMBED_COLORS["primary"]
+    # Main help menu, cached per language, prefix and command registry
+    embed = embed_cache.get(
+        ("help", get_lang(guild_id), current_prefix, len(bot.all_commands)),
+        lambda: render_help_menu(guild_id, current_prefix)
     )
-
-    # Add command categories
-    categories = {
-        "image": "🖼️",
-        "reaction": "💞",
-        "fun": "🎭",
-        "lastfm": "🎵",
-        "utility": "⚙️"
-    }
-
-    for category, emoji in categories.items():
-        category_name = get_text(guild_id, f"help.categories.{category}")
-        category_desc = get_text(guild_id, f"help.category_descriptions.{category}")
-        embed.add_field(
-            name=f"{emoji} {category_name}",
-            value=category_desc,
-            inline=True
-        )
-
-    # Add quick tips
-    embed.add_field(
-        name=f"🌐 {get_text(guild_id, 'tips')}",
-        value=get_text(guild_id, 'help_command_guide', prefix=current_prefix),
-        inline=False
-    )
-    
-    embed.set_thumbnail(url=bot.user.avatar.url if bot.user.avatar else None)
-    embed.set_footer(text=get_text(guild_id, "help.footer", creator=BOT_INFO['creator'], count=len(bot.commands)))
+    # The description mentions the caller, so it is filled in per invocation
+    embed.description = get_text(guild_id, "help.description", user=ctx.author.mention)
     
     view = HelpView(guild_id, bot)
     await ctx.send(embed=embed, view=view)
@@ -1404,6 +1412,12 @@ async def on_command_error(ctx, error):
     except Exception as e:
         print(f"Error logging command error: {e}")
     
+    if isinstance(error, RateLimited):
+        # Only the first rejection is answered, repeated spam is ignored silently
+        if error.notify:
+            await ctx.send(get_text(guild_id, "errors.rate_limited", seconds=max(1, round(error.retry_after))), delete_after=5)
+        return
+    
     if isinstance(error, commands.CommandNotFound):
         command_used = ctx.message.content.split()[0]
         embed = discord.Embed(
@@ -1972,12 +1986,6 @@ async def update_command(ctx):
             await message.edit(embed=timeout_embed)
         except:
             pass
-        
-    # Log command usage
-    try:
-        log_command(guild_id, ctx.author.id, "update")
-    except Exception as e:
-        print(f"Error logging update command: {e}")
 
 @bot.command(name="ping")
 async def ping(ctx):
@@ -2080,9 +2088,6 @@ async def change_prefix(ctx, new_prefix: str = None):
     
     embed.set_footer(text=f"Diubah oleh: {ctx.author.name}")
     
-    # Log command usage
-    log_command(ctx.guild.id, ctx.author.id, "prefix", success=True)
-    
     await ctx.send(embed=embed)
 
 # Imsakiyah functionality
@@ -2102,13 +2107,12 @@ class Imsakiyah:
         
     async def get_cities(self):
         """Get list of available cities"""
-        try:
-            response = requests.get("https://raw.githubusercontent.com/lakuapik/jadwalsholatorg/master/kota.json")
-            response.raise_for_status()
-            return {"data": response.json()}
-        except Exception as e:
-            print(f"Error fetching cities: {e}")
+        # Served from the shared revalidating disk cache (seeded from cache/cities.json)
+        data = await fetch_cities()
+        if data is None:
+            print("Error fetching cities: upstream unavailable and nothing cached")
             return None
+        return {"data": data}
     
     async def get_imsakiyah_data(self, city_id, year=None, month=None):
         """Get imsakiyah data for a specific city and month"""
@@ -2118,50 +2122,12 @@ class Imsakiyah:
         if not month:
             month = datetime.now().month
             
-        try:
-            # Try to get data from the API
-            response = requests.get(f"https://raw.githubusercontent.com/lakuapik/jadwalsholatorg/master/adzan/{city_id}/{year}/{month}.json")
-            
-            # If API returns error, use fallback data
-            if response.status_code != 200:
-                print(f"Error fetching imsakiyah data, using fallback: {response.status_code}")
-                return self.generate_fallback_data(city_id, month, year)
-                
-            return {"data": response.json()}
-        except Exception as e:
-            print(f"Error fetching imsakiyah data: {e}")
-            return self.generate_fallback_data(city_id, month, year)
-    
-    def generate_fallback_data(self, city_id, month, year):
-        """Generate fallback data when API is unavailable"""
-        # Generate 30 days of fallback data with slight variations
-        fallback_data = []
-        base_date = datetime(year, month, 1)
-        
-        for i in range(30):
-            current_date = base_date + timedelta(days=i)
-            
-            # Skip if month changes
-            if current_date.month != month:
-                continue
-                
-            # Generate slight variations in time
-            minute_offset = (i % 5) - 2  # Between -2 and 2
-            
-            fallback_data.append({
-                "date": current_date.strftime('%Y-%m-%d'),
-                "hijri": "Ramadan 1445",
-                "imsak": f"04:{(23 + minute_offset) % 60:02d}",
-                "subuh": f"04:{(33 + minute_offset) % 60:02d}",
-                "terbit": f"05:{(48 + minute_offset) % 60:02d}",
-                "dhuha": f"06:{(15 + minute_offset) % 60:02d}",
-                "dzuhur": f"12:{(0 + minute_offset) % 60:02d}",
-                "ashar": f"15:{(16 + minute_offset) % 60:02d}",
-                "maghrib": f"18:{(5 + minute_offset) % 60:02d}",
-                "isya": f"19:{(15 + minute_offset) % 60:02d}"
-            })
-            
-        return {"data": fallback_data}
+        # Cached copy (possibly stale if upstream is down) instead of made-up times
+        data = await fetch_schedule(city_id, year, month)
+        if data is None:
+            print(f"Error fetching imsakiyah data for {city_id} {year}-{month}: upstream unavailable and nothing cached")
+            return None
+        return {"data": data}
     
     async def get_today_schedule(self, city_id):
         """Get today's schedule for a specific city"""
@@ -2487,50 +2453,46 @@ async def display_anime_info(ctx, anime_data, message):
         # Remove reactions after timeout
         await message.clear_reactions()
 
-    # Log command usage
-    log_command(ctx.guild.id if ctx.guild else None, ctx.author.id, "anime")
-
-# Run the bot
-if __name__ == "__main__":
-    try:
-        print("Starting Ruri-chan Discord Bot...")
-        print(f"Python Version: {platform.python_version()}")
-        print(f"Discord.py Version: {discord.__version__}")
-        print(f"System: {platform.system()} {platform.release()}")
-        print("=========================================")
-        print("Connecting to Discord...")
-        
-        # Create logs directory if it doesn't exist
-        if not os.path.exists("logs"):
-            os.makedirs("logs")
-        
-        # Create a log file with timestamp
-        log_filename = f"logs/bot_log_{datetime.now().strftime('%Y%m%d_%H%M%S')}.log"
-        with open(log_filename, "w", encoding="utf-8") as f:
-            f.write(f"Bot started at {datetime.now()}\n")
-            f.write(f"Python Version: {platform.python_version()}\n")
-            f.write(f"Discord.py Version: {discord.__version__}\n")
-            f.write(f"System: {platform.system()} {platform.release()}\n")
-            f.write("=========================================\n")
-        
-        # Run the bot
-        bot.run(TOKEN)
-    except discord.LoginFailure:
-        print("ERROR: Invalid Discord token. Please check your .env file.")
-    except discord.PrivilegedIntentsRequired:
-        print("ERROR: Privileged intents are not enabled for this bot.")
-        print("Please go to the Discord Developer Portal and enable the intents in the Bot section.")
-    except Exception as e:
-        print(f"ERROR: An unexpected error occurred: {e}")
-    finally:
-        print("Bot has shut down.")
+@bot.command(name="metrics", aliases=["metrik"])
+@commands.has_permissions(administrator=True)
+async def metrics_command(ctx, limit: int = 10):
+    """Tampilkan latensi p50/p99 dan error rate per command dan API upstream"""
+    snapshot = metrics.snapshot()
+    limit = max(1, min(limit, 15))  # Embed fields are capped at 1024 characters
+    
+    embed = discord.Embed(
+        title="⏱️ Metrics",
+        description=f"Websocket: `{bot.latency * 1000:.0f}ms` | Diurutkan dari p99 terbesar",
+        color=EMBED_COLORS["info"]
+    )
+    embed.add_field(name="Command", value=f"```\n{format_table(snapshot['commands'], limit)}\n```", inline=False)
+    embed.add_field(name="API Upstream", value=f"```\n{format_table(snapshot['upstreams'], limit)}\n```", inline=False)
+    embed.set_footer(text=f"Requested by {ctx.author.name}", icon_url=ctx.author.avatar.url if ctx.author.avatar else None)
+    
+    await ctx.send(embed=embed)
 
 @bot.command(name="stats")
 @commands.has_permissions(administrator=True)
-async def stats_command(ctx):
-    """Tampilkan statistik penggunaan bot"""
+async def stats_command(ctx, mode: str = None):
+    """Tampilkan statistik penggunaan bot (`stats verify` untuk hitung ulang eksak)"""
     guild_id = ctx.guild.id if ctx.guild else None
     
+    if mode == "verify":
+        # Hitung ulang eksak dari log dan bandingkan dengan agregat inkremental
+        exact = exact_command_stats(COMMAND_LOGS)
+        approx = COMMAND_STATS.snapshot()
+        embed = discord.Embed(
+            title="🔍 Verifikasi Statistik",
+            description=(
+                f"Dihitung ulang dari {len(COMMAND_LOGS)} entri log yang tersimpan.\n"
+                "Agregat mencakup seluruh umur bot, log hanya entri yang belum kedaluwarsa."
+            ),
+            color=EMBED_COLORS["info"]
+        )
+        for label, key in (("📝 Total Perintah", "total_commands"), ("👥 Pengguna Unik", "unique_users"), ("🌐 Server Unik", "unique_guilds")):
+            embed.add_field(name=label, value=f"Eksak: `{exact[key]}`\nAgregat: `{approx[key]}`", inline=True)
+        return await ctx.send(embed=embed)
+    
     # Get command stats from database
     stats = get_command_stats()
     
@@ -2549,6 +2511,13 @@ async def stats_command(ctx):
         inline=False
     )
     
+    # Perkiraan pengguna dan server unik dari HyperLogLog
+    embed.add_field(
+        name="👥 Pengguna Unik",
+        value=f"~`{COMMAND_STATS.users.count()}` pengguna di ~`{COMMAND_STATS.guilds.count()}` server",
+        inline=False
+    )
+    
     # Add command usage breakdown
     popular_commands = []
     for key, value in stats.items():
@@ -2572,9 +2541,9 @@ async def stats_command(ctx):
     embed.add_field(
         name="🌐 Informasi Server",
         value=(
-            f"**Servers**: {len(bot.guilds)}\n"
-            f"**Users**: {sum(guild.member_count for guild in bot.guilds)}\n"
-            f"**Channels**: {len(list(bot.get_all_channels()))}"
+            f"**Servers**: {counters.guilds}\n"
+            f"**Users**: {counters.members}\n"
+            f"**Channels**: {counters.channels}"
         ),
         inline=True
     )
@@ -2594,11 +2563,46 @@ async def stats_command(ctx):
     embed.set_thumbnail(url=bot.user.avatar.url if bot.user.avatar else None)
     embed.set_footer(text=f"Requested by {ctx.author.name}", icon_url=ctx.author.avatar.url if ctx.author.avatar else None)
     
-    # Log command usage
-    log_command(ctx.guild.id, ctx.author.id, "stats", success=True)
-    
     await ctx.send(embed=embed)
 
+# Run the bot
+if __name__ == "__main__":
+    try:
+        print("Starting Ruri-chan Discord Bot...")
+        print(f"Python Version: {platform.python_version()}")
+        print(f"Discord.py Version: {discord.__version__}")
+        print(f"System: {platform.system()} {platform.release()}")
+        print("=========================================")
+        print("Connecting to Discord...")
+        
+        # Create logs directory if it doesn't exist
+        if not os.path.exists("logs"):
+            os.makedirs("logs")
+        
+        # Create a log file with timestamp
+        log_filename = f"logs/bot_log_{datetime.now().strftime('%Y%m%d_%H%M%S')}.log"
+        with open(log_filename, "w", encoding="utf-8") as f:
+            f.write(f"Bot started at {datetime.now()}\n")
+            f.write(f"Python Version: {platform.python_version()}\n")
+            f.write(f"Discord.py Version: {discord.__version__}\n")
+            f.write(f"System: {platform.system()} {platform.release()}\n")
+            f.write("=========================================\n")
+        
+        # Periodic metrics snapshot for the backend /api/metrics endpoint
+        metrics.start_export(os.getenv("METRICS_FILE", os.path.join("src", "data", "metrics.json")))
+        
+        # Run the bot
+        bot.run(TOKEN)
+    except discord.LoginFailure:
+        print("ERROR: Invalid Discord token. Please check your .env file.")
+    except discord.PrivilegedIntentsRequired:
+        print("ERROR: Privileged intents are not enabled for this bot.")
+        print("Please go to the Discord Developer Portal and enable the intents in the Bot section.")
+    except Exception as e:
+        print(f"ERROR: An unexpected error occurred: {e}")
+    finally:
+        print("Bot has shut down.")
+
 @bot.command(name="dbstatus")
 @commands.has_permissions(administrator=True)
 async def db_status_command(ctx):
@@ -2689,9 +2693,6 @@ async def db_status_command(ctx):
         
         embed.set_footer(text=f"Database command - {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
         
-        # Log command usage
-        log_command(ctx.guild.id if ctx.guild else None, ctx.author.id, "dbstatus", success=True)
-        
         await loading_message.edit(content=None, embed=embed)
     except Exception as e:
         error_embed = discord.Embed(
@@ -2772,9 +2773,6 @@ async def db_rebuild_command(ctx):
         
         embed.set_footer(text=f"Database rebuild - {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
         
-        # Log command usage
-        log_command(ctx.guild.id if ctx.guild else None, ctx.author.id, "dbrebuild", success=True)
-        
         await message.edit(content=None, embed=embed)
     except Exception as e:
         error_embed = discord.Embed(
@@ -2786,51 +2784,3 @@ async def db_rebuild_command(ctx):
         
         # Log error
         print(f"Error in dbrebuild command: {e}")
-
-@bot.event
-async def on_command(ctx):
-    """Log when a command is used"""
-    command_name = ctx.command.name
-    guild_id = ctx.guild.id if ctx.guild else None
-    user_id = ctx.author.id
-    
-    # Check for duplicate command invocation to prevent double logging
-    # Use ctx.message.id as a unique identifier for this command invocation
-    message_id = ctx.message.id
-    
-    # Store in global or bot variable to track processed messages
-    if not hasattr(bot, 'processed_commands'):
-        bot.processed_commands = set()
-        
-    # Skip if this message was already processed
-    if message_id in bot.processed_commands:
-        return
-        
-    # Add to processed commands set
-    bot.processed_commands.add(message_id)
-    
-    # Remove old message IDs to prevent memory leak (keep last 100)
-    if len(bot.processed_commands) > 100:
-        bot.processed_commands = set(list(bot.processed_commands)[-100:])
-    
-    # Filter out non-ASCII characters from the log message
-    clean_author = re.sub(r'[^\x00-\x7F]+', '[non-ASCII]', str(ctx.author))
-    clean_guild = re.sub(r'[^\x00-\x7F]+', '[non-ASCII]', str(ctx.guild)) if ctx.guild else "DM"
-    
-    # Log command usage to console
-    print(f"Command used: {command_name} by {clean_author} in {clean_guild}")
-    
-    # Log command to database
-    log_command(guild_id, user_id, command_name)
-    
-    # Update user data
-    try:
-        user_data = {
-            "name": str(ctx.author),
-            "updated_at": datetime.now(),
-            "last_command": command_name,
-            "last_command_time": datetime.now()
-        }
-# REMOVED MONGODB:         db.update_user(user_id, user_data)
-    except Exception as e:
-        print(f"Error updating user data: {e}")
@@ -15,6 +15,8 @@ import re
 from typing import Optional, Dict, Any, List, Union
 from utils import create_embed, log_command
 from constants import EMBED_COLORS
+from metrics import metrics
+from rate_limit import upstream_budget
 
 class Anime(commands.Cog):
     """Commands for anime information using Jikan API (MyAnimeList)"""
@@ -22,7 +24,7 @@ class Anime(commands.Cog):
     def __init__(self, bot):
         self.bot = bot
         self.base_url = "https://api.jikan.moe/v4"
-        self.session = aiohttp.ClientSession()
+        self.session = aiohttp.ClientSession(trace_configs=[upstream_budget.aiohttp_trace("jikan"), metrics.aiohttp_trace("jikan")])
     
     def cog_unload(self):
         asyncio.create_task(self.session.close())
@@ -5,14 +5,34 @@ Module ini menyediakan alternatif sederhana dari database MongoDB
 dengan menyimpan data dalam memory selama runtime.
 """
 
+from command_log import CommandLog, CommandStats, exact_command_stats
+from constants import COMMAND_LOG_CAPACITY, COMMAND_LOG_RETENTION
+
 class MemoryDB:
     def __init__(self):
         self.user_data = {}
         self.guild_data = {}
-        self.command_logs = []
+        self.command_logs = CommandLog(COMMAND_LOG_CAPACITY, COMMAND_LOG_RETENTION)
+        self.command_stats = CommandStats()
         self.guild_settings = {}
+        self.setting_listeners = []
         print("[INFO] MemoryDB initialized")
     
+    def add_setting_listener(self, listener):
+        """
+        Mendaftarkan callback yang dipanggil setiap setting guild berubah
+        
+        Args:
+            listener: Fungsi (guild_id, key, value), dipakai cache di luar
+                database untuk membuang entri yang sudah basi
+        """
+        self.setting_listeners.append(listener)
+    
+    def _notify_setting(self, guild_id, key, value):
+        """Memanggil semua listener setting guild"""
+        for listener in self.setting_listeners:
+            listener(guild_id, key, value)
+    
     def connect(self):
         """Mengembalikan True karena tidak perlu koneksi sebenarnya"""
         return True
@@ -52,16 +72,15 @@ class MemoryDB:
         return True
     
     def log_command(self, user_id, guild_id, command_name):
-        """Log penggunaan command"""
+        """Log penggunaan command, False jika ID pengguna/guild tidak valid"""
         from datetime import datetime
         
-        log_entry = {
-            'user_id': user_id,
-            'guild_id': guild_id,
-            'command': command_name,
-            'timestamp': datetime.now()
-        }
-        self.command_logs.append(log_entry)
+        try:
+            self.command_logs.append(user_id, guild_id, command_name)
+        except ValueError as e:
+            print(f"[WARNING] Command {command_name!r} tidak dicatat: {e}")
+            return False
+        self.command_stats.record(user_id, guild_id, command_name)
         
         # Update user data
         if user_id not in self.user_data:
@@ -78,24 +97,30 @@ class MemoryDB:
         return True
     
     def get_command_stats(self):
-        """Mendapatkan statistik penggunaan command"""
-        stats = {}
-        for log in self.command_logs:
-            command = log['command']
-            if command not in stats:
-                stats[command] = 0
-            stats[command] += 1
-        return stats
+        """Mendapatkan statistik penggunaan command per nama command"""
+        return dict(self.command_stats.per_command)
     
-    def get_guild_language(self, guild_id):
-        """Mendapatkan setting bahasa guild"""
+    def get_command_summary(self):
+        """Mendapatkan total, perkiraan user/guild unik, dan distribusi command"""
+        return self.command_stats.snapshot()
+    
+    def verify_command_stats(self):
+        """Menghitung ulang statistik secara eksak dari log (khusus admin, O(n))"""
+        return exact_command_stats(self.command_logs)
+    
+    def get_language(self, guild_id, default_lang="id"):
+        """Mendapatkan setting bahasa guild, antarmuka yang sama dengan backend src.core"""
         if guild_id is None:
-            return "id"  # Default language for DMs
+            return default_lang  # Default language for DMs
         
         guild_id = str(guild_id)
         if guild_id in self.guild_settings and 'language' in self.guild_settings[guild_id]:
             return self.guild_settings[guild_id]['language']
-        return "id"  # Default language
+        return default_lang  # Default language
+    
+    def get_guild_language(self, guild_id):
+        """Mendapatkan setting bahasa guild"""
+        return self.get_language(guild_id)
     
     def set_guild_language(self, guild_id, language):
         """Menyimpan setting bahasa guild"""
@@ -103,17 +128,22 @@ class MemoryDB:
         if guild_id not in self.guild_settings:
             self.guild_settings[guild_id] = {}
         self.guild_settings[guild_id]['language'] = language
+        self._notify_setting(guild_id, 'language', language)
         return True
     
-    def get_guild_prefix(self, guild_id):
-        """Mendapatkan prefix command guild"""
+    def get_prefix(self, guild_id, default_prefix="!"):
+        """Mendapatkan prefix command guild, antarmuka yang sama dengan backend src.core"""
         if guild_id is None:
-            return "!"  # Default prefix for DMs
+            return default_prefix  # Default prefix for DMs
         
         guild_id = str(guild_id)
         if guild_id in self.guild_settings and 'prefix' in self.guild_settings[guild_id]:
             return self.guild_settings[guild_id]['prefix']
-        return "!"  # Default prefix
+        return default_prefix  # Default prefix
+    
+    def get_guild_prefix(self, guild_id):
+        """Mendapatkan prefix command guild"""
+        return self.get_prefix(guild_id)
     
     def set_guild_prefix(self, guild_id, prefix):
         """Menyimpan prefix command guild"""
@@ -121,6 +151,7 @@ class MemoryDB:
         if guild_id not in self.guild_settings:
             self.guild_settings[guild_id] = {}
         self.guild_settings[guild_id]['prefix'] = prefix
+        self._notify_setting(guild_id, 'prefix', prefix)
         return True
 
 # Buat instance untuk digunakan dalam program
@@ -0,0 +1,385 @@
+"""
+metrics.py - Histogram latensi dan penghitung error
+
+Module ini mencatat lama eksekusi dan jumlah error per command dan per
+API upstream (Jikan, Last.fm, jadwal sholat, API sekolah) dalam memori
+berukuran tetap. Setiap seri memakai histogram log-linear ala HDR:
+nilai dikelompokkan per oktaf dengan 8 sub-bucket, jadi persentil
+selalu akurat dalam ~12% tanpa menyimpan sampel satu per satu.
+Snapshot bisa ditulis berkala ke file JSON untuk dibaca backend.
+"""
+
+import os
+import json
+import time
+import tempfile
+import threading
+import logging
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Iterator, List, Optional
+
+logger = logging.getLogger("metrics")
+
+# 2^SUB_BITS sub-bucket per oktaf; nilai di bawah 2^(SUB_BITS + 1) us disimpan persis
+SUB_BITS = 3
+SUB_COUNT = 1 << SUB_BITS
+# Nilai di atas ~35 menit masuk bucket terakhir
+MAX_VALUE_US = (1 << 31) - 1
+
+def _bucket_index(value: int) -> int:
+    """Indeks bucket untuk nilai dalam mikrodetik"""
+    if value < 2 * SUB_COUNT:
+        return value
+    shift = value.bit_length() - (SUB_BITS + 1)
+    return (shift + 1) * SUB_COUNT + (value >> shift) - SUB_COUNT
+
+def _bucket_bounds(index: int) -> tuple:
+    """Batas bawah dan atas (inklusif) bucket dalam mikrodetik"""
+    if index < 2 * SUB_COUNT:
+        return index, index
+    shift = index // SUB_COUNT - 1
+    sub = index % SUB_COUNT + SUB_COUNT
+    return sub << shift, ((sub + 1) << shift) - 1
+
+BUCKETS = _bucket_index(MAX_VALUE_US) + 1
+
+class LatencyHistogram:
+    """
+    Histogram latensi log-linear berukuran tetap
+    
+    Memakai BUCKETS penghitung integer apa pun jumlah sampelnya.
+    Persentil dilaporkan sebagai titik tengah bucket.
+    """
+    __slots__ = ("counts", "count", "total", "max")
+    
+    def __init__(self):
+        self.counts = [0] * BUCKETS
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+    
+    def record(self, seconds: float) -> None:
+        """
+        Mencatat satu durasi
+        
+        Args:
+            seconds: Durasi dalam detik
+        """
+        value = min(MAX_VALUE_US, max(0, int(seconds * 1e6)))
+        self.counts[_bucket_index(value)] += 1
+        self.count += 1
+        self.total += seconds
+        if seconds > self.max:
+            self.max = seconds
+    
+    def percentiles(self, fractions: List[float]) -> List[float]:
+        """
+        Mendapatkan beberapa persentil sekaligus
+        
+        Args:
+            fractions: Daftar persentil terurut naik, misalnya [0.5, 0.9, 0.99]
+        
+        Returns:
+            List durasi dalam milidetik
+        """
+        counts = list(self.counts)
+        total = sum(counts)
+        results = []
+        if not total:
+            return [0.0 for _ in fractions]
+        targets = iter(fractions)
+        target = next(targets)
+        seen = 0
+        for index, count in enumerate(counts):
+            seen += count
+            while seen >= target * total and count:
+                low, high = _bucket_bounds(index)
+                results.append(min((low + high) / 2e3, self.max * 1e3))
+                target = next(targets, None)
+                if target is None:
+                    return results
+        while len(results) < len(fractions):
+            results.append(self.max * 1e3)
+        return results
+
+class Series:
+    """Histogram latensi dan penghitung error untuk satu command atau API"""
+    __slots__ = ("histogram", "errors", "error_kinds")
+    
+    def __init__(self):
+        self.histogram = LatencyHistogram()
+        self.errors = 0
+        self.error_kinds: Dict[str, int] = {}
+    
+    def record(self, seconds: float, error: Optional[str] = None) -> None:
+        """
+        Mencatat satu pemanggilan
+        
+        Args:
+            seconds: Durasi dalam detik
+            error: Jenis error (nama exception, status HTTP, dll) atau None jika berhasil
+        """
+        self.histogram.record(seconds)
+        if error is not None:
+            self.errors += 1
+            self.error_kinds[error] = self.error_kinds.get(error, 0) + 1
+    
+    def snapshot(self) -> Dict[str, Any]:
+        """
+        Mendapatkan ringkasan seri
+        
+        Returns:
+            Dictionary calls, errors, error_rate, error_kinds, mean_ms,
+            p50_ms, p90_ms, p99_ms dan max_ms
+        """
+        histogram = self.histogram
+        calls = histogram.count
+        p50, p90, p99 = histogram.percentiles([0.50, 0.90, 0.99])
+        return {
+            "calls": calls,
+            "errors": self.errors,
+            "error_rate": self.errors / calls if calls else 0.0,
+            "error_kinds": dict(self.error_kinds),
+            "mean_ms": histogram.total / calls * 1e3 if calls else 0.0,
+            "p50_ms": p50,
+            "p90_ms": p90,
+            "p99_ms": p99,
+            "max_ms": histogram.max * 1e3
+        }
+
+class UpstreamCall:
+    """Status satu pemanggilan API yang sedang diukur track_upstream()"""
+    __slots__ = ("error",)
+    
+    def __init__(self):
+        self.error: Optional[str] = None
+    
+    def fail(self, reason: Any) -> None:
+        """
+        Menandai pemanggilan sebagai gagal tanpa melempar exception
+        
+        Args:
+            reason: Alasan, misalnya status HTTP
+        """
+        self.error = str(reason)
+
+class MetricsRegistry:
+    """Kumpulan seri per command dan per API upstream untuk seluruh proses"""
+    
+    def __init__(self):
+        self.commands: Dict[str, Series] = {}
+        self.upstreams: Dict[str, Series] = {}
+        self.started = time.time()
+        self._traces: Dict[str, Any] = {}
+        self._gauges: Dict[str, Callable[[], Dict[str, Any]]] = {}
+        self._exporter: Optional[threading.Thread] = None
+        self._stop = threading.Event()
+    
+    @staticmethod
+    def _series(table: Dict[str, Series], name: str) -> Series:
+        series = table.get(name)
+        if series is None:
+            series = table[name] = Series()
+        return series
+    
+    def record_command(self, name: str, seconds: float, error: Optional[str] = None) -> None:
+        """
+        Mencatat satu eksekusi command
+        
+        Args:
+            name: Nama command
+            seconds: Durasi dalam detik
+            error: Jenis error atau None jika berhasil
+        """
+        self._series(self.commands, name).record(seconds, error)
+    
+    def record_upstream(self, name: str, seconds: float, error: Optional[str] = None) -> None:
+        """
+        Mencatat satu pemanggilan API upstream
+        
+        Args:
+            name: Nama API
+            seconds: Durasi dalam detik
+            error: Jenis error atau None jika berhasil
+        """
+        self._series(self.upstreams, name).record(seconds, error)
+    
+    @contextmanager
+    def track_upstream(self, name: str) -> Iterator[UpstreamCall]:
+        """
+        Mengukur satu pemanggilan API upstream
+        
+        Exception yang keluar dari blok dicatat sebagai error lalu dilempar
+        ulang; respons yang gagal tanpa exception ditandai dengan call.fail().
+        
+        Args:
+            name: Nama API
+        
+        Yields:
+            UpstreamCall untuk menandai kegagalan
+        """
+        call = UpstreamCall()
+        start = time.perf_counter()
+        try:
+            yield call
+        except BaseException as e:
+            call.error = type(e).__name__
+            raise
+        finally:
+            self.record_upstream(name, time.perf_counter() - start, call.error)
+    
+    def aiohttp_trace(self, name: str):
+        """
+        Membuat TraceConfig aiohttp yang mencatat setiap request sebagai API upstream
+        
+        Dipasang lewat aiohttp.ClientSession(trace_configs=[...]). Durasi
+        diukur sampai header respons diterima; status 4xx/5xx dan exception
+        koneksi dicatat sebagai error.
+        
+        Args:
+            name: Nama API
+        
+        Returns:
+            aiohttp.TraceConfig
+        """
+        trace = self._traces.get(name)
+        if trace is not None:
+            return trace
+        import aiohttp
+        
+        async def on_request_start(session, context, params):
+            context.started = time.perf_counter()
+        
+        async def on_request_end(session, context, params):
+            status = params.response.status
+            self.record_upstream(name, time.perf_counter() - context.started, str(status) if status >= 400 else None)
+        
+        async def on_request_exception(session, context, params):
+            self.record_upstream(name, time.perf_counter() - context.started, type(params.exception).__name__)
+        
+        trace = aiohttp.TraceConfig()
+        trace.on_request_start.append(on_request_start)
+        trace.on_request_end.append(on_request_end)
+        trace.on_request_exception.append(on_request_exception)
+        self._traces[name] = trace
+        return trace
+    
+    def register_gauges(self, name: str, source: Callable[[], Dict[str, Any]]) -> None:
+        """
+        Menambahkan sumber angka sesaat ke snapshot
+        
+        source() dipanggil dari thread export, jadi harus murah dan aman
+        dipanggil di luar event loop.
+        
+        Args:
+            name: Nama grup di bawah "gauges"
+            source: Fungsi yang mengembalikan dictionary angka
+        """
+        self._gauges[name] = source
+    
+    def snapshot(self) -> Dict[str, Any]:
+        """
+        Mendapatkan snapshot semua seri
+        
+        Returns:
+            Dictionary generated_at, uptime_s, commands, upstreams dan gauges
+        """
+        now = time.time()
+        gauges = {}
+        for name, source in list(self._gauges.items()):
+            try:
+                gauges[name] = source()
+            except Exception as e:
+                logger.error(f"Gagal membaca gauge {name}: {e}")
+        return {
+            "generated_at": now,
+            "uptime_s": now - self.started,
+            "commands": {name: series.snapshot() for name, series in list(self.commands.items())},
+            "upstreams": {name: series.snapshot() for name, series in list(self.upstreams.items())},
+            "gauges": gauges
+        }
+    
+    def write_snapshot(self, path: str) -> bool:
+        """
+        Menulis snapshot ke file JSON secara atomik
+        
+        Args:
+            path: Path file tujuan
+        
+        Returns:
+            True jika berhasil
+        """
+        directory = os.path.dirname(path) or "."
+        tmp_path = None
+        try:
+            os.makedirs(directory, exist_ok=True)
+            fd, tmp_path = tempfile.mkstemp(dir=directory, prefix=".metrics-")
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                json.dump(self.snapshot(), f, separators=(",", ":"))
+            os.replace(tmp_path, path)
+            return True
+        except Exception as e:
+            logger.error(f"Gagal menulis snapshot metrics: {e}")
+            if tmp_path is not None:
+                try:
+                    os.unlink(tmp_path)
+                except OSError:
+                    pass
+            return False
+    
+    def start_export(self, path: str, interval: float = 15.0) -> None:
+        """
+        Menulis snapshot ke file secara berkala di thread background
+        
+        Args:
+            path: Path file JSON yang dibaca backend
+            interval: Jeda antar penulisan dalam detik
+        """
+        if self._exporter is not None:
+            return
+        
+        def run():
+            while not self._stop.wait(interval):
+                self.write_snapshot(path)
+            self.write_snapshot(path)
+        
+        self._exporter = threading.Thread(target=run, name="metrics-export", daemon=True)
+        self._exporter.start()
+    
+    def close(self) -> None:
+        """Menghentikan thread export setelah menulis snapshot terakhir"""
+        self._stop.set()
+        if self._exporter is not None:
+            self._exporter.join(timeout=5)
+            self._exporter = None
+
+# Registry bersama untuk seluruh proses
+metrics = MetricsRegistry()
+
+def format_table(table: Dict[str, Dict[str, Any]], limit: int = 10) -> str:
+    """
+    Merangkum snapshot seri menjadi tabel teks untuk code block Discord
+    
+    Baris diurutkan dari p99 terbesar, agar jalur lambat muncul di atas.
+    
+    Args:
+        table: Dictionary nama -> snapshot seri
+        limit: Jumlah baris maksimum
+    
+    Returns:
+        String tabel
+    """
+    rows = [
+        (name[:24], row)
+        for name, row in sorted(table.items(), key=lambda item: item[1]["p99_ms"], reverse=True)[:limit]
+    ]
+    if not rows:
+        return "-"
+    width = max(4, *(len(name) for name, _ in rows))
+    lines = [f"{'nama':<{width}} {'n':>6} {'err%':>5} {'p50 ms':>7} {'p99 ms':>7} {'max ms':>7}"]
+    for name, row in rows:
+        lines.append(
+            f"{name:<{width}} {row['calls']:>6} {row['error_rate'] * 100:>5.1f} "
+            f"{row['p50_ms']:>7.1f} {row['p99_ms']:>7.1f} {row['max_ms']:>7.1f}"
+        )
+    return "\n".join(lines)
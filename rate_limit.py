@@ -0,0 +1,363 @@
+"""
+rate_limit.py - Rate limiter token bucket untuk command dan API upstream
+
+Module ini membatasi command per pengguna dan per server untuk setiap
+kategori command (berdasarkan dictionary COOLDOWNS), serta memberi
+budget global per API upstream. Setiap pengecekan O(1): satu lookup
+OrderedDict per bucket, dan bucket yang sudah penuh kembali dibuang
+karena isinya sama persis dengan bucket baru, sehingga memori hanya
+sebesar jumlah pengguna yang aktif dalam jendela cooldown.
+"""
+
+import time
+import asyncio
+import logging
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable, Optional, Tuple
+
+from discord.ext import commands
+
+logger = logging.getLogger("rate-limit")
+
+class BucketTable:
+    """
+    Kumpulan token bucket dengan rate dan kapasitas yang sama
+    
+    Bucket disimpan sebagai [tokens, updated, notified] di OrderedDict
+    yang terurut dari yang paling lama tidak diperbarui. Bucket yang
+    tidak disentuh selama refill_time detik sudah penuh lagi, jadi
+    dibuang dari depan tanpa mengubah perilaku limiter. max_size adalah
+    batas keras untuk lonjakan pengguna baru.
+    """
+    def __init__(self, rate: float, burst: float, max_size: int = 100_000):
+        """
+        Membuat tabel bucket
+        
+        Args:
+            rate: Token yang diisi ulang per detik
+            burst: Kapasitas bucket
+            max_size: Jumlah bucket maksimum
+        """
+        self.rate = rate
+        self.burst = burst
+        self.refill_time = burst / rate
+        self.max_size = max_size
+        self._buckets: "OrderedDict[Hashable, list]" = OrderedDict()
+        self.expired = 0
+        self.evictions = 0
+    
+    def acquire(self, key: Hashable, now: float) -> list:
+        """
+        Mendapatkan bucket yang sudah diisi ulang sampai waktu now
+        
+        Args:
+            key: Kunci bucket
+            now: Waktu monotonic saat ini
+        
+        Returns:
+            List [tokens, updated, notified] milik bucket (boleh diubah)
+        """
+        buckets = self._buckets
+        # Buang bucket idle dari depan; masing-masing hanya dibuang sekali
+        while buckets:
+            oldest = next(iter(buckets.values()))
+            if now - oldest[1] < self.refill_time:
+                break
+            buckets.popitem(last=False)
+            self.expired += 1
+        
+        bucket = buckets.get(key)
+        if bucket is None:
+            bucket = buckets[key] = [self.burst, now, False]
+            if len(buckets) > self.max_size:
+                buckets.popitem(last=False)
+                self.evictions += 1
+        else:
+            bucket[0] = min(self.burst, bucket[0] + (now - bucket[1]) * self.rate)
+            bucket[1] = now
+            buckets.move_to_end(key)
+        return bucket
+    
+    def wait_time(self, bucket: list) -> float:
+        """Detik sampai bucket punya satu token (0 jika sudah ada)"""
+        return 0.0 if bucket[0] >= 1 else (1 - bucket[0]) / self.rate
+    
+    def __len__(self) -> int:
+        return len(self._buckets)
+
+class RateLimited(commands.CommandOnCooldown):
+    """
+    Command ditolak rate limiter
+    
+    notify hanya True untuk penolakan pertama sejak command terakhir
+    yang lolos, agar spam tidak dibalas dengan spam pesan cooldown.
+    """
+    def __init__(self, cooldown: commands.Cooldown, retry_after: float, scope: str, notify: bool):
+        bucket_type = commands.BucketType.guild if scope == "guild" else commands.BucketType.user
+        super().__init__(cooldown, retry_after, bucket_type)
+        self.scope = scope
+        self.notify = notify
+
+class CommandRateLimiter:
+    """
+    Rate limiter command per pengguna dan per server untuk setiap kategori
+    
+    Kategori command diambil dari nama command induk, lalu nama cog,
+    yang ada di COOLDOWNS; selain itu dipakai "general". Cooldown C
+    detik berarti satu token per C detik dengan burst token beruntun.
+    Bucket server memakai rate dan kapasitas guild_multiplier kali
+    bucket pengguna.
+    """
+    def __init__(self, cooldowns: Dict[str, float], default_cooldown: float = 3, burst: int = 3,
+                 guild_multiplier: int = 10, max_buckets: int = 100_000,
+                 clock: Callable[[], float] = time.monotonic):
+        """
+        Membuat rate limiter command
+        
+        Args:
+            cooldowns: Dictionary kategori -> cooldown dalam detik
+            default_cooldown: Cooldown untuk kategori yang tidak ada di cooldowns
+            burst: Jumlah command beruntun sebelum cooldown berlaku
+            guild_multiplier: Pengali rate dan kapasitas bucket server
+            max_buckets: Jumlah bucket maksimum per tabel
+            clock: Sumber waktu monotonic (bisa diganti untuk simulasi)
+        """
+        self.cooldowns = dict(cooldowns)
+        self.default_cooldown = default_cooldown
+        self.burst = burst
+        self.guild_multiplier = guild_multiplier
+        self.max_buckets = max_buckets
+        self.clock = clock
+        self._tables: Dict[Tuple[str, str], BucketTable] = {}
+        self._categories: Dict[str, str] = {}
+        self.checks = 0
+        self.denied = 0
+    
+    def category(self, command) -> str:
+        """
+        Menentukan kategori cooldown sebuah command
+        
+        Args:
+            command: commands.Command
+        
+        Returns:
+            Nama kategori
+        """
+        name = command.qualified_name
+        category = self._categories.get(name)
+        if category is None:
+            root = name.split(" ", 1)[0]
+            cog = (command.cog_name or "").lower()
+            if root in self.cooldowns:
+                category = root
+            elif cog in self.cooldowns:
+                category = cog
+            else:
+                category = "general"
+            self._categories[name] = category
+        return category
+    
+    def _table(self, scope: str, category: str) -> BucketTable:
+        """Tabel bucket untuk pasangan scope dan kategori"""
+        table = self._tables.get((scope, category))
+        if table is None:
+            cooldown = self.cooldowns.get(category, self.default_cooldown)
+            rate, burst = 1 / cooldown, self.burst
+            if scope == "guild":
+                rate, burst = rate * self.guild_multiplier, burst * self.guild_multiplier
+            table = self._tables[(scope, category)] = BucketTable(rate, burst, self.max_buckets)
+        return table
+    
+    def hit(self, category: str, user_id: int, guild_id: Optional[int]) -> Tuple[float, str, bool]:
+        """
+        Mencoba memakai satu token untuk pengguna (dan servernya)
+        
+        Token hanya dipakai jika semua bucket yang terlibat punya token,
+        jadi penolakan di level server tidak menghabiskan token pengguna.
+        
+        Args:
+            category: Kategori command
+            user_id: ID pengguna Discord
+            guild_id: ID server Discord atau None untuk DM
+        
+        Returns:
+            Tuple (retry_after, scope, notify); retry_after 0 berarti lolos
+        """
+        now = self.clock()
+        self.checks += 1
+        users = self._table("user", category)
+        user = users.acquire(user_id, now)
+        retry_after, scope = users.wait_time(user), "user"
+        guild = None
+        if guild_id is not None:
+            guilds = self._table("guild", category)
+            guild = guilds.acquire(guild_id, now)
+            guild_wait = guilds.wait_time(guild)
+            if guild_wait > retry_after:
+                retry_after, scope = guild_wait, "guild"
+        
+        if retry_after == 0:
+            user[0] -= 1
+            user[2] = False
+            if guild is not None:
+                guild[0] -= 1
+            return 0.0, scope, False
+        
+        self.denied += 1
+        notify = not user[2]
+        user[2] = True
+        return retry_after, scope, notify
+    
+    async def check(self, ctx) -> bool:
+        """Global check_once untuk bot: lolos atau melempar RateLimited"""
+        category = self.category(ctx.command)
+        retry_after, scope, notify = self.hit(category, ctx.author.id, ctx.guild.id if ctx.guild else None)
+        if retry_after:
+            cooldown = commands.Cooldown(self.burst, self.cooldowns.get(category, self.default_cooldown))
+            raise RateLimited(cooldown, retry_after, scope, notify)
+        return True
+    
+    def install(self, bot) -> "CommandRateLimiter":
+        """
+        Memasang limiter sebagai check global
+        
+        check_once dijalankan sekali per pesan, tidak untuk subcommand
+        dan tidak saat help memeriksa command dengan can_run().
+        
+        Args:
+            bot: Instance commands.Bot
+        
+        Returns:
+            Limiter ini
+        """
+        bot.check_once(self.check)
+        return self
+    
+    def stats(self) -> Dict[str, Any]:
+        """
+        Mendapatkan statistik limiter
+        
+        Returns:
+            Dictionary checks, denied, buckets, expired dan evictions
+        """
+        tables = list(self._tables.values())
+        return {
+            "checks": self.checks,
+            "denied": self.denied,
+            "buckets": sum(len(table) for table in tables),
+            "expired": sum(table.expired for table in tables),
+            "evictions": sum(table.evictions for table in tables)
+        }
+
+class UpstreamBudgetExceeded(Exception):
+    """Budget API upstream habis melebihi waktu tunggu maksimum"""
+    
+    def __init__(self, name: str, retry_after: float):
+        super().__init__(f"Budget API {name} habis, coba lagi dalam {retry_after:.1f} detik")
+        self.name = name
+        self.retry_after = retry_after
+
+class UpstreamBudget:
+    """
+    Budget request global per API upstream
+    
+    Setiap pemanggil memesan satu token; jika bucket kosong, token
+    dipesan di muka (saldo negatif) dan pemanggil menunggu gilirannya,
+    sehingga request ke API yang sama diantrekan adil tanpa lock. API
+    yang tidak dikonfigurasi tidak dibatasi.
+    """
+    def __init__(self, budgets: Optional[Dict[str, Tuple[float, float]]] = None, max_wait: float = 5.0,
+                 clock: Callable[[], float] = time.monotonic):
+        """
+        Membuat budget upstream
+        
+        Args:
+            budgets: Dictionary nama API -> (request per detik, burst)
+            max_wait: Waktu tunggu maksimum sebelum UpstreamBudgetExceeded
+            clock: Sumber waktu monotonic
+        """
+        self.max_wait = max_wait
+        self.clock = clock
+        self._buckets: Dict[str, list] = {}
+        self.throttled = 0
+        self.rejected = 0
+        self.configure(budgets or {})
+    
+    def configure(self, budgets: Dict[str, Tuple[float, float]], max_wait: Optional[float] = None) -> None:
+        """
+        Mengatur budget per API
+        
+        Args:
+            budgets: Dictionary nama API -> (request per detik, burst)
+            max_wait: Waktu tunggu maksimum baru (None = tidak diubah)
+        """
+        if max_wait is not None:
+            self.max_wait = max_wait
+        now = self.clock()
+        # [rate, burst, tokens, updated]
+        self._buckets = {name: [rate, burst, burst, now] for name, (rate, burst) in budgets.items()}
+    
+    def reserve(self, name: str) -> float:
+        """
+        Memesan satu request ke API
+        
+        Args:
+            name: Nama API
+        
+        Returns:
+            Detik yang harus ditunggu sebelum request dikirim
+        
+        Raises:
+            UpstreamBudgetExceeded: Jika harus menunggu lebih dari max_wait
+        """
+        bucket = self._buckets.get(name)
+        if bucket is None:
+            return 0.0
+        rate, burst, tokens, updated = bucket
+        now = self.clock()
+        tokens = min(burst, tokens + (now - updated) * rate) - 1
+        wait = -tokens / rate if tokens < 0 else 0.0
+        if wait > self.max_wait:
+            self.rejected += 1
+            bucket[2], bucket[3] = tokens + 1, now
+            raise UpstreamBudgetExceeded(name, wait)
+        bucket[2], bucket[3] = tokens, now
+        if wait:
+            self.throttled += 1
+        return wait
+    
+    async def acquire(self, name: str) -> None:
+        """
+        Menunggu sampai request ke API boleh dikirim
+        
+        Args:
+            name: Nama API
+        
+        Raises:
+            UpstreamBudgetExceeded: Jika harus menunggu lebih dari max_wait
+        """
+        wait = self.reserve(name)
+        if wait:
+            await asyncio.sleep(wait)
+    
+    def aiohttp_trace(self, name: str):
+        """
+        Membuat TraceConfig aiohttp yang menahan request sampai budget tersedia
+        
+        Args:
+            name: Nama API
+        
+        Returns:
+            aiohttp.TraceConfig
+        """
+        import aiohttp
+        
+        async def on_request_start(session, context, params):
+            await self.acquire(name)
+        
+        trace = aiohttp.TraceConfig()
+        trace.on_request_start.append(on_request_start)
+        return trace
+
+# Budget bersama untuk seluruh proses, diatur entry point lewat configure()
+upstream_budget = UpstreamBudget()
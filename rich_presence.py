@@ -12,6 +12,8 @@ from datetime import datetime
 import platform
 from typing import List, Dict, Any, Optional
 
+from bot_counters import counters
+
 class RichPresence:
     def __init__(self, bot):
         self.bot = bot
@@ -80,8 +82,8 @@ class RichPresence:
         
         # Replace placeholders
         formatted = text.format(
-            guilds=len(self.bot.guilds),
-            users=len(set(self.bot.get_all_members())),
+            guilds=counters.guilds,
+            users=counters.users,
             commands=len(self.bot.commands),
             prefix=self._get_default_prefix(),
             uptime=uptime,
@@ -182,6 +184,9 @@ def setup(bot):
     # Store the presence manager on the bot for future use
     bot.presence_manager = presence_manager
     
+    # Keep guild/user counts up to date from events instead of scanning members per rotation
+    counters.install(bot)
+    
     # Set bot start time if not already set
     if not hasattr(bot, 'start_time'):
         bot.start_time = datetime.now()
@@ -195,7 +200,7 @@ def setup(bot):
         # Log startup info
         print(f"\n{'='*50}")
         print(f"Bot is ready! Logged in as {bot.user.name} (ID: {bot.user.id})")
-        print(f"Connected to {len(bot.guilds)} guilds | Serving {len(set(bot.get_all_members()))} users")
+        print(f"Connected to {counters.guilds} guilds | Serving {counters.users} users")
         print(f"Python version: {platform.python_version()}")
         print(f"Discord.py version: {discord.__version__}")
         print(f"Running on: {platform.system()} {platform.release()}")
@@ -0,0 +1,272 @@
+"""
+schedule_prefetch.py - Prefetch jadwal sholat menjelang pergantian hari
+
+Tepat setelah tengah malam WIB, terutama tanggal 1 saat file adzan bulan
+baru belum pernah diunduh, banyak pengguna meminta jadwal pada saat yang
+sama dan semuanya mendapati cache kosong. Module ini mencatat kota yang
+paling sering diminta, lalu menjelang pergantian hari memastikan file
+bulan untuk hari berikutnya sudah ada di cache dan tetap segar melewati
+jam sibuk: file bulan depan diunduh sebelum tanggal 1, file bulan
+berjalan cukup direvalidasi (304). Jumlah request per pergantian hari
+dibatasi dan waktunya disebar acak agar upstream tidak diserbu.
+"""
+
+import time
+import heapq
+import random
+import asyncio
+import logging
+from datetime import datetime, timedelta, timezone
+from typing import Any, Callable, Dict, Hashable, List, Optional, Tuple
+
+from upstream_cache import UpstreamCache
+
+logger = logging.getLogger("schedule_prefetch")
+
+# Asia/Jakarta tidak memakai DST, jadi offset tetap UTC+7 cukup
+WIB = timezone(timedelta(hours=7), "WIB")
+
+# (kunci cache, URL, revalidate_after, expires_at) seperti argumen UpstreamCache.get
+Request = Tuple[str, str, float, Optional[float]]
+
+class DemandTracker:
+    """
+    Penghitung popularitas kota dengan peluruhan eksponensial
+    
+    Skor setiap kota meluruh setengahnya setiap `half_life` detik, jadi
+    kota yang ramai minggu lalu perlahan digantikan kota yang ramai hari
+    ini. Jumlah kota yang dilacak dibatasi `max_size`.
+    """
+    def __init__(self, half_life: float = 3 * 86400, max_size: int = 5000):
+        """
+        Membuat tracker
+        
+        Args:
+            half_life: Waktu paruh skor dalam detik
+            max_size: Jumlah kota maksimum yang dilacak
+        """
+        self.half_life = half_life
+        self.max_size = max_size
+        # kota -> [skor, waktu skor terakhir dihitung]
+        self._scores: Dict[Hashable, List[float]] = {}
+    
+    def __len__(self) -> int:
+        return len(self._scores)
+    
+    def _decayed(self, score: List[float], now: float) -> float:
+        return score[0] * 0.5 ** ((now - score[1]) / self.half_life)
+    
+    def record(self, key: Hashable, now: Optional[float] = None) -> None:
+        """
+        Mencatat satu permintaan
+        
+        Args:
+            key: ID kota
+            now: Waktu permintaan (epoch detik)
+        """
+        now = time.time() if now is None else now
+        score = self._scores.get(key)
+        if score is None:
+            if len(self._scores) >= self.max_size:
+                # Buang separuh kota dengan skor terendah
+                keep = heapq.nlargest(self.max_size // 2, self._scores.items(),
+                                      key=lambda item: self._decayed(item[1], now))
+                self._scores = dict(keep)
+            self._scores[key] = [1.0, now]
+        else:
+            score[0] = self._decayed(score, now) + 1.0
+            score[1] = now
+    
+    def top(self, count: int, now: Optional[float] = None) -> List[Hashable]:
+        """
+        Mendapatkan kota dengan skor tertinggi
+        
+        Args:
+            count: Jumlah kota
+            now: Waktu acuan peluruhan (epoch detik)
+        
+        Returns:
+            List ID kota, dari yang paling sering diminta
+        """
+        now = time.time() if now is None else now
+        return heapq.nlargest(count, self._scores, key=lambda key: self._decayed(self._scores[key], now))
+
+class SchedulePrefetcher:
+    """
+    Scheduler prefetch harian untuk cache jadwal sholat
+    
+    Setiap hari, `lead` detik sebelum tengah malam WIB, kota-kota teratas
+    dari DemandTracker (dan daftar kota) diprefetch pada waktu acak di
+    dalam jendela sampai `guard` detik sebelum tengah malam. Entri yang
+    sudah segar melewati tengah malam + `settle` dilewati tanpa request.
+    Selama `settle` detik setelah tengah malam, hit rate lookup cache
+    dicatat dan ditampilkan sebagai "rollover" di stats().
+    """
+    def __init__(self, cache: UpstreamCache, schedule_request: Callable[[Hashable, int, int], Request],
+                 cities_request: Optional[Callable[[], Request]] = None, demand: Optional[DemandTracker] = None,
+                 top: int = 500, budget: int = 520, lead: float = 3600, guard: float = 120, settle: float = 3600):
+        """
+        Membuat scheduler
+        
+        Args:
+            cache: Cache yang diisi
+            schedule_request: Fungsi (kota, tahun, bulan) -> request file adzan
+            cities_request: Fungsi () -> request daftar kota, ikut direvalidasi
+            demand: Tracker popularitas kota
+            top: Jumlah kota teratas yang diprefetch
+            budget: Jumlah request maksimum per pergantian hari
+            lead: Mulai prefetch sekian detik sebelum tengah malam
+            guard: Prefetch selesai paling lambat sekian detik sebelum tengah malam
+            settle: Lama jam sibuk setelah tengah malam dalam detik
+        """
+        self.cache = cache
+        self.schedule_request = schedule_request
+        self.cities_request = cities_request
+        self.demand = DemandTracker() if demand is None else demand
+        self.top = top
+        self.budget = budget
+        self.lead = lead
+        self.guard = guard
+        self.settle = settle
+        self._task: Optional[asyncio.Task] = None
+        self._rollover_base: Optional[Tuple[float, int, int]] = None
+        self.last_run: Dict[str, Any] = {}
+        self.last_rollover: Dict[str, Any] = {}
+    
+    @staticmethod
+    def next_rollover(now: Optional[float] = None) -> datetime:
+        """
+        Mendapatkan tengah malam WIB berikutnya
+        
+        Args:
+            now: Waktu acuan (epoch detik)
+        
+        Returns:
+            datetime tengah malam WIB (timezone-aware)
+        """
+        current = datetime.fromtimestamp(time.time() if now is None else now, WIB)
+        return datetime.combine(current.date() + timedelta(days=1), datetime.min.time(), WIB)
+    
+    def plan(self, rollover: datetime) -> List[Request]:
+        """
+        Menentukan request yang perlu diprefetch untuk satu pergantian hari
+        
+        Args:
+            rollover: Tengah malam WIB yang akan datang
+        
+        Returns:
+            List request, paling banyak `budget`
+        """
+        requests = [self.cities_request()] if self.cities_request is not None else []
+        count = max(0, min(self.top, self.budget - len(requests)))
+        for city in self.demand.top(count):
+            requests.append(self.schedule_request(city, rollover.year, rollover.month))
+        return requests[:self.budget]
+    
+    async def run_once(self, rollover: datetime, window: Optional[float] = None) -> Dict[str, Any]:
+        """
+        Menjalankan prefetch untuk satu pergantian hari
+        
+        Args:
+            rollover: Tengah malam WIB yang akan datang
+            window: Lama jendela penyebaran request dalam detik
+                (default sampai `guard` detik sebelum tengah malam)
+        
+        Returns:
+            Dictionary ringkasan: jumlah target, diunduh, dilewati, gagal
+        """
+        requests = self.plan(rollover)
+        if window is None:
+            window = rollover.timestamp() - self.guard - time.time()
+        window = max(0.0, window)
+        fresh_until = rollover.timestamp() + self.settle
+        offsets = sorted(random.uniform(0, window) for _ in requests)
+        
+        fetched = skipped = errors = 0
+        start = time.monotonic()
+        for offset, request in zip(offsets, requests):
+            delay = start + offset - time.monotonic()
+            if delay > 0:
+                await asyncio.sleep(delay)
+            try:
+                if await self.cache.prefetch(*request, fresh_until=fresh_until):
+                    fetched += 1
+                else:
+                    skipped += 1
+            except Exception as e:
+                errors += 1
+                logger.warning(f"Prefetch {request[0]} gagal: {type(e).__name__}: {e}")
+        
+        self.last_run = {
+            "rollover": rollover.isoformat(),
+            "targets": len(requests),
+            "fetched": fetched,
+            "skipped": skipped,
+            "errors": errors,
+            "duration": round(time.monotonic() - start, 3)
+        }
+        logger.info(f"Prefetch untuk {rollover:%Y-%m-%d}: {fetched} diunduh/direvalidasi, {skipped} masih segar, {errors} gagal")
+        return self.last_run
+    
+    def begin_rollover_window(self) -> None:
+        """Mulai mencatat hit rate lookup cache sebagai jam sibuk setelah pergantian hari"""
+        self._rollover_base = (time.time(), self.cache.lookups, self.cache.hits)
+    
+    def _rollover_rate(self) -> Dict[str, Any]:
+        started, lookups, hits = self._rollover_base
+        lookups = self.cache.lookups - lookups
+        hits = self.cache.hits - hits
+        return {
+            "since": datetime.fromtimestamp(started, WIB).isoformat(),
+            "lookups": lookups,
+            "hits": hits,
+            "hit_rate": hits / lookups if lookups else None
+        }
+    
+    async def run_forever(self) -> None:
+        """Loop harian: prefetch sebelum tengah malam, ukur hit rate setelahnya"""
+        while True:
+            try:
+                rollover = self.next_rollover()
+                start_at = rollover.timestamp() - self.lead
+                if time.time() < start_at:
+                    await asyncio.sleep(start_at - time.time())
+                await self.run_once(rollover)
+                
+                await asyncio.sleep(max(0.0, rollover.timestamp() - time.time()))
+                self.begin_rollover_window()
+                await asyncio.sleep(self.settle)
+                self.last_rollover = self._rollover_rate()
+                self._rollover_base = None
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error(f"Error di loop prefetch: {e}")
+                await asyncio.sleep(60)
+    
+    def start(self) -> None:
+        """Menjalankan loop di event loop yang sedang berjalan (jika belum berjalan)"""
+        if self._task is None or self._task.done():
+            self._task = asyncio.get_running_loop().create_task(self.run_forever())
+    
+    def stop(self) -> None:
+        """Menghentikan loop"""
+        if self._task is not None:
+            self._task.cancel()
+            self._task = None
+    
+    def stats(self) -> Dict[str, Any]:
+        """
+        Mendapatkan statistik prefetch
+        
+        Returns:
+            Dictionary jumlah kota yang dilacak, ringkasan prefetch terakhir
+            dan hit rate setelah pergantian hari (berjalan jika masih dalam
+            jam sibuk, selain itu hasil pergantian hari terakhir)
+        """
+        return {
+            "running": self._task is not None and not self._task.done(),
+            "tracked_cities": len(self.demand),
+            "last_run": self.last_run,
+            "rollover": self._rollover_rate() if self._rollover_base is not None else self.last_rollover
+        }
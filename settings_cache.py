@@ -0,0 +1,176 @@
+"""
+settings_cache.py - Cache pengaturan server untuk seluruh proses
+
+Berisi satu cache LRU dengan TTL untuk prefix dan bahasa server yang
+dipakai semua helper (utils.py untuk memory_db dan src/utils/helper.py
+untuk backend src.core). Entri diisi dari backend database yang sedang
+dipakai dan dibuang lewat listener pengaturan saat prefix atau bahasa
+server diubah, sehingga helper tidak perlu membaca database setiap
+panggilan dan tidak pernah melihat nilai basi.
+"""
+
+import time
+import threading
+from collections import OrderedDict
+from typing import Dict, Any, Optional
+
+class GuildSettingsCache:
+    """
+    Cache LRU guild_id -> pengaturan server (prefix dan bahasa)
+    
+    Ukuran dibatasi max_size; entri paling lama tidak dipakai digeser
+    keluar saat penuh. Entri juga kedaluwarsa setelah ttl detik sebagai
+    jaring pengaman jika database diubah tanpa lewat listener (misalnya
+    file diedit manual).
+    """
+    KEYS = ("prefix", "language")
+    
+    def __init__(self, database, max_size: int = 10_000, ttl: Optional[float] = 3600,
+                 default_prefix: str = "!", default_lang: str = "id"):
+        """
+        Membuat cache pengaturan server
+        
+        Args:
+            database: Backend database (punya get_prefix, get_language dan add_setting_listener)
+            max_size: Jumlah server maksimum di cache
+            ttl: Umur entri dalam detik (None = tanpa batas)
+            default_prefix: Prefix untuk DM dan server tanpa pengaturan
+            default_lang: Bahasa untuk DM dan server tanpa pengaturan
+        """
+        self.database = database
+        self.max_size = max_size
+        self.ttl = ttl
+        self.default_prefix = default_prefix
+        self.default_lang = default_lang
+        self._entries: "OrderedDict[int, tuple]" = OrderedDict()
+        # Listener bisa dipanggil dari thread I/O database; lock melindungi
+        # pengisian dan pembuangan entri, pembacaan yang hit tidak memakainya
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+        self.invalidations = 0
+        # Naik setiap invalidate, agar hasil baca yang kalah balapan tidak disimpan
+        self._generation = 0
+        database.add_setting_listener(self._on_setting_changed)
+    
+    def _load(self, guild_id: int) -> Dict[str, Any]:
+        """Membaca pengaturan server dari database"""
+        return {
+            "prefix": self.database.get_prefix(guild_id, self.default_prefix),
+            "language": self.database.get_language(guild_id, self.default_lang)
+        }
+    
+    def get_settings(self, guild_id: int) -> Dict[str, Any]:
+        """
+        Mendapatkan pengaturan server yang di-cache
+        
+        Args:
+            guild_id: ID server Discord
+        
+        Returns:
+            Dictionary prefix dan language (jangan diubah)
+        """
+        guild_id = int(guild_id)
+        now = time.monotonic()
+        # Jalur hit tanpa lock: get dan move_to_end atomik di bawah GIL
+        entry = self._entries.get(guild_id)
+        if entry is not None and (entry[0] is None or entry[0] > now):
+            try:
+                self._entries.move_to_end(guild_id)
+            except KeyError:
+                pass  # Baru saja dibuang listener, nilai ini tetap boleh dipakai sekali
+            self.hits += 1
+            return entry[1]
+        
+        with self._lock:
+            if entry is not None and self._entries.get(guild_id) is entry:
+                del self._entries[guild_id]
+                self.expirations += 1
+            self.misses += 1
+            generation = self._generation
+        
+        # Database dibaca di luar lock agar listener tidak ikut menunggu
+        settings = self._load(guild_id)
+        with self._lock:
+            if generation != self._generation:
+                return settings
+            self._entries[guild_id] = (None if self.ttl is None else now + self.ttl, settings)
+            self._entries.move_to_end(guild_id)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+        return settings
+    
+    def get_prefix(self, guild_id: Optional[int]) -> str:
+        """
+        Mendapatkan prefix server
+        
+        Args:
+            guild_id: ID server Discord atau None untuk DM
+        
+        Returns:
+            String prefix
+        """
+        if guild_id is None:
+            return self.default_prefix
+        return self.get_settings(guild_id)["prefix"]
+    
+    def get_language(self, guild_id: Optional[int]) -> str:
+        """
+        Mendapatkan bahasa server
+        
+        Args:
+            guild_id: ID server Discord atau None untuk DM
+        
+        Returns:
+            String kode bahasa
+        """
+        if guild_id is None:
+            return self.default_lang
+        return self.get_settings(guild_id)["language"]
+    
+    def invalidate(self, guild_id: Optional[int] = None) -> None:
+        """
+        Membuang pengaturan server dari cache
+        
+        Args:
+            guild_id: ID server Discord, None untuk mengosongkan cache
+        """
+        with self._lock:
+            self._generation += 1
+            if guild_id is None:
+                self.invalidations += len(self._entries)
+                self._entries.clear()
+            elif self._entries.pop(int(guild_id), None) is not None:
+                self.invalidations += 1
+    
+    def _on_setting_changed(self, guild_id: str, key: str, value: Any) -> None:
+        """Listener database: buang entri saat prefix atau bahasa server berubah"""
+        if key in self.KEYS:
+            self.invalidate(guild_id)
+    
+    def stats(self) -> Dict[str, Any]:
+        """
+        Mendapatkan statistik cache
+        
+        Returns:
+            Dictionary size, max_size, hits, misses, hit_rate, evictions,
+            expirations dan invalidations
+        """
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "size": len(self._entries),
+                "max_size": self.max_size,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": self.hits / lookups if lookups else 0.0,
+                "evictions": self.evictions,
+                "expirations": self.expirations,
+                "invalidations": self.invalidations
+            }
+    
+    def __len__(self) -> int:
+        return len(self._entries)
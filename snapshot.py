@@ -0,0 +1,252 @@
+"""
+Binary snapshot format for MemoryStorage.
+
+A snapshot is a small header followed by a stream of length-prefixed
+records. Records hold chunks of documents serialized with the pickle
+protocol, so encoding and decoding run in C and datetimes come back as
+datetimes instead of the strings JSON left behind. Loading only accepts
+the datetime types as globals; any other non-builtin value is stored as
+its str(), the same fallback the JSON backup used.
+
+Layout (everything after the header may be compressed as one stream):
+
+    header  : MAGIC, version (u8), compression (u8)
+    body    : repeated collection blocks, then END
+    block   : COLLECTION tag, name (u32 length + utf-8), kind (dict/list),
+              document count (u64), then records of u32 length + payload
+              until `count` documents have been read
+"""
+
+import gc
+import io
+import os
+import mmap
+import zlib
+import pickle
+import struct
+import logging
+import tempfile
+import datetime
+from typing import Dict, Any, Optional, BinaryIO
+
+try:
+    import zstandard
+except ImportError:  # zstd is optional, zlib is always available
+    zstandard = None
+
+logger = logging.getLogger("memory-db")
+
+MAGIC = b"MDBSNAP\x00"
+VERSION = 1
+
+COMPRESSION_NONE = 0
+COMPRESSION_ZLIB = 1
+COMPRESSION_ZSTD = 2
+COMPRESSION_NAMES = {None: COMPRESSION_NONE, "zlib": COMPRESSION_ZLIB, "zstd": COMPRESSION_ZSTD}
+
+HEADER = struct.Struct("<8sBB")
+NAME = struct.Struct("<BI")
+BLOCK = struct.Struct("<BQ")
+_U32 = struct.Struct("<I")
+
+# Block tags
+TAG_COLLECTION = 0x43  # "C"
+TAG_END = 0x45         # "E"
+KIND_DICT = 0
+KIND_LIST = 1
+
+# Documents per record; big enough to amortize framing, small enough to stream
+RECORD_DOCUMENTS = 1024
+# Writes are buffered and handed to the file/compressor in chunks of this size
+_CHUNK = 1 << 20
+
+_TYPED_VALUES = (datetime.datetime, datetime.date, datetime.time, datetime.timedelta, datetime.timezone)
+_GLOBAL_TYPES = set(_TYPED_VALUES) | {str}
+_ALLOWED_GLOBALS = {(cls.__module__, cls.__name__) for cls in _GLOBAL_TYPES}
+
+class _RecordPickler(pickle.Pickler):
+    """Pickler that keeps datetime values typed and stringifies everything else"""
+    
+    def reducer_override(self, obj):
+        # Not called for None/bool/int/float/str/bytes/list/tuple/dict; classes
+        # reach here when they are written as globals by the reductions below
+        if isinstance(obj, _TYPED_VALUES) or (isinstance(obj, type) and obj in _GLOBAL_TYPES):
+            return NotImplemented
+        return str, (str(obj),)
+
+class _RecordUnpickler(pickle.Unpickler):
+    """Unpickler that refuses any global other than str and the datetime types"""
+    
+    def find_class(self, module, name):
+        if (module, name) in _ALLOWED_GLOBALS:
+            return super().find_class(module, name)
+        raise pickle.UnpicklingError(f"Snapshot contains disallowed type {module}.{name}")
+
+def _pack_record(documents: list) -> bytes:
+    """Serialize one chunk of documents"""
+    buffer = io.BytesIO()
+    _RecordPickler(buffer, protocol=pickle.HIGHEST_PROTOCOL).dump(documents)
+    return buffer.getvalue()
+
+def _unpack_record(payload) -> list:
+    """Deserialize one chunk of documents"""
+    return _RecordUnpickler(io.BytesIO(payload)).load()
+
+class _Sink:
+    """File writer that optionally compresses the body as one stream"""
+    
+    def __init__(self, f: BinaryIO, compression: int, level: Optional[int]):
+        self.f = f
+        if compression == COMPRESSION_ZLIB:
+            self.compressor = zlib.compressobj(6 if level is None else level)
+        elif compression == COMPRESSION_ZSTD:
+            self.compressor = zstandard.ZstdCompressor(level=3 if level is None else level).compressobj()
+        else:
+            self.compressor = None
+    
+    def write(self, data) -> None:
+        if self.compressor is not None:
+            data = self.compressor.compress(bytes(data))
+        if data:
+            self.f.write(data)
+    
+    def close(self) -> None:
+        if self.compressor is not None:
+            self.f.write(self.compressor.flush())
+
+def write_snapshot(filename: str, collections: Dict[str, Any],
+                   compression: Optional[str] = None, level: Optional[int] = None) -> int:
+    """
+    Write collections to a binary snapshot atomically.
+    
+    The file is written to a temporary sibling, fsynced and renamed over
+    the target, so a crash never leaves a half-written snapshot.
+    Returns the size of the file in bytes.
+    """
+    if compression not in COMPRESSION_NAMES:
+        raise ValueError(f"Unknown snapshot compression: {compression}")
+    if compression == "zstd" and zstandard is None:
+        logger.warning("zstandard is not installed, compressing snapshot with zlib")
+        compression = "zlib"
+    codec = COMPRESSION_NAMES[compression]
+    
+    directory = os.path.dirname(os.path.abspath(filename))
+    fd, tmp_path = tempfile.mkstemp(prefix=".snapshot-", suffix=".tmp", dir=directory)
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(HEADER.pack(MAGIC, VERSION, codec))
+            sink = _Sink(f, codec, level)
+            out = bytearray()
+            
+            # Take the document lists up front so writers on other threads
+            # cannot resize a collection while it is being walked
+            for name, docs in list(collections.items()):
+                is_dict = isinstance(docs, dict)
+                records = list(docs.items()) if is_dict else list(docs)
+                encoded_name = name.encode("utf-8")
+                out += NAME.pack(TAG_COLLECTION, len(encoded_name))
+                out += encoded_name
+                out += BLOCK.pack(KIND_DICT if is_dict else KIND_LIST, len(records))
+                
+                for start in range(0, len(records), RECORD_DOCUMENTS):
+                    payload = _pack_record(records[start:start + RECORD_DOCUMENTS])
+                    out += _U32.pack(len(payload))
+                    out += payload
+                    if len(out) >= _CHUNK:
+                        sink.write(out)
+                        out.clear()
+            
+            out.append(TAG_END)
+            sink.write(out)
+            sink.close()
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, filename)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.unlink(tmp_path)
+        raise
+    return os.path.getsize(filename)
+
+def is_snapshot(filename: str) -> bool:
+    """Check whether a file starts with the binary snapshot magic"""
+    with open(filename, "rb") as f:
+        return f.read(len(MAGIC)) == MAGIC
+
+def read_snapshot(filename: str) -> Dict[str, Any]:
+    """
+    Read a binary snapshot written by write_snapshot.
+    
+    Uncompressed snapshots are decoded straight from a memory map, so the
+    file is paged in by the OS record by record instead of being read into
+    one large buffer first.
+    """
+    with open(filename, "rb") as f:
+        if os.fstat(f.fileno()).st_size < HEADER.size:
+            raise ValueError(f"{filename} is too small to be a snapshot")
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+            magic, version, codec = HEADER.unpack_from(mapped, 0)
+            if magic != MAGIC:
+                raise ValueError(f"{filename} is not a memory-db snapshot")
+            if version != VERSION:
+                raise ValueError(f"Unsupported snapshot version {version}")
+            
+            if codec == COMPRESSION_NONE:
+                return _read_body(mapped, HEADER.size)
+            if codec == COMPRESSION_ZLIB:
+                body = zlib.decompress(mapped[HEADER.size:])
+            elif codec == COMPRESSION_ZSTD:
+                if zstandard is None:
+                    raise ValueError("Snapshot is zstd-compressed but zstandard is not installed")
+                body = zstandard.ZstdDecompressor().decompressobj().decompress(mapped[HEADER.size:])
+            else:
+                raise ValueError(f"Unknown snapshot compression {codec}")
+    return _read_body(body, 0)
+
+def _read_body(buffer, pos: int) -> Dict[str, Any]:
+    """Decode the collection blocks of a snapshot body"""
+    # Millions of new containers would otherwise trigger repeated full GC
+    # passes that find nothing to collect
+    was_enabled = gc.isenabled()
+    gc.disable()
+    try:
+        return _read_collections(buffer, pos)
+    finally:
+        if was_enabled:
+            gc.enable()
+
+def _read_collections(buffer, pos: int) -> Dict[str, Any]:
+    """Decode collection blocks until the end marker"""
+    collections: Dict[str, Any] = {}
+    size = len(buffer)
+    while True:
+        if pos >= size:
+            raise ValueError("Corrupt snapshot: missing end marker")
+        tag = buffer[pos]
+        if tag == TAG_END:
+            return collections
+        if tag != TAG_COLLECTION:
+            raise ValueError(f"Corrupt snapshot: unexpected block tag {tag} at offset {pos}")
+        
+        _, length = NAME.unpack_from(buffer, pos)
+        pos += NAME.size
+        name = str(buffer[pos:pos + length], "utf-8")
+        pos += length
+        kind, count = BLOCK.unpack_from(buffer, pos)
+        pos += BLOCK.size
+        
+        docs: Any = {} if kind == KIND_DICT else []
+        loaded = 0
+        while loaded < count:
+            (length,) = _U32.unpack_from(buffer, pos)
+            pos += _U32.size
+            if pos + length > size:
+                raise ValueError(f"Corrupt snapshot: truncated record in {name}")
+            records = _unpack_record(buffer[pos:pos + length])
+            pos += length
+            if kind == KIND_DICT:
+                docs.update(records)
+            else:
+                docs.extend(records)
+            loaded += len(records)
+        collections[name] = docs
@@ -9,7 +9,7 @@ from discord.ext import commands
 
 from src.core.config import EMBED_COLORS, BOT_INFO
 from src.core.database import db
-from src.utils import log_command
+from embed_cache import embed_cache
 
 class HelpCommand(commands.Cog):
     """Command help untuk menampilkan bantuan"""
@@ -41,10 +41,71 @@ class HelpCommand(commands.Cog):
             "imsakiyah": "imsakiyah <kota>"
         }
     
+    def _render_command_help(self, command, prefix: str) -> discord.Embed:
+        """Membangun embed bantuan untuk satu command"""
+        # Get command description
+        if command.name in self.command_desc:
+            desc = self.command_desc[command.name]
+        else:
+            desc = command.help or "Tidak ada deskripsi"
+        
+        # Create embed for command help
+        embed = discord.Embed(
+            title=f"Bantuan: {prefix}{command.name}",
+            description=desc,
+            color=EMBED_COLORS["primary"]
+        )
+        
+        # Add usage if available
+        usage = self.command_usage.get(command.name)
+        if usage:
+            embed.add_field(name="Penggunaan", value=f"`{prefix}{usage}`", inline=False)
+        
+        # Add aliases if available
+        if command.aliases:
+            aliases = ", ".join([f"`{prefix}{alias}`" for alias in command.aliases])
+            embed.add_field(name="Alias", value=aliases, inline=False)
+        
+        return embed
+    
+    def _render_menu(self, prefix: str) -> discord.Embed:
+        """Membangun embed menu bantuan umum (tanpa footer per pengguna)"""
+        embed = discord.Embed(
+            title="📚 Menu Bantuan", 
+            description=f"Berikut adalah daftar perintah yang tersedia. Gunakan `{prefix}help <perintah>` untuk info lebih lanjut.", 
+            color=EMBED_COLORS["primary"]
+        )
+        
+        # Get all command categories
+        categories = {
+            "Umum": ["help", "ping", "info", "stats", "invite"],
+            "Setelan": ["prefix", "language"],
+            "Anime": ["anime", "waifu"],
+            "Islami": ["imsakiyah"]
+        }
+        
+        # Add fields for each category
+        for category, cmds in categories.items():
+            # Filter commands that exist
+            valid_cmds = []
+            for cmd_name in cmds:
+                cmd = self.bot.get_command(cmd_name)
+                if cmd:
+                    valid_cmds.append(f"`{prefix}{cmd_name}`")
+            
+            if valid_cmds:
+                embed.add_field(
+                    name=f"⚙️ {category}",
+                    value=" • ".join(valid_cmds),
+                    inline=False
+                )
+        
+        return embed
+    
     @commands.command(name="help", aliases=["bantuan", "h", "menu"])
     async def help(self, ctx, command_name=None):
         """Menampilkan daftar perintah yang tersedia"""
-        prefix = db.get_prefix(ctx.guild.id if ctx.guild else None)
+        prefix = await db.aget_prefix(ctx.guild.id if ctx.guild else None)
         
         if command_name:
             # Show help for specific command
@@ -58,61 +119,15 @@ class HelpCommand(commands.Cog):
                 await ctx.send(embed=embed)
                 return
             
-            # Get command description
-            if command.name in self.command_desc:
-                desc = self.command_desc[command.name]
-            else:
-                desc = command.help or "Tidak ada deskripsi"
-            
-            # Create embed for command help
-            embed = discord.Embed(
-                title=f"Bantuan: {prefix}{command.name}",
-                description=desc,
-                color=EMBED_COLORS["primary"]
+            # Embed hanya bergantung pada command dan prefix, jadi diambil dari cache
+            embed = embed_cache.get(
+                ("help", prefix, command.qualified_name),
+                lambda: self._render_command_help(command, prefix)
             )
-            
-            # Add usage if available
-            usage = self.command_usage.get(command.name)
-            if usage:
-                embed.add_field(name="Penggunaan", value=f"`{prefix}{usage}`", inline=False)
-            
-            # Add aliases if available
-            if command.aliases:
-                aliases = ", ".join([f"`{prefix}{alias}`" for alias in command.aliases])
-                embed.add_field(name="Alias", value=aliases, inline=False)
-            
             await ctx.send(embed=embed)
         else:
             # Show general help menu
-            embed = discord.Embed(
-                title="📚 Menu Bantuan", 
-                description=f"Berikut adalah daftar perintah yang tersedia. Gunakan `{prefix}help <perintah>` untuk info lebih lanjut.", 
-                color=EMBED_COLORS["primary"]
-            )
-            
-            # Get all command categories
-            categories = {
-                "Umum": ["help", "ping", "info", "stats", "invite"],
-                "Setelan": ["prefix", "language"],
-                "Anime": ["anime", "waifu"],
-                "Islami": ["imsakiyah"]
-            }
-            
-            # Add fields for each category
-            for category, cmds in categories.items():
-                # Filter commands that exist
-                valid_cmds = []
-                for cmd_name in cmds:
-                    cmd = self.bot.get_command(cmd_name)
-                    if cmd:
-                        valid_cmds.append(f"`{prefix}{cmd_name}`")
-                
-                if valid_cmds:
-                    embed.add_field(
-                        name=f"⚙️ {category}",
-                        value=" • ".join(valid_cmds),
-                        inline=False
-                    )
+            embed = embed_cache.get(("help", prefix), lambda: self._render_menu(prefix))
             
             # Add footer with bot info
             embed.set_footer(
@@ -121,9 +136,6 @@ class HelpCommand(commands.Cog):
             )
             
             await ctx.send(embed=embed)
-        
-        # Log command usage
-        log_command(ctx.author.id, ctx.guild.id if ctx.guild else None, "help")
 
 def setup(bot):
     """Adds the HelpCommand cog to the bot."""
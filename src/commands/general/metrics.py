@@ -0,0 +1,53 @@
+"""
+metrics.py - Command metrics untuk bot Discord
+
+Modul ini berisi command metrics untuk menampilkan histogram latensi dan
+tingkat error per command dan per API upstream.
+"""
+
+import discord
+from discord.ext import commands
+
+from src.core.config import EMBED_COLORS
+from metrics import metrics, format_table
+
+class Metrics(commands.Cog):
+    """Command metrics untuk mencari jalur lambat"""
+    
+    def __init__(self, bot):
+        self.bot = bot
+    
+    @commands.command(name="metrics", aliases=["metrik"])
+    @commands.has_permissions(administrator=True)
+    async def show_metrics(self, ctx, limit: int = 10):
+        """Menampilkan latensi p50/p99 dan error rate per command dan API (hanya admin)"""
+        snapshot = metrics.snapshot()
+        # Field embed dibatasi 1024 karakter
+        limit = max(1, min(limit, 15))
+        
+        embed = discord.Embed(
+            title="⏱️ Metrics",
+            description=f"Websocket: `{self.bot.latency * 1000:.0f}ms` | Diurutkan dari p99 terbesar",
+            color=EMBED_COLORS["info"]
+        )
+        embed.add_field(
+            name="Command",
+            value=f"```\n{format_table(snapshot['commands'], limit)}\n```",
+            inline=False
+        )
+        embed.add_field(
+            name="API Upstream",
+            value=f"```\n{format_table(snapshot['upstreams'], limit)}\n```",
+            inline=False
+        )
+        
+        embed.set_footer(
+            text=f"Requested by {ctx.author.name}",
+            icon_url=ctx.author.avatar.url if ctx.author.avatar else None
+        )
+        
+        await ctx.send(embed=embed)
+
+def setup(bot):
+    """Adds the Metrics cog to the bot."""
+    bot.add_cog(Metrics(bot))
@@ -9,7 +9,6 @@ import discord
 from discord.ext import commands
 
 from src.core.config import EMBED_COLORS
-from src.utils import log_command
 
 class Ping(commands.Cog):
     """Command ping untuk cek latensi bot"""
@@ -42,9 +41,6 @@ class Ping(commands.Cog):
         )
         
         await message.edit(content=None, embed=embed)
-        
-        # Log command usage
-        log_command(ctx.author.id, ctx.guild.id if ctx.guild else None, "ping")
 
 def setup(bot):
     """Adds the Ping cog to the bot."""
@@ -0,0 +1,65 @@
+"""
+stats.py - Command stats untuk bot Discord
+
+Modul ini berisi command stats untuk menampilkan statistik penggunaan bot
+dan kinerja cache pengaturan server.
+"""
+
+import discord
+from discord.ext import commands
+
+from src.core.config import EMBED_COLORS
+from src.core.database import db
+from src.utils import get_settings_cache_stats
+
+class Stats(commands.Cog):
+    """Command stats untuk melihat statistik bot"""
+    
+    def __init__(self, bot):
+        self.bot = bot
+    
+    @commands.command(name="stats", aliases=["statistik"])
+    @commands.has_permissions(administrator=True)
+    async def stats(self, ctx):
+        """Menampilkan statistik penggunaan bot (hanya admin)"""
+        command_stats = await db.aget_command_stats()
+        total_commands = await db.aget_total_commands()
+        cache = get_settings_cache_stats()
+        
+        embed = discord.Embed(
+            title="📊 Statistik Bot",
+            description=f"Total command digunakan: `{total_commands}`",
+            color=EMBED_COLORS["info"]
+        )
+        
+        # Top command
+        top_commands = sorted(command_stats.items(), key=lambda item: item[1], reverse=True)[:5]
+        if top_commands:
+            embed.add_field(
+                name="Command Terpopuler",
+                value="\n".join(f"`{name}`: {count}" for name, count in top_commands),
+                inline=False
+            )
+        
+        # Cache pengaturan server
+        embed.add_field(
+            name="Cache Pengaturan Server",
+            value=(
+                f"Hit rate: `{cache['hit_rate'] * 100:.1f}%` ({cache['hits']} hit / {cache['misses']} miss)\n"
+                f"Isi: `{cache['size']}/{cache['max_size']}` server\n"
+                f"Eviction: `{cache['evictions']}` | Kedaluwarsa: `{cache['expirations']}` | "
+                f"Invalidasi: `{cache['invalidations']}`"
+            ),
+            inline=False
+        )
+        
+        embed.set_footer(
+            text=f"Requested by {ctx.author.name}",
+            icon_url=ctx.author.avatar.url if ctx.author.avatar else None
+        )
+        
+        await ctx.send(embed=embed)
+
+def setup(bot):
+    """Adds the Stats cog to the bot."""
+    bot.add_cog(Stats(bot))
@@ -15,37 +15,73 @@ from typing import List, Optional, Callable, Dict, Any
 import discord
 from discord.ext import commands
 
-from src.core.config import TOKEN, DEFAULT_PREFIX, LOGGING_CONFIG, BOT_INFO
+from src.core.config import (
+    BOT_TOKEN, PREFIX, BOT_INFO, LOG_FILE, LOG_ERROR_FILE, LOG_LEVEL, LOG_MAX_BYTES, LOG_BACKUP_COUNT,
+    METRICS_FILE, METRICS_EXPORT_INTERVAL, COOLDOWN, COOLDOWNS, RATE_LIMIT_BURST, RATE_LIMIT_GUILD_MULTIPLIER,
+    RATE_LIMIT_MAX_BUCKETS, UPSTREAM_BUDGETS, UPSTREAM_MAX_WAIT
+)
 from src.core.database import db
+from src.core.prefix import PrefixTable, mention_prefixes, could_be_command
+from embed_cache import embed_cache
+from log_pipeline import setup_logging
+from command_middleware import CommandMiddleware
+from metrics import metrics
+from rate_limit import CommandRateLimiter, RateLimited, upstream_budget
+from bot_counters import counters
+from src.utils.helper import get_text
 
-# Setup logging
-logging.basicConfig(
-    format=LOGGING_CONFIG["format"],
-    datefmt=LOGGING_CONFIG["datefmt"],
-    level=getattr(logging, LOGGING_CONFIG["level"])
+# Setup logging: record dikirim ke antrean, ditulis oleh thread listener
+log_pipeline = setup_logging(
+    log_file=LOG_FILE,
+    error_file=LOG_ERROR_FILE,
+    level=LOG_LEVEL,
+    max_bytes=LOG_MAX_BYTES,
+    backup_count=LOG_BACKUP_COUNT
 )
 logger = logging.getLogger("bot")
 
+# Prefix per server di memori, dibuang otomatis saat set_prefix
+prefix_table = PrefixTable(db, PREFIX)
+
 # Custom prefix getter
-def get_prefix(bot, message):
+async def get_prefix(bot, message):
     """
     Mendapatkan prefix untuk pesan yang diterima
     
+    Dibaca dari tabel prefix di memori, dan mention bot juga diterima
+    sebagai prefix.
+    
     Args:
         bot: Instance bot
         message: Pesan yang diterima
         
     Returns:
-        String prefix
+        List prefix
     """
-    if message.guild:
-        return db.get_prefix(message.guild.id, DEFAULT_PREFIX)
-    return DEFAULT_PREFIX
+    prefix = prefix_table.get(message.guild.id if message.guild else None)
+    return [prefix, *mention_prefixes(bot.user.id)]
 
 # Initialize bot with intents
 intents = discord.Intents.all()
 bot = commands.Bot(command_prefix=get_prefix, intents=intents, help_command=None)
 
+# Dedupe, timing dan log command untuk semua command, disimpan per batch
+command_middleware = CommandMiddleware(db.alog_commands).install(bot)
+
+# Token bucket per pengguna/server per kategori COOLDOWNS, dan budget global per API
+rate_limiter = CommandRateLimiter(
+    COOLDOWNS,
+    default_cooldown=COOLDOWN,
+    burst=RATE_LIMIT_BURST,
+    guild_multiplier=RATE_LIMIT_GUILD_MULTIPLIER,
+    max_buckets=RATE_LIMIT_MAX_BUCKETS
+).install(bot)
+upstream_budget.configure(UPSTREAM_BUDGETS, max_wait=UPSTREAM_MAX_WAIT)
+
+# Jumlah server/pengguna/channel diperbarui per event, dibaca presence, stats dan dashboard
+counters.install(bot)
+metrics.register_gauges("bot", counters.snapshot)
+
 # Handle shutdowns gracefully
 def handle_exit(signum, frame):
     """
@@ -57,8 +93,10 @@ def handle_exit(signum, frame):
     """
     logger.info(f"Menerima signal {signum}, mematikan bot dengan baik...")
     
-    # Cleanup if needed
-    # db._save_data()  # Make sure all data is saved
+    # Flush buffered command logs and pending database writes before exiting
+    db.log_commands(command_middleware.drain())
+    db.close()
+    metrics.close()
     
     sys.exit(0)
 
@@ -74,7 +112,31 @@ bot.version = BOT_INFO.get('version', '1.0.0')
 async def on_ready():
     """Event yang dipanggil saat bot siap"""
     logger.info(f"Bot siap! Masuk sebagai {bot.user.name} (ID: {bot.user.id})")
-    logger.info(f"Terhubung ke {len(bot.guilds)} server | Melayani {len(set(bot.get_all_members()))} pengguna")
+    logger.info(f"Terhubung ke {counters.guilds} server | Melayani {counters.users} pengguna")
+
+@bot.event
+async def on_command_error(ctx, error):
+    """
+    Event yang dipanggil saat command gagal
+    
+    Args:
+        ctx: Context command
+        error: Exception yang terjadi
+    """
+    if isinstance(error, RateLimited):
+        # Hanya penolakan pertama yang dibalas, sisanya diabaikan diam-diam
+        if error.notify:
+            guild_id = ctx.guild.id if ctx.guild else None
+            await ctx.send(get_text(guild_id, "errors.rate_limited", seconds=max(1, round(error.retry_after))), delete_after=5)
+        return
+    if isinstance(error, commands.CommandNotFound):
+        return
+    logger.error(f"Error pada command {ctx.command}: {error}", exc_info=error)
+
+@bot.event
+async def on_guild_remove(guild):
+    """Membuang prefix server yang sudah ditinggalkan dari tabel"""
+    prefix_table.invalidate(guild.id)
 
 @bot.event
 async def on_message(message):
@@ -88,6 +150,11 @@ async def on_message(message):
     if message.author.bot:
         return
     
+    # Tolak obrolan biasa sebelum Context dibangun
+    prefix = prefix_table.get(message.guild.id if message.guild else None)
+    if not could_be_command(message.content, prefix, mention_prefixes(bot.user.id)):
+        return
+    
     # Process commands
     await bot.process_commands(message)
 
@@ -111,6 +178,9 @@ def load_extensions(extension_list: List[str]) -> Dict[str, bool]:
             logger.error(f"Gagal memuat ekstensi {extension}: {e}")
             results[extension] = False
     
+    # Daftar command berubah, embed help lama tidak berlaku lagi
+    embed_cache.invalidate()
+    
     return results
 
 def run_bot():
@@ -122,6 +192,7 @@ def run_bot():
         "src.commands.general.info",
         "src.commands.general.ping",
         "src.commands.general.stats",
+        "src.commands.general.metrics",
         "src.commands.general.invite",
         "src.commands.settings.prefix",
         "src.commands.settings.language",
@@ -138,10 +209,13 @@ def run_bot():
     if failed:
         logger.warning(f"Gagal memuat {len(failed)} ekstensi: {', '.join(failed)}")
     
+    # Snapshot metrics berkala untuk backend
+    metrics.start_export(METRICS_FILE, METRICS_EXPORT_INTERVAL)
+    
     # Run the bot
     try:
         logger.info(f"Memulai bot: {BOT_INFO['name']} v{BOT_INFO['version']}...")
-        bot.run(TOKEN)
+        bot.run(BOT_TOKEN)
     except discord.errors.LoginFailure:
         logger.critical("Token Discord tidak valid. Cek file .env Anda.")
         sys.exit(1)
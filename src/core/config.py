@@ -20,13 +20,38 @@ OWNER_ID = int(os.getenv('OWNER_ID', '0'))  # Bot owner's Discord ID
 
 # Log file configuration
 LOG_FILE = "logs/bot.log"
+LOG_ERROR_FILE = "logs/error.log"  # Hanya ERROR ke atas
 LOG_LEVEL = "INFO"  # DEBUG, INFO, WARNING, ERROR, CRITICAL
+# Ukuran file log sebelum dirotasi dan jumlah file lama yang disimpan
+LOG_MAX_BYTES = int(os.getenv('LOG_MAX_BYTES', str(5 * 1024 * 1024)))
+LOG_BACKUP_COUNT = int(os.getenv('LOG_BACKUP_COUNT', '5'))
 
 # Database configuration
 DATABASE_FILE = "src/data/database.json"
-
-# Command cooldown (in seconds)
-COOLDOWN = 3
+# Backend penyimpanan: "json" (snapshot + journal) atau "sqlite"
+DATABASE_BACKEND = os.getenv('DATABASE_BACKEND', 'json').lower()
+# Jumlah log command yang ditulis per batch oleh backend SQLite
+COMMAND_LOG_BATCH_SIZE = int(os.getenv('COMMAND_LOG_BATCH_SIZE', '500'))
+# Jeda write-behind database dalam detik (0 = tulis langsung setiap perubahan)
+DATABASE_FLUSH_INTERVAL = float(os.getenv('DATABASE_FLUSH_INTERVAL', '5'))
+# Snapshot ditulis ulang saat journal melebihi rasio ini terhadap ukuran snapshot
+JOURNAL_COMPACTION_RATIO = float(os.getenv('JOURNAL_COMPACTION_RATIO', '2'))
+# Jumlah server maksimum di cache pengaturan server (prefix/bahasa)
+GUILD_SETTINGS_CACHE_SIZE = int(os.getenv('GUILD_SETTINGS_CACHE_SIZE', '10000'))
+# Umur entri cache pengaturan server dalam detik
+GUILD_SETTINGS_CACHE_TTL = float(os.getenv('GUILD_SETTINGS_CACHE_TTL', '3600'))
+
+# Command cooldown, rate limiter and upstream budgets are shared with the
+# root modules (main_updated.py), so they are defined once in constants.py
+from constants import (
+    COOLDOWN,
+    COOLDOWNS,
+    RATE_LIMIT_BURST,
+    RATE_LIMIT_GUILD_MULTIPLIER,
+    RATE_LIMIT_MAX_BUCKETS,
+    UPSTREAM_BUDGETS,
+    UPSTREAM_MAX_WAIT
+)
 
 # Warna untuk embed Discord
 EMBED_COLORS = {
@@ -132,15 +157,11 @@ HELP_TEXT = {
 
 # Path-path penting
 BASE_DIR = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
-DATA_DIR = os.path.join(BASE_DIR, "src", "data")
+DATA_DIR = os.getenv('DATA_DIR', os.path.join(BASE_DIR, "src", "data"))
 
 # Pastikan direktori data ada
 os.makedirs(DATA_DIR, exist_ok=True)
 
-# Command cooldowns (seconds)
-COOLDOWNS = {
-    "general": 3,
-    "anime": 5,
-    "waifu": 3,
-    "imsakiyah": 5
-} 
\ No newline at end of file
+# Snapshot histogram latensi/error, dibaca endpoint /api/metrics di backend
+METRICS_FILE = os.getenv('METRICS_FILE', os.path.join(DATA_DIR, "metrics.json"))
+METRICS_EXPORT_INTERVAL = float(os.getenv('METRICS_EXPORT_INTERVAL', '15'))
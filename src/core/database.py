@@ -6,28 +6,67 @@ atau file JSON sederhana.
 """
 
 import os
+import glob
 import json
 import time
+import atexit
 import logging
-from typing import Dict, Any, Optional, List, Union
+import tempfile
+import threading
+from typing import Dict, Any, Optional, List, Union, Tuple
 
-from src.core.config import DATA_DIR
+from src.core.config import DATA_DIR, DATABASE_BACKEND, DATABASE_FLUSH_INTERVAL, JOURNAL_COMPACTION_RATIO
+from src.core.storage import AsyncStorageMixin
 
 logger = logging.getLogger("database")
 
-class Database:
+# Journal tidak dipadatkan sebelum mencapai ukuran ini
+JOURNAL_MIN_COMPACTION_BYTES = 64 * 1024
+
+class Database(AsyncStorageMixin):
     """
     Kelas Database untuk menyimpan dan mengelola data bot
+    
+    Data disimpan sebagai snapshot JSON ditambah journal append-only.
+    Setiap perubahan ditulis sebagai satu record kecil di journal, lalu
+    journal diputar ulang di atas snapshot saat startup. Snapshot baru
+    hanya ditulis saat journal sudah terlalu besar dibanding snapshot.
+    
+    Semua data ada di memori, jadi API async membaca langsung dan hanya
+    penulisan journal yang dikirim ke thread I/O.
     """
-    def __init__(self, filename: str = "database.json"):
+    MEMORY_RESIDENT = True
+    
+    def __init__(self, filename: str = "database.json", flush_interval: Optional[float] = DATABASE_FLUSH_INTERVAL,
+                 compaction_ratio: float = JOURNAL_COMPACTION_RATIO, data_dir: str = DATA_DIR):
         """
         Inisialisasi database
         
         Args:
             filename: Nama file untuk menyimpan data
+            flush_interval: Jeda antar fsync journal dalam detik,
+                None atau 0 untuk fsync setiap perubahan
+            compaction_ratio: Rasio ukuran journal terhadap snapshot
+                yang memicu penulisan snapshot baru
+            data_dir: Direktori tempat file database disimpan
         """
-        self.filename = os.path.join(DATA_DIR, filename)
+        self.filename = os.path.join(data_dir, filename)
+        self.journal_prefix = f"{self.filename}.journal."
+        self.flush_interval = flush_interval
+        self.compaction_ratio = compaction_ratio
+        
+        self._lock = threading.RLock()
+        self._write_lock = threading.Lock()
+        self._dirty = False
+        self._closed = threading.Event()
+        self._flusher = None
+        self._journal = None
+        self._journal_gen = 0
+        self._journal_bytes = 0
+        self._snapshot_bytes = 0
+        
         self.data = self._load_data()
+        self._seq = self.data.pop("_journal_seq", 0)
         
         # Setup default structure
         if "settings" not in self.data:
@@ -46,8 +85,20 @@ class Database:
         if "cache" not in self.data:
             self.data["cache"] = {}
         
-        # Simpan struktur default
-        self._save_data()
+        # Putar ulang journal, lalu mulai generasi journal baru agar
+        # record yang terpotong saat crash tidak tersambung dengan record baru
+        replayed = self._replay_journal()
+        self._open_journal(self._journal_gen + 1)
+        
+        # Simpan struktur default dan padatkan journal lama
+        if replayed or len(self._journal_files()) > 1 or not os.path.exists(self.filename):
+            with self._write_lock:
+                self._compact()
+        
+        if self.flush_interval:
+            self._flusher = threading.Thread(target=self._flush_loop, name="database-flusher", daemon=True)
+            self._flusher.start()
+        atexit.register(self.close)
         
     def _load_data(self) -> Dict[str, Any]:
         """
@@ -58,6 +109,7 @@ class Database:
         """
         if os.path.exists(self.filename):
             try:
+                self._snapshot_bytes = os.path.getsize(self.filename)
                 with open(self.filename, "r", encoding="utf-8") as f:
                     return json.load(f)
             except Exception as e:
@@ -70,13 +122,221 @@ class Database:
         
         return {}
     
-    def _save_data(self) -> None:
-        """Menyimpan data ke file"""
+    def _save_data(self, payload: str) -> bool:
+        """
+        Menulis snapshot ke file secara atomik
+        
+        Data ditulis ke file sementara di direktori yang sama, di-fsync,
+        lalu di-rename menggantikan file lama sehingga file database
+        tidak pernah setengah tertulis.
+        
+        Args:
+            payload: Isi JSON yang sudah diserialisasi
+            
+        Returns:
+            True jika snapshot berhasil ditulis
+        """
+        directory = os.path.dirname(self.filename) or "."
         try:
-            with open(self.filename, "w", encoding="utf-8") as f:
-                json.dump(self.data, f, indent=2, ensure_ascii=False)
+            fd, tmp_path = tempfile.mkstemp(prefix=".database-", suffix=".tmp", dir=directory)
+            try:
+                with os.fdopen(fd, "w", encoding="utf-8") as f:
+                    f.write(payload)
+                    f.flush()
+                    os.fsync(f.fileno())
+                os.replace(tmp_path, self.filename)
+            except BaseException:
+                os.unlink(tmp_path)
+                raise
+            return True
         except Exception as e:
             logger.error(f"Gagal menyimpan database: {e}")
+            return False
+    
+    # -- Journal --
+    
+    def _journal_files(self) -> List[Tuple[int, str]]:
+        """
+        Mendapatkan file journal yang ada, diurutkan per generasi
+        
+        Returns:
+            List tuple (generasi, path)
+        """
+        files = []
+        for path in glob.glob(f"{glob.escape(self.journal_prefix)}*"):
+            suffix = path[len(self.journal_prefix):]
+            if suffix.isdigit():
+                files.append((int(suffix), path))
+        return sorted(files)
+    
+    def _replay_journal(self) -> int:
+        """
+        Memutar ulang journal di atas snapshot yang sudah dimuat
+        
+        Record dengan nomor urut yang sudah tercakup snapshot dilewati,
+        sehingga replay aman diulang setelah crash di tengah pemadatan.
+        
+        Returns:
+            Jumlah record yang diterapkan
+        """
+        applied = 0
+        for gen, path in self._journal_files():
+            self._journal_gen = max(self._journal_gen, gen)
+            with open(path, "r", encoding="utf-8") as f:
+                for line_no, line in enumerate(f, start=1):
+                    line = line.strip()
+                    if not line:
+                        continue
+                    try:
+                        record = json.loads(line)
+                    except ValueError:
+                        # Hanya record terakhir yang bisa terpotong saat crash
+                        logger.warning(f"Record journal rusak di {path}:{line_no}, sisa file diabaikan")
+                        break
+                    if record[0] <= self._seq:
+                        continue
+                    self._apply(record)
+                    self._seq = record[0]
+                    applied += 1
+        
+        if applied:
+            logger.info(f"{applied} record journal diputar ulang")
+        return applied
+    
+    def _open_journal(self, gen: int) -> None:
+        """
+        Membuka file journal generasi baru untuk ditambahkan
+        
+        Args:
+            gen: Nomor generasi journal
+        """
+        if self._journal is not None:
+            self._journal.close()
+        self._journal_gen = gen
+        self._journal = open(f"{self.journal_prefix}{gen:06d}", "a", encoding="utf-8")
+        self._journal_bytes = 0
+    
+    def _apply(self, record: List[Any]) -> None:
+        """
+        Menerapkan satu record journal ke data di memori
+        
+        Args:
+            record: List [seq, op, *args]
+        """
+        op = record[1]
+        if op == "set":
+            _, _, guild_id, key, value = record
+            self.data["settings"]["guilds"].setdefault(guild_id, {})[key] = value
+        elif op == "user":
+            self.data["settings"]["users"][record[2]] = record[3]
+        elif op == "cmd":
+            command = record[2]
+            commands = self.data["stats"]["commands"]
+            commands[command] = commands.get(command, 0) + 1
+            self.data["stats"]["total_commands"] += 1
+        elif op == "cmds":
+            commands = self.data["stats"]["commands"]
+            for command, count in record[2].items():
+                commands[command] = commands.get(command, 0) + count
+                self.data["stats"]["total_commands"] += count
+        elif op == "cache":
+            self.data["cache"][record[2]] = record[3]
+        elif op == "uncache":
+            if record[2] is None:
+                self.data["cache"] = {}
+            else:
+                self.data["cache"].pop(record[2], None)
+        else:
+            logger.warning(f"Operasi journal tidak dikenal: {op}")
+    
+    def _record(self, op: str, *args: Any) -> None:
+        """
+        Menerapkan perubahan ke memori dan menambahkannya ke journal
+        
+        Args:
+            op: Nama operasi
+            *args: Argumen operasi
+        """
+        with self._lock:
+            record = [self._seq + 1, op, *args]
+            # Serialisasi dulu: argumen yang tidak bisa di-JSON-kan gagal
+            # sebelum state di memori berubah
+            line = json.dumps(record, ensure_ascii=False, separators=(",", ":")) + "\n"
+            self._seq += 1
+            self._apply(record)
+            try:
+                self._journal.write(line)
+                self._journal.flush()
+                self._journal_bytes += len(line.encode("utf-8"))
+            except Exception as e:
+                logger.error(f"Gagal menulis journal: {e}")
+            self._dirty = True
+        
+        # flush() mengambil _write_lock lalu _lock; dipanggil setelah _lock
+        # dilepas agar urutan kunci selalu sama dan tidak terjadi deadlock
+        if not self.flush_interval:
+            self.flush()
+    
+    def _compact(self) -> None:
+        """
+        Menulis snapshot baru dan menghapus journal yang sudah tercakup
+        
+        Harus dipanggil dengan _write_lock dipegang.
+        """
+        with self._lock:
+            snapshot = dict(self.data)
+            snapshot["_journal_seq"] = self._seq
+            payload = json.dumps(snapshot, ensure_ascii=False, separators=(",", ":"))
+            # Record baru masuk ke generasi berikutnya
+            self._open_journal(self._journal_gen + 1)
+            covered = [path for gen, path in self._journal_files() if gen < self._journal_gen]
+        
+        if not self._save_data(payload):
+            return
+        self._snapshot_bytes = len(payload.encode("utf-8"))
+        for path in covered:
+            try:
+                os.remove(path)
+            except OSError as e:
+                logger.warning(f"Gagal menghapus journal {path}: {e}")
+        logger.debug(f"Snapshot database dipadatkan ({self._snapshot_bytes} bytes)")
+    
+    def _flush_loop(self) -> None:
+        """Loop flusher background, paling banyak satu fsync per interval"""
+        while not self._closed.wait(self.flush_interval):
+            self.flush()
+    
+    def flush(self) -> None:
+        """Men-fsync journal dan memadatkannya jika sudah melewati rasio"""
+        with self._write_lock:
+            with self._lock:
+                if not self._dirty:
+                    return
+                self._dirty = False
+                self._journal.flush()
+                fileno = self._journal.fileno()
+                journal_bytes = self._journal_bytes
+            
+            try:
+                os.fsync(fileno)
+            except OSError as e:
+                logger.error(f"Gagal fsync journal: {e}")
+            
+            threshold = max(JOURNAL_MIN_COMPACTION_BYTES, self.compaction_ratio * self._snapshot_bytes)
+            if journal_bytes > threshold:
+                self._compact()
+    
+    def close(self) -> None:
+        """Menghentikan flusher dan memaksa penulisan terakhir"""
+        if self._closed.is_set():
+            return
+        self._shutdown_io()
+        self._closed.set()
+        if self._flusher is not None:
+            self._flusher.join()
+        self.flush()
+        with self._lock:
+            self._journal.close()
     
     # -- Server Settings --
     
@@ -108,11 +368,8 @@ class Database:
             value: Nilai yang akan disimpan
         """
         guild_id = str(guild_id)  # Convert to string for JSON
-        if guild_id not in self.data["settings"]["guilds"]:
-            self.data["settings"]["guilds"][guild_id] = {}
-        
-        self.data["settings"]["guilds"][guild_id][key] = value
-        self._save_data()
+        self._record("set", guild_id, key, value)
+        self._notify_setting(guild_id, key, value)
     
     def get_prefix(self, guild_id: Optional[int], default_prefix: str = "!") -> str:
         """
@@ -166,6 +423,30 @@ class Database:
         """
         self.set_guild_setting(guild_id, "language", language)
     
+    # -- User Data --
+    
+    def get_user_data(self, user_id: int) -> Dict[str, Any]:
+        """
+        Mendapatkan data pengguna
+        
+        Args:
+            user_id: ID pengguna Discord
+            
+        Returns:
+            Dictionary data pengguna (kosong jika belum ada)
+        """
+        return self.data["settings"]["users"].get(str(user_id), {})
+    
+    def set_user_data(self, user_id: int, data: Dict[str, Any]) -> None:
+        """
+        Menyimpan data pengguna
+        
+        Args:
+            user_id: ID pengguna Discord
+            data: Data pengguna
+        """
+        self._record("user", str(user_id), data)
+    
     # -- Command Stats --
     
     def log_command(self, user_id: int, guild_id: Optional[int], command: str) -> None:
@@ -178,23 +459,31 @@ class Database:
             command: Nama command
         """
         # Update command stats
-        if command not in self.data["stats"]["commands"]:
-            self.data["stats"]["commands"][command] = 0
-        
-        self.data["stats"]["commands"][command] += 1
-        self.data["stats"]["total_commands"] += 1
+        self._record("cmd", command)
+    
+    def log_commands(self, entries: List[Tuple[float, int, Optional[int], str]]) -> None:
+        """
+        Mencatat sekumpulan penggunaan command dalam satu record journal
         
-        # Save changes
-        self._save_data()
+        Args:
+            entries: List (timestamp, user_id, guild_id, command)
+        """
+        counts: Dict[str, int] = {}
+        for _, _, _, command in entries:
+            counts[command] = counts.get(command, 0) + 1
+        if counts:
+            self._record("cmds", counts)
     
     def get_command_stats(self) -> Dict[str, int]:
         """
         Mendapatkan statistik penggunaan command
         
         Returns:
-            Dictionary dengan nama command dan jumlah penggunaan
+            Salinan dictionary nama command dan jumlah penggunaan, aman
+            diiterasi saat thread lain mencatat command
         """
-        return self.data["stats"]["commands"]
+        with self._lock:
+            return dict(self.data["stats"]["commands"])
     
     def get_total_commands(self) -> int:
         """
@@ -224,8 +513,7 @@ class Database:
         if expire is not None:
             cache_entry["expire_at"] = time.time() + expire
         
-        self.data["cache"][key] = cache_entry
-        self._save_data()
+        self._record("cache", key, cache_entry)
     
     def get_cache(self, key: str, default: Any = None) -> Any:
         """
@@ -245,8 +533,7 @@ class Database:
         
         # Check expiration
         if "expire_at" in cache_entry and time.time() > cache_entry["expire_at"]:
-            del self.data["cache"][key]
-            self._save_data()
+            self._record("uncache", key)
             return default
         
         return cache_entry["value"]
@@ -258,12 +545,8 @@ class Database:
         Args:
             key: Kunci cache atau None untuk menghapus semua
         """
-        if key is None:
-            self.data["cache"] = {}
-        elif key in self.data["cache"]:
-            del self.data["cache"][key]
-        
-        self._save_data()
+        if key is None or key in self.data["cache"]:
+            self._record("uncache", key)
     
     def clean_expired_cache(self) -> int:
         """
@@ -276,18 +559,30 @@ class Database:
         now = time.time()
         
         keys_to_delete = []
-        for key, entry in self.data["cache"].items():
+        for key, entry in list(self.data["cache"].items()):
             if "expire_at" in entry and now > entry["expire_at"]:
                 keys_to_delete.append(key)
                 count += 1
         
         for key in keys_to_delete:
-            del self.data["cache"][key]
-        
-        if count > 0:
-            self._save_data()
+            self._record("uncache", key)
         
         return count
 
+def create_database():
+    """
+    Membuat instance database sesuai DATABASE_BACKEND
+    
+    Returns:
+        Database (JSON) atau SQLiteDatabase
+    """
+    if DATABASE_BACKEND == "sqlite":
+        from src.core.sqlite_database import SQLiteDatabase
+        return SQLiteDatabase()
+    
+    if DATABASE_BACKEND != "json":
+        logger.warning(f"DATABASE_BACKEND tidak dikenal: {DATABASE_BACKEND}, memakai json")
+    return Database()
+
 # Initialize database
-db = Database() 
\ No newline at end of file
+db = create_database() 
\ No newline at end of file
@@ -0,0 +1,117 @@
+"""
+prefix.py - Tabel prefix server di memori
+
+Berisi tabel prefix per server yang dipakai get_prefix dan filter awal
+on_message. Prefix dibaca dari database sekali per server lalu disimpan
+di dict; set_prefix di database membuang entri lewat listener
+pengaturan sehingga tabel tidak pernah basi.
+"""
+
+import threading
+from typing import Dict, Optional, Tuple, Any
+
+class PrefixTable:
+    """
+    Tabel guild_id -> prefix
+    
+    Pencarian untuk server yang sudah pernah dilihat hanya satu
+    dict.get dengan ID integer, tanpa konversi string atau menelusuri
+    pengaturan database.
+    """
+    def __init__(self, database, default_prefix: str = "!"):
+        """
+        Membuat tabel prefix
+        
+        Args:
+            database: Backend database (punya get_prefix dan add_setting_listener)
+            default_prefix: Prefix untuk DM dan server tanpa pengaturan
+        """
+        self.database = database
+        self.default_prefix = default_prefix
+        self._prefixes: Dict[int, str] = {}
+        # Listener bisa dipanggil dari thread I/O database; lock melindungi
+        # pengisian dan pembuangan entri, pembacaan yang hit tidak memakainya
+        self._lock = threading.Lock()
+        # Naik setiap invalidate, agar hasil baca yang kalah balapan tidak disimpan
+        self._generation = 0
+        self.hits = 0
+        self.misses = 0
+        database.add_setting_listener(self._on_setting_changed)
+    
+    def get(self, guild_id: Optional[int]) -> str:
+        """
+        Mendapatkan prefix untuk server
+        
+        Args:
+            guild_id: ID server Discord atau None untuk DM
+        
+        Returns:
+            String prefix
+        """
+        if guild_id is None:
+            return self.default_prefix
+        prefix = self._prefixes.get(guild_id)
+        if prefix is not None:
+            self.hits += 1
+            return prefix
+        
+        with self._lock:
+            self.misses += 1
+            generation = self._generation
+        # Database dibaca di luar lock agar listener tidak ikut menunggu
+        prefix = self.database.get_prefix(guild_id, self.default_prefix)
+        with self._lock:
+            if generation == self._generation:
+                self._prefixes[guild_id] = prefix
+        return prefix
+    
+    def invalidate(self, guild_id: Optional[int] = None) -> None:
+        """
+        Membuang prefix server dari tabel
+        
+        Args:
+            guild_id: ID server Discord, None untuk mengosongkan tabel
+        """
+        with self._lock:
+            self._generation += 1
+            if guild_id is None:
+                self._prefixes.clear()
+            else:
+                self._prefixes.pop(int(guild_id), None)
+    
+    def _on_setting_changed(self, guild_id: str, key: str, value: Any) -> None:
+        """Listener database: buang entri saat prefix server berubah"""
+        if key == "prefix":
+            self.invalidate(guild_id)
+    
+    def __len__(self) -> int:
+        return len(self._prefixes)
+
+def mention_prefixes(user_id: int) -> Tuple[str, str]:
+    """
+    Mendapatkan bentuk mention bot yang bisa dipakai sebagai prefix
+    
+    Args:
+        user_id: ID user bot
+    
+    Returns:
+        Tuple ("<@id> ", "<@!id> ")
+    """
+    return (f"<@{user_id}> ", f"<@!{user_id}> ")
+
+def could_be_command(content: str, prefix: str, mentions: Tuple[str, ...] = ()) -> bool:
+    """
+    Filter awal: apakah pesan mungkin berisi command
+    
+    Dipanggil sebelum process_commands agar obrolan biasa tidak pernah
+    membangun Context.
+    
+    Args:
+        content: Isi pesan
+        prefix: Prefix server
+        mentions: Bentuk mention bot yang juga diterima sebagai prefix
+    
+    Returns:
+        True jika pesan diawali prefix atau mention bot
+    """
+    return content.startswith(prefix) or (bool(mentions) and content.startswith(mentions))
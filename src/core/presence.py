@@ -14,6 +14,7 @@ from typing import Dict, Any, List
 
 from src.core.bot import bot
 from src.core.config import BOT_INFO
+from bot_counters import counters
 
 logger = logging.getLogger("presence")
 
@@ -93,8 +94,8 @@ class RichPresence:
         try:
             # Replace placeholders
             formatted = text.format(
-                guilds=len(self.bot.guilds),
-                users=len(set(self.bot.get_all_members())),
+                guilds=counters.guilds,
+                users=counters.users,
                 commands=len(self.bot.commands),
                 prefix=self._get_default_prefix(),
                 uptime=uptime,
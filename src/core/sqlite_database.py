@@ -0,0 +1,400 @@
+"""
+sqlite_database.py - Backend database SQLite untuk bot Discord
+
+Berisi implementasi Database yang menyimpan data di SQLite dengan
+API yang sama seperti backend JSON di database.py, sehingga bisa
+dipilih lewat konfigurasi DATABASE_BACKEND.
+"""
+
+import os
+import json
+import time
+import atexit
+import logging
+import sqlite3
+import threading
+from typing import Dict, Any, Optional, List, Tuple
+
+from src.core.config import DATA_DIR, DATABASE_FLUSH_INTERVAL, COMMAND_LOG_BATCH_SIZE
+from src.core.storage import AsyncStorageMixin
+
+logger = logging.getLogger("database")
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS guild_settings (
+    guild_id TEXT NOT NULL,
+    key TEXT NOT NULL,
+    value TEXT NOT NULL,
+    PRIMARY KEY (guild_id, key)
+) WITHOUT ROWID;
+
+CREATE TABLE IF NOT EXISTS users (
+    user_id TEXT PRIMARY KEY,
+    data TEXT NOT NULL
+) WITHOUT ROWID;
+
+CREATE TABLE IF NOT EXISTS command_log (
+    id INTEGER PRIMARY KEY,
+    ts REAL NOT NULL,
+    user_id INTEGER NOT NULL,
+    guild_id INTEGER,
+    command TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_command_log_ts ON command_log (ts);
+
+CREATE TABLE IF NOT EXISTS command_stats (
+    command TEXT PRIMARY KEY,
+    count INTEGER NOT NULL
+) WITHOUT ROWID;
+
+CREATE TABLE IF NOT EXISTS cache (
+    key TEXT PRIMARY KEY,
+    value TEXT NOT NULL,
+    created_at REAL NOT NULL,
+    expire_at REAL
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS idx_cache_expire_at ON cache (expire_at);
+"""
+
+# Statement tetap, di-cache oleh sqlite3 sebagai prepared statement
+SQL_ALL_SETTINGS = "SELECT guild_id, key, value FROM guild_settings"
+SQL_SET_SETTING = (
+    "INSERT INTO guild_settings (guild_id, key, value) VALUES (?, ?, ?) "
+    "ON CONFLICT (guild_id, key) DO UPDATE SET value = excluded.value"
+)
+SQL_GET_USER = "SELECT data FROM users WHERE user_id = ?"
+SQL_SET_USER = (
+    "INSERT INTO users (user_id, data) VALUES (?, ?) "
+    "ON CONFLICT (user_id) DO UPDATE SET data = excluded.data"
+)
+SQL_INSERT_COMMAND = "INSERT INTO command_log (ts, user_id, guild_id, command) VALUES (?, ?, ?, ?)"
+SQL_BUMP_COMMAND = (
+    "INSERT INTO command_stats (command, count) VALUES (?, ?) "
+    "ON CONFLICT (command) DO UPDATE SET count = count + excluded.count"
+)
+SQL_COMMAND_STATS = "SELECT command, count FROM command_stats"
+SQL_TOTAL_COMMANDS = "SELECT COALESCE(SUM(count), 0) FROM command_stats"
+SQL_GET_CACHE = "SELECT value, expire_at FROM cache WHERE key = ?"
+SQL_SET_CACHE = (
+    "INSERT INTO cache (key, value, created_at, expire_at) VALUES (?, ?, ?, ?) "
+    "ON CONFLICT (key) DO UPDATE SET value = excluded.value, "
+    "created_at = excluded.created_at, expire_at = excluded.expire_at"
+)
+SQL_DELETE_CACHE = "DELETE FROM cache WHERE key = ?"
+SQL_CLEAR_CACHE = "DELETE FROM cache"
+SQL_DELETE_EXPIRED = "DELETE FROM cache WHERE expire_at IS NOT NULL AND expire_at < ?"
+
+class SQLiteDatabase(AsyncStorageMixin):
+    """
+    Kelas Database berbasis SQLite
+    
+    Koneksi memakai mode WAL dan satu lock untuk semua akses. Log
+    command ditampung di buffer kecil lalu dimasukkan per batch dalam
+    satu transaksi, jadi memori tetap konstan berapa pun jumlah command
+    yang sudah tercatat.
+    
+    Pengaturan server (prefix, bahasa) dibaca sangat sering sehingga
+    disalin ke tampilan di memori saat startup; tabel hanya dipakai
+    untuk penulisan.
+    """
+    def __init__(self, filename: str = "database.sqlite3", flush_interval: Optional[float] = DATABASE_FLUSH_INTERVAL,
+                 batch_size: int = COMMAND_LOG_BATCH_SIZE, data_dir: str = DATA_DIR):
+        """
+        Inisialisasi database
+        
+        Args:
+            filename: Nama file SQLite di direktori data
+            flush_interval: Jeda maksimum sebelum buffer log command ditulis,
+                None atau 0 untuk menulis setiap command langsung
+            batch_size: Jumlah log command yang memicu penulisan batch
+            data_dir: Direktori tempat file SQLite disimpan
+        """
+        self.filename = os.path.join(data_dir, filename)
+        self.flush_interval = flush_interval
+        self.batch_size = batch_size if flush_interval else 1
+        
+        self._lock = threading.RLock()
+        self._pending_commands: List[Tuple[float, int, Optional[int], str]] = []
+        self._closed = threading.Event()
+        self._flusher = None
+        
+        self.conn = sqlite3.connect(self.filename, check_same_thread=False, isolation_level=None)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.executescript(SCHEMA)
+        
+        # guild_id -> {key: value}, sinkron dengan tabel guild_settings
+        self._settings: Dict[str, Dict[str, Any]] = {}
+        for guild_id, key, value in self.conn.execute(SQL_ALL_SETTINGS):
+            self._settings.setdefault(guild_id, {})[key] = json.loads(value)
+        
+        if self.flush_interval:
+            self._flusher = threading.Thread(target=self._flush_loop, name="database-flusher", daemon=True)
+            self._flusher.start()
+        atexit.register(self.close)
+    
+    def _flush_loop(self) -> None:
+        """Loop flusher background untuk buffer log command"""
+        while not self._closed.wait(self.flush_interval):
+            self.flush()
+    
+    def flush(self) -> None:
+        """Menulis buffer log command ke database dalam satu transaksi"""
+        with self._lock:
+            if not self._pending_commands:
+                return
+            batch = self._pending_commands
+            self._pending_commands = []
+            
+            counts: Dict[str, int] = {}
+            for _, _, _, command in batch:
+                counts[command] = counts.get(command, 0) + 1
+            
+            try:
+                self.conn.execute("BEGIN")
+                self.conn.executemany(SQL_INSERT_COMMAND, batch)
+                self.conn.executemany(SQL_BUMP_COMMAND, counts.items())
+                self.conn.execute("COMMIT")
+            except Exception as e:
+                self.conn.execute("ROLLBACK")
+                logger.error(f"Gagal menyimpan {len(batch)} log command: {e}")
+    
+    def close(self) -> None:
+        """Menghentikan flusher, menulis buffer terakhir, dan menutup koneksi"""
+        if self._closed.is_set():
+            return
+        self._shutdown_io()
+        self._closed.set()
+        if self._flusher is not None:
+            self._flusher.join()
+        self.flush()
+        with self._lock:
+            self.conn.close()
+    
+    # -- Server Settings --
+    
+    def get_guild_setting(self, guild_id: int, key: str, default: Any = None) -> Any:
+        """
+        Mendapatkan pengaturan server
+        
+        Args:
+            guild_id: ID server Discord
+            key: Kunci pengaturan
+            default: Nilai default jika tidak ditemukan
+        
+        Returns:
+            Nilai pengaturan atau default
+        """
+        settings = self._settings.get(str(guild_id))
+        if settings is None:
+            return default
+        return settings.get(key, default)
+    
+    def set_guild_setting(self, guild_id: int, key: str, value: Any) -> None:
+        """
+        Mengatur pengaturan server
+        
+        Args:
+            guild_id: ID server Discord
+            key: Kunci pengaturan
+            value: Nilai yang akan disimpan
+        """
+        guild_id = str(guild_id)
+        with self._lock:
+            self.conn.execute(SQL_SET_SETTING, (guild_id, key, json.dumps(value, ensure_ascii=False)))
+            self._settings.setdefault(guild_id, {})[key] = value
+        self._notify_setting(guild_id, key, value)
+    
+    def get_prefix(self, guild_id: Optional[int], default_prefix: str = "!") -> str:
+        """
+        Mendapatkan prefix untuk server
+        
+        Args:
+            guild_id: ID server Discord atau None untuk DM
+            default_prefix: Prefix default jika tidak diatur
+        
+        Returns:
+            String prefix
+        """
+        if guild_id is None:  # DMs
+            return default_prefix
+        
+        return self.get_guild_setting(guild_id, "prefix", default_prefix)
+    
+    def set_prefix(self, guild_id: int, prefix: str) -> None:
+        """
+        Mengatur prefix untuk server
+        
+        Args:
+            guild_id: ID server Discord
+            prefix: Prefix baru
+        """
+        self.set_guild_setting(guild_id, "prefix", prefix)
+    
+    def get_language(self, guild_id: Optional[int], default_lang: str = "id") -> str:
+        """
+        Mendapatkan bahasa untuk server
+        
+        Args:
+            guild_id: ID server Discord atau None untuk DM
+            default_lang: Bahasa default jika tidak diatur
+        
+        Returns:
+            String kode bahasa
+        """
+        if guild_id is None:  # DMs
+            return default_lang
+        
+        return self.get_guild_setting(guild_id, "language", default_lang)
+    
+    def set_language(self, guild_id: int, language: str) -> None:
+        """
+        Mengatur bahasa untuk server
+        
+        Args:
+            guild_id: ID server Discord
+            language: Kode bahasa baru
+        """
+        self.set_guild_setting(guild_id, "language", language)
+    
+    # -- User Data --
+    
+    def get_user_data(self, user_id: int) -> Dict[str, Any]:
+        """
+        Mendapatkan data pengguna
+        
+        Args:
+            user_id: ID pengguna Discord
+        
+        Returns:
+            Dictionary data pengguna (kosong jika belum ada)
+        """
+        with self._lock:
+            row = self.conn.execute(SQL_GET_USER, (str(user_id),)).fetchone()
+        return json.loads(row[0]) if row else {}
+    
+    def set_user_data(self, user_id: int, data: Dict[str, Any]) -> None:
+        """
+        Menyimpan data pengguna
+        
+        Args:
+            user_id: ID pengguna Discord
+            data: Data pengguna
+        """
+        with self._lock:
+            self.conn.execute(SQL_SET_USER, (str(user_id), json.dumps(data, ensure_ascii=False, default=str)))
+    
+    # -- Command Stats --
+    
+    def log_command(self, user_id: int, guild_id: Optional[int], command: str) -> None:
+        """
+        Mencatat penggunaan command
+        
+        Args:
+            user_id: ID pengguna Discord
+            guild_id: ID server Discord atau None untuk DM
+            command: Nama command
+        """
+        with self._lock:
+            self._pending_commands.append((time.time(), int(user_id), int(guild_id) if guild_id else None, command))
+            if len(self._pending_commands) >= self.batch_size:
+                self.flush()
+    
+    def log_commands(self, entries: List[Tuple[float, int, Optional[int], str]]) -> None:
+        """
+        Mencatat sekumpulan penggunaan command sekaligus
+        
+        Args:
+            entries: List (timestamp, user_id, guild_id, command)
+        """
+        with self._lock:
+            self._pending_commands.extend(
+                (timestamp, int(user_id), int(guild_id) if guild_id else None, command)
+                for timestamp, user_id, guild_id, command in entries
+            )
+            if len(self._pending_commands) >= self.batch_size:
+                self.flush()
+    
+    def get_command_stats(self) -> Dict[str, int]:
+        """
+        Mendapatkan statistik penggunaan command
+        
+        Returns:
+            Dictionary dengan nama command dan jumlah penggunaan
+        """
+        self.flush()
+        with self._lock:
+            return dict(self.conn.execute(SQL_COMMAND_STATS).fetchall())
+    
+    def get_total_commands(self) -> int:
+        """
+        Mendapatkan total command yang digunakan
+        
+        Returns:
+            Integer jumlah total
+        """
+        self.flush()
+        with self._lock:
+            return self.conn.execute(SQL_TOTAL_COMMANDS).fetchone()[0]
+    
+    # -- Cache --
+    
+    def set_cache(self, key: str, value: Any, expire: Optional[int] = None) -> None:
+        """
+        Menyimpan data ke cache
+        
+        Args:
+            key: Kunci cache
+            value: Nilai yang akan disimpan
+            expire: Waktu kedaluwarsa dalam detik, None untuk tidak kedaluwarsa
+        """
+        now = time.time()
+        expire_at = now + expire if expire is not None else None
+        with self._lock:
+            self.conn.execute(SQL_SET_CACHE, (key, json.dumps(value, ensure_ascii=False), now, expire_at))
+    
+    def get_cache(self, key: str, default: Any = None) -> Any:
+        """
+        Mendapatkan data dari cache
+        
+        Args:
+            key: Kunci cache
+            default: Nilai default jika tidak ditemukan atau kedaluwarsa
+        
+        Returns:
+            Nilai cache atau default
+        """
+        with self._lock:
+            row = self.conn.execute(SQL_GET_CACHE, (key,)).fetchone()
+            if row is None:
+                return default
+            
+            value, expire_at = row
+            if expire_at is not None and time.time() > expire_at:
+                self.conn.execute(SQL_DELETE_CACHE, (key,))
+                return default
+        
+        return json.loads(value)
+    
+    def clear_cache(self, key: Optional[str] = None) -> None:
+        """
+        Menghapus data dari cache
+        
+        Args:
+            key: Kunci cache atau None untuk menghapus semua
+        """
+        with self._lock:
+            if key is None:
+                self.conn.execute(SQL_CLEAR_CACHE)
+            else:
+                self.conn.execute(SQL_DELETE_CACHE, (key,))
+    
+    def clean_expired_cache(self) -> int:
+        """
+        Membersihkan cache yang kedaluwarsa
+        
+        Returns:
+            Jumlah entri yang dihapus
+        """
+        with self._lock:
+            return self.conn.execute(SQL_DELETE_EXPIRED, (time.time(),)).rowcount
@@ -0,0 +1,310 @@
+"""
+storage.py - Fasad async untuk backend database
+
+Berisi mixin yang menambahkan versi async (aget_*/aset_*/alog_command)
+dari API database. Pekerjaan disk dan serialisasi dijalankan di satu
+thread I/O khusus sehingga event loop Discord tidak pernah menunggu
+disk, sedangkan pembacaan pengaturan server dilayani langsung dari
+tampilan di memori.
+"""
+
+import time
+import asyncio
+import threading
+import logging
+import queue
+from typing import Dict, Any, Optional, Callable, List, Tuple
+
+logger = logging.getLogger("database")
+
+def _settle(future: asyncio.Future, result: Any, error: Optional[BaseException]) -> None:
+    """Mengisi future di event loop (dipanggil lewat call_soon_threadsafe)"""
+    if future.cancelled():
+        return
+    if error is not None:
+        future.set_exception(error)
+    else:
+        future.set_result(result)
+
+class LoopBlockStats:
+    """Mencatat berapa lama pemanggilan async menahan event loop"""
+    
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.calls = 0
+        self.total = 0.0
+        self.max = 0.0
+    
+    def record(self, elapsed: float) -> None:
+        """
+        Mencatat satu durasi blokir
+        
+        Args:
+            elapsed: Durasi dalam detik
+        """
+        with self._lock:
+            self.calls += 1
+            self.total += elapsed
+            if elapsed > self.max:
+                self.max = elapsed
+    
+    def snapshot(self) -> Dict[str, float]:
+        """
+        Mendapatkan ringkasan durasi blokir
+        
+        Returns:
+            Dictionary calls, mean_us dan max_us
+        """
+        with self._lock:
+            return {
+                "calls": self.calls,
+                "mean_us": self.total / self.calls * 1e6 if self.calls else 0.0,
+                "max_us": self.max * 1e6
+            }
+    
+    def reset(self) -> None:
+        """Mengosongkan catatan"""
+        with self._lock:
+            self.calls = 0
+            self.total = 0.0
+            self.max = 0.0
+
+class AsyncStorageMixin:
+    """
+    Mixin fasad async untuk Database dan SQLiteDatabase
+    
+    Semua penulisan dikirim lewat antrean ke satu thread I/O sehingga
+    urutannya tetap terjaga. Log command tidak ditunggu sama sekali;
+    penulisan lain ditunggu lewat future tanpa menahan event loop.
+    Backend dengan MEMORY_RESIDENT = True menyimpan semua data di
+    memori, jadi pembacaannya dijalankan langsung di event loop;
+    backend lain hanya membaca pengaturan server langsung dan sisanya
+    lewat thread I/O.
+    """
+    MEMORY_RESIDENT = False
+    
+    _io_queue: Optional[queue.SimpleQueue] = None
+    _io_thread: Optional[threading.Thread] = None
+    _loop_block: Optional[LoopBlockStats] = None
+    _setting_listeners: Optional[List[Callable[[str, str, Any], None]]] = None
+    
+    def add_setting_listener(self, listener: Callable[[str, str, Any], None]) -> None:
+        """
+        Mendaftarkan callback yang dipanggil setiap pengaturan server berubah
+        
+        Dipakai cache di luar database (misalnya tabel prefix) untuk
+        membuang entri yang sudah basi. Callback bisa dipanggil dari
+        thread I/O, jadi harus cepat dan aman dipanggil lintas thread.
+        
+        Args:
+            listener: Fungsi (guild_id, key, value)
+        """
+        if self._setting_listeners is None:
+            self._setting_listeners = []
+        self._setting_listeners.append(listener)
+    
+    def _notify_setting(self, guild_id: str, key: str, value: Any) -> None:
+        """Memanggil semua listener pengaturan server"""
+        for listener in self._setting_listeners or ():
+            try:
+                listener(guild_id, key, value)
+            except Exception as e:
+                logger.error(f"Listener pengaturan gagal: {e}")
+    
+    def _io_submit(self, func: Callable, args: tuple, future: Optional[asyncio.Future] = None) -> None:
+        """
+        Memasukkan pekerjaan ke antrean thread I/O (thread dibuat saat pertama dipakai)
+        
+        Args:
+            func: Fungsi database sinkron
+            args: Argumen fungsi
+            future: Future event loop yang diisi hasilnya, None jika tidak ditunggu
+        """
+        if self._io_thread is None:
+            self._io_queue = queue.SimpleQueue()
+            self._io_thread = threading.Thread(target=self._io_loop, args=(self._io_queue,), name="database-io", daemon=True)
+            self._io_thread.start()
+        self._io_queue.put((func, args, future))
+    
+    @staticmethod
+    def _io_loop(jobs: queue.SimpleQueue) -> None:
+        """Loop thread I/O, berhenti saat menerima None"""
+        while True:
+            job = jobs.get()
+            if job is None:
+                return
+            func, args, future = job
+            try:
+                result = func(*args)
+            except Exception as e:
+                if future is None:
+                    logger.error(f"Penulisan database di thread I/O gagal: {e}")
+                else:
+                    future.get_loop().call_soon_threadsafe(_settle, future, None, e)
+                continue
+            if future is not None:
+                future.get_loop().call_soon_threadsafe(_settle, future, result, None)
+    
+    def _loop_stats(self) -> LoopBlockStats:
+        """Mendapatkan pencatat blokir event loop"""
+        if self._loop_block is None:
+            self._loop_block = LoopBlockStats()
+        return self._loop_block
+    
+    async def _offload(self, func: Callable, *args: Any) -> Any:
+        """
+        Menjalankan fungsi sinkron di thread I/O dan menunggu hasilnya
+        
+        Args:
+            func: Fungsi database sinkron
+            *args: Argumen fungsi
+        
+        Returns:
+            Hasil fungsi
+        """
+        start = time.perf_counter()
+        future = asyncio.get_running_loop().create_future()
+        self._io_submit(func, args, future)
+        self._loop_stats().record(time.perf_counter() - start)
+        return await future
+    
+    def _enqueue(self, func: Callable, *args: Any) -> None:
+        """Mengantrekan penulisan ke thread I/O tanpa menunggu hasilnya"""
+        start = time.perf_counter()
+        self._io_submit(func, args)
+        self._loop_stats().record(time.perf_counter() - start)
+    
+    def _inline(self, func: Callable, *args: Any) -> Any:
+        """Menjalankan pembacaan di memori langsung di event loop sambil mengukurnya"""
+        start = time.perf_counter()
+        try:
+            return func(*args)
+        finally:
+            self._loop_stats().record(time.perf_counter() - start)
+    
+    async def _read(self, func: Callable, *args: Any) -> Any:
+        """Membaca langsung dari memori jika backend memori penuh, selain itu lewat thread I/O"""
+        if self.MEMORY_RESIDENT:
+            return self._inline(func, *args)
+        return await self._offload(func, *args)
+    
+    def loop_block_stats(self) -> Dict[str, float]:
+        """
+        Mendapatkan waktu blokir event loop oleh pemanggilan async
+        
+        Returns:
+            Dictionary calls, mean_us dan max_us
+        """
+        return self._loop_stats().snapshot()
+    
+    def _shutdown_io(self) -> None:
+        """Menunggu semua penulisan yang antre lalu menghentikan thread I/O"""
+        if self._io_thread is not None:
+            self._io_queue.put(None)
+            self._io_thread.join()
+            self._io_thread = None
+            self._io_queue = None
+    
+    # -- Server Settings (selalu dari tampilan memori) --
+    
+    async def aget_guild_setting(self, guild_id: int, key: str, default: Any = None) -> Any:
+        """Versi async dari get_guild_setting"""
+        return self._inline(self.get_guild_setting, guild_id, key, default)
+    
+    async def aset_guild_setting(self, guild_id: int, key: str, value: Any) -> None:
+        """Versi async dari set_guild_setting"""
+        await self._offload(self.set_guild_setting, guild_id, key, value)
+    
+    async def aget_prefix(self, guild_id: Optional[int], default_prefix: str = "!") -> str:
+        """Versi async dari get_prefix"""
+        return self._inline(self.get_prefix, guild_id, default_prefix)
+    
+    async def aset_prefix(self, guild_id: int, prefix: str) -> None:
+        """Versi async dari set_prefix"""
+        await self._offload(self.set_prefix, guild_id, prefix)
+    
+    async def aget_language(self, guild_id: Optional[int], default_lang: str = "id") -> str:
+        """Versi async dari get_language"""
+        return self._inline(self.get_language, guild_id, default_lang)
+    
+    async def aset_language(self, guild_id: int, language: str) -> None:
+        """Versi async dari set_language"""
+        await self._offload(self.set_language, guild_id, language)
+    
+    # -- User Data --
+    
+    async def aget_user_data(self, user_id: int) -> Dict[str, Any]:
+        """Versi async dari get_user_data"""
+        return await self._read(self.get_user_data, user_id)
+    
+    async def aset_user_data(self, user_id: int, data: Dict[str, Any]) -> None:
+        """Versi async dari set_user_data"""
+        await self._offload(self.set_user_data, user_id, data)
+    
+    # -- Command Stats --
+    
+    async def alog_command(self, user_id: int, guild_id: Optional[int], command: str) -> None:
+        """Versi async dari log_command (hanya diantrekan, tidak menunggu penulisan)"""
+        self._enqueue(self.log_command, user_id, guild_id, command)
+    
+    async def alog_commands(self, entries: List[Tuple[float, int, Optional[int], str]]) -> None:
+        """Versi async dari log_commands (hanya diantrekan, tidak menunggu penulisan)"""
+        self._enqueue(self.log_commands, entries)
+    
+    async def aget_command_stats(self) -> Dict[str, int]:
+        """Versi async dari get_command_stats (lewat thread I/O agar log yang antre ikut terhitung)"""
+        return await self._offload(self.get_command_stats)
+    
+    async def aget_total_commands(self) -> int:
+        """Versi async dari get_total_commands (lewat thread I/O agar log yang antre ikut terhitung)"""
+        return await self._offload(self.get_total_commands)
+    
+    # -- Cache --
+    
+    async def aset_cache(self, key: str, value: Any, expire: Optional[int] = None) -> None:
+        """Versi async dari set_cache"""
+        await self._offload(self.set_cache, key, value, expire)
+    
+    async def aget_cache(self, key: str, default: Any = None) -> Any:
+        """Versi async dari get_cache"""
+        # Entri kedaluwarsa dihapus lewat journal/SQL, jadi selalu di thread I/O
+        return await self._offload(self.get_cache, key, default)
+    
+    async def aclear_cache(self, key: Optional[str] = None) -> None:
+        """Versi async dari clear_cache"""
+        await self._offload(self.clear_cache, key)
+    
+    async def aflush(self) -> None:
+        """Versi async dari flush"""
+        await self._offload(self.flush)
+
+async def measure_loop_block(database, commands: int = 10_000) -> Dict[str, float]:
+    """
+    Mengukur blokir event loop per command untuk API sinkron dan async
+    
+    Setiap "command" membaca prefix lalu mencatat penggunaan command,
+    seperti alur handler yang sebenarnya.
+    
+    Args:
+        database: Instance Database atau SQLiteDatabase
+        commands: Jumlah command yang disimulasikan
+    
+    Returns:
+        Dictionary sync_us dan async_us (rata-rata per command)
+    """
+    start = time.perf_counter()
+    for i in range(commands):
+        database.get_prefix(i % 1000)
+        database.log_command(i, i % 1000, "ping")
+    sync_us = (time.perf_counter() - start) / commands * 1e6
+    
+    database._loop_stats().reset()
+    for i in range(commands):
+        await database.aget_prefix(i % 1000)
+        await database.alog_command(i, i % 1000, "ping")
+    stats = database.loop_block_stats()
+    async_us = stats["mean_us"] * stats["calls"] / commands
+    
+    print(f"sync : {sync_us:8.2f} us event loop blocked per command")
+    print(f"async: {async_us:8.2f} us event loop blocked per command (max {stats['max_us']:.1f} us per call)")
+    return {"sync_us": sync_us, "async_us": async_us}
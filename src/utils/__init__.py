@@ -9,6 +9,8 @@ from src.utils.helper import (
     format_timestamp,
     get_user_avatar_url,
     log_command,
+    alog_command,
+    get_settings_cache_stats,
     get_uptime,
     get_uptime_string
 )
@@ -18,6 +20,8 @@ __all__ = [
     'format_timestamp',
     'get_user_avatar_url',
     'log_command',
+    'alog_command',
+    'get_settings_cache_stats',
     'get_uptime',
     'get_uptime_string'
 ] 
\ No newline at end of file
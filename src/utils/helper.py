@@ -9,27 +9,20 @@ import discord
 import time
 from datetime import datetime
 from typing import Optional, Dict, Any, List, Union, Tuple
-import re
-import logging
 import pytz
 
-from src.core.config import EMBED_COLORS, TIME_FORMAT
+from src.core.config import EMBED_COLORS, TIME_FORMAT, PREFIX, GUILD_SETTINGS_CACHE_SIZE, GUILD_SETTINGS_CACHE_TTL
 from src.core.database import db
+from settings_cache import GuildSettingsCache
+from language import catalog
 
-# Configure logging to prevent non-ASCII characters from being displayed in terminal
-logging.basicConfig(level=logging.INFO, 
-                   format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
-
-# Filter to prevent non-ASCII characters in logs
-class ASCIIFilter(logging.Filter):
-    def filter(self, record):
-        if isinstance(record.msg, str):
-            record.msg = re.sub(r'[^\x00-\x7F]+', '[non-ASCII]', record.msg)
-        return True
-
-# Apply filter to root logger
-root_logger = logging.getLogger()
-root_logger.addFilter(ASCIIFilter())
+# Process-wide guild settings cache, dropped per guild when prefix/language change
+settings_cache = GuildSettingsCache(
+    db,
+    max_size=GUILD_SETTINGS_CACHE_SIZE,
+    ttl=GUILD_SETTINGS_CACHE_TTL,
+    default_prefix=PREFIX
+)
 
 def create_embed(
     title: Optional[str] = None, 
@@ -155,6 +148,19 @@ def log_command(user_id: int, guild_id: Optional[int], command_name: str) -> Non
     """
     db.log_command(user_id, guild_id, command_name)
 
+async def alog_command(user_id: int, guild_id: Optional[int], command_name: str) -> None:
+    """
+    Mencatat penggunaan command tanpa menahan event loop
+    
+    Penulisan dijalankan di thread I/O database.
+    
+    Args:
+        user_id: ID pengguna Discord
+        guild_id: ID server Discord (None jika di DM)
+        command_name: Nama command yang digunakan
+    """
+    await db.alog_command(user_id, guild_id, command_name)
+
 def get_uptime(bot) -> Tuple[int, int, int, int]:
     """
     Menghitung uptime bot dalam hari, jam, menit, detik
@@ -209,9 +215,7 @@ def get_lang(guild_id):
     Returns:
         Language code string (id, en, etc.)
     """
-    from src.core.database import MemoryDB
-    db = MemoryDB()
-    return db.get_guild_language(guild_id)
+    return settings_cache.get_language(guild_id)
 
 # Function to get guild prefix
 def get_prefix(bot, message):
@@ -225,11 +229,7 @@ def get_prefix(bot, message):
     Returns:
         Command prefix string
     """
-    if message.guild is None:
-        return "!"  # Default prefix for DMs
-    from src.core.database import MemoryDB
-    db = MemoryDB()
-    return db.get_guild_prefix(message.guild.id)
+    return settings_cache.get_prefix(message.guild.id if message.guild else None)
 
 # Translations helper function
 def get_text(guild_id: Optional[int], key: str, **kwargs) -> str:
@@ -244,33 +244,7 @@ def get_text(guild_id: Optional[int], key: str, **kwargs) -> str:
     Returns:
         Translated string
     """
-    from src.core import LANGUAGES
-    lang = get_lang(guild_id)
-    
-    # Split the key by dots to handle nested keys
-    keys = key.split('.')
-    value = LANGUAGES[lang]["translations"]
-    
-    # Navigate through nested dictionary
-    for k in keys:
-        if k in value:
-            value = value[k]
-        else:
-            # If key not found, use the default language (id)
-            if lang != "id":
-                return get_text(guild_id, key, lang="id", **kwargs)
-            # If still not found, return the key itself
-            return key
-    
-    # If we have a string, format it with kwargs
-    if isinstance(value, str):
-        try:
-            value = value.format(**kwargs)
-        except KeyError:
-            # If there's a missing key in kwargs, use key as fallback
-            pass
-    
-    return value
+    return catalog.get(get_lang(guild_id), key, **kwargs)
 
 def get_command_stats():
     """
@@ -279,10 +253,17 @@ def get_command_stats():
     Returns:
         Dictionary with command statistics
     """
-    from src.core.database import MemoryDB
-    db = MemoryDB()
     return db.get_command_stats()
 
+def get_settings_cache_stats() -> Dict[str, Any]:
+    """
+    Get hit rate and eviction counters of the guild settings cache
+    
+    Returns:
+        Dictionary from GuildSettingsCache.stats()
+    """
+    return settings_cache.stats()
+
 def get_timestamp():
     """
     Get current timestamp with Indonesia time
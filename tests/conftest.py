@@ -0,0 +1,8 @@
+"""Konfigurasi pytest bersama"""
+
+import os
+import tempfile
+
+# src.core.config membuat DATA_DIR dan src.core.database membuka database saat
+# di-import; arahkan keduanya ke direktori sementara, bukan src/data
+os.environ.setdefault("DATA_DIR", tempfile.mkdtemp(prefix="test-data-"))
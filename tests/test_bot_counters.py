@@ -0,0 +1,116 @@
+"""Tes penghitung server, member dan channel dengan guild palsu"""
+
+import asyncio
+from types import SimpleNamespace
+
+from bot_counters import BotCounters
+
+class FakeBot:
+    def __init__(self, guilds):
+        self.guilds = guilds
+        self.ready = True
+    
+    def add_listener(self, func, name):
+        pass
+    
+    def is_ready(self):
+        return self.ready
+
+def make_guild(guild_id, user_ids, channels=2):
+    guild = SimpleNamespace(id=guild_id, members=[], channels=[object() for _ in range(channels)])
+    guild.members = [SimpleNamespace(id=user_id, guild=guild) for user_id in user_ids]
+    guild.member_count = len(user_ids)
+    return guild
+
+def full_count(bot):
+    return {
+        "guilds": len(bot.guilds),
+        "members": sum(guild.member_count for guild in bot.guilds),
+        "users": len({member.id for guild in bot.guilds for member in guild.members}),
+        "channels": sum(len(guild.channels) for guild in bot.guilds)
+    }
+
+def counts(tracker):
+    return {key: value for key, value in tracker.snapshot().items() if key != "ready"}
+
+def make_tracker():
+    bot = FakeBot([make_guild(1, [10, 11, 12]), make_guild(2, [11, 20], channels=3)])
+    tracker = BotCounters().install(bot)
+    tracker.rebuild(bot.guilds)
+    return bot, tracker
+
+def test_rebuild_matches_full_count():
+    bot, tracker = make_tracker()
+    assert counts(tracker) == full_count(bot) == {"guilds": 2, "members": 5, "users": 4, "channels": 5}
+
+def test_member_join_and_leave():
+    bot, tracker = make_tracker()
+    guild = bot.guilds[1]
+    
+    joined = SimpleNamespace(id=10, guild=guild)
+    guild.members.append(joined)
+    guild.member_count += 1
+    asyncio.run(tracker.on_member_join(joined))
+    assert counts(tracker) == full_count(bot)
+    
+    # Pengguna 10 masih ada di server 1, jadi tetap terhitung sebagai pengguna unik
+    guild.members.remove(joined)
+    guild.member_count -= 1
+    asyncio.run(tracker.on_raw_member_remove(SimpleNamespace(guild_id=guild.id, user=joined)))
+    assert counts(tracker) == full_count(bot)
+    assert tracker.users == 4
+    
+    left = bot.guilds[0].members.pop()
+    bot.guilds[0].member_count -= 1
+    asyncio.run(tracker.on_raw_member_remove(SimpleNamespace(guild_id=1, user=left)))
+    assert counts(tracker) == full_count(bot)
+    assert tracker.users == 3
+
+def test_guild_join_and_remove():
+    bot, tracker = make_tracker()
+    guild = make_guild(3, [12, 30, 31], channels=4)
+    bot.guilds.append(guild)
+    asyncio.run(tracker.on_guild_join(guild))
+    # Event join ganda untuk server yang sama tidak menghitung dua kali
+    asyncio.run(tracker.on_guild_join(guild))
+    assert counts(tracker) == full_count(bot)
+    
+    removed = bot.guilds.pop(0)
+    asyncio.run(tracker.on_guild_remove(removed))
+    asyncio.run(tracker.on_guild_remove(removed))
+    assert counts(tracker) == full_count(bot) == {"guilds": 2, "members": 5, "users": 5, "channels": 7}
+
+def test_channel_create_and_delete():
+    bot, tracker = make_tracker()
+    guild = bot.guilds[0]
+    channel = SimpleNamespace(guild=guild)
+    guild.channels.append(channel)
+    asyncio.run(tracker.on_guild_channel_create(channel))
+    assert tracker.channels == 6
+    guild.channels.remove(channel)
+    asyncio.run(tracker.on_guild_channel_delete(channel))
+    assert counts(tracker) == full_count(bot)
+
+def test_rebuild_is_idempotent():
+    bot, tracker = make_tracker()
+    first = counts(tracker)
+    tracker.rebuild(bot.guilds)
+    tracker.rebuild(bot.guilds)
+    assert counts(tracker) == first
+    assert tracker.rebuilds == 3
+
+def test_reconnect_rebuilds_on_next_read():
+    bot, tracker = make_tracker()
+    asyncio.run(tracker.on_connect())
+    assert not tracker.snapshot()["ready"]
+    
+    # Event selama penghitung basi diabaikan; cache baru dihitung saat dibaca
+    guild = make_guild(3, [40])
+    bot.guilds.append(guild)
+    asyncio.run(tracker.on_guild_join(guild))
+    bot.ready = False
+    assert tracker.guilds == 2
+    bot.ready = True
+    assert tracker.guilds == 3
+    assert counts(tracker) == full_count(bot)
+    assert tracker.rebuilds == 2
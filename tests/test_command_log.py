@@ -0,0 +1,88 @@
+"""Tes ring buffer log command dan statistik inkremental"""
+
+import pytest
+
+from command_log import CommandLog, CommandStats, exact_command_stats
+from database import Database
+from memory_db import MemoryDB
+
+def test_capacity_must_be_positive():
+    with pytest.raises(ValueError):
+        CommandLog(capacity=0)
+
+def test_non_numeric_id_is_rejected_without_touching_buffer():
+    log = CommandLog(capacity=2)
+    log.append(1, 10, "help", timestamp=1.0)
+    log.append(2, 10, "ping", timestamp=2.0)
+    with pytest.raises(ValueError, match="numeric"):
+        log.append("abc", None, "x", timestamp=3.0)
+    assert [entry.command for entry in log] == ["help", "ping"]
+
+def test_database_log_command_reports_invalid_id():
+    db = Database()
+    assert db.log_command("abc", None, "x") is False
+    assert db.get_command_stats()["total_commands"] == 0
+    assert db.log_command(None, 42, "ping") is True
+    assert db.get_command_stats()["total_commands"] == 1
+
+def test_memory_db_log_command_skips_invalid_id():
+    db = MemoryDB()
+    assert db.log_command("abc", 1, "x") is False
+    assert db.log_command(1, 1, "ping") is True
+    assert db.get_command_stats() == {"ping": 1}
+    assert "abc" not in db.user_data
+
+def test_wraparound_keeps_newest_entries_in_order():
+    log = CommandLog(capacity=3, retention=None)
+    for i in range(7):
+        log.append(100 + i, None, f"cmd{i}", timestamp=float(i))
+    
+    assert len(log) == 3
+    assert [entry.command for entry in log] == ["cmd4", "cmd5", "cmd6"]
+    assert log[0].user_id == 104
+    assert log[-1].command == "cmd6"
+    assert log[-1].guild_id is None
+    assert [entry.command for entry in log.between(5.0, 6.0)] == ["cmd5"]
+    with pytest.raises(IndexError):
+        log[3]
+
+def test_retention_expires_old_entries():
+    log = CommandLog(capacity=10, retention=10)
+    for timestamp in (0.0, 4.0, 8.0, 12.0):
+        log.append(1, 1, "help", timestamp=timestamp)
+    
+    # Entri < 12 - 10 sudah dibuang saat append terakhir
+    assert [entry.timestamp for entry in log] == [4.0, 8.0, 12.0]
+    assert log.prune(now=20.0) == 2
+    assert [entry.timestamp for entry in log] == [12.0]
+    assert log.prune(now=20.0) == 0
+
+def test_exact_stats_match_hyperloglog_estimate():
+    log = CommandLog(capacity=20_000, retention=None)
+    stats = CommandStats()
+    for i in range(10_000):
+        user_id = 10**17 + i % 5_000
+        guild_id = 10**18 + i % 300
+        command = ("help", "ping", "imsakiyah")[i % 3]
+        log.append(user_id, guild_id, command, timestamp=float(i))
+        stats.record(user_id, guild_id, command)
+    
+    exact = exact_command_stats(log)
+    estimate = stats.snapshot()
+    assert exact["total_commands"] == estimate["total_commands"] == 10_000
+    assert exact["command_distribution"] == estimate["command_distribution"]
+    assert exact["unique_users"] == 5_000
+    assert exact["unique_guilds"] == 300
+    # Galat standar precision 12 sekitar 1.6%
+    assert abs(estimate["unique_users"] - 5_000) / 5_000 < 0.05
+    assert abs(estimate["unique_guilds"] - 300) / 300 < 0.05
+
+def test_exact_stats_only_cover_retained_entries():
+    log = CommandLog(capacity=100, retention=None)
+    stats = CommandStats()
+    for i in range(250):
+        log.append(i, None, "help", timestamp=float(i))
+        stats.record(i, None, "help")
+    
+    assert exact_command_stats(log)["total_commands"] == 100
+    assert stats.snapshot()["total_commands"] == 250
@@ -0,0 +1,43 @@
+"""Tes backend database JSON di src.core.database"""
+
+import threading
+
+import pytest
+
+from src.core import database as core_database
+
+@pytest.fixture
+def database(tmp_path):
+    database = core_database.Database(flush_interval=60, data_dir=str(tmp_path))
+    yield database
+    database.close()
+
+def test_command_stats_is_a_snapshot(database):
+    database.log_command(1, 1, "help")
+    stats = database.get_command_stats()
+    database.log_command(1, 1, "ping")
+    assert stats == {"help": 1}
+    assert database.get_command_stats() == {"help": 1, "ping": 1}
+
+def test_command_stats_can_be_iterated_while_logging(database):
+    stop = threading.Event()
+    
+    def writer():
+        i = 0
+        while not stop.is_set():
+            # Nama baru di setiap panggilan agar dict terus bertambah kunci
+            database.log_command(i, 1, f"cmd{i}")
+            i += 1
+    
+    thread = threading.Thread(target=writer)
+    thread.start()
+    try:
+        for _ in range(200):
+            stats = database.get_command_stats()
+            top = sorted(stats.items(), key=lambda item: item[1], reverse=True)[:5]
+            assert all(count >= 1 for _, count in top)
+    finally:
+        stop.set()
+        thread.join()
+    
+    assert sum(database.get_command_stats().values()) == database.get_total_commands()
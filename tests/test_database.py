@@ -0,0 +1,58 @@
+"""Tests for the secondary indexes of the in-memory storage"""
+
+import pytest
+
+from database import MemoryStorage
+
+QUERIES = [
+    {"b.x": 5},
+    {"b.x": {"$eq": 5}},
+    {"b.x": {"$ne": 5}},
+    {"b.x": {"$in": [1, 5, 9]}},
+    {"b.x": {"$exists": True}},
+    {"b.x": {"$exists": False}},
+    {"b.x": {"$gt": 5}},
+    {"b.x": {"$gte": 5}},
+    {"b.x": {"$lt": 5}},
+    {"b.x": {"$lte": 5}},
+    {"b.x": {"$gt": 2, "$lte": 7}},
+    {"a": 3},
+    {"a": {"$gte": 3, "$lt": 6}},
+]
+
+def make_storage():
+    storage = MemoryStorage()
+    for i in range(12):
+        doc = {"_id": str(i), "a": i % 7}
+        if i != 11:
+            doc["b"] = {"x": i}
+        storage.insert_one("c", doc)
+    return storage
+
+def ids(docs):
+    return sorted(int(doc["_id"]) for doc in docs)
+
+@pytest.mark.parametrize("field", ["b.x", "a"])
+@pytest.mark.parametrize("sorted_index", [False, True])
+@pytest.mark.parametrize("query", QUERIES)
+def test_indexed_results_match_full_scan(field, sorted_index, query):
+    storage = make_storage()
+    expected = ids(storage.find("c", query))
+    storage.create_index("c", field, sorted=sorted_index)
+    assert ids(storage.find("c", query)) == expected
+
+def test_dotted_index_follows_updates_and_deletes():
+    storage = make_storage()
+    storage.create_index("c", "b.x", sorted=True)
+    storage.update_one("c", {"_id": "3"}, {"$set": {"b": {"x": 100}}})
+    storage.delete_one("c", {"_id": "4"})
+    storage.insert_one("c", {"_id": "20", "b": {"x": 4}})
+    assert ids(storage.find("c", {"b.x": {"$gte": 4, "$lte": 5}})) == [5, 20]
+    assert ids(storage.find("c", {"b.x": 100})) == [3]
+
+def test_unique_dotted_index_rejects_duplicates():
+    storage = make_storage()
+    assert storage.create_index("c", "b.x", unique=True)
+    assert not storage.insert_one("c", {"_id": "20", "b": {"x": 1}})
+    assert not storage.update_one("c", {"_id": "2"}, {"$set": {"b": {"x": 1}}})
+    assert ids(storage.find("c", {"b.x": 1})) == [1]
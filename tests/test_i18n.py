@@ -0,0 +1,75 @@
+"""Tes katalog terjemahan per file bahasa"""
+
+import os
+import json
+import logging
+
+import pytest
+
+import i18n
+from i18n import LocaleCatalog
+
+def write_locale(directory, lang, title, mtime=None):
+    path = os.path.join(directory, f"{lang}.json")
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump({"name": lang, "translations": {"help": {"title": title}}}, f)
+    if mtime is not None:
+        os.utime(path, ns=(mtime, mtime))
+    return path
+
+@pytest.fixture
+def catalog(tmp_path):
+    write_locale(tmp_path, "id", "Bantuan", mtime=1_000_000_000)
+    catalog = LocaleCatalog(str(tmp_path), reload_interval=None)
+    yield catalog
+    catalog.close()
+
+def test_missing_language_is_memoized(catalog, monkeypatch):
+    assert catalog.get("xx", "help.title") == "Bantuan"
+    
+    calls = []
+    real_stat = os.stat
+    monkeypatch.setattr(i18n.os, "stat", lambda *args, **kwargs: calls.append(args) or real_stat(*args, **kwargs))
+    assert catalog.get("xx", "help.title") == "Bantuan"
+    assert catalog.get(None, "help.title") == "Bantuan"
+    assert catalog.get(None, "help.title") == "Bantuan"
+    assert calls == []
+
+def test_missing_language_is_loaded_when_file_appears(catalog, tmp_path):
+    assert catalog.get("en", "help.title") == "Bantuan"
+    write_locale(tmp_path, "en", "Help")
+    
+    assert catalog.reload_changed() == ["en"]
+    assert catalog.get("en", "help.title") == "Help"
+    assert catalog.language_data("en")["name"] == "en"
+
+def test_fallback_follows_default_language_reload(catalog, tmp_path):
+    assert catalog.get("xx", "help.title") == "Bantuan"
+    write_locale(tmp_path, "id", "Menu bantuan", mtime=2_000_000_000)
+    
+    assert catalog.reload_changed() == ["id"]
+    assert catalog.get("xx", "help.title") == "Menu bantuan"
+
+def test_corrupt_file_falls_back_to_default(catalog, tmp_path, caplog):
+    path = os.path.join(tmp_path, "en.json")
+    with open(path, "w", encoding="utf-8") as f:
+        f.write('{"translations": {"help": ')
+    os.utime(path, ns=(1_000_000_000, 1_000_000_000))
+    
+    with caplog.at_level(logging.ERROR, logger="i18n"):
+        assert catalog.get("en", "help.title") == "Bantuan"
+    assert "Gagal memuat bahasa en" in caplog.text
+    
+    # Tidak dicoba ulang selama file belum berubah
+    caplog.clear()
+    assert catalog.reload_changed() == []
+    assert caplog.text == ""
+    
+    write_locale(tmp_path, "en", "Help", mtime=2_000_000_000)
+    assert catalog.reload_changed() == ["en"]
+    assert catalog.get("en", "help.title") == "Help"
+
+def test_non_object_json_is_rejected(catalog, tmp_path):
+    with open(os.path.join(tmp_path, "en.json"), "w", encoding="utf-8") as f:
+        json.dump(["not", "a", "catalog"], f)
+    assert catalog.get("en", "help.title") == "Bantuan"
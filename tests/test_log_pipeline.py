@@ -0,0 +1,58 @@
+"""Tes pipeline logging berbasis antrean"""
+
+import io
+import queue
+import logging
+
+from log_pipeline import LOG_FORMAT, LoopQueueHandler, SanitizingQueueListener
+
+def make_pipeline():
+    log_queue = queue.SimpleQueue()
+    stream = io.StringIO()
+    sink = logging.StreamHandler(stream)
+    sink.setFormatter(logging.Formatter(LOG_FORMAT))
+    listener = SanitizingQueueListener(log_queue, sink)
+    logger = logging.Logger("test.pipeline", logging.DEBUG)
+    logger.addHandler(LoopQueueHandler(log_queue))
+    return logger, listener, stream, log_queue
+
+def test_message_is_formatted_before_queueing():
+    logger, listener, stream, log_queue = make_pipeline()
+    state = {"step": 1}
+    logger.info("state %s", state)
+    # Diubah setelah logger dipanggil, sebelum listener berjalan
+    state["step"] = 2
+    
+    record = log_queue.get_nowait()
+    assert record.msg == "state {'step': 1}"
+    assert record.args is None
+    log_queue.put_nowait(record)
+    
+    listener.start()
+    listener.stop()
+    assert "state {'step': 1}" in stream.getvalue()
+
+def test_exception_is_rendered_and_traceback_released():
+    logger, listener, stream, log_queue = make_pipeline()
+    try:
+        raise KeyError("missing")
+    except KeyError:
+        logger.exception("lookup failed")
+    
+    record = log_queue.get_nowait()
+    assert record.exc_info is None
+    assert "KeyError: 'missing'" in record.exc_text
+    log_queue.put_nowait(record)
+    
+    listener.start()
+    listener.stop()
+    output = stream.getvalue()
+    assert "lookup failed" in output
+    assert "Traceback" in output
+
+def test_listener_sanitizes_non_ascii():
+    logger, listener, stream, _ = make_pipeline()
+    listener.start()
+    logger.info("server %s", "Kopi ☕")
+    listener.stop()
+    assert "server Kopi [non-ASCII]" in stream.getvalue()
@@ -0,0 +1,63 @@
+"""Tes tabel prefix server"""
+
+from src.core import prefix
+
+class FakeDatabase:
+    def __init__(self):
+        self.prefixes = {}
+        self.listeners = []
+        self.reads = 0
+        self.on_read = None
+    
+    def add_setting_listener(self, listener):
+        self.listeners.append(listener)
+    
+    def get_prefix(self, guild_id, default="!"):
+        self.reads += 1
+        value = self.prefixes.get(guild_id, default)
+        if self.on_read is not None:
+            self.on_read()
+        return value
+    
+    def set_prefix(self, guild_id, value):
+        self.prefixes[guild_id] = value
+        for listener in self.listeners:
+            listener(str(guild_id), "prefix", value)
+
+def test_prefix_is_cached_and_invalidated_by_listener():
+    database = FakeDatabase()
+    table = prefix.PrefixTable(database)
+    assert table.get(1) == "!"
+    assert table.get(1) == "!"
+    assert database.reads == 1
+    
+    database.set_prefix(1, "?")
+    assert table.get(1) == "?"
+    assert table.get(None) == "!"
+
+def test_read_racing_with_invalidate_is_not_stored():
+    database = FakeDatabase()
+    table = prefix.PrefixTable(database)
+    
+    # set_prefix selesai di thread lain setelah nilai lama dibaca
+    def change_during_read():
+        database.on_read = None
+        database.set_prefix(1, "?")
+    
+    database.on_read = change_during_read
+    assert table.get(1) == "!"
+    assert len(table) == 0
+    assert table.get(1) == "?"
+
+def test_mention_prefixes():
+    assert prefix.mention_prefixes(42) == ("<@42> ", "<@!42> ")
+
+def test_could_be_command():
+    mentions = prefix.mention_prefixes(42)
+    assert prefix.could_be_command("!help", "!", mentions)
+    assert prefix.could_be_command("<@42> help", "?", mentions)
+    assert prefix.could_be_command("<@!42> help", "?", mentions)
+    assert not prefix.could_be_command("!help", "?", mentions)
+    assert not prefix.could_be_command("halo <@42>", "?", mentions)
+    assert not prefix.could_be_command("<@42> help", "?")
+    assert not prefix.could_be_command("", "!", mentions)
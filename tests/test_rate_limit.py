@@ -0,0 +1,88 @@
+"""Tes rate limiter command dan budget API upstream dengan jam simulasi"""
+
+import random
+
+import pytest
+
+from rate_limit import CommandRateLimiter, UpstreamBudget, UpstreamBudgetExceeded
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+    
+    def __call__(self):
+        return self.now
+
+def test_burst_from_many_users():
+    users, guilds, seconds, burst_size, cooldown = 2_000, 200, 30.0, 20, 5.0
+    clock = FakeClock()
+    limiter = CommandRateLimiter({"anime": cooldown}, burst=3, guild_multiplier=50, clock=clock)
+    rng = random.Random(42)
+    events = sorted((rng.uniform(0, seconds), user) for user in range(users))
+    
+    allowed = {}
+    for at, user in events:
+        for i in range(burst_size):
+            clock.now = at + i * 0.01
+            retry_after, _, _ = limiter.hit("anime", user, user % guilds)
+            if not retry_after:
+                allowed[user] = allowed.get(user, 0) + 1
+    
+    window = burst_size * 0.01
+    assert max(allowed.values()) <= limiter.burst + window / cooldown + 1
+    assert limiter.stats()["denied"] == users * burst_size - sum(allowed.values())
+    
+    # Setelah semua bucket penuh kembali, pengecekan berikutnya membuang semuanya
+    clock.now = seconds + cooldown * limiter.burst * limiter.guild_multiplier + 1
+    limiter.hit("anime", -1, None)
+    limiter.hit("anime", -1, -1)
+    assert limiter.stats()["buckets"] <= 2
+
+def test_guild_denial_does_not_spend_user_tokens():
+    clock = FakeClock()
+    limiter = CommandRateLimiter({"anime": 10}, burst=2, guild_multiplier=1, clock=clock)
+    # Pengguna lain menghabiskan bucket server
+    assert limiter.hit("anime", 1, 100)[0] == 0
+    assert limiter.hit("anime", 2, 100)[0] == 0
+    
+    retry_after, scope, _ = limiter.hit("anime", 3, 100)
+    assert retry_after > 0 and scope == "guild"
+    retry_after, scope, _ = limiter.hit("anime", 3, 100)
+    assert scope == "guild"
+    
+    # Token pengguna 3 masih utuh untuk server lain dan DM
+    assert limiter.hit("anime", 3, 200)[0] == 0
+    assert limiter.hit("anime", 3, None)[0] == 0
+    retry_after, scope, _ = limiter.hit("anime", 3, None)
+    assert retry_after > 0 and scope == "user"
+
+def test_notify_once_per_denial_streak():
+    clock = FakeClock()
+    limiter = CommandRateLimiter({"anime": 10}, burst=1, clock=clock)
+    assert limiter.hit("anime", 1, None) == (0.0, "user", False)
+    
+    notifications = [limiter.hit("anime", 1, None)[2] for _ in range(5)]
+    assert notifications == [True, False, False, False, False]
+    
+    # Command yang lolos mengakhiri streak
+    clock.now = 10.0
+    assert limiter.hit("anime", 1, None)[0] == 0
+    assert limiter.hit("anime", 1, None)[2] is True
+
+def test_upstream_reserve_queues_then_rejects_above_max_wait():
+    clock = FakeClock()
+    budget = UpstreamBudget({"jikan": (1.0, 2.0)}, max_wait=2.5, clock=clock)
+    
+    assert budget.reserve("jikan") == 0
+    assert budget.reserve("jikan") == 0
+    assert budget.reserve("jikan") == pytest.approx(1.0)
+    assert budget.reserve("jikan") == pytest.approx(2.0)
+    with pytest.raises(UpstreamBudgetExceeded) as excinfo:
+        budget.reserve("jikan")
+    assert excinfo.value.retry_after == pytest.approx(3.0)
+    assert (budget.throttled, budget.rejected) == (2, 1)
+    
+    # Penolakan tidak memesan token
+    clock.now = 3.0
+    assert budget.reserve("jikan") == 0
+    assert budget.reserve("unconfigured") == 0
@@ -0,0 +1,36 @@
+"""Tes cache pengaturan server bersama"""
+
+from memory_db import MemoryDB
+from settings_cache import GuildSettingsCache
+
+def test_prefix_and_language_are_cached_per_guild():
+    database = MemoryDB()
+    cache = GuildSettingsCache(database)
+    assert cache.get_prefix(1) == "!"
+    assert cache.get_language(1) == "id"
+    assert cache.get_prefix(None) == "!"
+    stats = cache.stats()
+    assert (stats["hits"], stats["misses"]) == (1, 1)
+
+def test_setting_listener_invalidates_entry():
+    database = MemoryDB()
+    cache = GuildSettingsCache(database)
+    cache.get_settings(1)
+    
+    database.set_guild_language(1, "en")
+    assert cache.get_language(1) == "en"
+    database.set_guild_prefix(1, "?")
+    assert cache.get_prefix(1) == "?"
+    assert cache.stats()["invalidations"] == 2
+
+def test_lru_eviction_and_ttl():
+    database = MemoryDB()
+    cache = GuildSettingsCache(database, max_size=2, ttl=0)
+    for guild_id in (1, 2, 3):
+        cache.get_settings(guild_id)
+    assert len(cache) == 2
+    assert cache.stats()["evictions"] == 1
+    
+    # ttl=0: entri langsung kedaluwarsa dan dibaca ulang
+    cache.get_settings(3)
+    assert cache.stats()["expirations"] == 1
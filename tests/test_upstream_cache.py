@@ -0,0 +1,75 @@
+"""Tes cache JSON upstream dengan klien HTTP stub"""
+
+import os
+import json
+import time
+import asyncio
+
+from upstream_cache import UpstreamCache
+
+class StubClient:
+    def __init__(self, status=200):
+        self.status = status
+        self.calls = 0
+    
+    async def fetch_json(self, url, headers=None, **kwargs):
+        self.calls += 1
+        await asyncio.sleep(0.01)
+        if self.status is None:
+            raise ConnectionError("upstream mati")
+        if self.status == 200:
+            return 200, {"ETag": '"v1"'}, {"url": url}
+        return self.status, {}, None
+
+def lookup_many(cache, count, key="kota"):
+    async def run():
+        return await asyncio.gather(*(cache.get(key, "https://upstream/kota.json", 60) for _ in range(count)))
+    return asyncio.run(run())
+
+def test_coalesced_lookups_count_as_full_fetch(tmp_path):
+    client = StubClient()
+    cache = UpstreamCache(str(tmp_path), client)
+    results = lookup_many(cache, 5)
+    assert results == [{"url": "https://upstream/kota.json"}] * 5
+    assert client.calls == 1
+    stats = cache.stats()
+    assert stats["coalesced"] == 4
+    assert stats["fetched"] == 5
+    assert stats["hit_rate"] == 0.0
+
+def test_coalesced_lookups_count_as_failures(tmp_path):
+    cache = UpstreamCache(str(tmp_path), StubClient(status=None))
+    assert lookup_many(cache, 3) == [None] * 3
+    stats = cache.stats()
+    assert stats["failures"] == 3
+    assert stats["upstream_errors"] == 1
+    assert stats["hit_rate"] == 0.0
+
+def test_coalesced_lookups_count_as_revalidated(tmp_path):
+    cache = UpstreamCache(str(tmp_path), StubClient(status=304))
+    asyncio.run(cache.seed("kota", "https://upstream/kota.json", ["Jakarta"]))
+    assert lookup_many(cache, 4) == [["Jakarta"]] * 4
+    stats = cache.stats()
+    assert stats["revalidated"] == 4
+    assert stats["hit_rate"] == 1.0
+
+def test_expired_files_pruned_before_first_lookup(tmp_path):
+    expired = tmp_path / "lama.json"
+    expired.write_text(json.dumps({"expires_at": time.time() - 10, "revalidate_at": 0, "data": 1}))
+    cache = UpstreamCache(str(tmp_path), StubClient())
+    lookup_many(cache, 1)
+    assert not expired.exists()
+    assert (tmp_path / "kota.json").exists()
+
+def test_prune_on_start_can_be_disabled(tmp_path):
+    expired = tmp_path / "lama.json"
+    expired.write_text(json.dumps({"expires_at": time.time() - 10, "revalidate_at": 0, "data": 1}))
+    cache = UpstreamCache(str(tmp_path), StubClient(), prune_on_start=False)
+    lookup_many(cache, 1)
+    assert expired.exists()
+
+def test_failed_write_removes_temp_file(tmp_path):
+    cache = UpstreamCache(str(tmp_path), StubClient())
+    # set tidak bisa di-serialize ke JSON, jadi penulisan gagal setelah file sementara dibuat
+    cache._write("kota", {"data": {1, 2}})
+    assert os.listdir(tmp_path) == []
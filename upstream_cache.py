@@ -0,0 +1,407 @@
+"""
+upstream_cache.py - Cache disk untuk file JSON upstream dengan revalidasi
+
+Module ini menyimpan respons JSON dari API upstream (kota.json dan file
+adzan bulanan jadwalsholat.org) di direktori cache, satu file per kunci,
+dengan salinan di memori. Entri yang masih segar langsung dipakai;
+entri yang lewat masa segarnya direvalidasi dengan If-None-Match /
+If-Modified-Since sehingga upstream cukup membalas 304 tanpa body.
+Jika upstream gagal, entri lama tetap disajikan (stale-if-error) selama
+belum melewati batas kedaluwarsanya. Baca/tulis disk dijalankan di
+thread (asyncio.to_thread) agar event loop tidak tertahan.
+"""
+
+import os
+import re
+import json
+import time
+import asyncio
+import logging
+import tempfile
+from typing import Any, Dict, Optional, Tuple
+
+from http_pool import PooledHTTPClient, pooled_client
+from metrics import metrics
+
+logger = logging.getLogger("upstream_cache")
+
+class UpstreamCache:
+    """
+    Cache JSON upstream yang disimpan di disk
+    
+    Setiap entri menyimpan data, ETag, Last-Modified, waktu revalidasi
+    berikutnya (revalidate_at) dan batas kedaluwarsa (expires_at, None
+    berarti tidak pernah). Pemanggil yang meminta kunci yang sama saat
+    request upstream masih berjalan ikut menunggu request tersebut,
+    jadi satu command yang memuat kota.json tiga kali hanya memicu satu
+    request.
+    """
+    def __init__(self, directory: str, client: PooledHTTPClient, prune_on_start: bool = True):
+        """
+        Membuat cache
+        
+        Args:
+            directory: Direktori file cache
+            client: Klien HTTP untuk API upstream
+            prune_on_start: Hapus file kedaluwarsa sebelum lookup pertama
+        """
+        self.directory = directory
+        self.client = client
+        self.prune_on_start = prune_on_start
+        self._entries: Dict[str, Dict[str, Any]] = {}
+        self._inflight: Dict[str, asyncio.Future] = {}
+        self._prune_task: Optional[asyncio.Task] = None
+        self.lookups = 0
+        self.hits = 0
+        self.revalidated = 0
+        self.fetched = 0
+        self.stale_served = 0
+        self.coalesced = 0
+        self.failures = 0
+        self.upstream_calls = 0
+        self.upstream_errors = 0
+        self.prefetched = 0
+        self.prefetch_skipped = 0
+    
+    def _path(self, key: str) -> str:
+        return os.path.join(self.directory, re.sub(r"[^A-Za-z0-9_.-]", "_", key) + ".json")
+    
+    def _read(self, key: str) -> Optional[Dict[str, Any]]:
+        """Membaca entri dari disk (blocking)"""
+        try:
+            with open(self._path(key), "r", encoding="utf-8") as f:
+                return json.load(f)
+        except FileNotFoundError:
+            return None
+        except (OSError, ValueError) as e:
+            logger.warning(f"File cache {key} rusak, diabaikan: {e}")
+            return None
+    
+    def _write(self, key: str, entry: Dict[str, Any]) -> None:
+        """Menulis entri ke disk secara atomik (blocking)"""
+        tmp_path = None
+        try:
+            os.makedirs(self.directory, exist_ok=True)
+            fd, tmp_path = tempfile.mkstemp(dir=self.directory, prefix=".cache-")
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                json.dump(entry, f, separators=(",", ":"))
+            os.replace(tmp_path, self._path(key))
+        except (OSError, TypeError, ValueError) as e:
+            logger.error(f"Gagal menulis cache {key}: {e}")
+            if tmp_path is not None:
+                try:
+                    os.unlink(tmp_path)
+                except OSError:
+                    pass
+    
+    async def _load(self, key: str) -> Optional[Dict[str, Any]]:
+        """Mengambil entri dari memori, atau dari disk saat pertama kali dipakai"""
+        entry = self._entries.get(key)
+        if entry is not None:
+            return entry
+        entry = await asyncio.to_thread(self._read, key)
+        # Entri yang disimpan selama file dibaca lebih baru dari isi file
+        current = self._entries.get(key)
+        if current is not None:
+            return current
+        if entry is not None:
+            self._entries[key] = entry
+        return entry
+    
+    async def _store(self, key: str, entry: Dict[str, Any]) -> None:
+        """Menyimpan entri ke memori lalu menulisnya ke disk"""
+        self._entries[key] = entry
+        await asyncio.to_thread(self._write, key, entry)
+    
+    async def _drop(self, key: str) -> None:
+        self._entries.pop(key, None)
+        try:
+            await asyncio.to_thread(os.remove, self._path(key))
+        except OSError:
+            pass
+    
+    def prune(self, now: Optional[float] = None) -> int:
+        """
+        Menghapus file cache yang sudah melewati expires_at
+        
+        Blocking; di dalam event loop get() menjalankannya di thread
+        sekali sebelum lookup pertama.
+        
+        Args:
+            now: Waktu sekarang (epoch detik)
+        
+        Returns:
+            Jumlah file yang dihapus
+        """
+        now = time.time() if now is None else now
+        removed = self._prune_files(now)
+        self._prune_entries(now)
+        return removed
+    
+    def _prune_files(self, now: float) -> int:
+        removed = 0
+        try:
+            names = os.listdir(self.directory)
+        except OSError:
+            return 0
+        for name in names:
+            if not name.endswith(".json") or name.startswith("."):
+                continue
+            path = os.path.join(self.directory, name)
+            try:
+                with open(path, "r", encoding="utf-8") as f:
+                    expires_at = json.load(f).get("expires_at")
+                if expires_at is not None and expires_at <= now:
+                    os.remove(path)
+                    removed += 1
+            except (OSError, ValueError):
+                continue
+        return removed
+    
+    def _prune_entries(self, now: float) -> None:
+        self._entries = {
+            key: entry for key, entry in self._entries.items()
+            if entry.get("expires_at") is None or entry["expires_at"] > now
+        }
+    
+    async def _prune_once(self) -> None:
+        """Menjalankan prune di thread satu kali; lookup lain menunggu sampai selesai"""
+        if not self.prune_on_start:
+            return
+        if self._prune_task is None:
+            async def run():
+                now = time.time()
+                await asyncio.to_thread(self._prune_files, now)
+                self._prune_entries(now)
+            self._prune_task = asyncio.get_running_loop().create_task(run())
+        if not self._prune_task.done():
+            await asyncio.shield(self._prune_task)
+    
+    async def seed(self, key: str, url: str, data: Any, etag: Optional[str] = None,
+                   last_modified: Optional[str] = None) -> bool:
+        """
+        Mengisi kunci yang belum pernah di-cache dengan data awal
+        
+        Data awal langsung dianggap perlu revalidasi, jadi hanya dipakai
+        jika upstream tidak bisa dihubungi atau membalas 304 untuk
+        etag/last_modified yang diberikan.
+        
+        Args:
+            key: Kunci cache
+            url: URL upstream
+            data: Data awal
+            etag: ETag data awal
+            last_modified: Last-Modified data awal
+        
+        Returns:
+            True jika kunci diisi
+        """
+        if await self._load(key) is not None:
+            return False
+        await self._store(key, {
+            "url": url,
+            "etag": etag,
+            "last_modified": last_modified,
+            "fetched_at": 0,
+            "revalidate_at": 0,
+            "expires_at": None,
+            "data": data
+        })
+        return True
+    
+    async def get(self, key: str, url: str, revalidate_after: float,
+                  expires_at: Optional[float] = None) -> Optional[Any]:
+        """
+        Mendapatkan data JSON untuk kunci, dari cache atau upstream
+        
+        Args:
+            key: Kunci cache, misalnya "kota" atau "adzan/jakarta/2025/3"
+            url: URL upstream
+            revalidate_after: Lama data dianggap segar dalam detik
+            expires_at: Batas waktu (epoch detik) data boleh disajikan, None = selamanya
+        
+        Returns:
+            Data JSON, atau None jika tidak ada di cache dan upstream gagal
+        """
+        await self._prune_once()
+        self.lookups += 1
+        entry = await self._load(key)
+        now = time.time()
+        if entry is not None and entry.get("expires_at") is not None and entry["expires_at"] <= now:
+            await self._drop(key)
+            entry = None
+        if entry is not None and now < entry["revalidate_at"]:
+            self.hits += 1
+            return entry["data"]
+        
+        pending = self._inflight.get(key)
+        if pending is not None:
+            # Dihitung menurut hasil request yang diikuti, seperti pemanggil pertama
+            self.coalesced += 1
+            data, outcome = await asyncio.shield(pending)
+        else:
+            data, outcome = await self._refresh_once(key, url, entry, revalidate_after, expires_at)
+        self._count(outcome)
+        return data
+    
+    async def prefetch(self, key: str, url: str, revalidate_after: float,
+                       expires_at: Optional[float] = None, fresh_until: Optional[float] = None) -> bool:
+        """
+        Mengisi atau merevalidasi kunci sebelum dibutuhkan pengguna
+        
+        Tidak dihitung sebagai lookup, jadi hit_rate tetap mencerminkan
+        permintaan pengguna saja.
+        
+        Args:
+            key: Kunci cache
+            url: URL upstream
+            revalidate_after: Lama data dianggap segar dalam detik
+            expires_at: Batas waktu (epoch detik) data boleh disajikan
+            fresh_until: Entri yang masih segar sampai waktu ini dilewati (default sekarang)
+        
+        Returns:
+            True jika upstream dihubungi
+        """
+        await self._prune_once()
+        entry = await self._load(key)
+        now = time.time()
+        if entry is not None and entry.get("expires_at") is not None and entry["expires_at"] <= now:
+            await self._drop(key)
+            entry = None
+        if entry is not None and entry["revalidate_at"] > (now if fresh_until is None else fresh_until):
+            self.prefetch_skipped += 1
+            return False
+        pending = self._inflight.get(key)
+        if pending is not None:
+            await asyncio.shield(pending)
+            return False
+        self.prefetched += 1
+        await self._refresh_once(key, url, entry, revalidate_after, expires_at)
+        return True
+    
+    def _count(self, outcome: str) -> None:
+        """Menambah penghitung lookup untuk hasil _refresh (nama atributnya)"""
+        setattr(self, outcome, getattr(self, outcome) + 1)
+    
+    async def _refresh_once(self, key: str, url: str, entry: Optional[Dict[str, Any]],
+                            revalidate_after: float, expires_at: Optional[float]) -> Tuple[Optional[Any], str]:
+        """Menjalankan _refresh dan membagikan hasilnya ke pemanggil lain untuk kunci yang sama"""
+        future = asyncio.get_running_loop().create_future()
+        self._inflight[key] = future
+        try:
+            result = await self._refresh(key, url, entry, revalidate_after, expires_at)
+            future.set_result(result)
+            return result
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except Exception as e:
+            future.set_exception(e)
+            # Hindari peringatan "exception was never retrieved" jika tidak ada yang menunggu
+            future.exception()
+            raise
+        finally:
+            del self._inflight[key]
+    
+    async def _refresh(self, key: str, url: str, entry: Optional[Dict[str, Any]],
+                       revalidate_after: float, expires_at: Optional[float]) -> Tuple[Optional[Any], str]:
+        """
+        Merevalidasi atau mengambil ulang satu kunci dari upstream
+        
+        Hanya upstream_calls dan upstream_errors yang dihitung di sini;
+        hasilnya ("revalidated", "fetched", "stale_served" atau "failures")
+        dihitung oleh get() untuk setiap lookup pengguna yang memakainya,
+        jadi prefetch tidak ikut terhitung.
+        
+        Returns:
+            Tuple (data, hasil)
+        """
+        headers = {}
+        if entry is not None:
+            if entry.get("etag"):
+                headers["If-None-Match"] = entry["etag"]
+            if entry.get("last_modified"):
+                headers["If-Modified-Since"] = entry["last_modified"]
+        
+        self.upstream_calls += 1
+        try:
+            status, response_headers, data = await self.client.fetch_json(url, headers=headers)
+        except Exception as e:
+            status, response_headers, data = None, {}, None
+            logger.warning(f"Gagal mengambil {url}: {type(e).__name__}: {e}")
+        
+        now = time.time()
+        if status == 304 and entry is not None:
+            entry = dict(entry, revalidate_at=now + revalidate_after, expires_at=expires_at)
+            await self._store(key, entry)
+            return entry["data"], "revalidated"
+        if status == 200 and data is not None:
+            await self._store(key, {
+                "url": url,
+                "etag": response_headers.get("ETag"),
+                "last_modified": response_headers.get("Last-Modified"),
+                "fetched_at": now,
+                "revalidate_at": now + revalidate_after,
+                "expires_at": expires_at,
+                "data": data
+            })
+            return data, "fetched"
+        
+        self.upstream_errors += 1
+        if status is not None:
+            logger.warning(f"Upstream {url} membalas {status}")
+        if entry is not None:
+            # stale-if-error: sajikan data lama, coba lagi pada pemanggilan berikutnya
+            return entry["data"], "stale_served"
+        return None, "failures"
+    
+    def stats(self) -> Dict[str, Any]:
+        """
+        Mendapatkan statistik cache
+        
+        Returns:
+            Dictionary jumlah lookup, hit, revalidasi 304, fetch penuh,
+            stale yang disajikan, kegagalan, request upstream, prefetch dan
+            hit_rate (bagian lookup yang dilayani tanpa mengunduh ulang body).
+            Lookup yang menunggu request lain (coalesced) juga dihitung
+            sebagai revalidated/fetched/stale_served/failures sesuai hasil
+            request tersebut.
+        """
+        served = self.hits + self.revalidated + self.stale_served
+        return {
+            "lookups": self.lookups,
+            "hits": self.hits,
+            "revalidated": self.revalidated,
+            "fetched": self.fetched,
+            "stale_served": self.stale_served,
+            "coalesced": self.coalesced,
+            "failures": self.failures,
+            "upstream_calls": self.upstream_calls,
+            "upstream_errors": self.upstream_errors,
+            "prefetched": self.prefetched,
+            "prefetch_skipped": self.prefetch_skipped,
+            "hit_rate": served / self.lookups if self.lookups else 0.0,
+            "entries": len(self._entries)
+        }
+
+_caches: Dict[str, UpstreamCache] = {}
+
+def shared_cache(name: str, directory: str) -> UpstreamCache:
+    """
+    Mendapatkan cache bersama untuk satu API
+    
+    Cache memakai klien pooled_client(name) dan statistiknya diekspor
+    sebagai gauge "cache_<name>" di snapshot metrics.
+    
+    Args:
+        name: Nama API
+        directory: Direktori file cache, hanya dipakai saat cache pertama dibuat
+    
+    Returns:
+        UpstreamCache
+    """
+    cache = _caches.get(name)
+    if cache is None:
+        cache = _caches[name] = UpstreamCache(directory, pooled_client(name))
+        metrics.register_gauges(f"cache_{name}", cache.stats)
+    return cache
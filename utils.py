@@ -8,25 +8,14 @@ di berbagai bagian program bot Discord.
 import discord
 from typing import Optional, Dict, Any
 from memory_db import db
-import re
-import logging
+from language import catalog
+from settings_cache import GuildSettingsCache
 import pytz
 from datetime import datetime
 
-# Configure logging to prevent Korean characters from being displayed in terminal
-logging.basicConfig(level=logging.INFO, 
-                   format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
-
-# Filter to prevent non-ASCII characters in logs
-class ASCIIFilter(logging.Filter):
-    def filter(self, record):
-        if isinstance(record.msg, str):
-            record.msg = re.sub(r'[^\x00-\x7F]+', '[non-ASCII]', record.msg)
-        return True
-
-# Apply filter to root logger
-root_logger = logging.getLogger()
-root_logger.addFilter(ASCIIFilter())
+# Cache pengaturan server yang sama dengan src/utils/helper.py, dibuang
+# lewat listener saat prefix atau bahasa guild diubah
+settings_cache = GuildSettingsCache(db)
 
 # Function to get guild language
 def get_lang(guild_id):
@@ -39,7 +28,7 @@ def get_lang(guild_id):
     Returns:
         String kode bahasa (id, en, dll)
     """
-    return db.get_guild_language(guild_id)
+    return settings_cache.get_language(guild_id)
 
 # Function to get guild prefix
 def get_prefix(bot, message):
@@ -53,9 +42,7 @@ def get_prefix(bot, message):
     Returns:
         String prefix command
     """
-    if message.guild is None:
-        return "!"  # Default prefix for DMs
-    return db.get_guild_prefix(message.guild.id)
+    return settings_cache.get_prefix(message.guild.id if message.guild else None)
 
 # Translations helper function
 def get_text(guild_id: Optional[int], key: str, **kwargs) -> str:
@@ -70,33 +57,7 @@ def get_text(guild_id: Optional[int], key: str, **kwargs) -> str:
     Returns:
         String terjemahan
     """
-    from language import LANGUAGES
-    lang = get_lang(guild_id)
-    
-    # Split the key by dots to handle nested keys
-    keys = key.split('.')
-    value = LANGUAGES[lang]["translations"]
-    
-    # Navigate through nested dictionary
-    for k in keys:
-        if k in value:
-            value = value[k]
-        else:
-            # If key not found, use the default language (id)
-            if lang != "id":
-                return get_text(guild_id, key, lang="id", **kwargs)
-            # If still not found, return the key itself
-            return key
-    
-    # If we have a string, format it with kwargs
-    if isinstance(value, str):
-        try:
-            value = value.format(**kwargs)
-        except KeyError:
-            # If there's a missing key in kwargs, use key as fallback
-            pass
-    
-    return value
+    return catalog.get(get_lang(guild_id), key, **kwargs)
 
 def log_command(user_id, guild_id, command_name):
     """